@@ -0,0 +1,318 @@
+# benchmarks/bench_analytics.py
+"""
+Micro-benchmark de los métodos calculate_* de AnalyticsEngine (core/analytics.py) sobre
+DataFrames sintéticos de 10k, 100k y 1M filas, sin base de datos.
+
+Los DataFrames tienen la forma de `coctel_completo` ya decorado (lugar, programa_nombre,
+canal_nombre, nombre_facebook_page, descripcion, nombre, mensaje_fuerza, ...) y las
+mismas vistas que arma DataLoader.load_coctel_data; se generan con las distribuciones de
+benchmarks/synthetic_data.py. Cada método se llama con opciones que recorren todos los
+datos ("Todos" donde existe) y se mide:
+    - tiempo de CPU (mediana de `--repeticiones`, time.process_time)
+    - pico de memoria asignada durante la llamada (tracemalloc, en una corrida aparte)
+
+Con los tiempos de cada tamaño se calcula el exponente de crecimiento
+log(t2 / t1) / log(n2 / n1): 1 es lineal; los métodos por encima de --max-exponente se
+marcan como superlineales.
+
+Uso:
+    python benchmarks/bench_analytics.py --json analytics_antes.json
+    python benchmarks/bench_analytics.py --comparar analytics_antes.json --tolerancia 0.2
+    python benchmarks/bench_analytics.py --filas 10k 100k --metodos calculate_top_lugares
+
+Termina con código 1 si algún método crece de forma superlineal o, con --comparar, si
+usa más CPU que el archivo anterior por más de --tolerancia.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import generar, parsear_escala
+from config.constants import ID_FUENTE_DICT
+from core.analytics import AnalyticsEngine
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TAMANOS = ["10k", "100k", "1m"]
+
+# Los métodos heredados comparan contra los nombres de color, no contra el hex de posiciones
+COLOR_POSICION = {1: "Azul", 2: "Celeste", 3: "Gris", 4: "Naranja", 5: "Rojo"}
+
+# Tiempos menores no se usan para el exponente: domina el costo fijo y el ruido
+MIN_CPU_EXPONENTE = 0.002
+
+Preparador = Callable[[Dict[str, Any]], Tuple[tuple, Dict[str, Any]]]
+
+# Método -> argumentos a partir de las vistas (cada vista pedida llega como copia)
+ARGUMENTOS: Dict[str, Preparador] = {
+    "calculate_coctel_proportion": lambda v: ((v["fuente"],), {}),
+    "calculate_coctel_proportion_combined": lambda v: ((v["fuente"], list(ID_FUENTE_DICT.values()), []), {}),
+    "calculate_position_by_source": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_weekly_percentage": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_weekly_favor_contra": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_cumulative_percentage": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_top_lugares": lambda v: ((v["fuente"], "Todos"), {"top_n": 3}),
+    "calculate_top_medios": lambda v: ((v["programas"], v["fb"], "Radio"), {"top_n": 3}),
+    "calculate_macroregion_growth": lambda v: ((v["fuente"], "Todos", "Macro región Sur 1"), {}),
+    "calculate_position_count": lambda v: ((v["fuente"], "Todos", "Todos"), {}),
+    "calculate_position_distribution": lambda v: ((v["fuente"], "Todos", "Todos"), {}),
+    "calculate_coctel_events_distribution": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_coctel_by_source_location": lambda v: ((v["fuente"],), {}),
+    "calculate_media_generating_coctel": lambda v: ((v["fuente"], v["fb"]), {}),
+    "calculate_monthly_coctel_count": lambda v: ((v["fuente"], v["fb"]), {}),
+    "calculate_favor_contra_notes": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_message_proportion_by_position": lambda v: ((v["fuente"], "Todos", "Todos"), {}),
+    "calculate_messages_by_topic": lambda v: ((v["temas"], "Todos", "Todos"), {"top_n": 10}),
+    "calculate_topic_proportion": lambda v: ((v["temas"], "Todos", "Todos"), {"top_n": 10}),
+    "calculate_notes_trend_by_medium": lambda v: ((v["programas"], v["fb"], "Radio", "Todos"), {}),
+    "calculate_notes_by_time_position": lambda v: ((v["fuente"], "Todos"), {}),
+    "calculate_actor_positions": lambda v: ((v["actores"], "Todos", "Todos"), {"top_n": 10}),
+    "calculate_coctel_percentage_by_media": lambda v: ((v["fuente"], v["mes_inicio"], v["mes_fin"]), {}),
+    "calculate_last_3_months_coctel": lambda v: ((v["fuente"], v["mes_fin"], "Radio"), {}),
+    "calculate_monthly_evolution": lambda v: ((v["fuente"],), {}),
+    "calculate_coctel_by_message_force": lambda v: ((v["completo"], "Todos", "Todos"), {}),
+    "calculate_program_impacts": lambda v: ((v["programas"], "Radio"), {}),
+    "calculate_coctel_distribution_by_media": lambda v: ((v["fuente"],), {}),
+    "calculate_program_impacts_complete": lambda v: ((v["programas"], "Radio"), {}),
+    "calculate_favor_vs_contra_monthly": lambda v: ((v["fuente"], "Todos"), {}),
+}
+
+
+class VistasCopiadas(dict):
+    """Entrega una copia nueva de cada DataFrame: varios métodos modifican su entrada"""
+
+    def __getitem__(self, clave):
+        valor = super().__getitem__(clave)
+        return valor.copy() if isinstance(valor, pd.DataFrame) else valor
+
+
+def _primero(puente: pd.DataFrame, columna: str) -> pd.Series:
+    """Primer valor de `columna` por acontecimiento en una tabla puente"""
+    return puente.drop_duplicates("id_acontecimiento").set_index("id_acontecimiento")[columna]
+
+
+def construir_coctel_completo(filas: int, semilla: int) -> pd.DataFrame:
+    """
+    `coctel_completo` decorado, una fila por acontecimiento: el primer programa, post,
+    tema y actor de cada uno (así el tamaño es exactamente `filas`). Las fechas no están
+    ordenadas: cualquier prefijo cubre todo el rango de meses.
+    """
+    partes = generar(filas, semilla=semilla, filas_por_bloque=filas)
+    dims = next(partes)
+    bloque = next(partes)
+    a = bloque["acontecimientos"]
+    ids = a["id"]
+
+    programas = dims["programas"].set_index("id")
+    id_programa = ids.map(_primero(bloque["acontecimiento_programa"], "id_programa"))
+    posts = bloque["acontecimiento_facebook_post"].merge(
+        bloque["facebook_posts"], left_on="id_facebook_post", right_on="id", suffixes=("_afp", "")
+    )
+    posts = posts.drop_duplicates("id_acontecimiento").set_index("id_acontecimiento")
+    notas = bloque["notas"].set_index("id")["id_mensaje_fuerza"]
+
+    def nombres(dimension: str, columna: str = "nombre") -> pd.Series:
+        return dims[dimension].set_index("id")[columna]
+
+    df = pd.DataFrame({
+        "id": ids,
+        "fecha_registro": a["fecha_registro"].dt.tz_convert(None).dt.normalize(),
+        "acontecimiento": a["acontecimiento"],
+        "coctel": a["coctel"].astype(float),
+        "id_posicion": a["id_posicion"],
+        "lugar": a["id_lugar"].map(nombres("lugares")),
+        "color": a["id_posicion"].map(COLOR_POSICION),
+        "id_fuente": id_programa.map(programas["id_fuente"]).fillna(3),
+        "id_canal": id_programa.map(programas["id_canal"]),
+        "programa_nombre": id_programa.map(programas["nombre"]),
+    })
+    df["fuente_nombre"] = df["id_fuente"].map(ID_FUENTE_DICT)
+    df["canal_nombre"] = df["id_canal"].map(nombres("canales"))
+    df["nombre_facebook_page"] = ids.map(posts["id_facebook_page"]).map(nombres("facebook_pages"))
+    for columna in ("num_reacciones", "num_comentarios", "num_compartidos"):
+        df[columna] = ids.map(posts[columna])
+    df["fecha_post"] = ids.map(posts["fecha"])
+    df["nombre"] = ids.map(_primero(bloque["acontecimiento_actor"], "id_actor")).map(nombres("actores"))
+    df["descripcion"] = ids.map(_primero(bloque["acontecimiento_tema"], "id_tema")).map(
+        nombres("temas", "descripcion"))
+    df["mensaje_fuerza"] = a["id_nota"].map(notas).map(nombres("mensaje_fuerza", "mensaje"))
+    df["rebote_nombre"] = df["canal_nombre"].fillna(df["nombre_facebook_page"])
+    return df
+
+
+def construir_vistas(completo: pd.DataFrame) -> Dict[str, Any]:
+    """Las mismas vistas que DataLoader.load_coctel_data"""
+    base = ['id', 'fecha_registro', 'acontecimiento', 'coctel', 'id_posicion',
+            'lugar', 'color', 'id_fuente', 'fuente_nombre', 'id_canal', 'canal_nombre']
+    fuente = completo[base + ['programa_nombre', 'rebote_nombre']].drop_duplicates()
+    programas = fuente.copy()
+    programas['nombre_canal'] = programas['canal_nombre']
+    fb = completo[base + ['num_reacciones', 'num_comentarios', 'num_compartidos',
+                          'fecha_post', 'nombre_facebook_page']].copy()
+    fb['nombre_canal'] = fb['canal_nombre']
+    fin = completo['fecha_registro'].max()
+    return VistasCopiadas({
+        "completo": completo,
+        "fuente": fuente,
+        "programas": programas,
+        "fb": fb,
+        "actores": completo[base + ['nombre']],
+        "temas": completo[base + ['descripcion']],
+        "mes_inicio": (fin - pd.DateOffset(months=5)).strftime('%Y-%m'),
+        "mes_fin": fin.strftime('%Y-%m'),
+    })
+
+
+def medir(funcion, preparar: Preparador, vistas: Dict[str, Any], repeticiones: int) -> Dict[str, float]:
+    """CPU (mediana) sin tracemalloc y luego una corrida con tracemalloc para el pico"""
+    args, kwargs = preparar(vistas)
+    funcion(*args, **kwargs)                        # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        args, kwargs = preparar(vistas)
+        gc.collect()
+        t0 = time.process_time()
+        funcion(*args, **kwargs)
+        tiempos.append(time.process_time() - t0)
+
+    args, kwargs = preparar(vistas)
+    gc.collect()
+    tracemalloc.start()
+    funcion(*args, **kwargs)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "cpu_s": statistics.median(tiempos),
+        "cpu_min_s": min(tiempos),
+        "pico_mb": pico / 2 ** 20,
+    }
+
+
+def exponente(por_tamano: Dict[int, Dict[str, float]]) -> float:
+    """Mayor exponente de crecimiento del CPU entre tamaños consecutivos (None si no hay datos)"""
+    puntos = sorted((n, r["cpu_s"]) for n, r in por_tamano.items())
+    pendientes = [
+        math.log(t2 / t1) / math.log(n2 / n1)
+        for (n1, t1), (n2, t2) in zip(puntos, puntos[1:])
+        if t1 >= MIN_CPU_EXPONENTE and t2 >= MIN_CPU_EXPONENTE
+    ]
+    return max(pendientes) if pendientes else None
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", nargs="+", default=TAMANOS, help="Tamaños (10k, 100k, 1m o un número)")
+    parser.add_argument("--metodos", nargs="+", help="Métodos a medir (default: todos los calculate_*)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--max-exponente", type=float, default=1.2,
+                        help="Exponente de crecimiento a partir del cual un método es superlineal")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior (por ejemplo, de otro commit)")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="Aumento de CPU tolerado (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    disponibles = sorted(m for m in dir(AnalyticsEngine) if m.startswith("calculate_"))
+    sin_argumentos = [m for m in disponibles if m not in ARGUMENTOS]
+    if sin_argumentos:
+        print(f"⚠️ Sin argumentos en ARGUMENTOS (no se miden): {', '.join(sin_argumentos)}\n")
+    metodos = args.metodos or [m for m in disponibles if m in ARGUMENTOS]
+    desconocidos = [m for m in metodos if m not in ARGUMENTOS]
+    if desconocidos:
+        parser.error(f"Métodos desconocidos: {', '.join(desconocidos)}")
+
+    tamanos = sorted(parsear_escala(t) for t in args.filas)
+    anterior = {}
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f).get("metodos", {})
+
+    # Los métodos heredados asignan sobre slices: el aviso de pandas no aporta aquí
+    warnings.simplefilter("ignore")
+
+    t0 = time.perf_counter()
+    completo = construir_coctel_completo(tamanos[-1], args.semilla)
+    print(f"Datos sintéticos: {len(completo):,} filas en {time.perf_counter() - t0:.1f}s\n")
+
+    resultados: Dict[str, Dict[str, Any]] = {m: {"tamanos": {}} for m in metodos}
+    for n in tamanos:
+        vistas = construir_vistas(completo.iloc[:n].copy())
+        for metodo in metodos:
+            funcion = getattr(AnalyticsEngine, metodo)
+            resultados[metodo]["tamanos"][n] = medir(funcion, ARGUMENTOS[metodo], vistas, args.repeticiones)
+        del vistas
+        gc.collect()
+
+    superlineales, regresiones = [], []
+    encabezado = "".join(f"{f'CPU {n:,} (ms)':>18}" for n in tamanos)
+    print(f"{'método':<42}{encabezado}{'pico (MB)':>11}{'exp.':>7}")
+    for metodo in metodos:
+        r = resultados[metodo]
+        r["exponente"] = exponente(r["tamanos"])
+        r["superlineal"] = r["exponente"] is not None and r["exponente"] > args.max_exponente
+        if r["superlineal"]:
+            superlineales.append(f"{metodo} (exponente {r['exponente']:.2f})")
+
+        for n, medicion in r["tamanos"].items():
+            base = anterior.get(metodo, {}).get("tamanos", {}).get(str(n))
+            if base and medicion["cpu_s"] > base["cpu_s"] * (1 + args.tolerancia):
+                regresiones.append(f"{metodo}/{n:,}: CPU {base['cpu_s'] * 1000:.1f}ms -> "
+                                   f"{medicion['cpu_s'] * 1000:.1f}ms")
+
+        columnas = "".join(f"{r['tamanos'][n]['cpu_s'] * 1000:>18.1f}" for n in tamanos)
+        exp = f"{r['exponente']:.2f}" if r["exponente"] is not None else "-"
+        marca = "  ❌ superlineal" if r["superlineal"] else ""
+        print(f"{metodo:<42}{columnas}{r['tamanos'][tamanos[-1]]['pico_mb']:>11.1f}{exp:>7}{marca}")
+
+    if args.json:
+        salida = {
+            "metadatos": {
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+                "commit": _commit(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "repeticiones": args.repeticiones,
+                "semilla": args.semilla,
+            },
+            "metodos": {
+                m: {**r, "tamanos": {str(n): v for n, v in r["tamanos"].items()}}
+                for m, r in resultados.items()
+            },
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(salida, f, indent=2, sort_keys=True)
+        print(f"\nResultados guardados en {args.json}")
+
+    if superlineales:
+        print("\n❌ Crecimiento superlineal:\n  " + "\n  ".join(superlineales))
+    if regresiones:
+        print("\n❌ Regresiones de CPU:\n  " + "\n  ".join(regresiones))
+    if superlineales or regresiones:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_cold_start.py
+"""
+Benchmark de arranque en frío: tiempo hasta el primer dibujo del formulario de
+login y de la sección SN, cada uno en un proceso Python nuevo.
+
+Mide:
+    - importación de los módulos que carga main_app antes del login
+    - importación de sections.coctel_sections (solo al dibujar secciones)
+    - primer run de main_app.py con streamlit.testing (formulario de login)
+    - primer run con sesión iniciada y la sección SN elegida (necesita la base)
+
+Uso:
+    python benchmarks/bench_cold_start.py --repeticiones 3
+    python benchmarks/bench_cold_start.py --max-login 2.5 --max-sn 15
+
+Con --max-login / --max-sn el script termina con código 1 si la mediana supera
+el límite, para usarlo como chequeo en CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cada medición corre en un intérprete nuevo para que no haya módulos ya cargados
+MEDICIONES = {
+    "import_login": """
+import time
+t0 = time.perf_counter()
+import streamlit, core.auth, core.data_loader, core.filters, sections.registry
+print(time.perf_counter() - t0)
+""",
+    "import_secciones": """
+import time
+import streamlit, core.auth, core.data_loader, core.filters, sections.registry
+t0 = time.perf_counter()
+import sections.coctel_sections
+print(time.perf_counter() - t0)
+""",
+    "primer_dibujo_login": """
+import time
+from streamlit.testing.v1 import AppTest
+t0 = time.perf_counter()
+at = AppTest.from_file("main_app.py", default_timeout=120).run()
+assert not at.exception, at.exception
+assert len(at.text_input) > 0, "no se dibujó el formulario de login"
+print(time.perf_counter() - t0)
+""",
+    "primer_dibujo_sn": """
+import time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("main_app.py", default_timeout=300)
+at.session_state["user"] = {"username": "bench", "name": "Bench", "role": "admin"}
+t0 = time.perf_counter()
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - t0)
+""",
+}
+
+
+def medir(nombre: str) -> float:
+    """Ejecutar una medición en un proceso nuevo y devolver sus segundos"""
+    salida = subprocess.run(
+        [sys.executable, "-c", MEDICIONES[nombre]],
+        cwd=RAIZ, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": RAIZ}
+    )
+    if salida.returncode != 0:
+        raise RuntimeError(f"{nombre} falló:\n{salida.stderr[-2000:]}")
+    return float(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-db", action="store_true", help="Omitir el primer dibujo de SN (requiere la base)")
+    parser.add_argument("--max-login", type=float, help="Límite en segundos para el primer dibujo del login")
+    parser.add_argument("--max-sn", type=float, help="Límite en segundos para el primer dibujo de SN")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    nombres = [n for n in MEDICIONES if not (args.sin_db and n == "primer_dibujo_sn")]
+    resultados = {}
+    print(f"{'medición':<22} {'mediana (s)':>12} {'mín (s)':>9} {'máx (s)':>9}")
+    for nombre in nombres:
+        tiempos = [medir(nombre) for _ in range(args.repeticiones)]
+        resultados[nombre] = {
+            "mediana": statistics.median(tiempos),
+            "min": min(tiempos),
+            "max": max(tiempos),
+        }
+        r = resultados[nombre]
+        print(f"{nombre:<22} {r['mediana']:>12.3f} {r['min']:>9.3f} {r['max']:>9.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+    fallos = []
+    for nombre, limite in (("primer_dibujo_login", args.max_login), ("primer_dibujo_sn", args.max_sn)):
+        if limite is not None and nombre in resultados and resultados[nombre]["mediana"] > limite:
+            fallos.append(f"{nombre}: {resultados[nombre]['mediana']:.3f}s > {limite:.3f}s")
+    if fallos:
+        print("❌ Límites superados:\n  " + "\n  ".join(fallos))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_copy_extract.py
+"""
+Benchmark: extracción con COPY (...) TO STDOUT + lector CSV de pandas
+frente a pd.read_sql_query sobre un PostgreSQL local sembrado.
+
+Uso:
+    python benchmarks/bench_copy_extract.py --filas 100000 500000 --repeticiones 3
+
+La conexión se toma de las variables DB_HOST, DB_PORT, DB_USER, DB_PASSWORD y
+DB_NAME (las mismas del dashboard). La tabla bench_coctel se crea y se borra.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.query_executor import _db_config, leer_copy
+
+TABLA = "bench_coctel"
+
+QUERY = f"""
+SELECT id, fecha_registro, acontecimiento, coctel, id_posicion, lugar,
+       id_fuente, fuente_nombre, canal_nombre, programa_nombre,
+       num_reacciones, nombre_facebook_page, descripcion
+FROM {TABLA};
+"""
+
+
+def sembrar(conn, filas: int):
+    """Crear y llenar la tabla de benchmark con una forma parecida a coctel_completo"""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {TABLA}")
+        cur.execute(f"""
+            CREATE TABLE {TABLA} AS
+            SELECT
+                g AS id,
+                NOW() - (g % 90) * INTERVAL '1 day' AS fecha_registro,
+                'Acontecimiento de prueba número ' || g AS acontecimiento,
+                (g % 7 = 0) AS coctel,
+                1 + g % 5 AS id_posicion,
+                (ARRAY['Lima', 'Arequipa', 'Cusco', 'Piura', 'Tacna', 'Puno'])[1 + g % 6] AS lugar,
+                CASE WHEN g % 3 = 2 THEN NULL ELSE 1 + g % 2 END AS id_fuente,
+                (ARRAY['Radio', 'TV', 'Redes'])[1 + g % 3] AS fuente_nombre,
+                CASE WHEN g % 3 = 2 THEN NULL ELSE 'Canal ' || (g % 40) END AS canal_nombre,
+                'Programa ' || (g % 300) AS programa_nombre,
+                CASE WHEN g % 3 = 2 THEN g % 500 END AS num_reacciones,
+                CASE WHEN g % 3 = 2 THEN 'Página ' || (g % 120) END AS nombre_facebook_page,
+                'Tema ' || (g % 60) AS descripcion
+            FROM generate_series(1, %s) AS g
+        """, [filas])
+        cur.execute(f"ANALYZE {TABLA}")
+    conn.commit()
+
+
+def medir(funcion):
+    """Tiempo de pared y pico de memoria Python de una extracción"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    df = funcion()
+    segundos = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico, len(df)
+
+
+def con_read_sql(conn):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.read_sql_query(QUERY, conn)
+
+
+def con_copy(conn):
+    with conn.cursor() as cur:
+        return leer_copy(cur, QUERY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--conservar", action="store_true", help="No borrar la tabla al terminar")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**_db_config())
+    try:
+        print(f"{'filas':>10} {'método':<16} {'mejor (s)':>10} {'pico MB':>9} {'speedup':>8}")
+        for filas in args.filas:
+            sembrar(conn, filas)
+            resultados = {}
+            for nombre, funcion in (("read_sql_query", con_read_sql), ("COPY csv", con_copy)):
+                corridas = [medir(lambda: funcion(conn)) for _ in range(args.repeticiones)]
+                mejor = min(c[0] for c in corridas)
+                pico = max(c[1] for c in corridas) / 1024 / 1024
+                resultados[nombre] = mejor
+                speedup = resultados["read_sql_query"] / mejor
+                print(f"{filas:>10} {nombre:<16} {mejor:>10.3f} {pico:>9.1f} {speedup:>7.2f}x")
+                conn.rollback()
+    finally:
+        if not args.conservar:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {TABLA}")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
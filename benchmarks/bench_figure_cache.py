@@ -0,0 +1,111 @@
+# benchmarks/bench_figure_cache.py
+"""
+Benchmark de la caché de figuras (core/figure_cache.py): costo de entregar a
+st.plotly_chart una figura como la de la sección 5 (px.line, una traza por lugar)
+en cada rerun, sin Streamlit ni base de datos.
+
+Cada camino termina como lo hace st.plotly_chart: plotly.tools convierte la figura
+en dict y plotly.io.to_json la serializa. Mide:
+    - construir: px.line + envío (sin caché)
+    - copia: go.Figure(figura_guardada) + envío (validación completa de las trazas)
+    - especificacion: FiguraSerializada(spec_guardado) + envío (acierto de la caché)
+
+Uso:
+    python benchmarks/bench_figure_cache.py --lugares 25 --semanas 52
+    python benchmarks/bench_figure_cache.py --repeticiones 50 --json figuras.json
+
+Termina con código 1 si el acierto de la caché no es más barato que construir, o si
+la especificación enviada difiere de la de la figura original.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import plotly.tools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.figure_cache import FiguraSerializada, serializar_figura  # noqa: E402
+
+
+def datos_seccion_5(lugares: int, semanas: int) -> pd.DataFrame:
+    """Porcentaje semanal por lugar, con la forma del resultado de la sección 5"""
+    rng = np.random.default_rng(7)
+    viernes = pd.date_range("2024-01-05", periods=semanas, freq="W-FRI").strftime("%d-%m-%Y")
+    return pd.DataFrame(
+        [(f"Lugar {i}", v, rng.uniform(0, 100)) for i in range(lugares) for v in viernes],
+        columns=["lugar", "eje_x", "porcentaje"],
+    )
+
+
+def construir_figura(df: pd.DataFrame) -> go.Figure:
+    fig = px.line(df, x="eje_x", y="porcentaje", color="lugar", markers=True,
+                  title="Porcentaje de cocteles por semana %",
+                  text=df["porcentaje"].map(lambda x: f"{x:.1f}%"))
+    fig.update_traces(textposition="top center")
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def enviar(figura) -> str:
+    """Lo que hace st.plotly_chart con su argumento antes de armar el mensaje"""
+    figura = plotly.tools.return_figure_from_figure_or_data(figura, validate_figure=True)
+    return pio.to_json(figura, validate=False)
+
+
+def cronometrar(funcion, repeticiones: int) -> float:
+    """Mediana en milisegundos (tras una llamada de calentamiento)"""
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lugares", type=int, default=25)
+    parser.add_argument("--semanas", type=int, default=52)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    df = datos_seccion_5(args.lugares, args.semanas)
+    figura = construir_figura(df)
+    spec = serializar_figura(figura)
+
+    if json.loads(enviar(FiguraSerializada(spec))) != json.loads(enviar(figura)):
+        print("❌ La especificación guardada no coincide con la figura original")
+        sys.exit(1)
+
+    resultados = {
+        "construir": cronometrar(lambda: enviar(construir_figura(df)), args.repeticiones),
+        "copia": cronometrar(lambda: enviar(go.Figure(figura)), args.repeticiones),
+        "especificacion": cronometrar(lambda: enviar(FiguraSerializada(spec)), args.repeticiones),
+    }
+    print(f"{args.lugares} lugares x {args.semanas} semanas ({len(figura.data)} trazas)")
+    print(f"{'camino':<16} {'mediana (ms)':>13} {'vs construir':>13}")
+    for nombre, ms in resultados.items():
+        print(f"{nombre:<16} {ms:>13.2f} {resultados['construir'] / ms:>12.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+    if resultados["especificacion"] >= resultados["construir"]:
+        print("❌ El acierto de la caché no es más barato que construir la figura")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
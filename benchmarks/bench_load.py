@@ -0,0 +1,282 @@
+# benchmarks/bench_load.py
+"""
+Prueba de carga: N sesiones simultáneas de main_app.py en un solo proceso, cada una
+con su propio streamlit.testing AppTest (mismo proceso = mismos cachés, pool de
+conexiones y control de admisión que un contenedor real).
+
+Cada sesión inicia sesión y luego recorre un escenario de interacciones: elegir una
+sección, cambiar el rango de fechas global, cambiar los lugares globales y pausas de
+"lectura". Se mide:
+    - latencia de cada interacción (un rerun completo), p50/p95/p99 por paso y total
+    - throughput: interacciones completadas por segundo
+    - RSS del proceso (inicial, pico y final) muestreado cada `--muestreo-rss` segundos
+
+Escenario (JSON, lista de pasos; se repite `--vueltas` veces por sesión):
+    [{"accion": "seccion", "codigo": "sn"},
+     {"accion": "fechas", "dias": 30},
+     {"accion": "lugares", "cantidad": 5},
+     {"accion": "pausa", "segundos": 2}]
+
+Uso (contra el PostgreSQL de DB_* sembrado con benchmarks/synthetic_data.py):
+    python benchmarks/bench_load.py --sesiones 1 4 16
+    python benchmarks/bench_load.py --sesiones 8 --escenario escenario.json --vueltas 3
+    python benchmarks/bench_load.py --sesiones 8 --usuario analista --password ... --max-p95 5
+
+Sin --usuario la sesión se inyecta en session_state (no pasa por bcrypt). Termina con
+código 1 si hubo errores o si el p95 total supera --max-p95.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest
+
+from sections.registry import SECCIONES_POR_CODIGO
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "main_app.py")
+
+ESCENARIO_DEFAULT = [
+    {"accion": "seccion", "codigo": "sn"},
+    {"accion": "pausa", "segundos": 1},
+    {"accion": "fechas", "dias": 30},
+    {"accion": "seccion", "codigo": "1"},
+    {"accion": "lugares", "cantidad": 5},
+    {"accion": "seccion", "codigo": "5"},
+    {"accion": "pausa", "segundos": 1},
+    {"accion": "seccion", "codigo": "12"},
+    {"accion": "fechas", "dias": 90},
+    {"accion": "seccion", "codigo": "23"},
+]
+
+
+def percentil(valores, p):
+    if not valores:
+        return float("nan")
+    return float(np.percentile(valores, p))
+
+
+def rss_mb() -> float:
+    """RSS actual del proceso (en sistemas sin /proc, el pico)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MuestreoRSS(threading.Thread):
+    """Muestrea el RSS en segundo plano mientras dura una ronda"""
+
+    def __init__(self, intervalo: float):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.muestras = [rss_mb()]
+        self.detener = threading.Event()
+
+    def run(self):
+        while not self.detener.wait(self.intervalo):
+            self.muestras.append(rss_mb())
+
+
+def _por_etiqueta(elementos, etiqueta: str):
+    for elemento in elementos:
+        if elemento.label == etiqueta:
+            return elemento
+    raise LookupError(f"No se encontró el widget '{etiqueta}'")
+
+
+class SesionSimulada:
+    """Una sesión del dashboard manejada por AppTest"""
+
+    def __init__(self, numero: int, usuario: Optional[str], password: Optional[str], timeout: float):
+        self.numero = numero
+        self.usuario = usuario
+        self.password = password
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.latencias: Dict[str, List[float]] = {}
+        self.errores: List[str] = []
+
+    def _medir(self, paso: str, accion) -> bool:
+        t0 = time.perf_counter()
+        try:
+            accion()
+        except Exception as e:
+            self.errores.append(f"sesión {self.numero} / {paso}: {e}")
+            return False
+        duracion = time.perf_counter() - t0
+        if self.at.exception:
+            self.errores.append(f"sesión {self.numero} / {paso}: {self.at.exception[0].value}")
+            return False
+        self.latencias.setdefault(paso, []).append(duracion)
+        return True
+
+    def iniciar(self) -> bool:
+        """Primer run y login (por formulario o inyectando la sesión)"""
+        if not self.usuario:
+            self.at.session_state["user"] = {
+                "username": f"carga{self.numero}", "name": f"Carga {self.numero}", "role": "viewer"
+            }
+            return self._medir("inicio", self.at.run)
+        if not self._medir("formulario_login", self.at.run):
+            return False
+
+        def login():
+            self.at.text_input[0].input(self.usuario)
+            self.at.text_input[1].input(self.password)
+            _por_etiqueta(self.at.button, "Ingresar").click().run()
+            if "user" not in self.at.session_state:
+                raise RuntimeError("login rechazado")
+        return self._medir("login", login)
+
+    def ejecutar(self, paso: Dict[str, Any]):
+        accion = paso["accion"]
+        if accion == "pausa":
+            time.sleep(paso.get("segundos", 1))
+        elif accion == "seccion":
+            titulo = SECCIONES_POR_CODIGO[paso["codigo"]].titulo
+            self._medir(f"seccion:{paso['codigo']}",
+                        lambda: self.at.selectbox(key="selector_seccion").select(titulo).run())
+        elif accion == "fechas":
+            def cambiar_fechas():
+                fin = _por_etiqueta(self.at.date_input, "Fecha Fin Global").value
+                inicio = fin - timedelta(days=paso["dias"] - 1)
+                _por_etiqueta(self.at.date_input, "Fecha Inicio Global").set_value(inicio).run()
+            self._medir(f"fechas:{paso['dias']}d", cambiar_fechas)
+        elif accion == "lugares":
+            def cambiar_lugares():
+                lugares = _por_etiqueta(self.at.multiselect, "Lugares Globales")
+                cantidad = paso.get("cantidad")
+                lugares.set_value(lugares.options[:cantidad] if cantidad else lugares.options).run()
+            self._medir(f"lugares:{paso.get('cantidad') or 'todos'}", cambiar_lugares)
+        else:
+            raise ValueError(f"Acción desconocida en el escenario: {accion}")
+
+    def recorrer(self, escenario: List[Dict[str, Any]], vueltas: int):
+        if not self.iniciar():
+            return
+        for _ in range(vueltas):
+            for paso in escenario:
+                self.ejecutar(paso)
+
+
+def ronda(sesiones: int, escenario, args) -> Dict[str, Any]:
+    """`sesiones` sesiones simultáneas recorriendo el escenario"""
+    simuladas = [SesionSimulada(i, args.usuario, args.password, args.timeout) for i in range(sesiones)]
+    muestreo = MuestreoRSS(args.muestreo_rss)
+    muestreo.start()
+
+    def correr(sesion: SesionSimulada):
+        time.sleep(random.uniform(0, args.rampa))         # arranques escalonados
+        sesion.recorrer(escenario, args.vueltas)
+
+    hilos = [threading.Thread(target=correr, args=(s,), name=f"sesion-{s.numero}") for s in simuladas]
+    t0 = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - t0
+    muestreo.detener.set()
+    muestreo.join()
+    muestreo.muestras.append(rss_mb())
+
+    por_paso: Dict[str, List[float]] = {}
+    for sesion in simuladas:
+        for paso, valores in sesion.latencias.items():
+            por_paso.setdefault(paso, []).extend(valores)
+    todas = [v for valores in por_paso.values() for v in valores]
+    resumen = lambda valores: {
+        "n": len(valores),
+        "p50_s": percentil(valores, 50),
+        "p95_s": percentil(valores, 95),
+        "p99_s": percentil(valores, 99),
+    }
+    return {
+        "sesiones": sesiones,
+        "segundos": total,
+        "interacciones_s": len(todas) / total if total else 0.0,
+        "total": resumen(todas),
+        "pasos": {paso: resumen(valores) for paso, valores in sorted(por_paso.items())},
+        "rss_mb": {
+            "inicial": muestreo.muestras[0],
+            "pico": max(muestreo.muestras),
+            "final": muestreo.muestras[-1],
+        },
+        "errores": [e for s in simuladas for e in s.errores],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 4, 16], help="Sesiones simultáneas por ronda")
+    parser.add_argument("--escenario", help="Archivo JSON con los pasos (default: ESCENARIO_DEFAULT)")
+    parser.add_argument("--vueltas", type=int, default=1, help="Veces que cada sesión recorre el escenario")
+    parser.add_argument("--rampa", type=float, default=2.0, help="Segundos en los que arrancan las sesiones")
+    parser.add_argument("--usuario", help="Usuario para iniciar sesión por el formulario")
+    parser.add_argument("--password", help="Contraseña de --usuario")
+    parser.add_argument("--timeout", type=float, default=300, help="Segundos máximos por rerun")
+    parser.add_argument("--muestreo-rss", type=float, default=0.5)
+    parser.add_argument("--sin-calentar", action="store_true",
+                        help="No recorrer el escenario una vez antes de medir (mide cachés fríos)")
+    parser.add_argument("--max-p95", type=float, help="Límite en segundos para el p95 total de cada ronda")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+    if args.usuario and not args.password:
+        parser.error("--usuario requiere --password")
+
+    escenario = ESCENARIO_DEFAULT
+    if args.escenario:
+        with open(args.escenario, encoding="utf-8") as f:
+            escenario = json.load(f)
+    desconocidas = [p["codigo"] for p in escenario
+                    if p.get("accion") == "seccion" and p.get("codigo") not in SECCIONES_POR_CODIGO]
+    if desconocidas:
+        parser.error(f"Secciones desconocidas en el escenario: {', '.join(desconocidas)}")
+
+    if not args.sin_calentar:
+        t0 = time.perf_counter()
+        calentamiento = SesionSimulada(-1, args.usuario, args.password, args.timeout)
+        calentamiento.recorrer(escenario, 1)
+        if calentamiento.errores:
+            raise SystemExit("El calentamiento falló:\n  " + "\n  ".join(calentamiento.errores))
+        print(f"Calentamiento: {time.perf_counter() - t0:.1f}s | RSS {rss_mb():.0f} MB\n")
+
+    resultados, fallos = [], []
+    for sesiones in args.sesiones:
+        r = ronda(sesiones, escenario, args)
+        resultados.append(r)
+        print(f"=== {sesiones} sesiones: {r['interacciones_s']:.2f} interacciones/s en {r['segundos']:.1f}s | "
+              f"RSS {r['rss_mb']['inicial']:.0f} -> pico {r['rss_mb']['pico']:.0f} MB | "
+              f"{len(r['errores'])} errores")
+        print(f"{'paso':<22} {'n':>5} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9}")
+        for paso, p in list(r["pasos"].items()) + [("TOTAL", r["total"])]:
+            print(f"{paso:<22} {p['n']:>5} {p['p50_s']:>9.3f} {p['p95_s']:>9.3f} {p['p99_s']:>9.3f}")
+        print()
+
+        fallos.extend(r["errores"])
+        if args.max_p95 is not None and r["total"]["p95_s"] > args.max_p95:
+            fallos.append(f"{sesiones} sesiones: p95 {r['total']['p95_s']:.3f}s > {args.max_p95:.3f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"escenario": escenario, "vueltas": args.vueltas, "rondas": resultados}, f, indent=2)
+
+    if fallos:
+        print("❌ Fallos:\n  " + "\n  ".join(fallos[:50]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_login.py
+"""
+Benchmark: throughput de login bajo concurrencia, bcrypt en línea (como antes)
+frente al pool acotado de core.auth.VerificadorPasswords.
+
+Mientras dura cada ráfaga, un hilo "sonda" ejecuta en bucle una agregación de
+pandas parecida a la de un gráfico y mide su latencia, para ver cuánto frena la
+ráfaga de logins al resto del dashboard.
+
+Uso:
+    python benchmarks/bench_login.py --concurrencia 1 8 32 --logins 200 --rondas 12
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.auth import VerificadorPasswords, VerificacionSaturada
+
+PASSWORD = "contraseña-de-prueba"
+
+
+def percentil(valores, p):
+    if not valores:
+        return float("nan")
+    return float(np.percentile(valores, p))
+
+
+class Sonda(threading.Thread):
+    """Agregación tipo gráfico repetida en bucle; guarda la latencia de cada vuelta"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'lugar': rng.integers(0, 25, 200_000),
+            'semana': rng.integers(0, 52, 200_000),
+            'coctel': rng.integers(0, 2, 200_000),
+        })
+        self.latencias = []
+        self.detener = threading.Event()
+
+    def run(self):
+        while not self.detener.is_set():
+            t0 = time.perf_counter()
+            self.df.groupby(['lugar', 'semana'])['coctel'].mean()
+            self.latencias.append(time.perf_counter() - t0)
+
+
+def rafaga(concurrencia: int, logins: int, verificar):
+    """Lanzar `logins` verificaciones con `concurrencia` clientes simultáneos"""
+    latencias, rechazos = [], [0]
+    lock = threading.Lock()
+
+    def cliente(_):
+        t0 = time.perf_counter()
+        try:
+            verificar()
+        except VerificacionSaturada:
+            with lock:
+                rechazos[0] += 1
+            return
+        with lock:
+            latencias.append(time.perf_counter() - t0)
+
+    sonda = Sonda()
+    sonda.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as clientes:
+        list(clientes.map(cliente, range(logins)))
+    total = time.perf_counter() - t0
+    sonda.detener.set()
+    sonda.join()
+    return {
+        'logins_s': len(latencias) / total,
+        'p50': percentil(latencias, 50),
+        'p95': percentil(latencias, 95),
+        'rechazados': rechazos[0],
+        'sonda_p95': percentil(sonda.latencias, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrencia", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rondas", type=int, default=12, help="Costo bcrypt del hash de prueba")
+    parser.add_argument("--hilos", type=int, default=2, help="Hilos del pool acotado")
+    parser.add_argument("--cola", type=int, default=16, help="Trabajos en espera del pool acotado")
+    args = parser.parse_args()
+
+    hash_prueba = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=args.rondas))
+    verificar_inline = lambda: bcrypt.checkpw(PASSWORD.encode(), hash_prueba)
+    pool = VerificadorPasswords(max_hilos=args.hilos, max_cola=args.cola)
+    verificar_pool = lambda: pool.ejecutar(bcrypt.checkpw, PASSWORD.encode(), hash_prueba)
+
+    base = Sonda()
+    base.start()
+    time.sleep(1)
+    base.detener.set()
+    base.join()
+    print(f"Sonda sin carga: p95 {percentil(base.latencias, 95) * 1000:.1f} ms | "
+          f"bcrypt costo {args.rondas} | pool {args.hilos} hilos + {args.cola} en cola")
+
+    print(f"{'clientes':>8} {'modo':<8} {'logins/s':>9} {'p50 (s)':>8} {'p95 (s)':>8} "
+          f"{'rechazos':>9} {'sonda p95 (ms)':>15}")
+    for concurrencia in args.concurrencia:
+        for nombre, verificar in (("inline", verificar_inline), ("pool", verificar_pool)):
+            r = rafaga(concurrencia, args.logins, verificar)
+            print(f"{concurrencia:>8} {nombre:<8} {r['logins_s']:>9.1f} {r['p50']:>8.3f} {r['p95']:>8.3f} "
+                  f"{r['rechazados']:>9} {r['sonda_p95'] * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# benchmarks/bench_sections_sql.py
+"""
+Benchmark de las funciones de datos de cada sección (SN a 28 y TOP 3) contra un
+PostgreSQL local sembrado con benchmarks/synthetic_data.py.
+
+Cada función se llama con parámetros representativos:
+    - rangos de 1 día, 1 mes y 3 meses hasta la última fecha_registro de la base
+    - 1, 5 y todos los lugares (solo en las secciones que reciben una lista)
+y se mide tiempo (mediana), round trips a la base, filas recibidas y pico de memoria
+(tracemalloc). Los resultados se comparan contra una línea base guardada y los round
+trips contra el presupuesto `max_queries` de cada sección (sections/registry.py), que
+no depende de cuántos lugares se elijan; también falla si una plantilla se repite en
+una misma llamada (posible N+1).
+
+Uso:
+    python benchmarks/synthetic_data.py --escala 1m --postgres --reemplazar
+    python benchmarks/bench_sections_sql.py --guardar-baseline
+    python benchmarks/bench_sections_sql.py --secciones 1 5 12 --tolerancia 0.25
+
+Termina con código 1 si alguna medición es más lenta que la línea base por más de
+--tolerancia, si hace más round trips o trae más filas, o si excede su presupuesto.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.query_executor import ejecutar_query
+from core.telemetry import contar_queries, revisar_queries
+from sections.registry import SECCIONES, SECCIONES_POR_CODIGO
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(RAIZ, "benchmarks", "baselines", "sections_sql.json")
+
+RANGOS = {"1d": 1, "1m": 30, "3m": 91}
+CANTIDADES_LUGARES = {"1l": 1, "5l": 5, "todos": None}
+
+# Secciones cuyo parámetro de lugar es una lista (el resto recibe un solo lugar o ninguno)
+CON_LISTA_LUGARES = {"1", "5", "9", "10", "11", "12", "13", "14", "21", "22", "23", "27"}
+SIN_LUGAR = {"top3", "19", "24", "26", "28"}
+
+
+def argumentos(codigo: str, inicio: date, fin: date, lugares: List[str]) -> Tuple[tuple, Dict[str, Any]]:
+    """Parámetros de la función de datos de `codigo` (los defaults de cada sección)"""
+    fi, ff = inicio.strftime('%Y-%m-%d'), fin.strftime('%Y-%m-%d')
+    lugar = lugares[0]
+    por_seccion = {
+        "sn": ((inicio, fin, lugar), {}),
+        "1": ((fi, ff, lugares, ["Radio", "TV", "Redes"]), {}),
+        "2": ((fi, ff, lugar), {}),
+        "3": ((fi, ff, lugar, "Todos"), {}),
+        "4": ((fi, ff, lugar, "Todos"), {}),
+        "5": ((fi, ff, lugares, "Todos"), {}),
+        "top3": ((fi, ff, "Radio"), {'top_n': 3}),
+        "6": ((fi, ff, lugar, "Radio"), {'top_n': 3}),
+        "7": ((fi, ff, "Macro región Centro", "Radio"), {}),
+        "8": ((fi, ff, lugar, "Todos", "Todos"), {}),
+        "9": ((fi, ff, lugares, "Todos", "Todos"), {}),
+        "10": ((fi, ff, lugares), {}),
+        "11": ((fi, ff, lugares), {}),
+        "12": ((fi, ff, lugares), {}),
+        "13": ((inicio.replace(day=1).strftime('%Y-%m-%d'), ff, lugares), {}),
+        "14": ((fi, ff, lugares, ["RADIO", "TV", "REDES"], "Todos"), {}),
+        "15": ((fi, ff, lugar, "Todos", "Todos"), {}),
+        "16": ((fi, ff, lugar, "Todos", "Todos"), {'top_n': 10}),
+        "17": ((fi, ff, lugar, "Todos", "Todos"), {'top_n': 10}),
+        "18": ((fi, ff, lugar, "Radio", "Todos"), {}),
+        "19": ((fi, ff, "Todos"), {}),
+        "20": ((fi, ff, lugar, "Todos", "Todos"), {'top_n': 10}),
+        "21": ((fi, ff, lugares), {}),
+        "22": ((fin.year, fin.month, lugares, "Radio"), {}),
+        "23": ((fi, ff, lugares), {}),
+        "24": ((fi, ff, "Todos", "Todos"), {}),
+        "25": ((fi, ff, lugar, "Radio"), {}),
+        "26": ((fi, ff), {}),
+        "27": ((fi, ff, lugares, "Todos"), {}),
+        "28": ((), {'id_fuente': 1}),
+    }
+    return por_seccion[codigo]
+
+
+def escenarios(codigo: str) -> List[Tuple[str, str]]:
+    """(rango, lugares) a medir para una sección"""
+    if codigo == "28":
+        return [("12m", "todos")]          # rango fijo de 12 meses, sin filtro de lugar
+    if codigo == "22":
+        return [("3m", c) for c in CANTIDADES_LUGARES]   # siempre los 3 meses previos
+    if codigo in SIN_LUGAR:
+        return [(r, "todos") for r in RANGOS]
+    if codigo in CON_LISTA_LUGARES:
+        return [(r, c) for r in RANGOS for c in CANTIDADES_LUGARES]
+    return [(r, "1l") for r in RANGOS]
+
+
+def contexto_base() -> Tuple[date, List[str]]:
+    """Última fecha con datos y lugares ordenados por cantidad de acontecimientos"""
+    df = ejecutar_query("SELECT MAX(fecha_registro)::date AS fin FROM acontecimientos")
+    if df is None or df.empty or df['fin'].iloc[0] is None:
+        raise SystemExit("La base no tiene acontecimientos: sembrarla con benchmarks/synthetic_data.py")
+    lugares = ejecutar_query("""
+        SELECT l.nombre
+        FROM lugares l
+        LEFT JOIN acontecimientos a ON a.id_lugar = l.id
+        GROUP BY l.nombre
+        ORDER BY COUNT(a.id) DESC, l.nombre
+    """)
+    return df['fin'].iloc[0], lugares['nombre'].tolist()
+
+
+def medir(funcion, args, kwargs, repeticiones: int, presupuesto=None) -> Dict[str, Any]:
+    """Una ejecución de calentamiento y luego `repeticiones` medidas"""
+    funcion(*args, **kwargs)
+    tiempos, picos = [], []
+    for _ in range(repeticiones):
+        tracemalloc.start()
+        with contar_queries() as conteo:
+            t0 = time.perf_counter()
+            funcion(*args, **kwargs)
+            tiempos.append(time.perf_counter() - t0)
+        picos.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "segundos": statistics.median(tiempos),
+        "round_trips": conteo.queries,
+        "filas": conteo.filas,
+        "pico_mb": max(picos) / 2 ** 20,
+        "problemas_queries": revisar_queries(conteo, presupuesto),
+    }
+
+
+def comparar(actual: Dict[str, Any], base: Optional[Dict[str, Any]], tolerancia: float) -> List[str]:
+    """Motivos de regresión de una medición frente a su línea base"""
+    motivos = list(actual.get("problemas_queries", []))
+    if not base:
+        return motivos
+    if actual["segundos"] > base["segundos"] * (1 + tolerancia):
+        motivos.append(f"tiempo {base['segundos']:.3f}s -> {actual['segundos']:.3f}s")
+    if actual["round_trips"] > base["round_trips"]:
+        motivos.append(f"round trips {base['round_trips']} -> {actual['round_trips']}")
+    if actual["filas"] > base["filas"]:
+        motivos.append(f"filas {base['filas']} -> {actual['filas']}")
+    return motivos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secciones", nargs="+", help="Códigos a medir (default: todas)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE, help="Archivo JSON de la línea base")
+    parser.add_argument("--guardar-baseline", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="Aumento de tiempo tolerado (0.20 = 20%%)")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    codigos = args.secciones or [s.codigo for s in SECCIONES]
+    desconocidos = [c for c in codigos if c not in SECCIONES_POR_CODIGO]
+    if desconocidos:
+        parser.error(f"Secciones desconocidas: {', '.join(desconocidos)}")
+
+    fin, todos_los_lugares = contexto_base()
+    base = {}
+    if os.path.exists(args.baseline) and not args.guardar_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+
+    resultados, regresiones = {}, []
+    print(f"Última fecha: {fin} | {len(todos_los_lugares)} lugares\n")
+    print(f"{'medición':<22} {'tiempo (s)':>10} {'round trips':>12} {'filas':>10} {'pico (MB)':>10}  vs. base")
+    for codigo in codigos:
+        entrada = SECCIONES_POR_CODIGO[codigo]
+        funcion = entrada.cargar_funcion_datos()
+        for rango, cantidad in escenarios(codigo):
+            dias = RANGOS.get(rango, 365)
+            n = CANTIDADES_LUGARES[cantidad]
+            lugares = todos_los_lugares[:n] if n else todos_los_lugares
+            f_args, f_kwargs = argumentos(codigo, fin - timedelta(days=dias - 1), fin, lugares)
+
+            clave = f"{codigo}/{rango}/{cantidad}"
+            r = medir(funcion, f_args, f_kwargs, args.repeticiones, entrada.max_queries)
+            resultados[clave] = r
+
+            comparacion = ""
+            motivos = comparar(r, base.get(clave), args.tolerancia)
+            if motivos:
+                regresiones.append(f"{clave}: {'; '.join(motivos)}")
+                comparacion = "❌ " + "; ".join(motivos)
+            elif clave in base:
+                comparacion = f"{r['segundos'] / max(base[clave]['segundos'], 1e-9):.2f}x"
+            print(f"{clave:<22} {r['segundos']:>10.3f} {r['round_trips']:>12} {r['filas']:>10} "
+                  f"{r['pico_mb']:>10.1f}  {comparacion}")
+
+    if args.guardar_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, sort_keys=True)
+        print(f"\nLínea base guardada en {args.baseline}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, sort_keys=True)
+
+    if regresiones:
+        print("\n❌ Regresiones:\n  " + "\n  ".join(regresiones))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
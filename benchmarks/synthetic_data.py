@@ -0,0 +1,376 @@
+# benchmarks/synthetic_data.py
+"""
+Generador de una base SIMA sintética para medir el dashboard sin la base de producción.
+
+Crea las tablas que tocan las queries (acontecimientos, lugares, posiciones, fuentes,
+canales, programas, actores, temas, notas, mensaje_fuerza, facebook_pages,
+facebook_posts, usuarios y las tablas puente acontecimiento_*) y las llena con
+distribuciones parecidas a las reales:
+    - lugares sesgados (unos pocos concentran la mayoría de los acontecimientos)
+    - Radio / TV / Redes en proporciones fijas, programas y páginas también sesgados
+    - rebotes: un acontecimiento de radio o TV aparece en 1 a 6 programas
+    - una fracción configurable con cóctel (nota + mensaje fuerza)
+    - posiciones, temas y actores con pesos no uniformes
+
+Escalas: 10k, 100k, 1m, 10m acontecimientos (o un número). Los acontecimientos se
+generan y escriben por bloques, así 10m no necesita tenerlo todo en memoria.
+
+Uso:
+    python benchmarks/synthetic_data.py --escala 1m --postgres --reemplazar
+    python benchmarks/synthetic_data.py --escala 10k --parquet datos_sinteticos/
+
+La conexión se toma de DB_HOST, DB_PORT, DB_USER, DB_PASSWORD y DB_NAME (las mismas
+del dashboard). Con --reemplazar se borran y recrean las tablas: usar solo en una
+base local de pruebas.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.constants import ID_FUENTE_DICT, ID_POSICION_DICT, MACROREGIONES
+
+ESCALAS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+FILAS_POR_BLOQUE = 500_000
+
+# Proporciones por fuente (id de fuentes) y por posición (id de posiciones)
+PESOS_FUENTE = {1: 0.45, 2: 0.20, 3: 0.35}
+PESOS_POSICION = {1: 0.22, 2: 0.16, 3: 0.34, 4: 0.12, 5: 0.16}
+COLORES_POSICION = {1: "#2E7D32", 2: "#66BB6A", 3: "#9E9E9E", 4: "#FF9800", 5: "#D32F2F"}
+
+LUGARES_EXTRA = ["Chiclayo", "Huancayo", "Cajamarca", "Iquitos", "Pucallpa", "Chimbote",
+                 "Juliaca", "Moquegua", "Tumbes", "Huaraz", "Abancay", "Moyobamba"]
+
+# Orden de creación (las tablas puente al final) y de borrado (al revés)
+DDL = {
+    "fuentes": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL",
+    "lugares": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL",
+    "posiciones": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL, color TEXT",
+    "canales": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL",
+    "programas": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL, id_canal INTEGER, id_fuente INTEGER",
+    "facebook_pages": "id INTEGER PRIMARY KEY, nombre TEXT NOT NULL",
+    "temas": "id INTEGER PRIMARY KEY, descripcion TEXT",
+    "actores": "id INTEGER PRIMARY KEY, nombre TEXT",
+    "mensaje_fuerza": "id INTEGER PRIMARY KEY, mensaje TEXT",
+    "usuarios": "id INTEGER PRIMARY KEY, nombre TEXT, apellido TEXT",
+    "notas": "id BIGINT PRIMARY KEY, id_mensaje_fuerza INTEGER",
+    "acontecimientos": ("id BIGINT PRIMARY KEY, acontecimiento TEXT, fecha_registro TIMESTAMPTZ NOT NULL, "
+                        "fecha_update TIMESTAMPTZ, coctel SMALLINT NOT NULL, id_posicion INTEGER, "
+                        "id_lugar INTEGER, id_nota BIGINT, id_usuario_registro INTEGER"),
+    "facebook_posts": ("id BIGINT PRIMARY KEY, id_facebook_page INTEGER, fecha TIMESTAMPTZ, "
+                       "num_reacciones INTEGER, num_comentarios INTEGER, num_compartidos INTEGER"),
+    "acontecimiento_programa": "id_acontecimiento BIGINT NOT NULL, id_programa INTEGER NOT NULL",
+    "acontecimiento_facebook_post": "id BIGINT PRIMARY KEY, id_acontecimiento BIGINT NOT NULL, id_facebook_post BIGINT NOT NULL",
+    "acontecimiento_tema": "id_acontecimiento BIGINT NOT NULL, id_tema INTEGER NOT NULL",
+    "acontecimiento_actor": "id_acontecimiento BIGINT NOT NULL, id_actor INTEGER NOT NULL",
+}
+
+# Índices que existirían en producción para los filtros y joins de las secciones
+INDICES = [
+    "CREATE INDEX ON acontecimientos (fecha_registro)",
+    "CREATE INDEX ON acontecimientos (id_lugar, fecha_registro)",
+    "CREATE INDEX ON acontecimientos (id_usuario_registro)",
+    "CREATE INDEX ON acontecimiento_programa (id_acontecimiento)",
+    "CREATE INDEX ON acontecimiento_programa (id_programa)",
+    "CREATE INDEX ON acontecimiento_facebook_post (id_acontecimiento)",
+    "CREATE INDEX ON acontecimiento_tema (id_acontecimiento)",
+    "CREATE INDEX ON acontecimiento_actor (id_acontecimiento)",
+    "CREATE INDEX ON facebook_posts (id_facebook_page)",
+    "CREATE INDEX ON programas (id_fuente)",
+    "CREATE INDEX ON lugares (nombre)",
+]
+
+
+def parsear_escala(valor: str) -> int:
+    """'10k' / '1m' / '10m' o un número de acontecimientos"""
+    return ESCALAS.get(valor.lower()) or int(valor.replace("_", ""))
+
+
+def _pesos_zipf(n: int, exponente: float = 1.1) -> np.ndarray:
+    """Pesos decrecientes por rango: el primero es el más frecuente"""
+    pesos = 1.0 / np.arange(1, n + 1) ** exponente
+    return pesos / pesos.sum()
+
+
+def generar_dimensiones(rng: np.random.Generator, n_programas: int = 300, n_paginas: int = 150,
+                        n_usuarios: int = 60) -> Dict[str, pd.DataFrame]:
+    """Tablas de dimensión (pequeñas, se generan completas)"""
+    nombres_lugares = list(dict.fromkeys(
+        [l for lugares in MACROREGIONES.values() for l in lugares] + LUGARES_EXTRA
+    ))
+    n_canales = 40
+    fuente_programa = rng.choice([1, 2], size=n_programas, p=[0.7, 0.3])
+    nombres = ["Ana", "Luis", "María", "Jorge", "Rosa", "Carlos", "Lucía", "Pedro", "Elena", "Raúl"]
+    apellidos = ["Quispe", "Flores", "Huamán", "Rojas", "Torres", "Vargas", "Mendoza", "Castillo"]
+
+    return {
+        "fuentes": pd.DataFrame({"id": list(ID_FUENTE_DICT), "nombre": list(ID_FUENTE_DICT.values())}),
+        "lugares": pd.DataFrame({"id": np.arange(1, len(nombres_lugares) + 1), "nombre": nombres_lugares}),
+        "posiciones": pd.DataFrame({
+            "id": list(ID_POSICION_DICT),
+            "nombre": [n.capitalize() for n in ID_POSICION_DICT.values()],
+            "color": [COLORES_POSICION[i] for i in ID_POSICION_DICT],
+        }),
+        "canales": pd.DataFrame({"id": np.arange(1, n_canales + 1),
+                                 "nombre": [f"Canal {i}" for i in range(1, n_canales + 1)]}),
+        "programas": pd.DataFrame({
+            "id": np.arange(1, n_programas + 1),
+            "nombre": [f"Programa {i}" for i in range(1, n_programas + 1)],
+            "id_canal": rng.integers(1, n_canales + 1, n_programas),
+            "id_fuente": fuente_programa,
+        }),
+        "facebook_pages": pd.DataFrame({"id": np.arange(1, n_paginas + 1),
+                                        "nombre": [f"Página {i}" for i in range(1, n_paginas + 1)]}),
+        "temas": pd.DataFrame({"id": np.arange(1, 61), "descripcion": [f"Tema {i}" for i in range(1, 61)]}),
+        "actores": pd.DataFrame({"id": np.arange(1, 501),
+                                 "nombre": ["periodista"] + [f"Actor {i}" for i in range(2, 501)]}),
+        "mensaje_fuerza": pd.DataFrame({"id": np.arange(1, 41),
+                                        "mensaje": [f"Mensaje fuerza {i}" for i in range(1, 41)]}),
+        "usuarios": pd.DataFrame({
+            "id": np.arange(1, n_usuarios + 1),
+            "nombre": rng.choice(nombres, n_usuarios),
+            "apellido": [f"{a} {i}" for i, a in enumerate(rng.choice(apellidos, n_usuarios), 1)],
+        }),
+    }
+
+
+def generar_bloque(rng: np.random.Generator, dims: Dict[str, pd.DataFrame], primer_id: int, n: int,
+                   contadores: Dict[str, int], meses: int, pct_coctel: float) -> Dict[str, pd.DataFrame]:
+    """
+    Acontecimientos [primer_id, primer_id + n) y sus filas relacionadas.
+    `contadores` lleva los próximos ids de notas, posts y acontecimiento_facebook_post.
+    """
+    ids = np.arange(primer_id, primer_id + n, dtype=np.int64)
+    fin = datetime.now(timezone.utc)
+    segundos_rango = meses * 30 * 86400
+
+    fuente = rng.choice(list(PESOS_FUENTE), size=n, p=list(PESOS_FUENTE.values()))
+    lugares = dims["lugares"]["id"].to_numpy()
+    id_lugar = rng.choice(lugares, size=n, p=_pesos_zipf(len(lugares)))
+    posicion = rng.choice(list(PESOS_POSICION), size=n, p=list(PESOS_POSICION.values()))
+    usuarios = dims["usuarios"]["id"].to_numpy()
+    id_usuario = rng.choice(usuarios, size=n, p=_pesos_zipf(len(usuarios), 0.8))
+    # Más registros recientes que antiguos (la carga crece con el tiempo)
+    antiguedad = (rng.power(0.8, n) * segundos_rango).astype(np.int64)
+    fecha_registro = pd.to_datetime(fin) - pd.to_timedelta(antiguedad, unit="s")
+    fecha_update = fecha_registro + pd.to_timedelta(rng.integers(0, 3 * 86400, n), unit="s")
+
+    con_coctel = rng.random(n) < pct_coctel
+    id_nota = np.full(n, np.nan)
+    n_notas = int(con_coctel.sum())
+    ids_notas = np.arange(contadores["notas"], contadores["notas"] + n_notas, dtype=np.int64)
+    id_nota[con_coctel] = ids_notas
+    contadores["notas"] += n_notas
+
+    tablas = {
+        "acontecimientos": pd.DataFrame({
+            "id": ids,
+            "acontecimiento": [f"Acontecimiento {i}" for i in ids],
+            "fecha_registro": fecha_registro,
+            "fecha_update": fecha_update,
+            "coctel": con_coctel.astype(np.int16),
+            "id_posicion": posicion,
+            "id_lugar": id_lugar,
+            "id_nota": pd.array(id_nota, dtype="Int64"),
+            "id_usuario_registro": id_usuario,
+        }),
+        "notas": pd.DataFrame({
+            "id": ids_notas,
+            "id_mensaje_fuerza": rng.choice(dims["mensaje_fuerza"]["id"].to_numpy(), n_notas,
+                                            p=_pesos_zipf(len(dims["mensaje_fuerza"]))),
+        }),
+    }
+
+    # Radio / TV: 1 programa de la misma fuente + rebotes en otros programas
+    programas = dims["programas"]
+    puente_programa = []
+    for id_fuente in (1, 2):
+        mascara = fuente == id_fuente
+        ids_fuente = ids[mascara]
+        candidatos = programas.loc[programas["id_fuente"] == id_fuente, "id"].to_numpy()
+        if len(ids_fuente) == 0 or len(candidatos) == 0:
+            continue
+        rebotes = np.minimum(1 + rng.poisson(0.6, len(ids_fuente)), 6)
+        id_acontecimiento = np.repeat(ids_fuente, rebotes)
+        id_programa = rng.choice(candidatos, size=len(id_acontecimiento), p=_pesos_zipf(len(candidatos), 0.9))
+        puente_programa.append(pd.DataFrame({"id_acontecimiento": id_acontecimiento, "id_programa": id_programa}))
+    tablas["acontecimiento_programa"] = (
+        pd.concat(puente_programa, ignore_index=True).drop_duplicates()
+        if puente_programa else pd.DataFrame(columns=["id_acontecimiento", "id_programa"])
+    )
+
+    # Redes: uno o más posts de Facebook por acontecimiento
+    ids_redes = ids[fuente == 3]
+    posts_por_evento = np.minimum(rng.geometric(0.7, len(ids_redes)), 4)
+    id_acontecimiento = np.repeat(ids_redes, posts_por_evento)
+    n_posts = len(id_acontecimiento)
+    ids_posts = np.arange(contadores["posts"], contadores["posts"] + n_posts, dtype=np.int64)
+    contadores["posts"] += n_posts
+    paginas = dims["facebook_pages"]["id"].to_numpy()
+    fecha_por_id = pd.Series(fecha_registro, index=ids)
+    tablas["facebook_posts"] = pd.DataFrame({
+        "id": ids_posts,
+        "id_facebook_page": rng.choice(paginas, n_posts, p=_pesos_zipf(len(paginas))),
+        "fecha": fecha_por_id.reindex(id_acontecimiento).to_numpy() if n_posts else [],
+        "num_reacciones": rng.negative_binomial(1, 0.01, n_posts),
+        "num_comentarios": rng.negative_binomial(1, 0.05, n_posts),
+        "num_compartidos": rng.negative_binomial(1, 0.08, n_posts),
+    })
+    tablas["acontecimiento_facebook_post"] = pd.DataFrame({
+        "id": np.arange(contadores["afp"], contadores["afp"] + n_posts, dtype=np.int64),
+        "id_acontecimiento": id_acontecimiento,
+        "id_facebook_post": ids_posts,
+    })
+    contadores["afp"] += n_posts
+
+    # Temas (0 a 2 por acontecimiento) y actores (0 a 3)
+    for tabla, columna, dimension, media, tope in (
+        ("acontecimiento_tema", "id_tema", "temas", 0.9, 2),
+        ("acontecimiento_actor", "id_actor", "actores", 1.2, 3),
+    ):
+        cantidad = np.minimum(rng.poisson(media, n), tope)
+        id_acontecimiento = np.repeat(ids, cantidad)
+        valores = dims[dimension]["id"].to_numpy()
+        tablas[tabla] = pd.DataFrame({
+            "id_acontecimiento": id_acontecimiento,
+            columna: rng.choice(valores, len(id_acontecimiento), p=_pesos_zipf(len(valores), 0.9)),
+        }).drop_duplicates()
+
+    return tablas
+
+
+def generar(eventos: int, semilla: int = 42, meses: int = 24, pct_coctel: float = 0.3,
+            filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Primero las dimensiones y luego los acontecimientos por bloques"""
+    rng = np.random.default_rng(semilla)
+    dims = generar_dimensiones(rng)
+    yield dims
+    contadores = {"notas": 1, "posts": 1, "afp": 1}
+    for inicio in range(0, eventos, filas_por_bloque):
+        n = min(filas_por_bloque, eventos - inicio)
+        yield generar_bloque(rng, dims, inicio + 1, n, contadores, meses, pct_coctel)
+
+
+# =====================================================
+# DESTINOS
+# =====================================================
+
+class DestinoPostgres:
+    """Escribe los bloques con COPY ... FROM STDIN"""
+
+    def __init__(self, reemplazar: bool):
+        import psycopg2
+        from core.query_executor import _db_config
+        self.conn = psycopg2.connect(**_db_config())
+        with self.conn.cursor() as cur:
+            if reemplazar:
+                for tabla in reversed(list(DDL)):
+                    cur.execute(f"DROP TABLE IF EXISTS {tabla}")
+            for tabla, columnas in DDL.items():
+                cur.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+        self.conn.commit()
+
+    def escribir(self, tablas: Dict[str, pd.DataFrame]):
+        with self.conn.cursor() as cur:
+            for tabla, df in tablas.items():
+                if df.empty:
+                    continue
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False, header=False, na_rep="\\N")
+                buffer.seek(0)
+                cur.copy_expert(
+                    f"COPY {tabla} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+                )
+        self.conn.commit()
+
+    def cerrar(self):
+        with self.conn.cursor() as cur:
+            for indice in INDICES:
+                cur.execute(indice)
+            self.conn.commit()
+            self.conn.autocommit = True
+            cur.execute("VACUUM ANALYZE")
+        self.conn.close()
+
+
+class DestinoParquet:
+    """Un archivo Parquet por tabla, escrito por grupos de filas"""
+
+    def __init__(self, carpeta: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("La exportación a Parquet requiere pyarrow (pip install pyarrow)")
+        os.makedirs(carpeta, exist_ok=True)
+        self.carpeta = carpeta
+        self._escritores = {}
+
+    def escribir(self, tablas: Dict[str, pd.DataFrame]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        for tabla, df in tablas.items():
+            escritor = self._escritores.get(tabla)
+            if df.empty and escritor is not None:
+                continue
+            datos = pa.Table.from_pandas(df, preserve_index=False)
+            if escritor is None:
+                ruta = os.path.join(self.carpeta, f"{tabla}.parquet")
+                escritor = pq.ParquetWriter(ruta, datos.schema, compression="zstd")
+                self._escritores[tabla] = escritor
+            escritor.write_table(datos.cast(escritor.schema))
+
+    def cerrar(self):
+        for escritor in self._escritores.values():
+            escritor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", default="10k", help="10k, 100k, 1m, 10m o un número de acontecimientos")
+    parser.add_argument("--postgres", action="store_true", help="Cargar en el PostgreSQL de DB_*")
+    parser.add_argument("--reemplazar", action="store_true", help="Borrar y recrear las tablas antes de cargar")
+    parser.add_argument("--parquet", metavar="CARPETA", help="Exportar cada tabla a CARPETA/<tabla>.parquet")
+    parser.add_argument("--meses", type=int, default=24, help="Antigüedad máxima de fecha_registro")
+    parser.add_argument("--pct-coctel", type=float, default=0.3, help="Fracción de acontecimientos con cóctel")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--filas-por-bloque", type=int, default=FILAS_POR_BLOQUE)
+    args = parser.parse_args()
+
+    if not (args.postgres or args.parquet):
+        parser.error("Elegir al menos un destino: --postgres y/o --parquet")
+
+    eventos = parsear_escala(args.escala)
+    destinos = []
+    if args.postgres:
+        destinos.append(DestinoPostgres(args.reemplazar))
+    if args.parquet:
+        destinos.append(DestinoParquet(args.parquet))
+
+    t0 = time.perf_counter()
+    filas: Dict[str, int] = {}
+    for bloque in generar(eventos, args.semilla, args.meses, args.pct_coctel, args.filas_por_bloque):
+        for destino in destinos:
+            destino.escribir(bloque)
+        for tabla, df in bloque.items():
+            filas[tabla] = filas.get(tabla, 0) + len(df)
+        print(f"  {filas.get('acontecimientos', 0):>12,} / {eventos:,} acontecimientos "
+              f"({time.perf_counter() - t0:.1f}s)")
+    for destino in destinos:
+        destino.cerrar()
+
+    print(f"\n{'tabla':<30} {'filas':>14}")
+    for tabla in DDL:
+        print(f"{tabla:<30} {filas.get(tabla, 0):>14,}")
+    print(f"Total: {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.constants import ID_POSICION_DICT, COCTEL_DICT, ID_FUENTE_DICT, MACROREGIONES
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 class AnalyticsEngine:
     """Motor de análisis de datos completo con todas las funciones migradas"""
@@ -24,27 +27,28 @@ class AnalyticsEngine:
         # Apply S25 logic: dedup first like S25 does
         data_deduped = data.drop_duplicates()
         
-        print("=== SN DEBUG ===")
-        print(f"total combined data rows: {len(data)}")
-        print(f"after dedup: {len(data_deduped)}")
-        print(f"unique id_fuente values: {sorted(data_deduped['id_fuente'].unique())}")
-        print(f"total coctel=1 in deduped data: {data_deduped['coctel'].sum()}")
-        
-        print("ID_FUENTE_DICT mapping:")
-        for k, v in ID_FUENTE_DICT.items():
-            print(f"  {k} -> {v}")
-        
-        print("breakdown by id_fuente:")
-        for fuente_id, fuente_name in ID_FUENTE_DICT.items():
-            temp_data_subset = data_deduped[data_deduped['id_fuente'] == fuente_id]
-            if not temp_data_subset.empty:
-                coctel_ones = len(temp_data_subset[temp_data_subset['coctel'] == 1])
-                coctel_zeros = len(temp_data_subset[temp_data_subset['coctel'] == 0])
-                print(f"  {fuente_name} (id={fuente_id}): {len(temp_data_subset)} total, {coctel_ones} coctel=1, {coctel_zeros} coctel=0")
-            else:
-                print(f"  {fuente_name} (id={fuente_id}): no data")
-        
-        print("=== END SN DEBUG ===\n")
+        if log.depurando():
+            log.debug("=== SN DEBUG ===")
+            log.debug("total combined data rows: %s", len(data))
+            log.debug("after dedup: %s", len(data_deduped))
+            log.debug("unique id_fuente values: %s", sorted(data_deduped['id_fuente'].unique()))
+            log.debug("total coctel=1 in deduped data: %s", data_deduped['coctel'].sum())
+        
+            log.debug("ID_FUENTE_DICT mapping:")
+            for k, v in ID_FUENTE_DICT.items():
+                log.debug("  %s -> %s", k, v)
+        
+            log.debug("breakdown by id_fuente:")
+            for fuente_id, fuente_name in ID_FUENTE_DICT.items():
+                temp_data_subset = data_deduped[data_deduped['id_fuente'] == fuente_id]
+                if not temp_data_subset.empty:
+                    coctel_ones = len(temp_data_subset[temp_data_subset['coctel'] == 1])
+                    coctel_zeros = len(temp_data_subset[temp_data_subset['coctel'] == 0])
+                    log.debug("  %s (id=%s): %s total, %s coctel=1, %s coctel=0", fuente_name, fuente_id, len(temp_data_subset), coctel_ones, coctel_zeros)
+                else:
+                    log.debug("  %s (id=%s): no data", fuente_name, fuente_id)
+        
+            log.debug("=== END SN DEBUG ===")
         
         data_deduped["Fuente"] = data_deduped["id_fuente"].map(ID_FUENTE_DICT)
         
@@ -902,7 +906,7 @@ class AnalyticsEngine:
             return result_coctel, result_total
             
         except Exception as e:
-            print(f"Error en calculate_program_impacts_complete: {e}")
+            log.error("Error en calculate_program_impacts_complete: %s", e)
             return pd.DataFrame(), pd.DataFrame()
         
     @staticmethod
@@ -2,103 +2,200 @@
 import streamlit as st
 import hashlib
 import bcrypt
-import json
 import os
-import secrets
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
+from core.user_store import obtener_user_store
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Costo de bcrypt para hashes nuevos; los hashes con otro costo se rehacen al ingresar
+BCRYPT_ROUNDS = int(os.getenv("SIMA_BCRYPT_ROUNDS", 12))
+# Verificaciones simultáneas y en espera (el resto se rechaza de inmediato)
+MAX_HILOS_BCRYPT = int(os.getenv("SIMA_BCRYPT_WORKERS", 2))
+MAX_COLA_BCRYPT = int(os.getenv("SIMA_BCRYPT_QUEUE", 16))
+TIMEOUT_BCRYPT_SEGUNDOS = float(os.getenv("SIMA_BCRYPT_TIMEOUT", 15))
+
+MENSAJE_SATURADA = "⏳ Hay muchos inicios de sesión en curso. Intenta nuevamente en unos segundos."
+
+
+class VerificacionSaturada(Exception):
+    """La cola de verificación de contraseñas está llena o el trabajo no terminó a tiempo"""
+
+
+class VerificadorPasswords:
+    """
+    Pool acotado para bcrypt: las verificaciones y hashes corren en pocos hilos
+    (bcrypt libera el GIL), con un máximo de trabajos en espera. Así una ráfaga de
+    logins no ocupa todos los núcleos ni los hilos de script de Streamlit.
+    """
+    
+    def __init__(self, max_hilos: int = MAX_HILOS_BCRYPT, max_cola: int = MAX_COLA_BCRYPT):
+        self.max_hilos = max(1, max_hilos)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_hilos, thread_name_prefix="sima_bcrypt")
+        self._cupos = threading.BoundedSemaphore(self.max_hilos + max(0, max_cola))
+        self._lock = threading.Lock()
+        self.rechazadas = 0
+        self.completadas = 0
+    
+    def ejecutar(self, funcion, *args, timeout: float = TIMEOUT_BCRYPT_SEGUNDOS):
+        """
+        Ejecutar en el pool; VerificacionSaturada si no hay cupo en la cola o si no
+        termina en `timeout` (el trabajo sigue y libera su cupo al terminar)
+        """
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self.rechazadas += 1
+            raise VerificacionSaturada()
+        try:
+            futuro = self._pool.submit(funcion, *args)
+        except Exception:
+            self._cupos.release()
+            raise
+        futuro.add_done_callback(lambda _: self._cupos.release())
+        try:
+            resultado = futuro.result(timeout=timeout)
+        except FuturoTimeout:
+            with self._lock:
+                self.rechazadas += 1
+            raise VerificacionSaturada() from None
+        with self._lock:
+            self.completadas += 1
+        return resultado
+    
+    def metricas(self) -> Dict[str, int]:
+        with self._lock:
+            return {'completadas': self.completadas, 'rechazadas': self.rechazadas}
+
+
+# Pool global del proceso
+verificador_passwords = VerificadorPasswords()
+
+
+def _es_hash_bcrypt(hash_str: str) -> bool:
+    return hash_str.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _costo_bcrypt(hash_str: str) -> Optional[int]:
+    """Costo (log2 rondas) de un hash bcrypt: $2b$12$..."""
+    try:
+        return int(hash_str.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
 class AuthManager:
     """Sistema de autenticación mejorado con gestión de contraseñas"""
     
     def __init__(self, config_file="config/users.json"):
         self.config_file = config_file
-        self.password_reset_tokens = {}
-        self.failed_attempts = {}
         
-        # Crear directorio de configuración si no existe
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        self.verificacion_saturada = False
         
-        self.users = self._load_users()
+        # Store compartido: sin lectura de disco en cada rerun
+        self.store = obtener_user_store(config_file)
+        self.store.recargar_si_cambio()
         
         # Inicializar session state si no existe
         if 'auth_initialized' not in st.session_state:
             st.session_state.auth_initialized = True
     
-    def _hash_password(self, password: str) -> str:
-        """Hash seguro de contraseña usando bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    @property
+    def users(self) -> Dict:
+        """Copia de solo lectura de los usuarios (los cambios van por el store)"""
+        return self.store.listar_usuarios()
     
-    def _verify_password(self, password: str, hash_str: str) -> bool:
-        """Verificar contraseña contra hash"""
+    @staticmethod
+    def _bcrypt_hash(password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+    
+    @staticmethod
+    def _bcrypt_check(password: str, hash_str: str) -> bool:
         try:
             return bcrypt.checkpw(password.encode('utf-8'), hash_str.encode('utf-8'))
         except ValueError:
-            # Fallback para hashes SHA256 antiguos (migración)
-            return hashlib.sha256(password.encode()).hexdigest() == hash_str
+            return False
     
-    def _load_users(self) -> Dict:
-        """Cargar usuarios desde archivo JSON o variables de entorno"""
-        # Intentar cargar desde archivo primero
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
-        
-        # Si no existe archivo, cargar desde variables de entorno
-        users_json = os.getenv('USERS_CONFIG')
-        if users_json:
-            try:
-                return json.loads(users_json)
-            except json.JSONDecodeError:
-                st.error("Error: USERS_CONFIG mal formateado")
-        
-        return {}
+    def _hash_password(self, password: str) -> str:
+        """Hash seguro de contraseña usando bcrypt (en el pool acotado)"""
+        return verificador_passwords.ejecutar(self._bcrypt_hash, password)
+    
+    def _hash_nuevo(self, password: str) -> Optional[str]:
+        """Hash para una contraseña nueva; None (y marca la saturación) si el pool está ocupado"""
+        try:
+            return self._hash_password(password)
+        except VerificacionSaturada:
+            self.verificacion_saturada = True
+            return None
+    
+    def _verify_password(self, password: str, hash_str: str) -> bool:
+        """Verificar contraseña contra hash"""
+        if not _es_hash_bcrypt(hash_str):
+            # Fallback para hashes SHA256 antiguos (migración); es barato, va en línea
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hash_str)
+        return verificador_passwords.ejecutar(self._bcrypt_check, password, hash_str)
     
-    def _save_users(self):
-        """Guardar usuarios en archivo JSON"""
+    @staticmethod
+    def _necesita_rehash(hash_str: str) -> bool:
+        """SHA256 antiguo o bcrypt con un costo distinto al configurado"""
+        return not _es_hash_bcrypt(hash_str) or _costo_bcrypt(hash_str) != BCRYPT_ROUNDS
+    
+    def _rehash_si_corresponde(self, username: str, password: str, hash_str: str):
+        """Actualizar el hash después de un login correcto, sin afectar el login"""
+        if not self._necesita_rehash(hash_str):
+            return
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, indent=2, ensure_ascii=False)
+            nuevo_hash = self._hash_password(password)
         except Exception as e:
-            st.error(f"Error guardando datos de usuario: {e}")
+            log.warning("⚠️ No se pudo actualizar el hash de %s: %s", username, e)
+            return
+        self.store.actualizar_usuario(
+            username,
+            {"password_hash": nuevo_hash, "password_rehashed_at": datetime.now().isoformat()},
+            si_hash=hash_str
+        )
     
     def _create_default_admin(self):
         """Crear usuario admin por defecto"""
-        if not self.users:
+        if not self.store.hay_usuarios():
             # En producción, usar variables de entorno
             admin_password = os.getenv('ADMIN_PASSWORD')
             admin_name = os.getenv('ADMIN_NAME', 'Administrator')
             
+            password_hash = self._hash_nuevo(admin_password or "admin123")
+            if password_hash is None:
+                # Sin admin todavía: se vuelve a intentar en el próximo rerun
+                st.warning(MENSAJE_SATURADA)
+                return
+            
             if admin_password:
                 # Configuración desde variables de entorno
-                self.users["admin"] = {
-                    "password_hash": self._hash_password(admin_password),
+                if self.store.crear_usuario("admin", {
+                    "password_hash": password_hash,
                     "role": "admin",
                     "name": admin_name,
                     "created_at": datetime.now().isoformat()
-                }
-                self._save_users()
-                st.success("✅ Admin configurado desde variables de entorno")
+                }):
+                    st.success("✅ Admin configurado desde variables de entorno")
             else:
-                # Fallback para desarrollo local
-                default_password = "admin123"
-                self.users["admin"] = {
-                    "password_hash": self._hash_password(default_password),
+                # Fallback para desarrollo local (contraseña "admin123")
+                if self.store.crear_usuario("admin", {
+                    "password_hash": password_hash,
                     "role": "admin",
                     "name": "Administrador",
                     "created_at": datetime.now().isoformat(),
                     "is_default": True
-                }
-                self._save_users()
-                st.warning("⚠️ Usuario admin creado con contraseña por defecto.")
+                }):
+                    st.warning("⚠️ Usuario admin creado con contraseña por defecto.")
     
     def setup_initial_admin(self):
         """Configurar el primer administrador de forma segura"""
-        if self.users:
+        if self.store.hay_usuarios():
             return False  # Ya hay usuarios
         
         st.error("⚠️ No se encontraron usuarios en el sistema.")
@@ -120,48 +217,55 @@ class AuthManager:
                 elif not admin_username:
                     st.error("El nombre de usuario es requerido")
                 else:
-                    self.users[admin_username] = {
-                        "password_hash": self._hash_password(admin_password),
+                    password_hash = self._hash_nuevo(admin_password)
+                    if password_hash is None:
+                        st.warning(MENSAJE_SATURADA)
+                    elif self.store.crear_usuario(admin_username, {
+                        "password_hash": password_hash,
                         "role": "admin",
                         "name": admin_name,
                         "created_at": datetime.now().isoformat()
-                    }
-                    self._save_users()
-                    st.success("✅ Administrador creado exitosamente")
-                    st.rerun()
+                    }):
+                        st.success("✅ Administrador creado exitosamente")
+                        st.rerun()
         
         return True  # Indica que se necesita configuración
     
     def _is_rate_limited(self, username: str) -> bool:
         """Verificar si el usuario está limitado por intentos fallidos"""
-        if username in self.failed_attempts:
-            attempts, last_attempt = self.failed_attempts[username]
+        registro = self.store.intentos_fallidos(username)
+        if registro:
+            attempts, last_attempt = registro
             if attempts >= 5 and datetime.now() - last_attempt < timedelta(minutes=15):
                 return True
         return False
     
     def _record_failed_attempt(self, username: str):
         """Registrar intento de login fallido"""
-        if username in self.failed_attempts:
-            attempts, _ = self.failed_attempts[username]
-            self.failed_attempts[username] = (attempts + 1, datetime.now())
-        else:
-            self.failed_attempts[username] = (1, datetime.now())
+        self.store.registrar_intento_fallido(username)
     
     def _clear_failed_attempts(self, username: str):
         """Limpiar intentos fallidos después de login exitoso"""
-        if username in self.failed_attempts:
-            del self.failed_attempts[username]
+        self.store.limpiar_intentos_fallidos(username)
     
     def authenticate(self, username: str, password: str) -> Optional[Dict]:
         """Autenticar usuario con rate limiting"""
+        self.verificacion_saturada = False
         if self._is_rate_limited(username):
             return None
             
-        if username in self.users:
-            user = self.users[username]
-            if self._verify_password(password, user["password_hash"]):
+        user = self.store.obtener_usuario(username)
+        if user is not None:
+            hash_str = user["password_hash"]
+            try:
+                valida = self._verify_password(password, hash_str)
+            except VerificacionSaturada:
+                # No cuenta como intento fallido: el servidor está ocupado
+                self.verificacion_saturada = True
+                return None
+            if valida:
                 self._clear_failed_attempts(username)
+                self._rehash_si_corresponde(username, password, hash_str)
                 return {
                     "username": username,
                     "role": user["role"], 
@@ -190,7 +294,7 @@ class AuthManager:
     
     def require_auth(self):
         """Decorator/método para requerir autenticación"""
-        if not self.users:
+        if not self.store.hay_usuarios():
             # Si no hay usuarios, intentar crear admin por defecto o mostrar setup
             if self.setup_initial_admin():
                 st.stop()
@@ -226,9 +330,10 @@ class AuthManager:
         if not new_name or len(new_name.strip()) < 2:
             return False
             
-        self.users[username]["name"] = new_name.strip()
-        self.users[username]["name_changed_at"] = datetime.now().isoformat()
-        self._save_users()
+        self.store.actualizar_usuario(username, {
+            "name": new_name.strip(),
+            "name_changed_at": datetime.now().isoformat()
+        })
         
         # Actualizar también en session_state si es el usuario actual
         if "user" in st.session_state and st.session_state["user"]["username"] == username:
@@ -243,14 +348,16 @@ class AuthManager:
         
         if len(new_password) < 8:
             return False
+        
+        password_hash = self._hash_nuevo(new_password)
+        if password_hash is None:
+            return False
             
-        self.users[username]["password_hash"] = self._hash_password(new_password)
-        self.users[username]["password_changed_at"] = datetime.now().isoformat()
         # Marcar que ya no es contraseña por defecto
-        if "is_default" in self.users[username]:
-            del self.users[username]["is_default"]
-        self._save_users()
-        return True
+        return self.store.actualizar_usuario(username, {
+            "password_hash": password_hash,
+            "password_changed_at": datetime.now().isoformat()
+        }, quitar=("is_default",))
     
     def admin_reset_password(self, admin_username: str, admin_password: str, 
                            target_username: str, new_password: str) -> bool:
@@ -259,17 +366,21 @@ class AuthManager:
         if not admin_user or admin_user["role"] != "admin":
             return False
             
-        if target_username not in self.users:
+        if self.store.obtener_usuario(target_username) is None:
             return False
         
         if len(new_password) < 8:
             return False
+        
+        password_hash = self._hash_nuevo(new_password)
+        if password_hash is None:
+            return False
             
-        self.users[target_username]["password_hash"] = self._hash_password(new_password)
-        self.users[target_username]["password_reset_by"] = admin_username
-        self.users[target_username]["password_reset_at"] = datetime.now().isoformat()
-        self._save_users()
-        return True
+        return self.store.actualizar_usuario(target_username, {
+            "password_hash": password_hash,
+            "password_reset_by": admin_username,
+            "password_reset_at": datetime.now().isoformat()
+        })
     
     def create_user(self, admin_username: str, admin_password: str, 
                    new_username: str, new_password: str, role: str, name: str) -> bool:
@@ -278,7 +389,7 @@ class AuthManager:
         if not admin_user or admin_user["role"] != "admin":
             return False
         
-        if new_username in self.users:
+        if self.store.obtener_usuario(new_username) is not None:
             return False  # Usuario ya existe
         
         if len(new_password) < 8:
@@ -287,15 +398,17 @@ class AuthManager:
         if role not in ["admin", "analyst", "viewer"]:
             return False
         
-        self.users[new_username] = {
-            "password_hash": self._hash_password(new_password),
+        password_hash = self._hash_nuevo(new_password)
+        if password_hash is None:
+            return False
+        
+        return self.store.crear_usuario(new_username, {
+            "password_hash": password_hash,
             "role": role,
             "name": name,
             "created_by": admin_username,
             "created_at": datetime.now().isoformat()
-        }
-        self._save_users()
-        return True
+        })
     
     def delete_user(self, admin_username: str, admin_password: str, target_username: str) -> bool:
         """Admin puede eliminar usuarios"""
@@ -303,15 +416,10 @@ class AuthManager:
         if not admin_user or admin_user["role"] != "admin":
             return False
         
-        if target_username not in self.users:
-            return False
-        
         if target_username == admin_username:
             return False  # No puede eliminarse a sí mismo
         
-        del self.users[target_username]
-        self._save_users()
-        return True
+        return self.store.eliminar_usuario(target_username)
     
     def login_form(self):
         """Mostrar formulario de login"""
@@ -337,6 +445,8 @@ class AuthManager:
                     st.session_state["user"] = user
                     st.success(f"¡Bienvenido, {user['name']}!")
                     st.rerun()
+                elif self.verificacion_saturada:
+                    st.warning(MENSAJE_SATURADA)
                 else:
                     st.error("Usuario o contraseña incorrectos")
     
@@ -361,6 +471,58 @@ class AuthManager:
             self.logout()
             st.rerun()
     
+    def _render_rendimiento(self):
+        """Latencias p50/p95/p99 por sección y por query (ventana móvil del proceso)"""
+        from core.cassette import cassette
+        from core.telemetry import metricas_latencia, VENTANA_METRICAS
+        
+        st.markdown("#### Latencia por sección y por query")
+        st.caption(f"Últimas {VENTANA_METRICAS} mediciones por clave, en milisegundos, "
+                   "compartidas por todas las sesiones del proceso.")
+        if cassette.modo != "off":
+            e = cassette.estadisticas()
+            st.info(f"Cassettes en modo **{e['modo']}** ({e['directorio']}): "
+                    f"{e.get('grabados', 0)} grabados, {e.get('reproducidos', 0)} reproducidos, "
+                    f"{e.get('faltantes', 0)} faltantes. En replay, 'db_ejecucion' es la lectura del archivo.")
+        formato = {c: st.column_config.NumberColumn(format="%.1f") for c in ("p50_ms", "p95_ms", "p99_ms")}
+        
+        secciones = metricas_latencia.resumen_secciones()
+        etapas = sorted(secciones['etapa'].unique()) if not secciones.empty else []
+        elegidas = st.multiselect("Etapas", etapas, default=etapas, key="admin_metricas_etapas")
+        st.markdown("**Por sección**")
+        st.dataframe(secciones[secciones['etapa'].isin(elegidas)], column_config=formato,
+                     hide_index=True, use_container_width=True)
+        
+        st.markdown("**Por plantilla de query**")
+        queries = metricas_latencia.resumen_queries()
+        st.dataframe(queries[queries['etapa'].isin(elegidas)], column_config=formato,
+                     hide_index=True, use_container_width=True)
+
+        st.markdown("**Queries por llamada de datos de cada sección**")
+        st.dataframe(metricas_latencia.resumen_queries_secciones(), hide_index=True,
+                     use_container_width=True)
+
+        from core.memory import contabilidad_memoria
+        st.markdown("**Memoria de cachés**")
+        presupuesto = contabilidad_memoria.presupuesto_bytes / 2 ** 20
+        st.caption(f"{contabilidad_memoria.total_bytes() / 2 ** 20:.1f} MB de "
+                   f"{presupuesto:.0f} MB de presupuesto (SIMA_CACHE_BUDGET_MB) · "
+                   f"{contabilidad_memoria.desalojos_presupuesto} desalojos por presupuesto")
+        formato_mb = {"mb": st.column_config.NumberColumn(format="%.1f")}
+        st.dataframe(contabilidad_memoria.resumen(), column_config=formato_mb,
+                     hide_index=True, use_container_width=True)
+        st.markdown("**Memoria por sesión**")
+        st.dataframe(contabilidad_memoria.por_sesion(), column_config=formato_mb,
+                     hide_index=True, use_container_width=True)
+
+        if st.button("Reiniciar métricas", key="admin_metricas_limpiar"):
+            metricas_latencia.limpiar()
+            st.rerun()
+
+        st.divider()
+        from core.profiler import render_perfiles
+        render_perfiles()
+    
     def render_admin_panel(self):
         """Renderizar panel de administración"""
         if not st.session_state.get("show_admin_panel", False):
@@ -372,7 +534,8 @@ class AuthManager:
         
         st.markdown("### Panel de Administración")
         
-        tab1, tab2, tab3, tab4 = st.tabs(["Usuarios", "Crear Usuario", "Resetear Contraseña", "Cambiar Nombres"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["Usuarios", "Crear Usuario", "Resetear Contraseña",
+                                                "Cambiar Nombres", "Rendimiento"])
         
         with tab1:
             st.markdown("#### Usuarios del Sistema")
@@ -403,6 +566,8 @@ class AuthManager:
                                 st.success(f"Usuario {username} eliminado")
                                 del st.session_state[f"confirm_delete_{username}"]
                                 st.rerun()
+                            elif self.verificacion_saturada:
+                                st.warning(MENSAJE_SATURADA)
                     with col2:
                         if st.button("Cancelar", key=f"confirm_no_{username}"):
                             del st.session_state[f"confirm_delete_{username}"]
@@ -421,6 +586,8 @@ class AuthManager:
                     if self.create_user(user["username"], admin_password, new_username, new_password, new_role, new_name):
                         st.success(f"Usuario {new_username} creado exitosamente")
                         st.rerun()
+                    elif self.verificacion_saturada:
+                        st.warning(MENSAJE_SATURADA)
                     else:
                         st.error("Error al crear usuario. Verifica los datos y tu contraseña.")
         
@@ -434,6 +601,8 @@ class AuthManager:
                 if st.form_submit_button("Resetear Contraseña"):
                     if self.admin_reset_password(user["username"], admin_password, target_user, new_password):
                         st.success(f"Contraseña de {target_user} reseteada exitosamente")
+                    elif self.verificacion_saturada:
+                        st.warning(MENSAJE_SATURADA)
                     else:
                         st.error("Error al resetear contraseña. Verifica tu contraseña.")
         
@@ -448,15 +617,18 @@ class AuthManager:
                 
                 if st.form_submit_button("Cambiar Nombre"):
                     admin_user = self.authenticate(user["username"], admin_password)
-                    if not admin_user or admin_user["role"] != "admin":
+                    if self.verificacion_saturada:
+                        st.warning(MENSAJE_SATURADA)
+                    elif not admin_user or admin_user["role"] != "admin":
                         st.error("Contraseña de administrador incorrecta")
                     elif not new_display_name.strip() or len(new_display_name.strip()) < 2:
                         st.error("El nombre debe tener al menos 2 caracteres")
                     else:
-                        self.users[target_user]["name"] = new_display_name.strip()
-                        self.users[target_user]["name_changed_by"] = user["username"]
-                        self.users[target_user]["name_changed_at"] = datetime.now().isoformat()
-                        self._save_users()
+                        self.store.actualizar_usuario(target_user, {
+                            "name": new_display_name.strip(),
+                            "name_changed_by": user["username"],
+                            "name_changed_at": datetime.now().isoformat()
+                        })
                         
                         # Actualizar session_state si es el usuario actual
                         if target_user == user["username"]:
@@ -465,6 +637,9 @@ class AuthManager:
                         st.success(f"Nombre de {target_user} cambiado exitosamente")
                         st.rerun()
         
+        with tab5:
+            self._render_rendimiento()
+        
         if st.button("Cerrar Panel"):
             st.session_state["show_admin_panel"] = False
             st.rerun()
\ No newline at end of file
@@ -0,0 +1,194 @@
+# core/cassette.py
+"""
+Grabación y reproducción de resultados de la base ("cassettes").
+
+Con SIMA_DB_CASSETTE=record cada query que pasa por el ejecutor compartido
+(core/query_executor.py) o por la carga principal (utils.py) guarda su resultado en
+un archivo Arrow IPC comprimido con zstd, indexado por plantilla SQL + parámetros.
+Con SIMA_DB_CASSETTE=replay esos mismos resultados se sirven desde disco sin abrir
+ninguna conexión: permite perfilar el lado pandas/Plotly de cada sección sin
+PostgreSQL y separar la latencia de la base de la de Python.
+
+Requiere pyarrow. Una query sin cassette en modo replay falla como si la base
+hubiera devuelto un error.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# off | record | replay
+MODO_CASSETTE = os.getenv("SIMA_DB_CASSETTE", "off").lower()
+DIRECTORIO_CASSETTE = os.getenv("SIMA_DB_CASSETTE_DIR", "cassettes")
+EXTENSION = ".arrow"
+
+
+class CassetteNoEncontrado(LookupError):
+    """La query no tiene un resultado grabado en el directorio de cassettes"""
+
+
+def _sql_normalizado(query: str) -> str:
+    return " ".join(str(query).split())
+
+
+def _params_json(params: Optional[Any]) -> str:
+    """Parámetros serializados de forma estable (fechas y Decimal como texto)"""
+    return json.dumps(params if params else None, default=str, sort_keys=True, ensure_ascii=False)
+
+
+def _unir_tablas(tablas):
+    """
+    concat_tables que unifica esquemas (una columna nula toma el tipo de los demás
+    lotes). `promote_options` existe desde pyarrow 14; antes era `promote=True`.
+    """
+    import pyarrow as pa
+
+    if int(pa.__version__.split(".")[0]) >= 14:
+        return pa.concat_tables(tablas, promote_options="permissive")
+    return pa.concat_tables(tablas, promote=True)
+
+
+class Cassette:
+    """Directorio de resultados grabados, uno por (plantilla SQL, parámetros)"""
+
+    def __init__(self, modo: str = MODO_CASSETTE, directorio: str = DIRECTORIO_CASSETTE):
+        if modo not in ("off", "record", "replay"):
+            log.warning("SIMA_DB_CASSETTE=%r desconocido; se usa 'off'", modo)
+            modo = "off"
+        if modo != "off":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                log.error("SIMA_DB_CASSETTE=%s requiere pyarrow; cassettes desactivados", modo)
+                modo = "off"
+        self.modo = modo
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._estadisticas = defaultdict(int)
+
+    @property
+    def grabando(self) -> bool:
+        return self.modo == "record"
+
+    @property
+    def reproduciendo(self) -> bool:
+        return self.modo == "replay"
+
+    def clave(self, query: str, params: Optional[Any] = None) -> str:
+        contenido = _sql_normalizado(query) + "\n" + _params_json(params)
+        return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+    def ruta(self, query: str, params: Optional[Any] = None) -> str:
+        return os.path.join(self.directorio, self.clave(query, params) + EXTENSION)
+
+    def _contar(self, evento: str):
+        with self._lock:
+            self._estadisticas[evento] += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Modo, directorio y resultados grabados/reproducidos/faltantes desde el arranque"""
+        with self._lock:
+            return {'modo': self.modo, 'directorio': self.directorio, **self._estadisticas}
+
+    # --- Grabación ---
+
+    @contextmanager
+    def grabar_lotes(self, query: str, params: Optional[Any] = None) -> Iterator[Callable[[pd.DataFrame], None]]:
+        """
+        Entrega una función que agrega un lote (DataFrame) al resultado de la query.
+        Al cerrar el bloque sin errores los lotes se unifican (una columna vacía en un
+        lote toma el tipo de los demás) y se escriben como un archivo Arrow, uno por
+        record batch; un resultado que Arrow no puede representar no se graba.
+        """
+        import pyarrow as pa
+
+        tablas = []
+        errores = []
+
+        def agregar(df: pd.DataFrame):
+            if errores:
+                return
+            try:
+                tablas.append(pa.Table.from_pandas(df, preserve_index=False))
+            except (pa.ArrowException, ValueError) as e:
+                errores.append(e)
+
+        yield agregar
+        try:
+            if errores:
+                raise errores[0]
+            self._escribir(_unir_tablas(tablas), query, params)
+        except (pa.ArrowException, ValueError, OSError) as e:
+            log.warning("No se graba el cassette de la query (%s): %s", _sql_normalizado(query)[:60], e)
+
+    def _escribir(self, tabla, query: str, params: Optional[Any]):
+        """Escribe en un temporal y lo publica con os.replace (lectores nunca ven un archivo a medias)"""
+        import pyarrow as pa
+
+        os.makedirs(self.directorio, exist_ok=True)
+        destino = self.ruta(query, params)
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tabla = tabla.replace_schema_metadata({
+            **(tabla.schema.metadata or {}),
+            b'sima_sql': _sql_normalizado(query).encode('utf-8'),
+            b'sima_params': _params_json(params).encode('utf-8'),
+        })
+        try:
+            opciones = pa.ipc.IpcWriteOptions(compression='zstd')
+            with pa.OSFile(temporal, 'wb') as archivo, \
+                    pa.ipc.new_file(archivo, tabla.schema, options=opciones) as escritor:
+                for lote in tabla.to_batches():
+                    escritor.write_batch(lote)
+            os.replace(temporal, destino)
+            self._contar('grabados')
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def grabar(self, query: str, params: Optional[Any], df: Optional[pd.DataFrame]):
+        """Guardar el resultado completo de una query (None = error, no se graba)"""
+        if df is None:
+            return
+        with self.grabar_lotes(query, params) as agregar:
+            agregar(df)
+
+    # --- Reproducción ---
+
+    def _abrir(self, query: str, params: Optional[Any] = None):
+        import pyarrow as pa
+
+        destino = self.ruta(query, params)
+        if not os.path.exists(destino):
+            self._contar('faltantes')
+            raise CassetteNoEncontrado(
+                f"Sin cassette para la query en {self.directorio} "
+                f"({_sql_normalizado(query)[:80]} | params={_params_json(params)[:80]})"
+            )
+        self._contar('reproducidos')
+        return pa.ipc.open_file(pa.memory_map(destino, 'r'))
+
+    def reproducir(self, query: str, params: Optional[Any] = None) -> pd.DataFrame:
+        """Resultado grabado de la query; CassetteNoEncontrado si no existe"""
+        return self._abrir(query, params).read_all().to_pandas()
+
+    def reproducir_lotes(self, query: str, params: Optional[Any] = None) -> Iterator[pd.DataFrame]:
+        """Lotes grabados de la query, en el mismo orden en que se grabaron"""
+        lector = self._abrir(query, params)
+        if lector.num_record_batches == 0:
+            # Resultado sin filas: un lote vacío conserva las columnas
+            yield lector.schema.empty_table().to_pandas()
+        for i in range(lector.num_record_batches):
+            yield lector.get_batch(i).to_pandas()
+
+
+# Cassette del proceso, según SIMA_DB_CASSETTE
+cassette = Cassette()
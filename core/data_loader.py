@@ -1,6 +1,7 @@
 import pandas as pd
 import streamlit as st
 import time
+from functools import partial
 from datetime import datetime, timedelta
 from typing import Tuple, List
 import sys
@@ -9,39 +10,85 @@ import os
 # Agregar el directorio raíz al path para poder importar utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import get_query
+from utils import get_query, get_query_por_lotes
+from core.dimensions import DimensionNoDisponible, decorar_etiquetas
+from core.logger import obtener_logger
+from core.memory import contabilizar
+
+log = obtener_logger(__name__)
+
 
 class DataLoader:
     """Gestor centralizado de carga de datos"""
     
+    # Columnas numéricas de coctel_completo que pueden llegar como None en un lote
+    COLUMNAS_NUMERICAS_COCTEL = [
+        'id', 'id_posicion', 'id_fuente', 'id_canal',
+        'num_reacciones', 'num_comentarios', 'num_compartidos'
+    ]
+    
+    # coctel_completo llega solo con ids; columna de etiqueta -> (columna id, dimensión)
+    ETIQUETAS_COCTEL = {
+        'lugar': ('id_lugar', 'lugares'),
+        'fuente_nombre': ('id_fuente', 'fuentes'),
+        'programa_nombre': ('id_programa', 'programas'),
+        'canal_nombre': ('id_canal', 'canales'),
+        'nombre': ('id_actor', 'actores'),
+        'nombre_facebook_page': ('id_facebook_page', 'facebook_pages'),
+        'descripcion': ('id_tema', 'temas'),
+        'mensaje_fuerza': ('id_mensaje_fuerza', 'mensaje_fuerza'),
+    }
+    
     @staticmethod
-    @st.cache_data(ttl=3600)
-    def load_coctel_data() -> Tuple:
-        """Cargar todos los datos de cocteles con cacheo"""
-        print("⏳ [START] load_coctel_data()", flush=True)
-        t0 = time.time()
+    def _procesar_lote_coctel(lote: pd.DataFrame, etiquetas_sql: bool = False) -> pd.DataFrame:
+        """
+        Tipar y filtrar un lote de coctel_completo. Con `etiquetas_sql` el lote ya trae
+        las etiquetas (coctel_completo_etiquetas) y no se decoran.
+        """
+        lote['fecha_registro'] = pd.to_datetime(lote['fecha_registro']).dt.normalize()
         
-        # Cargar datos principales
-        temp_coctel_completo = get_query("cocteles", "coctel_completo")
+        # Un lote con todos los valores nulos quedaría como object; forzar numérico
+        # para que todos los lotes concatenen con el mismo dtype
+        for columna in DataLoader.COLUMNAS_NUMERICAS_COCTEL:
+            lote[columna] = pd.to_numeric(lote[columna], errors='coerce')
         
-        # Procesar datos
-        temp_coctel_completo['fecha_registro'] = pd.to_datetime(
-            temp_coctel_completo['fecha_registro']
-        ).dt.normalize()
+        # Etiquetas desde las dimensiones cacheadas (antes de rellenar id_fuente).
+        # El resultado se cachea una hora: los ids nuevos recargan la dimensión sin
+        # esperar el intervalo entre recargas
+        if not etiquetas_sql:
+            lote = decorar_etiquetas(lote, DataLoader.ETIQUETAS_COCTEL, recarga_inmediata=True)
         
-        temp_coctel_completo['rebote_nombre'] = temp_coctel_completo['canal_nombre'].fillna(
-            temp_coctel_completo['nombre_facebook_page']
-        )
+        lote['rebote_nombre'] = lote['canal_nombre'].fillna(lote['nombre_facebook_page'])
         
-        temp_coctel_completo['coctel'] = pd.to_numeric(
-            temp_coctel_completo['coctel'], errors='coerce'
-        ).fillna(0.0)
+        lote['coctel'] = pd.to_numeric(lote['coctel'], errors='coerce').fillna(0.0)
+        lote['coctel'] = (lote['coctel'] != 0).astype(float)
         
-        temp_coctel_completo['coctel'] = (temp_coctel_completo['coctel'] != 0).astype(float)
-        temp_coctel_completo = temp_coctel_completo[
-            temp_coctel_completo["acontecimiento"] != "pRUEBA"
-        ]
-        temp_coctel_completo['id_fuente'] = temp_coctel_completo['id_fuente'].fillna(3)
+        lote = lote[lote["acontecimiento"] != "pRUEBA"]
+        lote['id_fuente'] = lote['id_fuente'].fillna(3)
+        return lote
+    
+    @staticmethod
+    @st.cache_data(ttl=3600, max_entries=1)
+    @contabilizar("load_coctel_data")
+    def load_coctel_data() -> Tuple:
+        """Cargar todos los datos de cocteles con cacheo"""
+        log.info("⏳ [START] load_coctel_data()")
+        t0 = time.time()
+        
+        # Cargar datos principales por lotes (cursor del lado del servidor);
+        # tipos y filtro de "pRUEBA" se aplican a cada lote
+        try:
+            temp_coctel_completo = get_query_por_lotes(
+                "cocteles", "coctel_completo",
+                transformar_lote=DataLoader._procesar_lote_coctel
+            )
+        except DimensionNoDisponible as e:
+            # Sin la dimensión no hay etiquetas: se vuelve a cargar con los JOIN
+            log.warning("⚠️ %s; coctel_completo se carga con etiquetas desde SQL", e)
+            temp_coctel_completo = get_query_por_lotes(
+                "cocteles", "coctel_completo_etiquetas",
+                transformar_lote=partial(DataLoader._procesar_lote_coctel, etiquetas_sql=True)
+            )
         
         # Crear vistas especializadas
         temp_coctel_fuente_notas = temp_coctel_completo[[
@@ -84,14 +131,15 @@ class DataLoader:
         lugares_uniques = temp_coctel_fuente['lugar'].unique().tolist()
 
         t1 = time.time()
-        print(f"✅ [END] load_coctel_data() ({t1-t0:.1f}s)", flush=True)
+        log.info("✅ [END] load_coctel_data() (%.1fs)", t1 - t0)
         
         return (temp_coctel_completo, temp_coctel_fuente_notas, temp_coctel_fuente,
                 temp_coctel_fuente_programas, temp_coctel_fuente_fb, 
                 temp_coctel_fuente_actores, temp_coctel_temas, lugares_uniques)
     
     @staticmethod
-    @st.cache_data(ttl=3600) 
+    @st.cache_data(ttl=3600, max_entries=1)
+    @contabilizar("load_user_data")
     def load_user_data() -> Tuple:
         """Cargar datos de usuarios"""
         usuarios_por_dia = get_query("usuarios", "usuarios_por_dia")
@@ -102,7 +150,7 @@ class DataLoader:
         return usuarios_por_dia, acontecimientos_por_dia, usuarios_ultimo_dia, usuarios_semana
     
     @staticmethod
-    @st.cache_data(ttl=3600)
+    @st.cache_data(ttl=3600, max_entries=1)
     def get_last_update_date() -> str:
         """Obtener fecha de última actualización"""
         try:
@@ -0,0 +1,162 @@
+# core/dimensions.py
+"""
+Tablas de dimensión cacheadas (lugares, canales, programas, páginas de Facebook,
+temas, mensajes fuerza, fuentes, actores) y decoración de etiquetas en pandas.
+
+`coctel_completo` y la sección 12 devuelven solo ids enteros; las etiquetas se
+agregan aquí a partir de códigos categóricos, de modo que cada texto existe una sola
+vez en memoria y lo comparten todos los resultados cacheados. El resto de las
+secciones sigue trayendo sus etiquetas desde SQL (agrupan y filtran por ellas).
+
+Una carga fallida no se cachea. Si aparece un id mayor que los de la dimensión
+cacheada (fila nueva después de cargarla), esa dimensión se vuelve a consultar, como
+mucho una vez cada SIMA_DIMENSION_RELOAD_SECONDS. La carga principal, que se cachea
+una hora, recarga sin esperar ese intervalo (`recarga_inmediata`) salvo que el mismo
+id ya haya provocado una recarga. Los ids que siguen sin etiqueta quedan nulos, como
+con el LEFT JOIN.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Intervalo mínimo entre recargas de una dimensión por ids desconocidos
+INTERVALO_RECARGA = float(os.getenv("SIMA_DIMENSION_RELOAD_SECONDS", 60))
+
+# nombre -> (tabla, columna de la etiqueta)
+DIMENSIONES: Dict[str, Tuple[str, str]] = {
+    'lugares': ('lugares', 'nombre'),
+    'canales': ('canales', 'nombre'),
+    'programas': ('programas', 'nombre'),
+    'facebook_pages': ('facebook_pages', 'nombre'),
+    'temas': ('temas', 'descripcion'),
+    'mensaje_fuerza': ('mensaje_fuerza', 'mensaje'),
+    'fuentes': ('fuentes', 'nombre'),
+    'actores': ('actores', 'nombre'),
+}
+
+
+class Dimension:
+    """Ids de una dimensión con el código de su etiqueta entre las etiquetas únicas"""
+
+    def __init__(self, ids: np.ndarray, etiquetas: np.ndarray):
+        categorias, codigos = np.unique(etiquetas.astype(str), return_inverse=True)
+        self.ids = pd.Index(ids.astype('float64'))
+        self.codigos = codigos.astype('int32')
+        self.categorias = pd.Index(categorias, dtype=object)
+        self.id_maximo = float(np.max(ids)) if len(ids) else float('-inf')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def codigos_de(self, ids: pd.Series) -> np.ndarray:
+        """Código categórico por fila (-1 para ids nulos o desconocidos)"""
+        posiciones = self.ids.get_indexer(self._valores(ids))
+        return np.where(posiciones >= 0, self.codigos[posiciones], -1)
+
+    def id_nuevo_maximo(self, ids: pd.Series) -> Optional[float]:
+        """
+        Mayor id por encima de todos los cargados (fila creada después de la carga),
+        o None si no hay. Ids huérfanos o con etiqueta nula por debajo del máximo no
+        cuentan: seguirían faltando tras recargar.
+        """
+        nuevos = self._valores(ids)
+        nuevos = nuevos[nuevos > self.id_maximo]
+        return float(nuevos.max()) if len(nuevos) else None
+
+    @staticmethod
+    def _valores(ids: pd.Series) -> np.ndarray:
+        return pd.to_numeric(ids, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+class DimensionNoDisponible(RuntimeError):
+    """La tabla de dimensión no se pudo cargar (error de la base o tabla vacía)"""
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def obtener_dimension(nombre: str, version: int = 0) -> Dimension:
+    """
+    Cargar una tabla de dimensión. Se usa cache_resource (sin copia por llamada)
+    para que todas las sesiones compartan las mismas cadenas. `version` solo forma
+    parte de la clave: subirla fuerza una nueva consulta de esa dimensión.
+    Lanza DimensionNoDisponible (y no se cachea) si la carga falla.
+    """
+    tabla, columna = DIMENSIONES[nombre]
+    df = ejecutar_query(f"SELECT id, {columna} AS etiqueta FROM {tabla} WHERE {columna} IS NOT NULL")
+    if df is None or df.empty:
+        raise DimensionNoDisponible(f"Dimensión vacía o no disponible: {nombre}")
+    return Dimension(df['id'].to_numpy(), df['etiqueta'].to_numpy())
+
+
+_versiones: Dict[str, int] = defaultdict(int)
+_ultima_recarga: Dict[str, float] = {}
+# Mayor id que ya provocó una recarga de cada dimensión
+_id_recargado: Dict[str, float] = {}
+_recarga_lock = threading.Lock()
+
+
+def dimension(nombre: str) -> Dimension:
+    """Versión vigente (cacheada) de la dimensión `nombre`"""
+    return obtener_dimension(nombre, _versiones[nombre])
+
+
+def _pedir_recarga(nombre: str, id_nuevo: float, inmediata: bool = False) -> bool:
+    """
+    Pasar a una versión nueva de la dimensión por `id_nuevo`. False si se recargó
+    hace poco; con `inmediata` solo si ese id (o uno mayor) ya provocó una recarga,
+    es decir, si recargar de nuevo no lo encontraría.
+    """
+    with _recarga_lock:
+        ahora = time.monotonic()
+        reciente = ahora - _ultima_recarga.get(nombre, float('-inf')) < INTERVALO_RECARGA
+        ya_buscado = id_nuevo <= _id_recargado.get(nombre, float('-inf'))
+        if ya_buscado if inmediata else reciente:
+            return False
+        _ultima_recarga[nombre] = ahora
+        _id_recargado[nombre] = max(id_nuevo, _id_recargado.get(nombre, float('-inf')))
+        _versiones[nombre] += 1
+        return True
+
+
+def decorar_etiquetas(df: pd.DataFrame, mapeo: Dict[str, Tuple[str, str]],
+                      categorica: bool = False, recarga_inmediata: bool = False) -> pd.DataFrame:
+    """
+    Agregar columnas de etiqueta a partir de columnas de id.
+
+    Args:
+        df: DataFrame con las columnas de id
+        mapeo: {columna_destino: (columna_id, nombre_dimension)}
+        categorica: True deja las etiquetas como dtype category; False como object
+            (mismo comportamiento que un texto traído de SQL, sin copiar las cadenas)
+        recarga_inmediata: recargar ante ids nuevos sin esperar
+            SIMA_DIMENSION_RELOAD_SECONDS (resultados que se cachean por mucho tiempo)
+
+    Raises:
+        DimensionNoDisponible: si una dimensión no se puede cargar
+    """
+    for destino, (columna_id, nombre_dimension) in mapeo.items():
+        if columna_id not in df.columns:
+            continue
+        actual = dimension(nombre_dimension)
+        id_nuevo = actual.id_nuevo_maximo(df[columna_id])
+        if id_nuevo is not None and _pedir_recarga(nombre_dimension, id_nuevo, recarga_inmediata):
+            log.info("Ids nuevos en %s; se recarga la dimensión", nombre_dimension)
+            actual = dimension(nombre_dimension)
+        codigos = actual.codigos_de(df[columna_id])
+        etiquetas = pd.Categorical.from_codes(codigos, categories=actual.categorias)
+        if categorica:
+            df[destino] = pd.Series(etiquetas, index=df.index)
+        else:
+            df[destino] = pd.Series(np.asarray(etiquetas, dtype=object), index=df.index)
+    return df
+
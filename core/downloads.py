@@ -0,0 +1,113 @@
+# core/downloads.py
+"""
+Descargas bajo demanda: el archivo se arma solo cuando el usuario lo pide y se
+guarda por huella del resultado + formato, en lugar de serializar el DataFrame a
+CSV en cada rerun para alimentar st.download_button.
+"""
+import gzip
+import io
+import os
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from core.figure_cache import huella
+from core.memory import CacheMedida
+
+# Presupuesto de la caché de archivos del proceso (MB)
+MAX_MB_DESCARGAS = float(os.getenv("SIMA_DOWNLOAD_CACHE_MB", 64))
+
+
+def _csv(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def _csv_gzip(df: pd.DataFrame) -> bytes:
+    return gzip.compress(_csv(df), compresslevel=6)
+
+
+def _parquet(df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False, compression='zstd')
+    return buffer.getvalue()
+
+
+# formato -> (serializador, extensión, mime)
+FORMATOS: Dict[str, Tuple[Callable[[pd.DataFrame], bytes], str, str]] = {
+    "CSV": (_csv, "csv", "text/csv"),
+    "CSV comprimido (gzip)": (_csv_gzip, "csv.gz", "application/gzip"),
+    "Parquet": (_parquet, "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _formatos_disponibles():
+    try:
+        import pyarrow  # noqa: F401
+        return list(FORMATOS)
+    except ImportError:
+        return [f for f in FORMATOS if f != "Parquet"]
+
+
+class DownloadCache:
+    """LRU de archivos generados, acotado por tamaño total en bytes"""
+
+    def __init__(self, max_mb: float = MAX_MB_DESCARGAS):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._archivos = CacheMedida("descargas", max_bytes=self.max_bytes)
+
+    def obtener(self, df: pd.DataFrame, formato: str, clave_datos: str = None) -> bytes:
+        """Archivo de `df` en `formato`, generado solo si no está en caché"""
+        clave = (clave_datos or huella(df), formato)
+        datos = self._archivos.obtener(clave)
+        if datos is not None:
+            return datos
+
+        datos = FORMATOS[formato][0](df)
+        self._archivos.guardar(clave, datos, tamano=len(datos))
+        return datos
+
+    def metricas(self) -> Dict[str, float]:
+        m = self._archivos.metricas()
+        return {'archivos': m['entradas'], 'mb': m['mb']}
+
+
+# Caché global del proceso
+download_cache = DownloadCache()
+
+
+def render_descarga(df: pd.DataFrame, key: str, nombre_base: str, etiqueta: str = "📥 Descargar"):
+    """
+    Selector de formato + botón "Preparar". El archivo se genera (o se toma de la
+    caché) al pedirlo; después se muestra el st.download_button con los bytes.
+    """
+    formatos = _formatos_disponibles()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        formato = st.selectbox("Formato de descarga", formatos, key=f"{key}_formato")
+    with col2:
+        st.write("")
+        preparar = st.button("⚙️ Preparar descarga", key=f"{key}_preparar")
+
+    clave_estado = f"_{key}_descarga"
+    if preparar:
+        st.session_state[clave_estado] = (huella(df), formato)
+
+    preparada = st.session_state.get(clave_estado)
+    if preparada is None or preparada[1] != formato:
+        return
+    # Solo se vuelve a calcular la huella si hay una descarga preparada
+    clave_datos = preparada[0] if preparar else huella(df)
+    if clave_datos != preparada[0]:
+        # Los datos cambiaron desde que se preparó: hay que volver a pedirla
+        del st.session_state[clave_estado]
+        return
+
+    _, extension, mime = FORMATOS[formato]
+    st.download_button(
+        label=etiqueta,
+        data=download_cache.obtener(df, formato, clave_datos),
+        file_name=f"{nombre_base}.{extension}",
+        mime=mime,
+        key=key
+    )
@@ -0,0 +1,132 @@
+# core/figure_cache.py
+"""
+Caché de figuras Plotly por huella de los datos + opciones de visualización.
+
+Construir una figura con px.* (agrupar por color, armar trazas, textos) en cada
+rerun cuesta aunque el resultado y las opciones no hayan cambiado, y también copiar
+o validar una figura ya construida. Aquí la figura se construye una sola vez por
+(gráfico, huella del DataFrame, opciones), se serializa a JSON y se guarda solo su
+especificación, compartida entre sesiones del proceso. En cada acierto la
+especificación llega a st.plotly_chart tal cual, sin reconstruir ni validar trazas.
+La especificación guardada no se modifica; quien necesite cambiar la figura pide
+una copia con `FigureCache.copia`.
+"""
+import copy
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from core.memory import CacheMedida
+from core.telemetry import medir
+
+# Figuras guardadas en el proceso (LRU)
+MAX_FIGURAS_CACHE = int(os.getenv("SIMA_FIGURE_CACHE_ENTRIES", 256))
+
+
+def _actualizar_huella(h, obj: Any):
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr((list(obj.columns), [str(t) for t in obj.dtypes], obj.shape)).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        except TypeError:
+            # Celdas no hasheables (listas, dicts): se usa el JSON del frame
+            h.update(obj.to_json(date_format='iso').encode())
+    elif isinstance(obj, pd.Series):
+        h.update(repr((obj.name, str(obj.dtype), len(obj))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, dict):
+        for clave in sorted(obj, key=repr):
+            h.update(repr(clave).encode())
+            _actualizar_huella(h, obj[clave])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)}".encode())
+        for elemento in obj:
+            _actualizar_huella(h, elemento)
+    else:
+        h.update(repr(obj).encode())
+
+
+def huella(*objetos: Any) -> str:
+    """Huella de contenido de DataFrames / Series / valores (sha1 hex)"""
+    h = hashlib.sha1()
+    for obj in objetos:
+        _actualizar_huella(h, obj)
+    return h.hexdigest()
+
+
+def serializar_figura(figura: go.Figure) -> Dict[str, Any]:
+    """Especificación de la figura como JSON ya decodificado (solo listas, dicts y escalares)"""
+    return json.loads(pio.to_json(figura, validate=False))
+
+
+class FiguraSerializada(go.Figure):
+    """
+    Figura vacía que entrega una especificación ya serializada. st.plotly_chart
+    valida por completo los dict que recibe, pero de un go.Figure solo toma
+    to_dict(): así la especificación guardada se envía sin reconstruir la figura.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__()
+        self._spec = spec
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._spec
+
+    def to_plotly_json(self) -> Dict[str, Any]:
+        return self._spec
+
+
+class FigureCache:
+    """LRU de especificaciones de figuras compartido por todas las sesiones del proceso"""
+
+    def __init__(self, max_entradas: int = MAX_FIGURAS_CACHE):
+        self._figuras = CacheMedida("figuras", max_entradas=max_entradas)
+
+    def obtener(self, nombre: str, datos: Any, construir: Callable[[], go.Figure],
+                **opciones) -> Dict[str, Any]:
+        """
+        Especificación serializada de la figura de `nombre` para `datos` y `opciones`;
+        `construir` solo se llama si no está en caché. Es la instancia compartida:
+        no modificarla.
+        """
+        clave = (nombre, huella(datos, opciones))
+        spec = self._figuras.obtener(clave)
+        if spec is None:
+            spec = serializar_figura(construir())
+            self._figuras.guardar(clave, spec)
+        return spec
+
+    def copia(self, nombre: str, datos: Any, construir: Callable[[], go.Figure],
+              **opciones) -> go.Figure:
+        """go.Figure propia (validada) para modificarla sin afectar a la caché"""
+        return go.Figure(copy.deepcopy(self.obtener(nombre, datos, construir, **opciones)))
+
+    def metricas(self) -> Dict[str, Any]:
+        return self._figuras.metricas()
+
+    def limpiar(self):
+        self._figuras.limpiar()
+
+
+# Caché global del proceso
+figure_cache = FigureCache()
+
+
+def mostrar_figura(figura: go.Figure, *args, **kwargs):
+    """st.plotly_chart con su tiempo (serialización + envío) registrado como 'serializacion'"""
+    import streamlit as st
+    with medir("serializacion"):
+        return st.plotly_chart(figura, *args, **kwargs)
+
+
+def plotly_chart_cacheado(nombre: str, datos: Any, construir: Callable[[], go.Figure],
+                          **opciones):
+    """st.plotly_chart de la especificación tomada de la caché (o construida y guardada)"""
+    spec = figure_cache.obtener(nombre, datos, construir, **opciones)
+    mostrar_figura(FiguraSerializada(spec), use_container_width=True)
@@ -136,4 +136,29 @@ class FilterManager:
                     f"Lugar {section_name}",
                     self.lugares_uniques,
                     key=f"lugar_{section_name}"
-                )
\ No newline at end of file
+                )
+    
+    def resolve_section_dates(self, section_name: str, global_filters: Dict[str, Any],
+                              default_days: int = 30) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """Fechas de una sección sin dibujar widgets (valores actuales de session_state)"""
+        if global_filters.get('use_global_dates'):
+            return global_filters['global_fecha_inicio'], global_filters['global_fecha_fin']
+        default_end = self.max_date if self.max_date else datetime.now().date()
+        default_start = default_end - timedelta(days=default_days)
+        fecha_inicio = st.session_state.get(f"inicio_{section_name}", default_start)
+        fecha_fin = st.session_state.get(f"fin_{section_name}", default_end)
+        return pd.to_datetime(fecha_inicio), pd.to_datetime(fecha_fin)
+    
+    def resolve_section_locations(self, section_name: str, global_filters: Dict[str, Any],
+                                  multi: bool = True, default: Optional[List[str]] = None):
+        """Ubicaciones de una sección sin dibujar widgets (valores actuales de session_state)"""
+        if global_filters.get('use_global_locations'):
+            return global_filters['global_lugares']
+        valor = st.session_state.get(f"lugar_{section_name}")
+        if multi:
+            if valor is None:
+                return list(default or self.lugares_uniques)
+            return [lugar for lugar in valor if lugar in self.lugares_uniques]
+        if valor in self.lugares_uniques:
+            return valor
+        return self.lugares_uniques[0] if self.lugares_uniques else None
@@ -0,0 +1,137 @@
+# core/logger.py
+"""
+Logging del dashboard sobre el módulo estándar `logging`.
+
+    from core.logger import obtener_logger
+    log = obtener_logger(__name__)
+    log.debug("Parámetros: %s, %s", fecha_inicio, lugares)   # se formatea solo si se emite
+    log.dataframe("Datos finales", resultado)                 # solo con SIMA_LOG_DATAFRAMES=1
+
+Configuración por variables de entorno:
+    SIMA_LOG_LEVEL       nivel general (default INFO)
+    SIMA_LOG_MODULES     niveles por módulo: "sections.functions=DEBUG,core.analytics=WARNING"
+    SIMA_LOG_SAMPLE      fracción emitida de DEBUG/INFO por módulo: "sections.functions=0.1"
+    SIMA_LOG_FORMAT      "text" o "json" (una línea JSON por registro)
+    SIMA_LOG_DATAFRAMES  "1" para volcar DataFrames en DEBUG (con SIMA_LOG_DATAFRAME_ROWS filas)
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+RAIZ_LOGGER = "sima"
+
+NIVEL_GENERAL = os.getenv("SIMA_LOG_LEVEL", "INFO").upper()
+FORMATO_LOG = os.getenv("SIMA_LOG_FORMAT", "text").lower()
+VOLCAR_DATAFRAMES = os.getenv("SIMA_LOG_DATAFRAMES", "0") == "1"
+FILAS_DATAFRAME_LOG = int(os.getenv("SIMA_LOG_DATAFRAME_ROWS", 20))
+
+_configurado = False
+_lock_config = threading.Lock()
+
+
+def _leer_pares(valor: str) -> Dict[str, str]:
+    """'a=1,b.c=2' -> {'a': '1', 'b.c': '2'}"""
+    pares = {}
+    for parte in (valor or "").split(","):
+        if "=" in parte:
+            clave, dato = parte.split("=", 1)
+            if clave.strip():
+                pares[clave.strip()] = dato.strip()
+    return pares
+
+
+def _nombre_completo(modulo: str) -> str:
+    return f"{RAIZ_LOGGER}.{modulo}" if modulo else RAIZ_LOGGER
+
+
+class FiltroMuestreo(logging.Filter):
+    """Deja pasar solo una fracción de los DEBUG/INFO de los módulos configurados"""
+
+    def __init__(self, fracciones: Dict[str, float]):
+        super().__init__()
+        # Prefijos más largos primero: el módulo más específico gana
+        self.fracciones = sorted(
+            ((_nombre_completo(m), f) for m, f in fracciones.items()),
+            key=lambda par: len(par[0]), reverse=True
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.fracciones:
+            return True
+        for prefijo, fraccion in self.fracciones:
+            if record.name == prefijo or record.name.startswith(prefijo + "."):
+                return random.random() < fraccion
+        return True
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "nivel": record.levelname,
+            "modulo": record.name[len(RAIZ_LOGGER) + 1:] or record.name,
+            "mensaje": record.getMessage(),
+            "hilo": record.threadName,
+        }
+        from core.query_executor import contexto_actual
+        seccion = contexto_actual().get('seccion')
+        if seccion:
+            datos["seccion"] = seccion
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def configurar_logging():
+    """Configurar el logger raíz del dashboard (una sola vez por proceso)"""
+    global _configurado
+    with _lock_config:
+        if _configurado:
+            return
+        raiz = logging.getLogger(RAIZ_LOGGER)
+        raiz.setLevel(NIVEL_GENERAL)
+        raiz.propagate = False
+
+        manejador = logging.StreamHandler(sys.stdout)
+        if FORMATO_LOG == "json":
+            manejador.setFormatter(FormatoJSON())
+        else:
+            manejador.setFormatter(logging.Formatter(
+                "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+            ))
+        fracciones = {m: float(f) for m, f in _leer_pares(os.getenv("SIMA_LOG_SAMPLE", "")).items()}
+        manejador.addFilter(FiltroMuestreo(fracciones))
+        raiz.addHandler(manejador)
+
+        for modulo, nivel in _leer_pares(os.getenv("SIMA_LOG_MODULES", "")).items():
+            logging.getLogger(_nombre_completo(modulo)).setLevel(nivel.upper())
+        _configurado = True
+
+
+class LoggerSIMA(logging.LoggerAdapter):
+    """Logger de un módulo: API de `logging` más volcado opcional de DataFrames"""
+
+    def depurando(self) -> bool:
+        """True si DEBUG está activo: para saltar cálculos que solo sirven al log"""
+        return self.isEnabledFor(logging.DEBUG)
+
+    def dataframe(self, mensaje: str, df: Any, *args):
+        """Volcar un DataFrame en DEBUG, solo si SIMA_LOG_DATAFRAMES=1"""
+        if not (VOLCAR_DATAFRAMES and self.isEnabledFor(logging.DEBUG)):
+            return
+        texto = df.head(FILAS_DATAFRAME_LOG).to_string() if hasattr(df, "head") else repr(df)
+        filas = len(df) if hasattr(df, "__len__") else "?"
+        self.debug(mensaje + " (%s filas):\n%s", *args, filas, texto)
+
+
+def obtener_logger(modulo: str) -> LoggerSIMA:
+    """Logger del módulo (usar __name__)"""
+    configurar_logging()
+    return LoggerSIMA(logging.getLogger(_nombre_completo(modulo)), {})
@@ -0,0 +1,251 @@
+# core/memory.py
+"""
+Contabilidad de memoria de los resultados cacheados del proceso.
+
+Cada caché propia del dashboard (figuras, descargas, resultados por sesión) guarda sus
+entradas en un `CacheMedida`: un LRU que conoce el tamaño profundo de cada entrada y
+su último acceso. Todas se registran en `contabilidad_memoria`, que suma los bytes por
+caché y por sesión y, si el total supera SIMA_CACHE_BUDGET_MB, desaloja las entradas
+menos usadas recientemente de cualquier caché hasta volver al presupuesto.
+
+Los resultados de st.cache_data (carga principal y usuarios) no se pueden desalojar
+desde aquí: se miden al calcularse y cuentan como memoria fija dentro del presupuesto;
+su cantidad la acota `max_entries`.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Presupuesto de memoria de todas las cachés del proceso (MB); 0 = sin límite
+PRESUPUESTO_MB = float(os.getenv("SIMA_CACHE_BUDGET_MB", 1024))
+
+
+def tamano_profundo(obj: Any, _vistos: Optional[set] = None) -> int:
+    """
+    Bytes aproximados de un objeto y lo que referencia: DataFrames con
+    memory_usage(deep=True), arrays por nbytes, figuras Plotly por sus trazas y layout.
+    Un objeto alcanzado dos veces se cuenta una sola vez.
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return obj.nbytes + sum(tamano_profundo(x, vistos) for x in obj.ravel())
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray, str)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            tamano_profundo(k, vistos) + tamano_profundo(v, vistos) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(tamano_profundo(x, vistos) for x in obj)
+    # go.Figure: los datos viven en _data (lista de dicts) y _layout
+    datos, layout = getattr(obj, "_data", None), getattr(obj, "_layout", None)
+    if isinstance(datos, list) and isinstance(layout, dict):
+        return sys.getsizeof(obj) + tamano_profundo(datos, vistos) + tamano_profundo(layout, vistos)
+    return sys.getsizeof(obj)
+
+
+class CacheMedida:
+    """
+    LRU thread-safe con tamaño por entrada, acotado por entradas y/o bytes.
+    Se registra en la contabilidad del proceso, que puede desalojar su entrada
+    más fría para respetar el presupuesto global.
+    """
+
+    def __init__(self, nombre: str, max_entradas: Optional[int] = None,
+                 max_bytes: Optional[int] = None, sesion: Optional[str] = None):
+        self.nombre = nombre
+        self.sesion = sesion
+        self.max_entradas = max(1, max_entradas) if max_entradas else None
+        self.max_bytes = max_bytes
+        # clave -> (valor, bytes, último acceso)
+        self._entradas: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        contabilidad_memoria.registrar(self)
+
+    def __contains__(self, clave: Hashable) -> bool:
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entradas)
+
+    def obtener(self, clave: Hashable, defecto: Any = None) -> Any:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return defecto
+            self._entradas[clave] = (entrada[0], entrada[1], time.monotonic())
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[0]
+
+    def guardar(self, clave: Hashable, valor: Any, tamano: Optional[int] = None):
+        """Guardar `valor` (medido con tamano_profundo si no se indica su tamaño)"""
+        tamano = tamano_profundo(valor) if tamano is None else tamano
+        if self.max_bytes is not None and tamano > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._entradas[clave] = (valor, tamano, time.monotonic())
+            self._bytes += tamano
+            while self._entradas and (
+                (self.max_entradas is not None and len(self._entradas) > self.max_entradas)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._quitar_mas_frio()
+        contabilidad_memoria.controlar()
+
+    def _quitar_mas_frio(self) -> int:
+        _, (_, tamano, _) = self._entradas.popitem(last=False)
+        self._bytes -= tamano
+        self.desalojos += 1
+        return tamano
+
+    def ultimo_acceso_mas_frio(self) -> Optional[float]:
+        """Último acceso de la entrada menos usada recientemente (None si está vacía)"""
+        with self._lock:
+            if not self._entradas:
+                return None
+            return next(iter(self._entradas.values()))[2]
+
+    def desalojar_mas_frio(self) -> int:
+        """Quitar la entrada menos usada recientemente; retorna los bytes liberados"""
+        with self._lock:
+            return self._quitar_mas_frio() if self._entradas else 0
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def metricas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'mb': self._bytes / 2 ** 20,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+            }
+
+
+class ContabilidadMemoria:
+    """Totales de memoria de las cachés del proceso y control del presupuesto"""
+
+    def __init__(self, presupuesto_mb: float = PRESUPUESTO_MB):
+        self.presupuesto_bytes = int(presupuesto_mb * 2 ** 20)
+        # Las cachés de sesión desaparecen con su sesión
+        self._caches: "weakref.WeakSet[CacheMedida]" = weakref.WeakSet()
+        self._fijos: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._control = threading.Lock()
+        self.desalojos_presupuesto = 0
+
+    def registrar(self, cache: CacheMedida):
+        with self._lock:
+            self._caches.add(cache)
+
+    def registrar_fijo(self, nombre: str, valor: Any) -> Any:
+        """Medir un resultado que no se puede desalojar (st.cache_data); retorna `valor`"""
+        tamano = tamano_profundo(valor)
+        with self._lock:
+            self._fijos[nombre] = tamano
+        log.info("Memoria de %s: %.1f MB", nombre, tamano / 2 ** 20)
+        self.controlar()
+        return valor
+
+    def _caches_vivas(self) -> List[CacheMedida]:
+        with self._lock:
+            return list(self._caches)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            fijos = sum(self._fijos.values())
+        return fijos + sum(c.bytes for c in self._caches_vivas())
+
+    def controlar(self):
+        """Desalojar las entradas más frías de cualquier caché hasta respetar el presupuesto"""
+        if self.presupuesto_bytes <= 0 or self.total_bytes() <= self.presupuesto_bytes:
+            return
+        # Un solo hilo desaloja; los demás siguen sin esperar
+        if not self._control.acquire(blocking=False):
+            return
+        try:
+            exceso = self.total_bytes() - self.presupuesto_bytes
+            liberados = 0
+            while liberados < exceso:
+                candidatas = [(c.ultimo_acceso_mas_frio(), id(c), c) for c in self._caches_vivas()]
+                candidatas = [x for x in candidatas if x[0] is not None]
+                if not candidatas:
+                    log.warning("⚠️ Memoria fija de cachés sobre el presupuesto (%.0f MB > %.0f MB)",
+                                self.total_bytes() / 2 ** 20, self.presupuesto_bytes / 2 ** 20)
+                    break
+                liberados += min(candidatas)[2].desalojar_mas_frio()
+                self.desalojos_presupuesto += 1
+        finally:
+            self._control.release()
+
+    def resumen(self) -> pd.DataFrame:
+        """Entradas y MB por caché (y sesión), incluidas las entradas fijas"""
+        filas = [{'cache': c.nombre, 'sesion': c.sesion or '-', **c.metricas()}
+                 for c in self._caches_vivas()]
+        with self._lock:
+            filas += [{'cache': nombre, 'sesion': '-', 'entradas': 1, 'mb': tamano / 2 ** 20}
+                      for nombre, tamano in self._fijos.items()]
+        columnas = ['cache', 'sesion', 'entradas', 'mb', 'aciertos', 'fallos', 'desalojos']
+        return pd.DataFrame(filas, columns=columnas).sort_values('mb', ascending=False)
+
+    def por_sesion(self) -> pd.DataFrame:
+        """MB de las cachés de cada sesión"""
+        resumen = self.resumen()
+        resumen = resumen[resumen['sesion'] != '-']
+        return (resumen.groupby('sesion', as_index=False)[['entradas', 'mb']].sum()
+                .sort_values('mb', ascending=False))
+
+
+# Contabilidad global del proceso
+contabilidad_memoria = ContabilidadMemoria()
+
+
+def contabilizar(nombre: str) -> Callable:
+    """Decorador para funciones con st.cache_data: mide su resultado al calcularlo"""
+    def decorador(funcion: Callable) -> Callable:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            return contabilidad_memoria.registrar_fijo(nombre, funcion(*args, **kwargs))
+        return envoltura
+    return decorador
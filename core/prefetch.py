@@ -0,0 +1,152 @@
+# core/prefetch.py
+import os
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from core.memory import CacheMedida
+from core.query_executor import query_context, obtener_session_id, PRIORIDAD_TODAS
+from core.telemetry import medir, medir_datos
+
+# Hilos de precarga por render del modo "todas" (el control de admisión
+# sigue limitando las queries simultáneas por sesión)
+MAX_HILOS_PREFETCH = int(os.getenv("SIMA_PREFETCH_WORKERS", 4))
+
+# Resultados por sesión que guarda el modo diferido ("lazy") de "todas"
+MAX_ENTRADAS_CACHE_SESION = int(os.getenv("SIMA_SESSION_CACHE_ENTRIES", 64))
+
+
+def clave_solicitud(funcion: Callable, args: tuple, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+    """Clave de una solicitud de datos: función + parámetros"""
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+    return nombre, repr((args, sorted(kwargs.items())))
+
+
+def _adjuntar_contexto_streamlit(ctx):
+    """Asociar el contexto de la sesión a los hilos del pool (cachés de Streamlit)"""
+    if ctx is None:
+        return
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        add_script_run_ctx(threading.current_thread(), ctx)
+    except Exception:
+        pass
+
+
+class DataPrefetcher:
+    """
+    Precarga concurrente de los datos de varias secciones.
+    Fase 1: `enviar` lanza cada solicitud en un pool acotado de hilos.
+    Fase 2: las secciones piden sus datos con `obtener`; si la solicitud fue
+    precargada se espera su resultado, si no (parámetros distintos) se ejecuta
+    la función en el momento, así el resultado siempre coincide con la sección.
+    """
+
+    def __init__(self, max_hilos: int = MAX_HILOS_PREFETCH):
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx()
+        except Exception:
+            ctx = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_hilos),
+            thread_name_prefix="sima_prefetch",
+            initializer=_adjuntar_contexto_streamlit,
+            initargs=(ctx,)
+        )
+        self._futuros: Dict[Tuple[str, str], Future] = {}
+        self._por_seccion: Dict[str, List[Future]] = {}
+
+    def enviar(self, seccion: str, funcion: Callable, *args, **kwargs) -> Future:
+        """Lanzar la solicitud de datos de una sección"""
+        clave = clave_solicitud(funcion, args, kwargs)
+        futuro = self._futuros.get(clave)
+        if futuro is None:
+            contexto = contextvars.copy_context()
+
+            def tarea():
+                with query_context(prioridad=PRIORIDAD_TODAS, seccion=seccion), medir_datos():
+                    return funcion(*args, **kwargs)
+
+            futuro = self._pool.submit(contexto.run, tarea)
+            self._futuros[clave] = futuro
+        self._por_seccion.setdefault(seccion, []).append(futuro)
+        return futuro
+
+    def obtener(self, funcion: Callable, *args, **kwargs) -> Any:
+        """Resultado precargado o, si no hubo precarga, ejecución directa"""
+        futuro = self._futuros.get(clave_solicitud(funcion, args, kwargs))
+        if futuro is None:
+            with medir_datos():
+                return funcion(*args, **kwargs)
+        with medir("espera_prefetch"):
+            return futuro.result()
+
+    def secciones_listas(self, secciones: List[str]) -> Iterator[str]:
+        """
+        Entregar las secciones a medida que terminan sus precargas.
+        Las secciones sin precarga se entregan primero.
+        """
+        pendientes = {}
+        for seccion in secciones:
+            futuros = self._por_seccion.get(seccion)
+            if futuros:
+                pendientes[seccion] = futuros
+            else:
+                yield seccion
+
+        while pendientes:
+            todos = [f for futuros in pendientes.values() for f in futuros]
+            wait(todos, return_when=FIRST_COMPLETED)
+            for seccion in list(pendientes):
+                if all(f.done() for f in pendientes[seccion]):
+                    del pendientes[seccion]
+                    yield seccion
+
+    def cerrar(self):
+        """Cancelar lo que no empezó y liberar el pool"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _copiar(resultado: Any) -> Any:
+    """Copia de los DataFrames de un resultado (las secciones los modifican al graficar)"""
+    if isinstance(resultado, pd.DataFrame):
+        return resultado.copy()
+    if isinstance(resultado, (tuple, list)):
+        return type(resultado)(_copiar(r) for r in resultado)
+    return resultado
+
+
+class CacheSesion:
+    """
+    Resultados de datos de secciones guardados en st.session_state, para que una
+    sección ya abierta no vuelva a consultar la base mientras dure la sesión.
+    LRU con un máximo de entradas; sus bytes cuentan en el presupuesto del proceso
+    (core/memory.py), que puede desalojar sus entradas más frías.
+    """
+
+    CLAVE_ESTADO = "_sima_cache_secciones"
+    _FALTANTE = object()
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS_CACHE_SESION):
+        import streamlit as st
+        if self.CLAVE_ESTADO not in st.session_state:
+            st.session_state[self.CLAVE_ESTADO] = CacheMedida(
+                "secciones_sesion", max_entradas=max_entradas, sesion=obtener_session_id()
+            )
+        self._entradas: CacheMedida = st.session_state[self.CLAVE_ESTADO]
+
+    def contiene(self, funcion: Callable, *args, **kwargs) -> bool:
+        return clave_solicitud(funcion, args, kwargs) in self._entradas
+
+    def obtener(self, funcion: Callable, calcular: Callable[[], Any], *args, **kwargs) -> Any:
+        """Resultado guardado o calculado con `calcular` (y guardado)"""
+        clave = clave_solicitud(funcion, args, kwargs)
+        resultado = self._entradas.obtener(clave, self._FALTANTE)
+        if resultado is self._FALTANTE:
+            resultado = calcular()
+            self._entradas.guardar(clave, resultado)
+        return _copiar(resultado)
@@ -0,0 +1,231 @@
+# core/profiler.py
+"""
+Perfil de un rerun completo a pedido de un admin.
+
+Con el botón "Perfilar próximo rerun" del panel de administración, o abriendo la app
+con `?perfil=1`, el siguiente run del script de esa sesión se ejecuta bajo cProfile y
+tracemalloc. El perfil guarda las funciones con más tiempo (propio y acumulado), los
+sitios que más memoria asignaron y las queries del rerun; se resume en la pestaña
+"Rendimiento" y se descarga como un zip (reporte de texto + `.prof` para snakeviz).
+
+El alcance de cProfile depende de la versión de Python. Hasta 3.11 solo ve el hilo
+del script: el trabajo de las tareas de precarga del modo "Ver Todas" aparece como
+espera. Desde 3.12 (la del Dockerfile) usa sys.monitoring, que es de todo el
+intérprete: mientras está activo registra las llamadas de cualquier hilo, incluidas
+las tareas de precarga y los reruns de otras sesiones concurrentes. No se puede
+limitar a un hilo; cada perfil indica su alcance. tracemalloc también es de todo el
+proceso, así que solo se perfila un rerun a la vez.
+"""
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from core.logger import obtener_logger
+from core.telemetry import contar_queries
+
+log = obtener_logger(__name__)
+
+# Perfiles guardados en el proceso y tamaño de los rankings
+MAX_PERFILES = int(os.getenv("SIMA_PROFILE_KEEP", 5))
+TOP_FUNCIONES = int(os.getenv("SIMA_PROFILE_TOP", 40))
+PROFUNDIDAD_TRACEMALLOC = int(os.getenv("SIMA_PROFILE_TRACE_DEPTH", 1))
+
+# Desde Python 3.12 cProfile usa sys.monitoring y registra todos los hilos
+ALCANCE_CPROFILE = ("todos los hilos del proceso" if sys.version_info >= (3, 12)
+                    else "solo el hilo del script")
+
+CLAVE_PEDIDO = "perfilar_proximo_rerun"
+PARAMETRO_URL = "perfil"
+
+
+class PerfilRerun:
+    """Resultado de perfilar un rerun"""
+
+    def __init__(self, usuario: str, seccion: Optional[str], segundos: float,
+                 stats: pstats.Stats, asignaciones: List[tracemalloc.Statistic],
+                 pico_bytes: int, queries: int, filas: int):
+        self.fecha = datetime.now()
+        self.usuario = usuario
+        self.seccion = seccion
+        self.segundos = segundos
+        self.pico_mb = pico_bytes / 2 ** 20
+        self.queries = queries
+        self.filas = filas
+        self.alcance = ALCANCE_CPROFILE
+        self.funciones = self._tabla_funciones(stats)
+        self.asignaciones = pd.DataFrame([
+            {'sitio': str(a.traceback), 'kb': a.size / 1024, 'bloques': a.count}
+            for a in asignaciones
+        ], columns=['sitio', 'kb', 'bloques'])
+        self._prof = marshal.dumps(stats.stats)
+        self._texto = self._reporte(stats)
+
+    @property
+    def nombre(self) -> str:
+        return f"perfil_{self.fecha:%Y%m%d_%H%M%S}_{self.usuario}"
+
+    @staticmethod
+    def _tabla_funciones(stats: pstats.Stats) -> pd.DataFrame:
+        filas = []
+        for (archivo, linea, funcion), (_, llamadas, propio, acumulado, _) in stats.stats.items():
+            filas.append({
+                'funcion': f"{funcion} ({os.path.basename(archivo)}:{linea})",
+                'llamadas': llamadas,
+                'propio_s': propio,
+                'acumulado_s': acumulado,
+            })
+        tabla = pd.DataFrame(filas, columns=['funcion', 'llamadas', 'propio_s', 'acumulado_s'])
+        return tabla.sort_values('acumulado_s', ascending=False).head(TOP_FUNCIONES).reset_index(drop=True)
+
+    def _reporte(self, stats: pstats.Stats) -> str:
+        salida = io.StringIO()
+        salida.write(f"Perfil de rerun — {self.fecha:%Y-%m-%d %H:%M:%S} — usuario {self.usuario} — "
+                     f"sección {self.seccion or '-'}\n")
+        salida.write(f"Tiempo total: {self.segundos:.3f}s | queries: {self.queries} | filas: {self.filas} | "
+                     f"pico tracemalloc: {self.pico_mb:.1f} MB\n")
+        salida.write(f"Alcance de cProfile: {self.alcance} (Python {sys.version.split()[0]})\n\n")
+        stats.stream = salida
+        salida.write("=== Por tiempo acumulado ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCIONES)
+        salida.write("\n=== Por tiempo propio ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_FUNCIONES)
+        salida.write("\n=== Sitios de asignación (tracemalloc) ===\n")
+        salida.write(self.asignaciones.to_string(index=False))
+        salida.write("\n")
+        return salida.getvalue()
+
+    def archivo_zip(self) -> bytes:
+        """Reporte de texto + estadísticas de cProfile (abrir con snakeviz o pstats)"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+            z.writestr(f"{self.nombre}.txt", self._texto)
+            z.writestr(f"{self.nombre}.prof", self._prof)
+        return buffer.getvalue()
+
+
+class RegistroPerfiles:
+    """Últimos perfiles del proceso, visibles para todos los admins"""
+
+    def __init__(self, maximo: int = MAX_PERFILES):
+        self._perfiles = deque(maxlen=max(1, maximo))
+        self._lock = threading.Lock()
+        # Solo un rerun perfilado a la vez (tracemalloc y el profiler son globales)
+        self.en_curso = threading.Lock()
+
+    def agregar(self, perfil: PerfilRerun):
+        with self._lock:
+            self._perfiles.appendleft(perfil)
+
+    def listar(self) -> List[PerfilRerun]:
+        with self._lock:
+            return list(self._perfiles)
+
+
+registro_perfiles = RegistroPerfiles()
+
+
+def pedir_perfil():
+    """Marcar la sesión para perfilar el próximo rerun"""
+    st.session_state[CLAVE_PEDIDO] = True
+
+
+def _perfil_pedido() -> bool:
+    """True si un admin pidió perfilar este run (botón o ?perfil=1); consume el pedido"""
+    usuario = st.session_state.get("user") or {}
+    if usuario.get("role") != "admin":
+        return False
+    pedido = st.session_state.pop(CLAVE_PEDIDO, False)
+    if st.query_params.get(PARAMETRO_URL) == "1":
+        del st.query_params[PARAMETRO_URL]
+        pedido = True
+    return pedido
+
+
+def ejecutar_perfilado(run: Callable[[], Any]):
+    """
+    Ejecuta `run` (un run del script); si un admin lo pidió, bajo cProfile y
+    tracemalloc. Las excepciones de control de Streamlit (st.rerun, st.stop) se
+    propagan igual, con el perfil ya guardado.
+    """
+    if not _perfil_pedido():
+        return run()
+    if not registro_perfiles.en_curso.acquire(blocking=False):
+        log.warning("Ya hay un rerun perfilándose; se ejecuta sin perfil")
+        return run()
+
+    ya_trazaba = tracemalloc.is_tracing()
+    if not ya_trazaba:
+        tracemalloc.start(PROFUNDIDAD_TRACEMALLOC)
+    tracemalloc.reset_peak()
+    perfilador = cProfile.Profile()
+    inicio = time.perf_counter()
+    try:
+        with contar_queries() as conteo:
+            perfilador.enable()
+            try:
+                return run()
+            finally:
+                perfilador.disable()
+    finally:
+        segundos = time.perf_counter() - inicio
+        try:
+            asignaciones = tracemalloc.take_snapshot().statistics('lineno')[:TOP_FUNCIONES]
+            pico = tracemalloc.get_traced_memory()[1]
+            usuario = st.session_state.get("user") or {}
+            registro_perfiles.agregar(PerfilRerun(
+                usuario.get("username", "?"), st.session_state.get("selector_seccion"), segundos,
+                pstats.Stats(perfilador), asignaciones, pico, conteo.queries, conteo.filas,
+            ))
+            log.info("Rerun perfilado: %.2fs, %d queries", segundos, conteo.queries)
+        finally:
+            if not ya_trazaba:
+                tracemalloc.stop()
+            registro_perfiles.en_curso.release()
+
+
+def render_perfiles():
+    """Botón para pedir un perfil y resumen/descarga de los últimos perfiles"""
+    st.markdown("#### Perfil del próximo rerun")
+    st.caption("Ejecuta el siguiente rerun de esta sesión bajo cProfile y tracemalloc "
+               "(más lento que un rerun normal). También se puede abrir la app con `?perfil=1`.")
+    if st.button("Perfilar próximo rerun", key="admin_perfilar"):
+        pedir_perfil()
+        st.rerun()
+
+    perfiles = registro_perfiles.listar()
+    if not perfiles:
+        st.caption("Todavía no hay perfiles en este proceso.")
+        return
+
+    opciones = {f"{p.fecha:%H:%M:%S} · {p.usuario} · {p.seccion or '-'} · {p.segundos:.2f}s": p
+                for p in perfiles}
+    perfil = opciones[st.selectbox("Perfil", list(opciones), key="admin_perfil_elegido")]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Tiempo total", f"{perfil.segundos:.2f} s")
+    col2.metric("Queries", f"{perfil.queries} ({perfil.filas:,} filas)")
+    col3.metric("Pico de memoria", f"{perfil.pico_mb:.1f} MB")
+
+    st.caption(f"cProfile registró {perfil.alcance}; tracemalloc, todo el proceso.")
+    st.markdown("**Funciones por tiempo acumulado**")
+    st.dataframe(perfil.funciones, hide_index=True, use_container_width=True, column_config={
+        c: st.column_config.NumberColumn(format="%.3f") for c in ("propio_s", "acumulado_s")
+    })
+    st.markdown("**Sitios de asignación**")
+    st.dataframe(perfil.asignaciones, hide_index=True, use_container_width=True,
+                 column_config={"kb": st.column_config.NumberColumn(format="%.1f")})
+    st.download_button("Descargar perfil (.zip)", data=perfil.archivo_zip(),
+                       file_name=f"{perfil.nombre}.zip", mime="application/zip",
+                       key="admin_perfil_descarga")
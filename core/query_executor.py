@@ -0,0 +1,609 @@
+# core/query_executor.py
+import io
+import os
+import re
+import json
+import hashlib
+import time
+import threading
+import itertools
+import contextvars
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Optional, List, Any, Dict, Iterator, Union
+
+import pandas as pd
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import connection as PGConnection
+
+from core.cassette import cassette
+from core.telemetry import medir, metricas_latencia, plantilla_de
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Prioridades de ejecución (menor valor = mayor prioridad)
+PRIORIDAD_INTERACTIVA = 0   # Una sola sección seleccionada por el usuario
+PRIORIDAD_TODAS = 1         # Modo "Ver Todas las Secciones"
+PRIORIDAD_PREFETCH = 2      # Precarga / calentamiento de caché
+
+NOMBRES_PRIORIDAD = {
+    PRIORIDAD_INTERACTIVA: "interactiva",
+    PRIORIDAD_TODAS: "todas",
+    PRIORIDAD_PREFETCH: "prefetch",
+}
+
+# Límites configurables por variables de entorno
+MAX_QUERIES_CONCURRENTES = int(os.getenv("SIMA_DB_MAX_CONCURRENT", 8))
+MAX_QUERIES_POR_SESION = int(os.getenv("SIMA_DB_MAX_PER_SESSION", 3))
+TIMEOUT_COLA_SEGUNDOS = float(os.getenv("SIMA_DB_QUEUE_TIMEOUT", 120))
+
+# Extracción con COPY para resultados grandes
+UMBRAL_FILAS_COPY = int(os.getenv("SIMA_COPY_ROW_THRESHOLD", 200000))
+MARCA_NULL_COPY = "\\N"
+
+# Pool de conexiones y sentencias preparadas
+POOL_MIN_CONEXIONES = int(os.getenv("SIMA_DB_POOL_MIN", 1))
+POOL_MAX_CONEXIONES = int(os.getenv("SIMA_DB_POOL_MAX", MAX_QUERIES_CONCURRENTES))
+USAR_SENTENCIAS_PREPARADAS = os.getenv("SIMA_DB_PREPARED", "1") != "0"
+MAX_PREPARADAS_POR_CONEXION = int(os.getenv("SIMA_DB_MAX_PREPARED", 200))
+
+# Cada query admitida toma una conexión del pool: admitir más de las que el pool
+# tiene haría fallar getconn con PoolError
+if max(POOL_MIN_CONEXIONES, POOL_MAX_CONEXIONES) < MAX_QUERIES_CONCURRENTES:
+    log.warning("SIMA_DB_POOL_MAX=%d es menor que SIMA_DB_MAX_CONCURRENT=%d; "
+                "se admiten como máximo %d queries simultáneas",
+                POOL_MAX_CONEXIONES, MAX_QUERIES_CONCURRENTES,
+                max(POOL_MIN_CONEXIONES, POOL_MAX_CONEXIONES))
+    MAX_QUERIES_CONCURRENTES = max(1, POOL_MIN_CONEXIONES, POOL_MAX_CONEXIONES)
+
+# Contexto de la query actual (sesión, prioridad y sección que la originan)
+_contexto_query = contextvars.ContextVar("sima_query_context", default={})
+
+
+def _db_config() -> Dict[str, str]:
+    """Configuración de la base de datos desde variables de entorno"""
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
+        'user': os.getenv('DB_USER', 'tu_usuario'),
+        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
+        'port': os.getenv('DB_PORT', '5432')
+    }
+
+
+def obtener_session_id() -> Optional[str]:
+    """Obtener el id de la sesión de Streamlit actual (None fuera de Streamlit)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+@contextmanager
+def query_context(prioridad: Optional[int] = None, session_id: Optional[str] = None,
+                  seccion: Optional[str] = None):
+    """
+    Define prioridad, sesión y sección para las queries ejecutadas dentro del bloque.
+    Los valores no indicados se heredan del contexto exterior.
+    """
+    actual = dict(_contexto_query.get())
+    if prioridad is not None:
+        actual['prioridad'] = prioridad
+    if session_id is not None:
+        actual['session_id'] = session_id
+    elif 'session_id' not in actual:
+        actual['session_id'] = obtener_session_id()
+    if seccion is not None:
+        actual['seccion'] = seccion
+    token = _contexto_query.set(actual)
+    try:
+        yield actual
+    finally:
+        _contexto_query.reset(token)
+
+
+def contexto_actual() -> Dict[str, Any]:
+    """Contexto de query vigente en el hilo/tarea actual"""
+    return _contexto_query.get()
+
+
+class AdmissionController:
+    """
+    Control de admisión global para queries pesadas.
+    Limita las queries concurrentes del proceso, atiende primero las de mayor
+    prioridad (FIFO dentro de cada prioridad) y aplica un tope por sesión para
+    que una sola sesión en modo "todas" no acapare la base de datos.
+    """
+
+    def __init__(self, max_concurrentes: int, max_por_sesion: int):
+        self.max_concurrentes = max(1, max_concurrentes)
+        self.max_por_sesion = max(1, max_por_sesion)
+        self._cond = threading.Condition()
+        self._secuencia = itertools.count()
+        self._cola: List[tuple] = []  # (prioridad, secuencia, session_id)
+        self._activas = 0
+        self._activas_por_sesion: Dict[Any, int] = defaultdict(int)
+
+        # Métricas
+        self._max_profundidad = 0
+        self._admitidas = defaultdict(int)
+        self._rechazadas = 0
+        self._esperas = defaultdict(lambda: deque(maxlen=1000))
+
+    def _siguiente_elegible(self) -> Optional[tuple]:
+        """Primer ticket de la cola cuya sesión no ha alcanzado su tope"""
+        for ticket in sorted(self._cola):
+            if self._activas_por_sesion[ticket[2]] < self.max_por_sesion:
+                return ticket
+        return None
+
+    def acquire(self, prioridad: int, session_id: Any, timeout: Optional[float] = None) -> float:
+        """Esperar turno de ejecución. Retorna el tiempo de espera en segundos."""
+        inicio = time.perf_counter()
+        limite = inicio + timeout if timeout else None
+
+        with self._cond:
+            ticket = (prioridad, next(self._secuencia), session_id)
+            self._cola.append(ticket)
+            self._max_profundidad = max(self._max_profundidad, len(self._cola))
+
+            while not (self._activas < self.max_concurrentes and self._siguiente_elegible() == ticket):
+                restante = None if limite is None else limite - time.perf_counter()
+                if restante is not None and restante <= 0:
+                    self._cola.remove(ticket)
+                    self._rechazadas += 1
+                    self._cond.notify_all()
+                    raise TimeoutError(
+                        f"Tiempo de espera agotado en la cola de queries ({timeout:.0f}s)"
+                    )
+                self._cond.wait(restante)
+
+            self._cola.remove(ticket)
+            self._activas += 1
+            self._activas_por_sesion[session_id] += 1
+
+            espera = time.perf_counter() - inicio
+            self._admitidas[prioridad] += 1
+            self._esperas[prioridad].append(espera)
+            # Otro ticket puede haber quedado elegible
+            self._cond.notify_all()
+            return espera
+
+    def release(self, session_id: Any):
+        """Liberar el turno de ejecución"""
+        with self._cond:
+            self._activas -= 1
+            self._activas_por_sesion[session_id] -= 1
+            if self._activas_por_sesion[session_id] <= 0:
+                del self._activas_por_sesion[session_id]
+            self._cond.notify_all()
+
+    @contextmanager
+    def turno(self, prioridad: int, session_id: Any, timeout: Optional[float] = None):
+        """Context manager que adquiere y libera un turno de ejecución"""
+        espera = self.acquire(prioridad, session_id, timeout)
+        try:
+            yield espera
+        finally:
+            self.release(session_id)
+
+    def metricas(self) -> Dict[str, Any]:
+        """Profundidad de cola, queries activas y tiempos de espera por prioridad"""
+        with self._cond:
+            por_prioridad = {}
+            for prioridad, esperas in self._esperas.items():
+                ordenadas = sorted(esperas)
+                n = len(ordenadas)
+                por_prioridad[NOMBRES_PRIORIDAD.get(prioridad, str(prioridad))] = {
+                    'admitidas': self._admitidas[prioridad],
+                    'espera_promedio_s': sum(ordenadas) / n if n else 0.0,
+                    'espera_p95_s': ordenadas[min(n - 1, int(n * 0.95))] if n else 0.0,
+                    'espera_max_s': ordenadas[-1] if n else 0.0,
+                }
+            return {
+                'profundidad_cola': len(self._cola),
+                'profundidad_maxima': self._max_profundidad,
+                'activas': self._activas,
+                'sesiones_activas': len(self._activas_por_sesion),
+                'rechazadas_por_timeout': self._rechazadas,
+                'por_prioridad': por_prioridad,
+            }
+
+
+# Controlador compartido por todas las sesiones del proceso
+admission_controller = AdmissionController(MAX_QUERIES_CONCURRENTES, MAX_QUERIES_POR_SESION)
+
+
+class ConexionPreparada(PGConnection):
+    """Conexión psycopg2 que recuerda las sentencias preparadas en su sesión"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preparadas: Dict[str, str] = {}
+        self.no_preparables: set = set()
+
+
+_pool: Optional[pg_pool.ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+_estadisticas_sentencias = defaultdict(int)
+_estadisticas_lock = threading.Lock()
+
+_PATRON_PARAMETRO = re.compile(r"%%|%s")
+
+
+def _obtener_pool() -> pg_pool.ThreadedConnectionPool:
+    """Pool de conexiones del proceso (se crea en la primera query)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pg_pool.ThreadedConnectionPool(
+                    POOL_MIN_CONEXIONES,
+                    max(POOL_MIN_CONEXIONES, POOL_MAX_CONEXIONES),
+                    connection_factory=ConexionPreparada,
+                    **_db_config()
+                )
+    return _pool
+
+
+@contextmanager
+def conexion_del_pool() -> Iterator[ConexionPreparada]:
+    """
+    Presta una conexión del pool en modo autocommit (las consultas del dashboard
+    son de solo lectura) y la devuelve al terminar. Las conexiones rotas se descartan.
+    """
+    pool = _obtener_pool()
+    connection = pool.getconn()
+    try:
+        if not connection.autocommit:
+            connection.autocommit = True
+        yield connection
+    finally:
+        pool.putconn(connection, close=bool(connection.closed))
+
+
+def cerrar_pool():
+    """Cerrar todas las conexiones del pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def _contar_sentencia(evento: str):
+    with _estadisticas_lock:
+        _estadisticas_sentencias[evento] += 1
+
+
+def _sql_posicional(query: str, con_params: bool) -> str:
+    """
+    Convierte los marcadores %s de psycopg2 a $1, $2, ... para PREPARE.
+    Con parámetros, psycopg2 exige escapar % como %%; se deshace el escape.
+    """
+    sql = _sql_para_copy(query)
+    if not con_params:
+        return sql
+    contador = itertools.count(1)
+    return _PATRON_PARAMETRO.sub(
+        lambda m: '%' if m.group(0) == '%%' else f"${next(contador)}", sql
+    )
+
+
+def _ejecutar_preparada(cursor, query: str, params: Optional[List[Any]] = None) -> bool:
+    """
+    Ejecuta la query como sentencia preparada de la conexión: PREPARE la primera vez
+    que la plantilla llega a esta conexión y EXECUTE en las siguientes.
+    Retorna False si la plantilla no se puede preparar (se ejecuta de forma normal).
+    """
+    connection = cursor.connection
+    preparadas = getattr(connection, 'preparadas', None)
+    if preparadas is None or isinstance(params, dict):
+        return False
+
+    nombre = "sima_" + hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+    if nombre in connection.no_preparables:
+        return False
+
+    if nombre not in preparadas:
+        if len(preparadas) >= MAX_PREPARADAS_POR_CONEXION:
+            cursor.execute("DEALLOCATE ALL")
+            preparadas.clear()
+        try:
+            cursor.execute(f"PREPARE {nombre} AS {_sql_posicional(query, bool(params))}")
+        except psycopg2.Error:
+            # Parámetros sin tipo inferible, varias sentencias, etc.
+            connection.no_preparables.add(nombre)
+            _contar_sentencia('no_preparables')
+            return False
+        preparadas[nombre] = query
+        _contar_sentencia('preparadas')
+    else:
+        _contar_sentencia('reutilizadas')
+
+    if params:
+        marcadores = ', '.join(['%s'] * len(params))
+        cursor.execute(f"EXECUTE {nombre} ({marcadores})", params)
+    else:
+        cursor.execute(f"EXECUTE {nombre}")
+    return True
+
+
+def estadisticas_sentencias() -> Dict[str, int]:
+    """Sentencias preparadas, reutilizadas y no preparables desde el arranque"""
+    with _estadisticas_lock:
+        return dict(_estadisticas_sentencias)
+
+
+def obtener_metricas() -> Dict[str, Any]:
+    """Métricas del control de admisión y de sentencias preparadas"""
+    metricas = admission_controller.metricas()
+    metricas['sentencias'] = estadisticas_sentencias()
+    return metricas
+
+
+def _leer_resultado(cursor, query: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
+    """Ejecutar la query (preparada si es posible) y construir el DataFrame con fetchall"""
+    plantilla = plantilla_de(query)
+    with medir("db_ejecucion", plantilla):
+        if not (USAR_SENTENCIAS_PREPARADAS and _ejecutar_preparada(cursor, query, params)):
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+    with medir("fetch", plantilla) as info:
+        results = cursor.fetchall()
+        info['filas'] = len(results)
+
+        if not results:
+            return pd.DataFrame()
+
+        column_names = [desc[0] for desc in cursor.description]
+        df = pd.DataFrame(results, columns=column_names)
+
+    return df
+
+
+@contextmanager
+def _turno_y_conexion(query: str) -> Iterator[ConexionPreparada]:
+    """Turno de admisión + conexión del pool; registra la espera total como 'db_espera'"""
+    contexto = _contexto_query.get()
+    prioridad = contexto.get('prioridad', PRIORIDAD_INTERACTIVA)
+    session_id = contexto.get('session_id') or obtener_session_id()
+
+    inicio = time.perf_counter()
+    with admission_controller.turno(prioridad, session_id, TIMEOUT_COLA_SEGUNDOS):
+        with conexion_del_pool() as connection:
+            metricas_latencia.registrar("db_espera", time.perf_counter() - inicio,
+                                        plantilla=plantilla_de(query))
+            yield connection
+
+
+def _reproducir(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
+    """
+    Modo replay: el resultado sale del cassette, sin turno de admisión ni conexión.
+    La lectura del archivo se registra como 'db_ejecucion' para que los conteos de
+    queries y presupuestos sigan funcionando.
+    """
+    plantilla = plantilla_de(query)
+    try:
+        with medir("db_ejecucion", plantilla):
+            df = cassette.reproducir(query, params)
+    except Exception as e:
+        log.error("Error al leer el cassette de la consulta: %s", e)
+        return None
+    with medir("fetch", plantilla) as info:
+        info['filas'] = len(df)
+    return df
+
+
+def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
+    """
+    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
+    La ejecución pasa por el control de admisión global según el contexto actual.
+    Con SIMA_DB_CASSETTE=record/replay el resultado se graba o se lee de core/cassette.py.
+    """
+    if cassette.reproduciendo:
+        return _reproducir(query, params)
+    try:
+        with _turno_y_conexion(query) as connection, connection.cursor() as cursor:
+            df = _leer_resultado(cursor, query, params)
+        if cassette.grabando:
+            cassette.grabar(query, params, df)
+        return df
+
+    except Exception as e:
+        log.error("Error al ejecutar la consulta: %s", e)
+        return None
+
+
+def _sql_para_copy(sql: str) -> str:
+    """Quitar el ';' final para poder envolver la query en COPY (...)"""
+    return sql.strip().rstrip(';').strip()
+
+
+def estimar_filas(cursor, sql: str, params: Optional[List[Any]] = None) -> int:
+    """Filas estimadas por el planificador (EXPLAIN, sin ejecutar la query)"""
+    with medir("db_plan", plantilla_de(sql)):
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {_sql_para_copy(sql)}", params or None)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan'].get('Plan Rows', 0))
+
+
+# OIDs de tipos de PostgreSQL que el lector CSV no infiere igual que fetchall
+_OID_BOOL = {16}
+_OID_ENTEROS = {20, 21, 23}
+_OID_REALES = {700, 701, 1700}
+_OID_TEXTO = {18, 19, 25, 1042, 1043}
+_OID_FECHA = {1082}
+_OID_TIMESTAMP = {1114}
+_OID_TIMESTAMPTZ = {1184}
+
+
+def _tipos_columnas(cursor, consulta: str) -> Dict[str, int]:
+    """OID del tipo de cada columna del resultado (LIMIT 0: solo planifica)"""
+    cursor.execute(f"SELECT * FROM ({consulta}) AS sima_tipos LIMIT 0")
+    return {desc[0]: desc[1] for desc in cursor.description}
+
+
+def _dtypes_csv(tipos: Dict[str, int]) -> Dict[str, str]:
+    """
+    dtype fijo por columna para read_csv, para que todos los lotes de un COPY tengan
+    los mismos tipos (un lote sin valores no cae a float64, un texto numérico sigue
+    siendo texto). Enteros y booleanos nullables; las fechas se leen como texto.
+    """
+    dtypes = {}
+    for columna, oid in tipos.items():
+        if oid in _OID_ENTEROS:
+            dtypes[columna] = 'Int64'
+        elif oid in _OID_REALES:
+            dtypes[columna] = 'float64'
+        elif oid in _OID_BOOL:
+            dtypes[columna] = 'boolean'
+        elif oid in _OID_TEXTO or oid in _OID_FECHA | _OID_TIMESTAMP | _OID_TIMESTAMPTZ:
+            dtypes[columna] = 'object'
+    return dtypes
+
+
+def _convertir_fechas(df: pd.DataFrame, tipos: Dict[str, int]) -> pd.DataFrame:
+    """Fechas como las entrega fetchall: date -> objetos date, timestamp -> datetime64"""
+    for columna, oid in tipos.items():
+        if columna not in df.columns:
+            continue
+        if oid in _OID_FECHA:
+            df[columna] = pd.to_datetime(df[columna]).dt.date.astype(object).where(df[columna].notna(), None)
+        elif oid in _OID_TIMESTAMP:
+            df[columna] = pd.to_datetime(df[columna])
+        elif oid in _OID_TIMESTAMPTZ:
+            df[columna] = pd.to_datetime(df[columna], utc=True, format='ISO8601')
+    return df
+
+
+def normalizar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tras unir los lotes de un COPY: enteros y booleanos nullables a los tipos que
+    arma pandas desde fetchall (int64/bool sin nulos; float64/object con nulos).
+    """
+    for columna in df.columns:
+        dtype = df[columna].dtype
+        if isinstance(dtype, pd.Int64Dtype):
+            serie = df[columna]
+            df[columna] = serie.astype('int64') if not serie.hasnans else serie.astype('float64')
+        elif isinstance(dtype, pd.BooleanDtype):
+            serie = df[columna]
+            df[columna] = serie.astype(bool) if not serie.hasnans else serie.astype(object).where(serie.notna(), None)
+    return df
+
+
+def _vacio_tipado(tipos: Dict[str, int]) -> pd.DataFrame:
+    """Resultado sin filas con las columnas y tipos de la query (como un lote vacío del CSV)"""
+    dtypes = _dtypes_csv(tipos)
+    return _convertir_fechas(
+        pd.DataFrame({columna: pd.Series(dtype=dtypes.get(columna, 'object')) for columna in tipos}),
+        tipos,
+    )
+
+
+def _lotes_medidos(lector, plantilla: str, tipos: Dict[str, int]) -> Iterator[pd.DataFrame]:
+    """
+    Itera los lotes del lector CSV sumando su tiempo de parseo y sus filas como 'fetch'.
+    Un resultado sin filas entrega un lote vacío con las columnas de la query.
+    """
+    segundos, filas, lotes = 0.0, 0, 0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                lote = _convertir_fechas(next(lector), tipos)
+            except StopIteration:
+                break
+            finally:
+                segundos += time.perf_counter() - inicio
+            filas += len(lote)
+            lotes += 1
+            yield lote
+        if not lotes:
+            yield _vacio_tipado(tipos)
+    finally:
+        metricas_latencia.registrar("fetch", segundos, plantilla=plantilla, filas=filas)
+
+
+def leer_copy(cursor, sql: str, params: Optional[List[Any]] = None,
+              chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Extrae el resultado con COPY (...) TO STDOUT en formato CSV a un buffer en memoria
+    y lo parsea con el lector C de pandas, sin crear un objeto Python por celda.
+    Los tipos de cada columna salen de la descripción de la query, no de la inferencia
+    del CSV. Con chunksize retorna un iterador de DataFrames (unirlos y pasarlos por
+    normalizar_tipos para obtener los mismos tipos que sin lotes); sin filas entrega
+    un lote vacío con las columnas de la query.
+    """
+    consulta = _sql_para_copy(sql)
+    if params:
+        codificacion = psycopg2.extensions.encodings.get(cursor.connection.encoding, 'utf-8')
+        consulta = cursor.mogrify(consulta, params).decode(codificacion)
+    copy_sql = (
+        f"COPY ({consulta}) TO STDOUT "
+        f"WITH (FORMAT csv, HEADER true, NULL '{MARCA_NULL_COPY}')"
+    )
+
+    plantilla = plantilla_de(sql)
+    with medir("db_plan", plantilla):
+        tipos = _tipos_columnas(cursor, consulta)
+    buffer = io.BytesIO()
+    with medir("db_ejecucion", plantilla):
+        cursor.copy_expert(copy_sql, buffer)
+    buffer.seek(0)
+
+    # NULL se distingue del texto vacío con una marca propia; los booleanos
+    # de PostgreSQL llegan como t/f en CSV
+    opciones = dict(
+        engine='c',
+        dtype=_dtypes_csv(tipos),
+        na_values=[MARCA_NULL_COPY],
+        keep_default_na=False,
+        true_values=['t'],
+        false_values=['f'],
+    )
+    if chunksize is not None:
+        return _lotes_medidos(pd.read_csv(buffer, chunksize=chunksize, **opciones), plantilla, tipos)
+    with medir("fetch", plantilla) as info:
+        resultado = normalizar_tipos(_convertir_fechas(pd.read_csv(buffer, **opciones), tipos))
+        info['filas'] = len(resultado)
+    return resultado
+
+
+def ejecutar_query_copy(query: str, params: Optional[List[Any]] = None,
+                        umbral_filas: int = UMBRAL_FILAS_COPY) -> Optional[pd.DataFrame]:
+    """
+    Variante de ejecutar_query para extracciones grandes: si el planificador estima
+    al menos `umbral_filas` filas, extrae con COPY en formato CSV; si no, usa fetchall.
+    Con COPY los tipos salen de la descripción de la query (ver leer_copy).
+    """
+    if cassette.reproduciendo:
+        return _reproducir(query, params)
+    try:
+        with _turno_y_conexion(query) as connection, connection.cursor() as cursor:
+            if umbral_filas and estimar_filas(cursor, query, params) < umbral_filas:
+                df = _leer_resultado(cursor, query, params)
+            else:
+                df = leer_copy(cursor, query, params)
+        if cassette.grabando:
+            cassette.grabar(query, params, df)
+        return df
+
+    except pd.errors.EmptyDataError:
+        if cassette.grabando:
+            cassette.grabar(query, params, pd.DataFrame())
+        return pd.DataFrame()
+    except Exception as e:
+        log.error("Error al ejecutar la consulta (COPY): %s", e)
+        return None
@@ -0,0 +1,96 @@
+# core/tables.py
+"""
+Tabla paginada del lado del servidor: filtro de texto y orden se aplican en pandas
+sobre el resultado ya cacheado y al navegador solo viaja la página visible.
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+FILAS_POR_PAGINA = int(os.getenv("SIMA_TABLE_PAGE_SIZE", 50))
+OPCIONES_FILAS = [25, 50, 100, 250]
+
+
+def filtrar_texto(df: pd.DataFrame, texto: str, columnas: Optional[List[str]] = None) -> pd.DataFrame:
+    """Filas donde alguna columna de texto contiene `texto` (sin distinguir mayúsculas)"""
+    texto = (texto or "").strip()
+    if not texto or df.empty:
+        return df
+    columnas = columnas or [c for c in df.columns
+                            if df[c].dtype == object or isinstance(df[c].dtype, (pd.StringDtype, pd.CategoricalDtype))]
+    if not columnas:
+        return df
+    mascara = np.zeros(len(df), dtype=bool)
+    for columna in columnas:
+        mascara |= df[columna].astype(str).str.contains(texto, case=False, regex=False, na=False).to_numpy()
+    return df[mascara]
+
+
+def ordenar(df: pd.DataFrame, columna: Optional[str], ascendente: bool = True) -> pd.DataFrame:
+    """Orden estable por una columna (los nulos al final)"""
+    if not columna or columna not in df.columns or df.empty:
+        return df
+    return df.sort_values(columna, ascending=ascendente, kind='stable', na_position='last')
+
+
+def pagina(df: pd.DataFrame, numero: int, filas: int) -> pd.DataFrame:
+    """Página `numero` (desde 1) de `filas` filas"""
+    inicio = (max(1, numero) - 1) * filas
+    return df.iloc[inicio:inicio + filas]
+
+
+def render_tabla_paginada(df: pd.DataFrame, key: str,
+                          column_config: Optional[Dict[str, Any]] = None,
+                          columnas_busqueda: Optional[List[str]] = None,
+                          orden_inicial: Optional[str] = None,
+                          filas_por_pagina: int = FILAS_POR_PAGINA) -> pd.DataFrame:
+    """
+    Dibujar `df` como tabla paginada con búsqueda y orden.
+
+    Returns:
+        El DataFrame filtrado y ordenado (completo), para totales o descargas.
+    """
+    columnas = list(df.columns)
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        texto = st.text_input("🔎 Buscar", key=f"{key}_buscar", placeholder="Texto a buscar...")
+    with col2:
+        indice = columnas.index(orden_inicial) + 1 if orden_inicial in columnas else 0
+        columna_orden = st.selectbox("Ordenar por", ["(sin orden)"] + columnas, index=indice,
+                                     key=f"{key}_orden")
+    with col3:
+        descendente = st.toggle("Desc.", key=f"{key}_desc")
+
+    resultado = filtrar_texto(df, texto, columnas_busqueda)
+    if columna_orden != "(sin orden)":
+        resultado = ordenar(resultado, columna_orden, ascendente=not descendente)
+
+    total = len(resultado)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        indice_filas = OPCIONES_FILAS.index(filas_por_pagina) if filas_por_pagina in OPCIONES_FILAS else 1
+        filas = st.selectbox("Filas por página", OPCIONES_FILAS, index=indice_filas, key=f"{key}_filas")
+    paginas = max(1, -(-total // filas))
+    # Si el filtro achicó el resultado, volver a una página válida antes del widget
+    if st.session_state.get(f"{key}_pagina", 1) > paginas:
+        st.session_state[f"{key}_pagina"] = paginas
+    with col2:
+        numero = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1,
+                                 key=f"{key}_pagina")
+    numero = min(int(numero), paginas)
+
+    visible = pagina(resultado, numero, filas)
+    st.dataframe(visible, hide_index=True, use_container_width=True, column_config=column_config)
+
+    with col3:
+        if total:
+            inicio = (numero - 1) * filas
+            st.caption(f"Filas {inicio + 1}–{inicio + len(visible)} de {total:,} "
+                       f"(página {numero} de {paginas}; {len(df):,} sin filtrar)")
+        else:
+            st.caption(f"Sin coincidencias ({len(df):,} filas sin filtrar)")
+
+    return resultado
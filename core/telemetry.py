@@ -0,0 +1,302 @@
+# core/telemetry.py
+"""
+Tiempos por etapa de cada query y de cada sección, agregados en memoria del proceso.
+
+Etapas:
+    db_espera        turno en el control de admisión + conexión del pool
+    db_plan          EXPLAIN y descripción de columnas previos a un COPY
+    db_ejecucion     ejecución de la query en PostgreSQL (EXECUTE / COPY)
+    fetch            lectura de filas y armado del DataFrame (fetchall o CSV)
+    pandas           función de datos de la sección menos sus etapas de base
+    espera_prefetch  espera del resultado precargado en el modo "todas"
+    serializacion    st.plotly_chart (figura a JSON + envío)
+    figura           resto del render: construcción de figuras y widgets
+    render           render completo de la sección
+
+Cada medición se etiqueta con la sección del contexto de query, la plantilla de la
+query y la cantidad de filas; se guardan las últimas N por clave (ventana móvil) y
+se resumen con p50/p95/p99.
+
+Además se cuentan las queries de cada llamada a la función de datos de una sección:
+si supera el presupuesto declarado en sections/registry.py o repite una misma
+plantilla (posible N+1) se emite un warning, o una excepción con
+SIMA_QUERY_BUDGETS=strict (modo de prueba).
+"""
+import contextvars
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Mediciones guardadas por (sección o plantilla, etapa)
+VENTANA_METRICAS = int(os.getenv("SIMA_METRICS_WINDOW", 500))
+
+ETAPAS_DB = ("db_espera", "db_plan", "db_ejecucion", "fetch")
+
+# Presupuestos de queries: "off", "warn" (log) o "strict" (excepción, para pruebas)
+MODO_PRESUPUESTOS = os.getenv("SIMA_QUERY_BUDGETS", "warn").lower()
+
+# Ejecuciones de una misma plantilla en una llamada a partir de las cuales se avisa
+UMBRAL_REPETICION = int(os.getenv("SIMA_QUERY_REPEAT_WARN", 3))
+
+# Suma de etapas del bloque medido actual (datos o render de una sección)
+_acumulador: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "sima_telemetria_acumulador", default=None
+)
+
+# Conteo de queries del bloque actual (ver contar_queries)
+_conteo: contextvars.ContextVar[Optional["ConteoQueries"]] = contextvars.ContextVar(
+    "sima_telemetria_conteo", default=None
+)
+
+_ESPACIOS = re.compile(r"\s+")
+
+
+def plantilla_de(query: str) -> str:
+    """Etiqueta corta y estable de una plantilla SQL: hash + comienzo del texto"""
+    digest = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+    texto = _ESPACIOS.sub(" ", query).strip()
+    return f"{digest} {texto[:60]}"
+
+
+def _seccion_actual() -> str:
+    from core.query_executor import contexto_actual
+    return contexto_actual().get('seccion') or "-"
+
+
+class MetricasLatencia:
+    """Ventanas móviles de duraciones por sección y por plantilla de query"""
+
+    def __init__(self, ventana: int = VENTANA_METRICAS):
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._por_seccion = defaultdict(lambda: deque(maxlen=self.ventana))
+        self._por_plantilla = defaultdict(lambda: deque(maxlen=self.ventana))
+        self._filas = defaultdict(lambda: deque(maxlen=self.ventana))
+        self._queries = defaultdict(lambda: deque(maxlen=self.ventana))
+
+    def registrar(self, etapa: str, segundos: float, plantilla: Optional[str] = None,
+                  filas: Optional[int] = None, seccion: Optional[str] = None):
+        seccion = seccion or _seccion_actual()
+        with self._lock:
+            self._por_seccion[(seccion, etapa)].append(segundos)
+            if plantilla is not None:
+                self._por_plantilla[(plantilla, etapa)].append(segundos)
+                if filas is not None and etapa == "fetch":
+                    self._filas[plantilla].append(filas)
+
+        acumulado = _acumulador.get()
+        if acumulado is not None:
+            acumulado[etapa] = acumulado.get(etapa, 0.0) + segundos
+
+        conteo = _conteo.get()
+        while conteo is not None:
+            if etapa == "db_ejecucion":
+                conteo.queries += 1
+                conteo.plantillas.append(plantilla)
+            elif etapa == "fetch" and filas:
+                conteo.filas += filas
+            conteo = conteo.padre
+
+    def registrar_queries(self, seccion: str, queries: int):
+        """Queries de una llamada a la función de datos de una sección"""
+        with self._lock:
+            self._queries[seccion].append(queries)
+
+    @staticmethod
+    def _resumir(series: Dict, nombre_clave: str) -> pd.DataFrame:
+        filas = []
+        for (clave, etapa), valores in series.items():
+            if not valores:
+                continue
+            arreglo = np.fromiter(valores, dtype=float)
+            p50, p95, p99 = np.percentile(arreglo, [50, 95, 99])
+            filas.append({
+                nombre_clave: clave, 'etapa': etapa, 'n': len(arreglo),
+                'p50_ms': p50 * 1000, 'p95_ms': p95 * 1000, 'p99_ms': p99 * 1000,
+            })
+        if not filas:
+            return pd.DataFrame(columns=[nombre_clave, 'etapa', 'n', 'p50_ms', 'p95_ms', 'p99_ms'])
+        return pd.DataFrame(filas).sort_values(['p95_ms'], ascending=False, ignore_index=True)
+
+    def resumen_secciones(self) -> pd.DataFrame:
+        with self._lock:
+            series = {k: list(v) for k, v in self._por_seccion.items()}
+        return self._resumir(series, 'seccion')
+
+    def resumen_queries(self) -> pd.DataFrame:
+        with self._lock:
+            series = {k: list(v) for k, v in self._por_plantilla.items()}
+            filas = {k: list(v) for k, v in self._filas.items()}
+        df = self._resumir(series, 'plantilla')
+        if not df.empty:
+            df['filas_promedio'] = df['plantilla'].map(
+                lambda p: float(np.mean(filas[p])) if filas.get(p) else np.nan
+            )
+        return df
+
+    def resumen_queries_secciones(self) -> pd.DataFrame:
+        """Queries por llamada a la función de datos de cada sección, con su presupuesto"""
+        with self._lock:
+            series = {k: list(v) for k, v in self._queries.items()}
+        filas = [{
+            'seccion': seccion, 'n': len(valores),
+            'queries_p50': float(np.percentile(valores, 50)), 'queries_max': max(valores),
+            'presupuesto': presupuesto_de(seccion),
+        } for seccion, valores in series.items() if valores]
+        if not filas:
+            return pd.DataFrame(columns=['seccion', 'n', 'queries_p50', 'queries_max', 'presupuesto'])
+        return pd.DataFrame(filas).sort_values(['queries_max'], ascending=False, ignore_index=True)
+
+    def limpiar(self):
+        with self._lock:
+            self._por_seccion.clear()
+            self._por_plantilla.clear()
+            self._filas.clear()
+            self._queries.clear()
+
+
+# Métricas globales del proceso
+metricas_latencia = MetricasLatencia()
+
+
+class ConteoQueries:
+    """Round trips, filas recibidas y plantillas ejecutadas dentro de un bloque"""
+
+    def __init__(self, padre: Optional["ConteoQueries"] = None):
+        self.queries = 0
+        self.filas = 0
+        self.plantillas: List[Optional[str]] = []
+        self.padre = padre
+
+    def repetidas(self, minimo: int = UMBRAL_REPETICION) -> Dict[str, int]:
+        """Plantillas ejecutadas `minimo` veces o más"""
+        veces: Dict[str, int] = defaultdict(int)
+        for plantilla in self.plantillas:
+            veces[plantilla or "-"] += 1
+        return {p: n for p, n in veces.items() if n >= minimo}
+
+
+class PresupuestoQueriesExcedido(AssertionError):
+    """Una sección hizo más queries de las declaradas o repitió una plantilla (strict)"""
+
+
+def presupuesto_de(seccion: str) -> Optional[int]:
+    """Máximo de queries declarado para la sección en el registro"""
+    from sections.registry import obtener_seccion
+    entrada = obtener_seccion(seccion)
+    return entrada.max_queries if entrada else None
+
+
+def revisar_queries(conteo: ConteoQueries, presupuesto: Optional[int] = None) -> List[str]:
+    """Problemas de una llamada: presupuesto excedido y plantillas repetidas"""
+    problemas = []
+    if presupuesto is not None and conteo.queries > presupuesto:
+        problemas.append(f"{conteo.queries} queries (presupuesto {presupuesto})")
+    for plantilla, veces in conteo.repetidas().items():
+        problemas.append(f"plantilla repetida {veces} veces (posible N+1): {plantilla}")
+    return problemas
+
+
+@contextmanager
+def contar_queries() -> Iterator[ConteoQueries]:
+    """Contar las queries que el ejecutor compartido corre en este contexto (anidable)"""
+    conteo = ConteoQueries(padre=_conteo.get())
+    token = _conteo.set(conteo)
+    try:
+        yield conteo
+    finally:
+        _conteo.reset(token)
+
+
+@contextmanager
+def medir(etapa: str, plantilla: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Medir un bloque; el llamador puede informar info['filas']"""
+    info: Dict[str, Any] = {}
+    inicio = time.perf_counter()
+    try:
+        yield info
+    finally:
+        metricas_latencia.registrar(etapa, time.perf_counter() - inicio,
+                                    plantilla=plantilla, filas=info.get('filas'))
+
+
+@contextmanager
+def _bloque(etapa: str):
+    """Mide un bloque y acumula aparte las etapas internas; devuelve ese detalle"""
+    padre = _acumulador.get()
+    propio: Dict[str, float] = {}
+    token = _acumulador.set(propio)
+    inicio = time.perf_counter()
+    try:
+        yield propio
+    finally:
+        total = time.perf_counter() - inicio
+        _acumulador.reset(token)
+        propio[etapa] = total
+        if padre is not None:
+            for clave, valor in propio.items():
+                padre[clave] = padre.get(clave, 0.0) + valor
+
+
+def _registrar_sin_acumular(etapas: Dict[str, float], seccion: Optional[str] = None):
+    """Registrar etapas derivadas de un bloque (ya sumadas al bloque padre)"""
+    token = _acumulador.set(None)
+    try:
+        for etapa, segundos in etapas.items():
+            metricas_latencia.registrar(etapa, segundos, seccion=seccion)
+    finally:
+        _acumulador.reset(token)
+
+
+def _controlar_presupuesto(conteo: ConteoQueries):
+    if MODO_PRESUPUESTOS == "off":
+        return
+    seccion = _seccion_actual()
+    metricas_latencia.registrar_queries(seccion, conteo.queries)
+    problemas = revisar_queries(conteo, presupuesto_de(seccion))
+    if not problemas:
+        return
+    if MODO_PRESUPUESTOS == "strict":
+        raise PresupuestoQueriesExcedido(f"Sección {seccion}: " + "; ".join(problemas))
+    for problema in problemas:
+        log.warning("⚠️ Sección %s: %s", seccion, problema)
+
+
+@contextmanager
+def medir_datos():
+    """
+    Función de datos de una sección: registra 'datos' y 'pandas' (= datos - base)
+    y controla sus queries contra el presupuesto de la sección
+    """
+    with _bloque("datos") as detalle, contar_queries() as conteo:
+        yield
+    base = sum(detalle.get(e, 0.0) for e in ETAPAS_DB)
+    _registrar_sin_acumular({
+        "datos": detalle["datos"],
+        "pandas": max(0.0, detalle["datos"] - base),
+    })
+    _controlar_presupuesto(conteo)
+
+
+@contextmanager
+def medir_render(seccion: str):
+    """Render completo de una sección: registra 'render' y 'figura' (el resto)"""
+    with _bloque("render") as detalle:
+        yield
+    otros = sum(detalle.get(e, 0.0) for e in ("datos", "espera_prefetch", "serializacion"))
+    _registrar_sin_acumular({
+        "render": detalle["render"],
+        "figura": max(0.0, detalle["render"] - otros),
+    }, seccion=seccion)
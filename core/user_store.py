@@ -0,0 +1,376 @@
+# core/user_store.py
+"""
+Almacenes de usuarios compartidos por todas las sesiones del proceso.
+
+- JsonUserStore: config/users.json (o USERS_CONFIG). Se lee una vez, se recarga solo
+  si cambia el archivo y se reescribe completo de forma atómica.
+- SQLiteUserStore: base SQLite embebida en modo WAL (SIMA_USERS_DB). Búsquedas por
+  clave primaria y actualizaciones por fila; varios procesos de Streamlit pueden
+  compartirla. La primera vez migra el contenido de users.json.
+
+Si users.json no se puede escribir, el cambio en memoria se revierte y se informa con
+st.error, de modo que memoria y disco no divergen.
+
+Ambos exponen la misma interfaz, que es la que usa AuthManager.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import streamlit as st
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Cada cuánto se revisa (stat) si users.json cambió en disco
+INTERVALO_RECARGA_USUARIOS = float(os.getenv("SIMA_USERS_RELOAD_SECONDS", 2))
+
+# Ruta de la base SQLite de usuarios; vacío = usar users.json
+RUTA_DB_USUARIOS = os.getenv("SIMA_USERS_DB", "")
+
+# Columnas propias de la tabla users; el resto de campos va en `extra` (JSON)
+_COLUMNAS_USUARIO = ("password_hash", "role", "name")
+
+
+class JsonUserStore:
+    """
+    Usuarios en un documento JSON. Los intentos fallidos viven en memoria del proceso.
+    """
+
+    def __init__(self, config_file: str):
+        self.config_file = config_file
+        self.lock = threading.RLock()
+        self.users: Dict = {}
+        self._failed_attempts: Dict[str, Tuple[int, datetime]] = {}
+        self._firma: Optional[Tuple[int, int]] = None
+        self._hash: Optional[str] = None
+        self._ultima_revision = 0.0
+
+        # Crear directorio de configuración si no existe (una sola vez por proceso)
+        directorio = os.path.dirname(self.config_file)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._cargar()
+
+    def _firma_archivo(self) -> Optional[Tuple[int, int]]:
+        try:
+            estado = os.stat(self.config_file)
+            return estado.st_mtime_ns, estado.st_size
+        except FileNotFoundError:
+            return None
+
+    def _cargar(self):
+        """Cargar usuarios desde archivo JSON o variables de entorno"""
+        firma = self._firma_archivo()
+        if firma is not None:
+            try:
+                with open(self.config_file, 'rb') as f:
+                    contenido = f.read()
+                digest = hashlib.sha256(contenido).hexdigest()
+                if digest != self._hash:
+                    self.users = json.loads(contenido.decode('utf-8'))
+                    self._hash = digest
+                self._firma = firma
+                return
+            except (json.JSONDecodeError, FileNotFoundError, UnicodeDecodeError):
+                pass
+
+        # Si no existe archivo, cargar desde variables de entorno
+        self._firma = firma
+        users_json = os.getenv('USERS_CONFIG')
+        if users_json and self._hash != 'env':
+            try:
+                self.users = json.loads(users_json)
+                self._hash = 'env'
+            except json.JSONDecodeError:
+                st.error("Error: USERS_CONFIG mal formateado")
+
+    def recargar_si_cambio(self):
+        """Recargar si el archivo cambió en disco (a lo sumo un stat cada INTERVALO)"""
+        ahora = time.monotonic()
+        if ahora - self._ultima_revision < INTERVALO_RECARGA_USUARIOS:
+            return
+        with self.lock:
+            self._ultima_revision = ahora
+            if self._firma_archivo() != self._firma:
+                self._cargar()
+
+    def guardar(self):
+        """Escritura atómica de los usuarios actuales"""
+        with self.lock:
+            contenido = json.dumps(self.users, indent=2, ensure_ascii=False).encode('utf-8')
+            directorio = os.path.dirname(self.config_file) or '.'
+            fd, temporal = tempfile.mkstemp(prefix='.users_', suffix='.json', dir=directorio)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(contenido)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporal, self.config_file)
+            except Exception:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+            self._hash = hashlib.sha256(contenido).hexdigest()
+            self._firma = self._firma_archivo()
+
+    def _persistir(self, deshacer: Callable[[], None]) -> bool:
+        """Guardar; si la escritura falla se deshace el cambio en memoria y se avisa"""
+        try:
+            self.guardar()
+            return True
+        except Exception as e:
+            deshacer()
+            log.error("Error guardando %s: %s", self.config_file, e)
+            st.error(f"Error guardando datos de usuario: {e}")
+            return False
+
+    # --- Usuarios ---
+
+    def hay_usuarios(self) -> bool:
+        return bool(self.users)
+
+    def obtener_usuario(self, username: str) -> Optional[Dict]:
+        with self.lock:
+            usuario = self.users.get(username)
+            return dict(usuario) if usuario is not None else None
+
+    def listar_usuarios(self) -> Dict[str, Dict]:
+        with self.lock:
+            return {username: dict(datos) for username, datos in self.users.items()}
+
+    def crear_usuario(self, username: str, datos: Dict) -> bool:
+        with self.lock:
+            if username in self.users:
+                return False
+            self.users[username] = dict(datos)
+            return self._persistir(lambda: self.users.pop(username, None))
+
+    def actualizar_usuario(self, username: str, campos: Dict, quitar: Iterable[str] = (),
+                           si_hash: Optional[str] = None) -> bool:
+        """
+        Actualizar campos de un usuario. Con `si_hash` solo se actualiza si el hash
+        guardado sigue siendo ese (para el rehash tras un login).
+        """
+        with self.lock:
+            usuario = self.users.get(username)
+            if usuario is None or (si_hash is not None and usuario.get("password_hash") != si_hash):
+                return False
+            actualizado = dict(usuario)
+            actualizado.update(campos)
+            for campo in quitar:
+                actualizado.pop(campo, None)
+            self.users[username] = actualizado
+            return self._persistir(lambda: self.users.__setitem__(username, usuario))
+
+    def eliminar_usuario(self, username: str) -> bool:
+        with self.lock:
+            usuario = self.users.pop(username, None)
+            if usuario is None:
+                return False
+            return self._persistir(lambda: self.users.__setitem__(username, usuario))
+
+    # --- Límite de intentos ---
+
+    def intentos_fallidos(self, username: str) -> Optional[Tuple[int, datetime]]:
+        with self.lock:
+            return self._failed_attempts.get(username)
+
+    def registrar_intento_fallido(self, username: str):
+        with self.lock:
+            intentos, _ = self._failed_attempts.get(username, (0, None))
+            self._failed_attempts[username] = (intentos + 1, datetime.now())
+
+    def limpiar_intentos_fallidos(self, username: str):
+        with self.lock:
+            self._failed_attempts.pop(username, None)
+
+
+class SQLiteUserStore:
+    """
+    Usuarios e intentos fallidos en SQLite (WAL). Una sola conexión por proceso,
+    usada de a un hilo por vez; cada operación es una transacción corta sobre una fila.
+    """
+
+    ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        username      TEXT PRIMARY KEY,
+        password_hash TEXT NOT NULL,
+        role          TEXT NOT NULL,
+        name          TEXT,
+        extra         TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE TABLE IF NOT EXISTS failed_attempts (
+        username     TEXT PRIMARY KEY,
+        attempts     INTEGER NOT NULL,
+        last_attempt REAL NOT NULL
+    );
+    """
+
+    def __init__(self, ruta_db: str, config_file: Optional[str] = None):
+        self.ruta_db = ruta_db
+
+        directorio = os.path.dirname(ruta_db)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        # Las operaciones duran microsegundos: una conexión compartida alcanza y no
+        # deja conexiones abiertas por cada hilo de script que pasa por el store
+        self._con = sqlite3.connect(ruta_db, timeout=10, isolation_level=None,
+                                    check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("PRAGMA busy_timeout=10000")
+        self._con.row_factory = sqlite3.Row
+        self._lock_conexion = threading.RLock()
+
+        with self._conexion() as con:
+            con.executescript(self.ESQUEMA)
+
+        if config_file:
+            self.migrar_desde_json(config_file)
+
+    def _conexion(self) -> "_Transaccion":
+        """La conexión compartida, tomada en exclusiva durante el bloque `with`"""
+        return _Transaccion(self._con, self._lock_conexion)
+
+    @staticmethod
+    def _a_fila(datos: Dict) -> Tuple[str, str, Optional[str], str]:
+        extra = {k: v for k, v in datos.items() if k not in _COLUMNAS_USUARIO}
+        return datos["password_hash"], datos.get("role", "viewer"), datos.get("name"), \
+            json.dumps(extra, ensure_ascii=False)
+
+    @staticmethod
+    def _de_fila(fila: sqlite3.Row) -> Dict:
+        datos = json.loads(fila["extra"] or "{}")
+        datos.update(password_hash=fila["password_hash"], role=fila["role"], name=fila["name"])
+        return datos
+
+    def migrar_desde_json(self, config_file: str) -> int:
+        """Migración única: copiar users.json si la tabla de usuarios está vacía"""
+        with self._conexion() as con:
+            if con.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return 0
+        usuarios = JsonUserStore(config_file).listar_usuarios()
+        if not usuarios:
+            return 0
+        with self._conexion() as con:
+            con.executemany(
+                "INSERT OR IGNORE INTO users (username, password_hash, role, name, extra) VALUES (?, ?, ?, ?, ?)",
+                [(username, *self._a_fila(datos)) for username, datos in usuarios.items()]
+            )
+        log.info("✅ %s usuarios migrados de %s a %s", len(usuarios), config_file, self.ruta_db)
+        return len(usuarios)
+
+    def recargar_si_cambio(self):
+        """Sin caché en memoria: cada lectura consulta la base"""
+
+    # --- Usuarios ---
+
+    def hay_usuarios(self) -> bool:
+        with self._conexion() as con:
+            return con.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None
+
+    def obtener_usuario(self, username: str) -> Optional[Dict]:
+        with self._conexion() as con:
+            fila = con.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return self._de_fila(fila) if fila else None
+
+    def listar_usuarios(self) -> Dict[str, Dict]:
+        with self._conexion() as con:
+            filas = con.execute("SELECT * FROM users ORDER BY username").fetchall()
+        return {fila["username"]: self._de_fila(fila) for fila in filas}
+
+    def crear_usuario(self, username: str, datos: Dict) -> bool:
+        with self._conexion() as con:
+            cursor = con.execute(
+                "INSERT OR IGNORE INTO users (username, password_hash, role, name, extra) VALUES (?, ?, ?, ?, ?)",
+                (username, *self._a_fila(datos))
+            )
+            return cursor.rowcount == 1
+
+    def actualizar_usuario(self, username: str, campos: Dict, quitar: Iterable[str] = (),
+                           si_hash: Optional[str] = None) -> bool:
+        """Actualización de una fila (leer-modificar-escribir en una transacción IMMEDIATE)"""
+        with self._conexion() as con:
+            con.execute("BEGIN IMMEDIATE")
+            fila = con.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+            if fila is None or (si_hash is not None and fila["password_hash"] != si_hash):
+                return False
+            datos = self._de_fila(fila)
+            datos.update(campos)
+            for campo in quitar:
+                datos.pop(campo, None)
+            con.execute(
+                "UPDATE users SET password_hash = ?, role = ?, name = ?, extra = ? WHERE username = ?",
+                (*self._a_fila(datos), username)
+            )
+            return True
+
+    def eliminar_usuario(self, username: str) -> bool:
+        with self._conexion() as con:
+            return con.execute("DELETE FROM users WHERE username = ?", (username,)).rowcount == 1
+
+    # --- Límite de intentos (compartido entre procesos) ---
+
+    def intentos_fallidos(self, username: str) -> Optional[Tuple[int, datetime]]:
+        with self._conexion() as con:
+            fila = con.execute("SELECT attempts, last_attempt FROM failed_attempts WHERE username = ?",
+                               (username,)).fetchone()
+        return (fila["attempts"], datetime.fromtimestamp(fila["last_attempt"])) if fila else None
+
+    def registrar_intento_fallido(self, username: str):
+        with self._conexion() as con:
+            con.execute(
+                "INSERT INTO failed_attempts (username, attempts, last_attempt) VALUES (?, 1, ?) "
+                "ON CONFLICT(username) DO UPDATE SET attempts = attempts + 1, last_attempt = excluded.last_attempt",
+                (username, time.time())
+            )
+
+    def limpiar_intentos_fallidos(self, username: str):
+        with self._conexion() as con:
+            con.execute("DELETE FROM failed_attempts WHERE username = ?", (username,))
+
+
+class _Transaccion:
+    """
+    Contexto que toma la conexión compartida y, al salir, confirma o revierte la
+    transacción abierta (si la hay) antes de liberarla
+    """
+
+    def __init__(self, conexion: sqlite3.Connection, lock: threading.RLock):
+        self.conexion = conexion
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        return self.conexion
+
+    def __exit__(self, tipo, valor, traza):
+        try:
+            if self.conexion.in_transaction:
+                if tipo is None:
+                    self.conexion.execute("COMMIT")
+                else:
+                    self.conexion.execute("ROLLBACK")
+        finally:
+            self.lock.release()
+        return False
+
+
+@st.cache_resource(show_spinner=False)
+def obtener_user_store(config_file: str):
+    """
+    Un store por archivo de configuración en todo el proceso: SQLite si está
+    definido SIMA_USERS_DB (migrando users.json la primera vez), si no JSON.
+    """
+    if RUTA_DB_USUARIOS:
+        return SQLiteUserStore(RUTA_DB_USUARIOS, config_file=config_file)
+    return JsonUserStore(config_file)
@@ -4,9 +4,11 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
 from utils import get_query
+from core.memory import contabilizar
 
 #%% Carga de Base de Datos
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=3600, max_entries=1)
+@contabilizar("cargar_usuarios_completo")
 def cargar_usuarios_completo():
     # Cargar las tablas desde los archivos
     # usuarios_por_dia = pd.read_parquet('app/tables/temp_usuarios_por_dia.parquet')
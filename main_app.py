@@ -19,8 +19,9 @@ import os
 from core.auth import AuthManager
 from core.data_loader import DataLoader
 from core.filters import FilterManager
-from sections.coctel_sections import CoctelSections
-from function_users import usarios_acontecimientos_dashboard
+from core.profiler import ejecutar_perfilado
+# Registro liviano: coctel_sections (plotly) y los gráficos se importan al dibujar
+from sections.registry import SECCIONES, clase_secciones
 
 class DashboardApp:
     """Aplicación principal del dashboard con todas las secciones migradas"""
@@ -41,6 +42,12 @@ class DashboardApp:
             user = self.auth_manager.get_current_user()
             if user:
                 st.success(f"👤 Bienvenido, {user['name']} ({user['role']})")
+        
+        with col3:
+            # Panel de administración (usuarios y métricas de rendimiento)
+            if user and user['role'] == 'admin':
+                if st.button("⚙️ Administración", type="secondary"):
+                    st.session_state["show_admin_panel"] = True
                 
         with col4:
             # Botón de logout
@@ -178,7 +185,7 @@ class DashboardApp:
             st.stop()
         
         # Crear secciones
-        sections = CoctelSections(data_tuple, filter_manager)
+        sections = clase_secciones()(data_tuple, filter_manager)
         
         # ============================================
         # SELECTOR DE SECCIÓN EN EL HEADER
@@ -186,39 +193,8 @@ class DashboardApp:
         st.markdown("### 📊 Seleccionar Análisis")
         
         # Diccionario de secciones disponibles
-        secciones_disponibles = {
-            "📋 Ver Todas las Secciones (Scroll)": "all",
-            "SN. Proporción de cocteles en lugar y fecha específica": "sn",
-            "1. Proporción de cocteles en lugar, fuentes y fechas específicas": "1",
-            "2. Posición por fuente en lugar y fecha específica": "2",
-            "3. Gráfico semanal por porcentaje de cocteles": "3",
-            "4. Tendencia A Favor vs En Contra": "4",
-            "5. Gráfico Acumulativo": "5",
-            "TOP 3. Mejores lugares": "top3",
-            "6. Top 3 mejores radios, redes, tv": "6",
-            "7. Crecimiento por Macroregión": "7",
-            "8. Gráfico de barras contando posiciones": "8",
-            "9. Gráfico de dona - porcentaje de posiciones": "9",
-            "10. Porcentaje de acontecimientos con coctel": "10",
-            "11. Cantidad de cocteles por fuente y lugar": "11",
-            "12. Medios que Generan Coctel": "12",
-            "13. Conteo mensual de coctel utilizado": "13",
-            "14. Notas A Favor, Neutral, En Contra": "14",
-            "15. Proporción de Mensajes por Posición": "15",
-            "16. Mensajes por Tema": "16",
-            "17. Proporción por Tema": "17",
-            "18. Tendencia por medio": "18",
-            "19. Notas por Tiempo y Posición": "19",
-            "20. Actores y Posiciones": "20",
-            "21. Porcentaje de cóctel por medios": "21",
-            "22. Últimos 3 Meses": "22",
-            "23. Evolución mensual (Radio, Redes, TV)": "23",
-            "24. Mensajes Fuerza": "24",
-            "25. Impactos por programa": "25",
-            "26. Distribución por medio": "26",
-            "27. A Favor vs En Contra (Mensual)": "27",
-            "28. Registros creados por usuarios (Mensual)": "28",
-        }
+        secciones_disponibles = {"📋 Ver Todas las Secciones (Scroll)": "all"}
+        secciones_disponibles.update({seccion.titulo: seccion.codigo for seccion in SECCIONES})
         
         # Selectbox para elegir la sección
         seccion_seleccionada = st.selectbox(
@@ -253,7 +229,8 @@ class DashboardApp:
             
             **📊 Selección de Análisis:**
             - Usa el selector arriba para elegir un análisis específico
-            - O selecciona "Ver Todas las Secciones" para scroll continuo (más lento)
+            - O selecciona "Ver Todas las Secciones" para scroll continuo; con
+              "Carga diferida" cada sección se consulta recién al abrirla
             
             **⚡ Consejo de Rendimiento:**
             - Seleccionar análisis individuales carga **mucho más rápido**
@@ -267,7 +244,7 @@ class DashboardApp:
         # ============================================
         
         if codigo_seccion == "all":
-            # Renderizar todas las secciones (comportamiento original)
+            # Renderizar todas las secciones (las cerradas no consultan en modo diferido)
             with st.spinner("⏳ Cargando todas las secciones... esto puede tomar un momento"):
                 sections.render_all_sections(global_filters)
         else:
@@ -348,6 +325,7 @@ class DashboardApp:
         st.info("📋 Esta sección mantiene la funcionalidad original sin modificaciones")
         
         # Ejecutar dashboard original de usuarios
+        from function_users import usarios_acontecimientos_dashboard
         usarios_acontecimientos_dashboard()
     
     def run(self):
@@ -365,6 +343,9 @@ class DashboardApp:
         # Mostrar fecha de actualización
         self.show_last_update()
         
+        # Panel de administración (solo si un admin lo abrió)
+        self.auth_manager.render_admin_panel()
+        
         # Menú de navegación principal
         st.sidebar.title("🧭 Navegación Principal")
         menu = st.sidebar.radio(
@@ -391,8 +372,6 @@ if __name__ == "__main__":
     except ImportError:
         pass  # Si no está disponible python-dotenv, continuar sin cargar .env
     
-    print("=" * 50)
-    
-    # Ejecutar aplicación
+    # Ejecutar aplicación (bajo cProfile/tracemalloc si un admin pidió perfilar este rerun)
     app = DashboardApp()
-    app.run()
\ No newline at end of file
+    ejecutar_perfilado(app.run)
\ No newline at end of file
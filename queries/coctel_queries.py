@@ -3,6 +3,8 @@ from sqlalchemy.sql import text
 
 queries = {
     # Queries de cocteles
+    # Solo ids de dimensiones; las etiquetas se agregan en DataLoader (core/dimensions.py).
+    # Los ids se toman de las tablas puente; un id sin fila en su dimensión queda sin etiqueta (NaN)
     "coctel_completo": {
         "read": text("""
         SELECT
@@ -11,20 +13,71 @@ queries = {
             a.acontecimiento,
             a.coctel,
             a.id_posicion,
+            a.id_lugar,
+            p.color AS color,
+            pr.id_fuente AS id_fuente,
+            pr.id_canal AS id_canal,
+            pr.id AS id_programa,
+            aa.id_actor AS id_actor,
+            fb.num_reacciones,
+            fb.num_comentarios,
+            fb.num_compartidos,
+            fb.fecha AS fecha_post,
+            fb.id_facebook_page AS id_facebook_page,
+            at.id_tema AS id_tema,
+            a.id_nota AS id_mensaje_fuerza
+        FROM
+            acontecimientos a
+        JOIN
+            lugares l ON a.id_lugar = l.id
+        JOIN
+            posiciones p ON a.id_posicion = p.id
+        LEFT JOIN
+            acontecimiento_programa ap ON a.id = ap.id_acontecimiento
+        LEFT JOIN
+            programas pr ON ap.id_programa = pr.id
+        LEFT JOIN
+            acontecimiento_actor aa ON a.id = aa.id_acontecimiento
+        LEFT JOIN
+            acontecimiento_facebook_post afb ON a.id = afb.id_acontecimiento
+        LEFT JOIN
+            facebook_posts fb ON afb.id_facebook_post = fb.id
+        LEFT JOIN
+            acontecimiento_tema at ON a.id = at.id_acontecimiento
+        WHERE
+            a.fecha_registro >= NOW() - INTERVAL '3 months';
+        """)
+    },
+    # Mismas filas y columnas con las etiquetas desde SQL: respaldo de DataLoader si
+    # una tabla de dimensión no se puede cargar
+    "coctel_completo_etiquetas": {
+        "read": text("""
+        SELECT
+            a.id AS id,
+            a.fecha_registro,
+            a.acontecimiento,
+            a.coctel,
+            a.id_posicion,
+            a.id_lugar,
             l.nombre AS lugar,
             p.color AS color,
             pr.id_fuente AS id_fuente,
             f.nombre AS fuente_nombre,
             pr.id_canal AS id_canal,
+            pr.id AS id_programa,
             pr.nombre AS programa_nombre,
             c.nombre AS canal_nombre,
+            aa.id_actor AS id_actor,
             ac.nombre AS nombre,
             fb.num_reacciones,
             fb.num_comentarios,
             fb.num_compartidos,
             fb.fecha AS fecha_post,
+            fb.id_facebook_page AS id_facebook_page,
             fbp.nombre AS nombre_facebook_page,
+            at.id_tema AS id_tema,
             t.descripcion AS descripcion,
+            a.id_nota AS id_mensaje_fuerza,
             mf.mensaje AS mensaje_fuerza
         FROM
             acontecimientos a
@@ -6,7 +6,6 @@ import plotly.express as px
 import plotly.graph_objects as go
 import sys
 import os
-from sections.functions.sn import data_section_sn_proporcion_simple_sql
 
 
 # Agregar el directorio raíz al path
@@ -14,9 +13,36 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.analytics import AnalyticsEngine
 from core.filters import FilterManager
+from core.query_executor import query_context, contexto_actual, PRIORIDAD_INTERACTIVA, PRIORIDAD_TODAS
+from core.telemetry import medir_datos, medir_render
+from core.figure_cache import plotly_chart_cacheado, mostrar_figura
+from core.tables import render_tabla_paginada
+from core.downloads import render_descarga
+from sections.registry import (SECCIONES, SECCIONES_POR_CODIGO, ORDEN_SECCIONES,
+                               FIRMA_FILTROS_MOSTRAR, FIRMA_FILTROS, ContextoArgumentos)
 from config.constants import *
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Callable
 from datetime import datetime, timedelta
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
+# Modo "todas" con secciones cerradas que se cargan al abrirlas
+MODO_DIFERIDO_TODAS = os.getenv("SIMA_LAZY_ALL", "1") != "0"
+
+
+@st.fragment
+def _render_fragmento(codigo: str, render: Callable[[], None]):
+    """
+    Sección aislada como fragmento: un cambio en sus widgets locales vuelve a
+    ejecutar solo esta sección. Los filtros globales del sidebar siguen
+    provocando un rerun completo.
+    """
+    # En un rerun del fragmento no hay contexto exterior: es una interacción directa
+    prioridad = contexto_actual().get('prioridad', PRIORIDAD_INTERACTIVA)
+    with query_context(prioridad=prioridad, seccion=codigo), medir_render(codigo):
+        render()
+
 
 class CoctelSections:
     """Todas las secciones del dashboard de cocteles migradas"""
@@ -29,132 +55,128 @@ class CoctelSections:
         
         self.filter_manager = filter_manager
         self.analytics = AnalyticsEngine()
+        self._prefetcher = None
+        self._cache_sesion = None
         
+    # Orden de las secciones en el modo "Ver Todas las Secciones" (sections/registry.py)
+    ORDEN_SECCIONES = ORDEN_SECCIONES
+    
+    def _datos(self, funcion, *args, **kwargs):
+        """
+        Datos de una sección: guardados en la sesión (modo diferido), precargados
+        en el modo "todas" o ejecutados en el momento
+        """
+        def calcular():
+            if self._prefetcher is not None:
+                return self._prefetcher.obtener(funcion, *args, **kwargs)
+            with medir_datos():
+                return funcion(*args, **kwargs)
+        
+        if self._cache_sesion is not None:
+            return self._cache_sesion.obtener(funcion, calcular, *args, **kwargs)
+        return calcular()
+    
+    def _mapa_secciones(self, global_filters: Dict[str, Any], mostrar_todos: bool) -> Dict[str, Any]:
+        """Mapeo de códigos de sección a su método de render (según el registro)"""
+        def render(entrada):
+            metodo = getattr(self, entrada.metodo)
+            if entrada.firma == FIRMA_FILTROS_MOSTRAR:
+                return lambda: metodo(global_filters, mostrar_todos)
+            if entrada.firma == FIRMA_FILTROS:
+                return lambda: metodo(global_filters)
+            return metodo
+        
+        return {entrada.codigo: render(entrada) for entrada in SECCIONES}
+    
+    def _datos_seccion(self, codigo: str, global_filters: Dict[str, Any] = None):
+        """
+        Datos de una sección con los argumentos de su constructor en el registro,
+        leídos de sus widgets ya dibujados: los mismos que pide la precarga
+        """
+        entrada = SECCIONES_POR_CODIGO[codigo]
+        args, kwargs = entrada.construir_argumentos(ContextoArgumentos(self, global_filters))
+        return self._datos(entrada.cargar_funcion_datos(), *args, **kwargs)
+    
+    def _solicitudes_prefetch(self, global_filters: Dict[str, Any], secciones=None):
+        """
+        Fase 1 del modo "todas": función y parámetros de datos de cada sección, con
+        el mismo constructor de argumentos que usa la sección al dibujarse
+        (sections/registry.py). Solo se importan los módulos de datos de `secciones`
+        (todas si es None).
+        """
+        contexto = ContextoArgumentos(self, global_filters)
+        solicitudes = []
+        for entrada in SECCIONES:
+            if secciones is None or entrada.codigo in secciones:
+                args, kwargs = entrada.construir_argumentos(contexto)
+                solicitudes.append((entrada.codigo, entrada.cargar_funcion_datos(), args, kwargs))
+        return solicitudes
+    
     def render_all_sections(self, global_filters: Dict[str, Any]):
-        """Renderizar todas las secciones en orden secuencial (scroll down)"""
-        
-        # Checkbox global para mostrar valores
-        mostrar_todos = st.checkbox("Mostrar todos los porcentajes en gráficos", value=True, key="global_mostrar")
-        
-        st.markdown("---")
-        
-        # SECCIÓN SN - Proporción básica de cocteles
-        self.section_sn_proporcion_basica(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 1 - Proporción combinada
-        self.section_1_proporcion_combinada(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 2 - Posición por fuente
-        self.section_2_posicion_por_fuente(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 3 - Tendencia semanal
-        self.section_3_tendencia_semanal(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 4 - Tendencia a favor vs en contra
-        self.section_4_favor_vs_contra(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 5 - Gráfico acumulativo
-        self.section_5_grafico_acumulativo(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN TOP 3 - Mejores lugares
-        self.section_top3_mejores_lugares(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 6 - Top medios
-        self.section_6_top_medios(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 7 - Crecimiento por macroregión
-        self.section_7_macroregion(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 8 - Conteo de posiciones
-        self.section_8_conteo_posiciones(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 9 - Distribución de posiciones (dona)
-        self.section_9_distribucion_posiciones(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 10 - Eventos con coctel
-        self.section_10_eventos_coctel(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 11 - Cocteles por fuente y lugar
-        self.section_11_cocteles_fuente_lugar(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 12 - Medios que generan coctel
-        self.section_12_medios_generan_coctel(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 13 - Conteo mensual
-        self.section_13_conteo_mensual(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 14 - Notas a favor, neutral, en contra
-        self.section_14_notas_favor_contra(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 15 - Proporción de mensajes por posición
-        self.section_15_proporcion_mensajes(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 16 - Mensajes por tema
-        self.section_16_mensajes_por_tema(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 17 - Proporción por tema
-        self.section_17_proporcion_por_tema(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 18 - Tendencia por medio
-        self.section_18_tendencia_por_medio(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 19 - Notas por tiempo y posición
-        self.section_19_notas_tiempo_posicion(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 20 - Actores y posiciones
-        self.section_20_actores_posiciones(global_filters)
-        st.markdown("---")
-        
-        # SECCIÓN 21 - Porcentaje de cóctel por medios
-        self.section_21_porcentaje_medios(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 22 - Últimos 3 meses
-        self.section_22_ultimos_3_meses(global_filters, mostrar_todos)
-        st.markdown("---")
-        
-        # SECCIÓN 23 - Evolución mensual
-        self.section_23_evolucion_mensual(global_filters, mostrar_todos)
-        st.markdown("---")
+        """
+        Renderizar todas las secciones (scroll down) en dos fases:
+        1. Se lanzan en paralelo las queries de todas las secciones (pool acotado).
+        2. Cada sección se dibuja en su lugar apenas llegan sus datos; mientras tanto
+           se muestra un marcador de carga.
         
-        # SECCIÓN 24 - Mensajes fuerza
-        self.section_24_mensajes_fuerza(global_filters, mostrar_todos)
-        st.markdown("---")
+        En modo diferido cada sección empieza cerrada y solo consulta y dibuja al
+        abrirla; lo ya abierto queda guardado en la sesión (CacheSesion).
+        """
+        from core.prefetch import DataPrefetcher, CacheSesion
         
-        # SECCIÓN 25 - Impactos por programa
-        self.section_25_impactos_programa(global_filters)
-        st.markdown("---")
+        # Las queries del modo "todas" ceden el paso a las secciones interactivas
+        with query_context(prioridad=PRIORIDAD_TODAS):
         
-        # SECCIÓN 26 - Distribución por medio
-        self.section_26_distribucion_medio(global_filters)
-        st.markdown("---")
+            # Checkbox global para mostrar valores
+            mostrar_todos = st.checkbox("Mostrar todos los porcentajes en gráficos", value=True, key="global_mostrar")
+            diferido = st.toggle("Carga diferida (abrir cada sección a demanda)",
+                                 value=MODO_DIFERIDO_TODAS, key="modo_diferido_todas")
         
-        # SECCIÓN 27 - A favor vs en contra mensual
-        self.section_27_favor_contra_mensual(global_filters)
-
-        # SECCIÓN 28 - Registros creados por usuarios
-        self.section_28_registros_usuarios()
+            st.markdown("---")
+            
+            # Contenedores en el orden de la página, con marcador mientras cargan
+            contenedores = {}
+            marcadores = {}
+            abiertas = []
+            for i, codigo in enumerate(self.ORDEN_SECCIONES):
+                if i > 0:
+                    st.markdown("---")
+                contenedores[codigo] = st.container()
+                with contenedores[codigo]:
+                    if diferido and not st.toggle(f"📂 {SECCIONES_POR_CODIGO[codigo].titulo}",
+                                                  key=f"abrir_seccion_{codigo}"):
+                        continue
+                    abiertas.append(codigo)
+                    marcadores[codigo] = st.empty()
+                    marcadores[codigo].info(f"⏳ Cargando sección {codigo}...")
+            
+            if not abiertas:
+                return
+            
+            self._cache_sesion = CacheSesion() if diferido else None
+            
+            # Fase 1: lanzar las solicitudes de datos de las secciones abiertas
+            self._prefetcher = DataPrefetcher()
+            try:
+                try:
+                    solicitudes = self._solicitudes_prefetch(global_filters, secciones=set(abiertas))
+                except Exception as e:
+                    log.warning("⚠️ No se pudieron precargar las secciones: %s", e)
+                    solicitudes = []
+                for codigo, funcion, args, kwargs in solicitudes:
+                    if self._cache_sesion is not None and self._cache_sesion.contiene(funcion, *args, **kwargs):
+                        continue
+                    self._prefetcher.enviar(codigo, funcion, *args, **kwargs)
+                
+                # Fase 2: dibujar cada sección a medida que sus datos están listos
+                mapa = self._mapa_secciones(global_filters, mostrar_todos)
+                for codigo in self._prefetcher.secciones_listas(abiertas):
+                    marcadores[codigo].empty()
+                    with contenedores[codigo]:
+                        _render_fragmento(codigo, mapa[codigo])
+            finally:
+                self._prefetcher.cerrar()
+                self._prefetcher = None
         
         
     # =====================================================
@@ -163,6 +185,7 @@ class CoctelSections:
     
     def section_sn_proporcion_basica(self, global_filters: Dict[str, Any], mostrar_todos: bool):
       """SN.- Proporción de cocteles en lugar y fecha específica"""
+      
       st.subheader("SN.- Proporción de cocteles en lugar y fecha específica")
   
       fecha_inicio, fecha_fin = self.filter_manager.get_section_dates("sn", global_filters)
@@ -174,9 +197,7 @@ class CoctelSections:
   
       # Obtener datos de la base de datos usando la nueva función
       try:
-          resultado_radio, resultado_tv, resultado_redes_sociales = data_section_sn_proporcion_simple_sql(
-              fecha_inicio, fecha_fin, option_lugar
-          )
+          resultado_radio, resultado_tv, resultado_redes_sociales = self._datos_seccion("sn", global_filters)
           
           # Verificar si se obtuvieron datos válidos
           datos_disponibles = (
@@ -254,7 +275,7 @@ class CoctelSections:
               
       except Exception as e:
           st.error(f"Error al obtener los datos: {e}")
-          print(f"Error en section_sn_proporcion_basica: {e}")
+          log.error("Error en section_sn_proporcion_basica: %s", e)
           
           # Fallback al código anterior si hay problemas con la nueva función
           st.info("Intentando con método alternativo...")
@@ -364,7 +385,7 @@ class CoctelSections:
               st.warning("No hay datos para mostrar")
     
     def section_1_proporcion_combinada(self, global_filters: Dict[str, Any], mostrar_todos: bool):
-       from sections.functions.grafico1 import data_section_1_proporcion_combinada_sql, convertir_a_formato_streamlit
+       from sections.functions.grafico1 import convertir_a_formato_streamlit
        
        """1.- Proporción de cocteles en lugar, fuentes y fechas específicas"""
        st.subheader("1.- Proporción de cocteles en lugar, fuentes y fechas específicas")
@@ -381,12 +402,7 @@ class CoctelSections:
        st.write(f"Proporción de cocteles en {', '.join(option_lugares)} entre {fecha_inicio.strftime('%d.%m.%Y')} y {fecha_fin.strftime('%d.%m.%Y')}")
        
        # Usar tu función SQL
-       resultado = data_section_1_proporcion_combinada_sql(
-           fecha_inicio.strftime('%Y-%m-%d'),
-           fecha_fin.strftime('%Y-%m-%d'),
-           option_lugares,
-           option_fuente
-       )  
+       resultado = self._datos_seccion("1", global_filters)  
        
        if not resultado.empty:
            df_resultado = convertir_a_formato_streamlit(resultado)
@@ -396,7 +412,7 @@ class CoctelSections:
    
     def section_8_conteo_posiciones(self, global_filters: Dict[str, Any], mostrar_todos: bool):
      """8.- Gráfico de barras contando posiciones"""
-     from sections.functions.grafico8 import data_section_8_conteo_posiciones_sql, convertir_posicion_a_nombre
+     from sections.functions.grafico8 import convertir_posicion_a_nombre
      
      st.subheader("8.- Gráfico de barras contando posiciones en lugar y fecha específica")
      
@@ -417,13 +433,7 @@ class CoctelSections:
          option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s8")
      
      # Usar la nueva función SQL
-     conteo_data = data_section_8_conteo_posiciones_sql(
-         fecha_inicio.strftime('%Y-%m-%d'),
-         fecha_fin.strftime('%Y-%m-%d'),
-         option_lugar,
-         option_fuente,
-         option_nota
-     )
+     conteo_data = self._datos_seccion("8", global_filters)
      
      if not conteo_data.empty:
          # Convertir posiciones a nombres si es necesario
@@ -461,7 +471,7 @@ class CoctelSections:
              legend_title='Tipo de Medio'
          )
          
-         st.plotly_chart(fig, use_container_width=True)
+         mostrar_figura(fig, use_container_width=True)
          
          # Mostrar mensaje descriptivo
          st.write(f"Gráfico de barras contando posiciones en {option_lugar} entre {fecha_inicio.strftime('%Y-%m-%d')} y {fecha_fin.strftime('%Y-%m-%d')}")
@@ -521,7 +531,7 @@ class CoctelSections:
                     legend_title='Tipo de Medio'
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                mostrar_figura(fig, use_container_width=True)
             else:
                 st.warning("No hay datos para mostrar")
         else:
@@ -570,7 +580,7 @@ class CoctelSections:
                     hole=0.3
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                mostrar_figura(fig, use_container_width=True)
             else:
                 st.warning("No hay datos para mostrar")
         else:
@@ -578,7 +588,7 @@ class CoctelSections:
     '''
     def section_9_distribucion_posiciones(self, global_filters: Dict[str, Any], mostrar_todos: bool):
      """9.- Gráfico de dona que representa el porcentaje de posiciones"""
-     from sections.functions.grafico9 import data_section_9_distribucion_posiciones_sql, convertir_posicion_a_nombre
+     from sections.functions.grafico9 import convertir_posicion_a_nombre
      
      st.subheader("9.- Gráfico de dona que representa el porcentaje de posiciones en lugar y fecha específica")
      
@@ -593,13 +603,7 @@ class CoctelSections:
      option_lugares = self.filter_manager.get_section_locations("s9", global_filters, multi=True)
      
      # Usar la nueva función SQL
-     distrib_data = data_section_9_distribucion_posiciones_sql(
-         fecha_inicio.strftime('%Y-%m-%d'),
-         fecha_fin.strftime('%Y-%m-%d'),
-         option_lugares,
-         option_fuente,
-         option_nota
-     )
+     distrib_data = self._datos_seccion("9", global_filters)
      
      if not distrib_data.empty:
          # Convertir posiciones a nombres si es necesario
@@ -624,7 +628,7 @@ class CoctelSections:
              hole=0.3
          )
          
-         st.plotly_chart(fig, use_container_width=True)
+         mostrar_figura(fig, use_container_width=True)
          
      else:
          st.warning("No hay datos para mostrar")
@@ -632,7 +636,7 @@ class CoctelSections:
      
     def section_10_eventos_coctel(self, global_filters: Dict[str, Any], mostrar_todos: bool):
       """10.- Porcentaje de acontecimientos con coctel"""
-      from sections.functions.grafico10 import data_section_10_eventos_coctel_sql, convertir_a_formato_grafico
+      from sections.functions.grafico10 import convertir_a_formato_grafico
       
       st.subheader("10.- Porcentaje de acontecimientos con coctel en lugar y fecha específica")
       
@@ -642,11 +646,7 @@ class CoctelSections:
       option_lugares = self.filter_manager.get_section_locations("s10", global_filters, multi=True)
       
       # Usar la nueva función SQL
-      resultado_sql = data_section_10_eventos_coctel_sql(
-          fecha_inicio.strftime('%Y-%m-%d'),
-          fecha_fin.strftime('%Y-%m-%d'),
-          option_lugares
-      )
+      resultado_sql = self._datos_seccion("10", global_filters)
       
       if not resultado_sql.empty:
           # Filtrar por fuente si no es "Todos"
@@ -688,7 +688,7 @@ class CoctelSections:
                   textinfo='label+percent' if mostrar_todos else 'label'
               )
               
-              st.plotly_chart(fig, use_container_width=True)
+              mostrar_figura(fig, use_container_width=True)
               
               # Mostrar tabla de datos (opcional)
               '''
@@ -742,7 +742,7 @@ class CoctelSections:
                     textinfo='label+percent' if mostrar_todos else 'label'
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                mostrar_figura(fig, use_container_width=True)
             else:
                 st.warning("No hay datos para mostrar")
         else:
@@ -751,7 +751,6 @@ class CoctelSections:
 
     def section_11_cocteles_fuente_lugar(self, global_filters: Dict[str, Any]):
       """11.- Cantidad de cocteles por fuente y lugar"""
-      from sections.functions.grafico11 import data_section_11_conteo_integrado_sql
       
       st.subheader("11.- Cantidad de cocteles por fuente y lugar en fecha específica")
       
@@ -760,11 +759,7 @@ class CoctelSections:
       
       # Usar la nueva función SQL de grafico11
       try:
-          resultado = data_section_11_conteo_integrado_sql(
-              fecha_inicio.strftime('%Y-%m-%d'),
-              fecha_fin.strftime('%Y-%m-%d'),
-              option_lugares
-          )
+          resultado = self._datos_seccion("11", global_filters)
       except Exception as e:
           st.error(f"ERROR al ejecutar la consulta: {e}")
           st.warning("No hay datos para mostrar")
@@ -833,15 +828,8 @@ class CoctelSections:
        fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
-       # Importar la función SQL
-       from sections.functions.grafico12 import data_section_12_medios_generan_coctel_sql
-       
        # Obtener los tres DataFrames: resumen, desagregado y gráfico
-       tabla_resumen, tabla_desagregada, datos_grafico = data_section_12_medios_generan_coctel_sql(
-           fecha_inicio_str, 
-           fecha_fin_str, 
-           option_lugares
-       )
+       tabla_resumen, tabla_desagregada, datos_grafico = self._datos_seccion("12", global_filters)
        
        if not tabla_resumen.empty:
            # 1. TABLA RESUMEN (agregada por lugar y fuente)
@@ -871,7 +859,7 @@ class CoctelSections:
                    legend_title="Fuente"
                )
                
-               st.plotly_chart(fig, use_container_width=True)
+               mostrar_figura(fig, use_container_width=True)
            
            # 3. TABLA DESAGREGADA (detalle por cada canal/página)
            if not tabla_desagregada.empty:
@@ -913,22 +901,16 @@ class CoctelSections:
                    promedio = total_cocteles / total_medios if total_medios > 0 else 0
                    st.metric("Promedio por Medio", f"{promedio:.1f}")
                
-               # Mostrar tabla con opción de búsqueda
-               st.dataframe(
-                   tabla_mostrar,
-                   hide_index=True,
-                   use_container_width=True,
-                   height=400
-               )
+               # Tabla paginada: búsqueda y orden en el servidor, al navegador solo la página
+               render_tabla_paginada(tabla_mostrar, key="tabla_s12",
+                                     orden_inicial="Cantidad de Cocteles")
                
-               # Opción para descargar
-               csv = tabla_mostrar.to_csv(index=False).encode('utf-8')
-               st.download_button(
-                   label="📥 Descargar tabla completa (CSV)",
-                   data=csv,
-                   file_name=f"medios_coctel_{fecha_inicio_str}_{fecha_fin_str}.csv",
-                   mime="text/csv",
-                   key="download_s12"
+               # Opción para descargar (el archivo se arma solo al pedirlo)
+               render_descarga(
+                   tabla_mostrar,
+                   key="download_s12",
+                   nombre_base=f"medios_coctel_{fecha_inicio_str}_{fecha_fin_str}",
+                   etiqueta="📥 Descargar tabla completa"
                )
            else:
                st.info("No hay datos desagregados para mostrar")
@@ -989,7 +971,6 @@ class CoctelSections:
 # Y reemplazar toda la función section_13_conteo_mensual con esto:
 
     def section_13_conteo_mensual(self, global_filters: Dict[str, Any]):
-        from sections.functions.grafico13 import data_section_13_acontecimientos_por_lugar_mes
         """13.- Conteo mensual de la cantidad de coctel utilizado por región"""
         st.subheader("13.- Conteo mensual de la cantidad de coctel utilizado por región, dividido en redes, radio y tv")
         
@@ -1007,13 +988,7 @@ class CoctelSections:
         
         option_lugares = self.filter_manager.get_section_locations("s13", global_filters, multi=True)
         
-        # Calcular rango de fechas
-        fecha_inicio = f'{year_inicio}-{month_inicio:02d}-01'
-        fecha_fin = pd.to_datetime(f'{year_fin}-{month_fin}-01') + pd.offsets.MonthEnd(1)
-        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
-        
-        # Usar la nueva función de grafico13.py
-        resultado = data_section_13_acontecimientos_por_lugar_mes(fecha_inicio, fecha_fin_str, option_lugares)
+        resultado = self._datos_seccion("13", global_filters)
         
         if not resultado.empty:
             st.write(f"Conteo mensual de coctel en {len(option_lugares)} regiones entre {month_inicio:02d}/{year_inicio} y {month_fin:02d}/{year_fin}")
@@ -1037,7 +1012,7 @@ class CoctelSections:
             )
             
             fig.update_traces(textposition="inside")
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
         else:
             st.warning("No hay datos para mostrar")
      
@@ -1046,19 +1021,19 @@ class CoctelSections:
         """Verificar si el dataset de Facebook está disponible"""
         if hasattr(self, 'temp_coctel_fuente_fb'):
             if self.temp_coctel_fuente_fb is not None and not self.temp_coctel_fuente_fb.empty:
-                print(f"✅ Dataset FB disponible: {self.temp_coctel_fuente_fb.shape[0]} registros")
-                print(f"🔍 Fuentes en FB: {self.temp_coctel_fuente_fb['id_fuente'].unique()}")
+                log.debug("✅ Dataset FB disponible: %s registros", self.temp_coctel_fuente_fb.shape[0])
+                if log.depurando():
+                    log.debug("🔍 Fuentes en FB: %s", self.temp_coctel_fuente_fb['id_fuente'].unique())
                 return True
             else:
-                print("❌ Dataset FB está vacío o es None")
+                log.error("❌ Dataset FB está vacío o es None")
                 return False
         else:
-            print("❌ No existe atributo temp_coctel_fuente_fb")
+            log.error("❌ No existe atributo temp_coctel_fuente_fb")
             return False
     
     def section_14_notas_favor_contra(self, global_filters: Dict[str, Any], mostrar_todos: bool):
         """14.- Porcentaje de notas que sean a favor, neutral y en contra"""
-        from sections.functions.grafico14 import data_section_14_favor_contra_neutral_sql
         
         st.subheader("14.- Porcentaje de notas que sean a favor, neutral y en contra")
         
@@ -1073,32 +1048,12 @@ class CoctelSections:
             option_lugares = self.filter_manager.get_section_locations("s14", global_filters, multi=True)
         
         with col2:
-            # filtro de fuente con labels amigables
-            fuente_display_to_real = {
-                "Radio": "RADIO",
-                "TV": "TV",
-                "Redes": "REDES"
-            }
-            
             option_fuente_display = st.multiselect(
                 "Fuente", ["Radio", "TV", "Redes"],
                 ["Radio", "TV", "Redes"], key="fuente_s14"
             )
-            
-            option_fuente = [fuente_display_to_real[f] for f in option_fuente_display]
-        
-        # Convertir fechas a string formato YYYY-MM-DD
-        fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
         
-        # ✅ Llamar a la función SQL con LISTA de lugares
-        conteo_pct, long_df, conteo_abs = data_section_14_favor_contra_neutral_sql(
-            fecha_inicio_str, 
-            fecha_fin_str, 
-            option_lugares,  # ✅ Ahora es una lista
-            option_fuente, 
-            option_nota
-        )
+        conteo_pct, long_df, conteo_abs = self._datos_seccion("14", global_filters)
         
         if not conteo_pct.empty:
             if option_nota == "Con coctel":
@@ -1166,7 +1121,7 @@ class CoctelSections:
             fig.update_layout(barmode='stack', xaxis={'categoryorder': 'category ascending'})
             fig.for_each_trace(lambda t: t.update(name=t.name.replace('_pct', ' (%)')))
             
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
         else:
             st.warning("No hay datos para mostrar")
 
@@ -1282,7 +1237,6 @@ class CoctelSections:
     
     
     def section_15_proporcion_mensajes(self, global_filters: Dict[str, Any]):
-        from sections.functions.grafico15 import data_section_15_proporcion_mensajes_sql
         """15.- Proporción de Mensajes Emitidos por Fuente y Tipo de Nota"""
         st.subheader("15.- Proporción de Mensajes Emitidos por Fuente y Tipo de Nota en un Lugar y Fecha Específica")
         
@@ -1301,18 +1255,9 @@ class CoctelSections:
         with col3:
             option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s15")
         
-        # Convertir fechas a string
-        fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
         
         # Llamar función SQL
-        prop_data = data_section_15_proporcion_mensajes_sql(
-            fecha_inicio_str,
-            fecha_fin_str,
-            option_lugar,
-            option_fuente,
-            option_nota
-        )
+        prop_data = self._datos_seccion("15", global_filters)
         
         if not prop_data.empty:
             if option_nota == 'Con coctel':
@@ -1332,7 +1277,7 @@ class CoctelSections:
                 hole=0.3
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
             st.dataframe(prop_data, hide_index=True)
         else:
             st.warning("No hay datos para mostrar")
@@ -1396,7 +1341,6 @@ class CoctelSections:
 
     def section_16_mensajes_por_tema(self, global_filters: Dict[str, Any]):
 
-        from sections.functions.grafico16 import data_section_16_mensajes_por_tema_sql
         """16.- Recuento de Mensajes Emitidos por Tema y Tipo de Nota"""
         st.subheader("16.- Recuento de Mensajes Emitidos por Tema y Tipo de Nota en Lugar y Fecha Específica")
         
@@ -1420,19 +1364,9 @@ class CoctelSections:
         # CAMBIO PRINCIPAL: Usar la función SQL
         # ====================================
         
-        # Convertir fechas a string formato YYYY-MM-DD
-        fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
         
         # Llamar a la función SQL
-        topic_data = data_section_16_mensajes_por_tema_sql(
-            fecha_inicio_str,
-            fecha_fin_str,
-            option_lugar,
-            option_fuente,
-            option_nota,
-            top_n=10
-        )
+        topic_data = self._datos_seccion("16", global_filters)
         
         # ====================================
         # RESTO DEL CÓDIGO IGUAL (visualización)
@@ -1478,7 +1412,7 @@ class CoctelSections:
             )
             
             fig.update_xaxes(tickangle=45)
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
         else:
             st.warning("No hay datos para mostrar")
 
@@ -1562,7 +1496,6 @@ class CoctelSections:
 
     def section_17_proporcion_por_tema(self, global_filters: Dict[str, Any], mostrar_todos: bool):
        
-       from sections.functions.grafico17 import data_section_17_proporcion_por_tema_sql
        """17.- Proporción de Mensajes Emitidos por Fuente y Tipo de Nota por Tema"""
        st.subheader("17.- Proporción de Mensajes Emitidos por Fuente y Tipo de Nota en un Lugar y Fecha Específicos")
        
@@ -1581,19 +1514,9 @@ class CoctelSections:
        with col3:
            option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s17")
        
-       # Convertir fechas a string
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar función SQL
-       prop_data = data_section_17_proporcion_por_tema_sql(
-           fecha_inicio_str,
-           fecha_fin_str,
-           option_lugar,
-           option_fuente,
-           option_nota,
-           top_n=10
-       )
+       prop_data = self._datos_seccion("17", global_filters)
        
        if not prop_data.empty:
            if option_nota == 'Con coctel':
@@ -1616,7 +1539,7 @@ class CoctelSections:
            fig.update_traces(textposition="outside" if mostrar_todos else "none")
            fig.update_layout(yaxis={'categoryorder': 'total ascending'})
            
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
        else:
            st.warning("No hay datos para mostrar")
    
@@ -1681,7 +1604,6 @@ class CoctelSections:
     
 
     def section_18_tendencia_por_medio(self, global_filters: Dict[str, Any]):
-       from sections.functions.grafico18 import data_section_18_tendencia_por_medio_sql
        """18.- Tendencia de las notas emitidas en lugar y fecha específica por fuente y tipo de nota"""
        st.subheader("18.- Tendencia de las notas emitidas en lugar y fecha específica por fuente y tipo de nota")
        
@@ -1701,18 +1623,9 @@ class CoctelSections:
        with col3:
            option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s18")
        
-       # Convertir fechas a string
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar función SQL
-       trend_data = data_section_18_tendencia_por_medio_sql(
-           fecha_inicio_str,
-           fecha_fin_str,
-           option_lugar,
-           option_fuente,
-           option_nota
-       )
+       trend_data = self._datos_seccion("18", global_filters)
        
        if not trend_data.empty:
            if option_nota == 'Con coctel':
@@ -1735,7 +1648,7 @@ class CoctelSections:
            )
            
            fig.update_xaxes(tickangle=45)
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
        else:
            st.warning("No hay datos para mostrar")
    
@@ -1811,7 +1724,6 @@ class CoctelSections:
 # ====================================
 
     def section_19_notas_tiempo_posicion(self, global_filters: Dict[str, Any]):
-          from sections.functions.grafico19 import data_section_19_notas_tiempo_posicion_sql
           """19.- Notas emitidas en un rango de tiempo segun posicion y coctel"""
           st.subheader("19.- Notas emitidas en un rango de tiempo segun posicion y coctel")
           
@@ -1822,16 +1734,9 @@ class CoctelSections:
           # CAMBIO PRINCIPAL: Usar la función SQL
           # ====================================
           
-          # Convertir fechas a string formato YYYY-MM-DD
-          fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-          fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
           
           # Llamar a la función SQL
-          time_data = data_section_19_notas_tiempo_posicion_sql(
-              fecha_inicio_str,
-              fecha_fin_str,
-              option_nota
-          )
+          time_data = self._datos_seccion("19", global_filters)
           
           # ====================================
           # RESTO DEL CÓDIGO IGUAL (visualización)
@@ -1856,7 +1761,7 @@ class CoctelSections:
                   text='frecuencia'
               )
               
-              st.plotly_chart(fig, use_container_width=True)
+              mostrar_figura(fig, use_container_width=True)
           else:
               st.warning("No hay datos para mostrar")
               
@@ -1905,7 +1810,6 @@ class CoctelSections:
 
     def section_20_actores_posiciones(self, global_filters: Dict[str, Any]):
        
-       from sections.functions.grafico20 import data_section_20_actores_posiciones_sql
        """20.- Recuento de posiciones emitidas por actor en lugar y fecha específica"""
        st.subheader("20.- Recuento de posiciones emitidas por actor en lugar y fecha específica")
        
@@ -1924,19 +1828,9 @@ class CoctelSections:
        with col3:
            option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s20")
        
-       # Convertir fechas a string
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar función SQL
-       actor_data = data_section_20_actores_posiciones_sql(
-           fecha_inicio_str,
-           fecha_fin_str,
-           option_lugar,
-           option_fuente,
-           option_nota,
-           top_n=10
-       )
+       actor_data = self._datos_seccion("20", global_filters)
        
        if not actor_data.empty:
            if option_nota == 'Con coctel':
@@ -1963,7 +1857,7 @@ class CoctelSections:
            )
            
            fig.update_xaxes(tickangle=45)
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
        else:
            st.warning("No hay datos para mostrar")
    
@@ -2027,7 +1921,7 @@ class CoctelSections:
 
 
     def section_21_porcentaje_medios(self, global_filters: Dict[str, Any], mostrar_todos: bool):
-         from sections.functions.grafico21 import data_section_21_porcentaje_medios_sql, calcular_promedios_por_fuente
+         from sections.functions.grafico21 import calcular_promedios_por_fuente
          
          """21.- Porcentaje de cóctel de todos los medios"""
          st.subheader("21.- Porcentaje de cóctel de todos los medios")
@@ -2046,19 +1940,8 @@ class CoctelSections:
          
          option_regiones = self.filter_manager.get_section_locations("s21", global_filters, multi=True)
          
-         # Calcular fechas de inicio y fin del período
-         fecha_inicio = f"{ano_inicio}-{MESES_ES.index(mes_inicio) + 1:02d}-01"
-         # Para fecha_fin, necesitamos el último día del mes
-         import calendar
-         ultimo_dia = calendar.monthrange(ano_fin, MESES_ES.index(mes_fin) + 1)[1]
-         fecha_fin = f"{ano_fin}-{MESES_ES.index(mes_fin) + 1:02d}-{ultimo_dia:02d}"
-         
          # Llamar a la función SQL
-         resultado = data_section_21_porcentaje_medios_sql(
-             fecha_inicio,
-             fecha_fin,
-             option_regiones
-         )
+         resultado = self._datos_seccion("21", global_filters)
          
          if not resultado.empty:
              # Calcular promedios por fuente
@@ -2072,45 +1955,50 @@ class CoctelSections:
              }
              
              # Crear el gráfico de barras agrupadas
-             fig = px.bar(
-                 resultado,
-                 x="lugar",
-                 y="porcentaje_coctel",
-                 color="fuente",
-                 barmode="group",
-                 title=f"Porcentaje de cóctel de todos los medios - {mes_inicio}/{ano_inicio} hasta {mes_fin}/{ano_fin}",
-                 labels={
-                     "lugar": "Regiones", 
-                     "porcentaje_coctel": "Porcentaje de Cóctel (%)",
-                     "fuente": "Fuente"
-                 },
-                 text=resultado["porcentaje_coctel"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
-                 color_discrete_map=color_map,
-             )
-             
-             fig.update_layout(
-                 font=dict(size=8),
-                 xaxis_tickangle=-45
-             )
-             
-             fig.update_traces(
-                 textposition="outside" if mostrar_todos else "none"
-             )
-             
-             # Agregar líneas de promedio por fuente
-             for fuente, promedio in promedios.items():
-                 # Determinar color de la línea
-                 line_color = color_map.get(fuente, "black")
+             def construir_figura():
+                 fig = px.bar(
+                     resultado,
+                     x="lugar",
+                     y="porcentaje_coctel",
+                     color="fuente",
+                     barmode="group",
+                     title=f"Porcentaje de cóctel de todos los medios - {mes_inicio}/{ano_inicio} hasta {mes_fin}/{ano_fin}",
+                     labels={
+                         "lugar": "Regiones", 
+                         "porcentaje_coctel": "Porcentaje de Cóctel (%)",
+                         "fuente": "Fuente"
+                     },
+                     text=resultado["porcentaje_coctel"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
+                     color_discrete_map=color_map,
+                 )
+                 
+                 fig.update_layout(
+                     font=dict(size=8),
+                     xaxis_tickangle=-45
+                 )
                  
-                 fig.add_hline(
-                     y=promedio,
-                     line_dash="dash",
-                     annotation_text=f"Promedio de {fuente}: {promedio:.2f}%",
-                     annotation_position="right",
-                     line_color=line_color,
+                 fig.update_traces(
+                     textposition="outside" if mostrar_todos else "none"
                  )
+                 
+                 # Agregar líneas de promedio por fuente
+                 for fuente, promedio in promedios.items():
+                     # Determinar color de la línea
+                     line_color = color_map.get(fuente, "black")
+                     
+                     fig.add_hline(
+                         y=promedio,
+                         line_dash="dash",
+                         annotation_text=f"Promedio de {fuente}: {promedio:.2f}%",
+                         annotation_position="right",
+                         line_color=line_color,
+                     )
+                 return fig
              
-             st.plotly_chart(fig, use_container_width=True)
+             # El título depende del período elegido, no solo de los datos
+             plotly_chart_cacheado("s21", resultado, construir_figura,
+                                   mostrar_todos=mostrar_todos,
+                                   periodo=(mes_inicio, ano_inicio, mes_fin, ano_fin))
          else:
              st.warning("No hay datos para mostrar")
 
@@ -2196,7 +2084,6 @@ class CoctelSections:
     #        st.warning("No hay datos para mostrar")
     
     def section_22_ultimos_3_meses(self, global_filters: Dict[str, Any], mostrar_todos: bool):
-       from sections.functions.grafico22 import data_section_22_ultimos_3_meses_sql
        
        """22.- Porcentaje de cóctel en los últimos 3 meses por fuente"""
        st.subheader("22.- Porcentaje de cóctel en los últimos 3 meses por fuente")
@@ -2213,16 +2100,8 @@ class CoctelSections:
        
        option_regiones = self.filter_manager.get_section_locations("s22", global_filters, multi=True)
        
-       # Convertir índice de mes a número (MESES_ES es 0-indexed, necesitamos 1-12)
-       mes_fin_numero = MESES_ES.index(mes_fin) + 1
-       
        # Llamar a la función SQL
-       resultado = data_section_22_ultimos_3_meses_sql(
-           ano_fin,
-           mes_fin_numero,
-           option_regiones,
-           fuente
-       )
+       resultado = self._datos_seccion("22", global_filters)
        
        if not resultado.empty:
            # Verificar que tengamos meses únicos
@@ -2250,32 +2129,36 @@ class CoctelSections:
                color_mapping = {}
            
            # Crear el gráfico de barras agrupadas
-           fig = px.bar(
-               resultado,
-               x="lugar",
-               y="porcentaje_coctel",
-               color="mes",
-               barmode="group",
-               title=f"Porcentaje de cóctel {fuente} - Últimos 3 meses (hasta {mes_fin} {ano_fin})",
-               labels={
-                   "lugar": "Región", 
-                   "porcentaje_coctel": "Porcentaje de Cóctel (%)", 
-                   "mes": "Mes"
-               },
-               color_discrete_map=color_mapping,
-               text=resultado["porcentaje_coctel"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None
-           )
-           
-           fig.update_layout(
-               font=dict(size=15),
-               xaxis_tickangle=-45
-           )
-           
-           fig.update_traces(
-               textposition="outside" if mostrar_todos else "none"
-           )
+           def construir_figura():
+               fig = px.bar(
+                   resultado,
+                   x="lugar",
+                   y="porcentaje_coctel",
+                   color="mes",
+                   barmode="group",
+                   title=f"Porcentaje de cóctel {fuente} - Últimos 3 meses (hasta {mes_fin} {ano_fin})",
+                   labels={
+                       "lugar": "Región", 
+                       "porcentaje_coctel": "Porcentaje de Cóctel (%)", 
+                       "mes": "Mes"
+                   },
+                   color_discrete_map=color_mapping,
+                   text=resultado["porcentaje_coctel"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None
+               )
+               
+               fig.update_layout(
+                   font=dict(size=15),
+                   xaxis_tickangle=-45
+               )
+               
+               fig.update_traces(
+                   textposition="outside" if mostrar_todos else "none"
+               )
+               return fig
            
-           st.plotly_chart(fig, use_container_width=True)
+           plotly_chart_cacheado("s22", resultado, construir_figura,
+                                 mostrar_todos=mostrar_todos, fuente=fuente,
+                                 referencia=(mes_fin, ano_fin))
            
            # Mostrar información adicional
            meses_mostrados = ', '.join(unique_months)
@@ -2409,7 +2292,7 @@ class CoctelSections:
                     margin=dict(l=50, r=50, t=50, b=50)
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                mostrar_figura(fig, use_container_width=True)
             else:
                 st.warning("No hay datos para mostrar")
         else:
@@ -2417,7 +2300,7 @@ class CoctelSections:
     '''
     def section_23_evolucion_mensual(self, global_filters: Dict[str, Any], mostrar_todos: bool):
        """23.- Gráfico Mensual Lineal sobre la evolución de Radio, Redes y TV"""
-       from sections.functions.grafico23 import data_section_23_evolucion_mensual_sql, data_section_23_add_total_line
+       from sections.functions.grafico23 import data_section_23_add_total_line
        
        st.subheader("23.- Gráfico Mensual Lineal sobre la evolución de Radio, Redes y TV")
        
@@ -2441,11 +2324,7 @@ class CoctelSections:
        fecha_fin = pd.to_datetime(f'{year_fin}-{month_fin}-01') + pd.offsets.MonthEnd(1)
        
        # Usar la función SQL directa (como los otros gráficos)
-       resultado_sql = data_section_23_evolucion_mensual_sql(
-           fecha_inicio.strftime('%Y-%m-%d'),
-           fecha_fin.strftime('%Y-%m-%d'),
-           option_lugares
-       )
+       resultado_sql = self._datos_seccion("23", global_filters)
        
        if not resultado_sql.empty:
            # Agregar línea Total
@@ -2484,7 +2363,7 @@ class CoctelSections:
                    margin=dict(l=50, r=50, t=50, b=50)
                )
                
-               st.plotly_chart(fig, use_container_width=True)
+               mostrar_figura(fig, use_container_width=True)
                
                # Mostrar información del rango
                st.write(f"Evolución mensual de coctel en {len(option_lugares)} regiones entre {fecha_inicio.strftime('%m/%Y')} y {fecha_fin.strftime('%m/%Y')}")
@@ -2496,7 +2375,6 @@ class CoctelSections:
            st.warning("No hay datos para mostrar")
    
     def section_24_mensajes_fuerza(self, global_filters: Dict[str, Any], mostrar_todos: bool):
-       from sections.functions.grafico24 import data_section_24_mensajes_fuerza_sql
        
        """24.- Porcentaje de cocteles por mensajes fuerza"""
        st.subheader("24.- Porcentaje de cocteles por mensajes fuerza")
@@ -2509,17 +2387,9 @@ class CoctelSections:
        with col2:
            option_nota = st.selectbox("Nota", ("Con coctel", "Sin coctel", "Todos"), key="nota_s24")
        
-       # Convertir fechas a string formato YYYY-MM-DD
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar a la función SQL
-       message_data = data_section_24_mensajes_fuerza_sql(
-           fecha_inicio_str,
-           fecha_fin_str,
-           option_fuente,
-           option_nota
-       )
+       message_data = self._datos_seccion("24", global_filters)
        
        if not message_data.empty:
            # Determinar título
@@ -2545,7 +2415,7 @@ class CoctelSections:
            fig.update_layout(font=dict(size=8))
            fig.update_traces(textposition="outside" if mostrar_todos else "none")
            
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
        else:
            st.warning("No hay datos para mostrar")
    
@@ -2602,7 +2472,6 @@ class CoctelSections:
     
 
     def section_25_impactos_programa(self, global_filters: Dict[str, Any]):
-       from sections.functions.grafico25 import data_section_25_impactos_programa_sql
        
        """25.- Impactos por programa"""
        st.subheader("25.- Impactos por programa")
@@ -2620,17 +2489,9 @@ class CoctelSections:
            
            region = st.selectbox("Lugar", options=all_locations, key="lugar_s32")
        
-       # Convertir fechas a string formato YYYY-MM-DD
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar a la función SQL
-       result_coctel, result_total = data_section_25_impactos_programa_sql(
-           fecha_inicio_str,
-           fecha_fin_str,
-           region,
-           medio
-       )
+       result_coctel, result_total = self._datos_seccion("25", global_filters)
        
        # Mapeo de columnas para display
        if medio in ("Radio", "TV"):
@@ -2823,22 +2684,15 @@ class CoctelSections:
     # Código para reemplazar en coctel_sections.py en la función section_26_distribucion_medio
 
     def section_26_distribucion_medio(self, global_filters: Dict[str, Any]):
-       from sections.functions.grafico26 import data_section_26_distribucion_medio_sql
        
        """26.- Distribución de cócteles por medio"""
        st.subheader("26.- Distribución de cócteles por medio")
        
        fecha_inicio, fecha_fin = self.filter_manager.get_section_dates("s33", global_filters)
        
-       # Convertir fechas a string formato YYYY-MM-DD
-       fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-       fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
        
        # Llamar a la función SQL
-       conteo_data = data_section_26_distribucion_medio_sql(
-           fecha_inicio_str,
-           fecha_fin_str
-       )
+       conteo_data = self._datos_seccion("26", global_filters)
        
        if not conteo_data.empty:
            # Renombrar columna para el gráfico
@@ -2863,7 +2717,7 @@ class CoctelSections:
                textinfo="value+percent"
            )
            
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
            
            # Mostrar tabla con datos
            st.write("**Detalle por medio:**")
@@ -2878,7 +2732,6 @@ class CoctelSections:
    # Código para reemplazar en coctel_sections.py en la función section_27_favor_contra_mensual
 
     def section_27_favor_contra_mensual(self, global_filters: Dict[str, Any]):
-        from sections.functions.grafico27 import data_section_27_favor_contra_mensual_sql
         
         """27.- Notas a favor vs en contra por mes"""
         st.subheader("27.- Notas a favor vs en contra por mes")
@@ -2891,17 +2744,9 @@ class CoctelSections:
         with col2:
             regiones = self.filter_manager.get_section_locations("s34", global_filters, multi=True)
     
-        # Convertir fechas a string
-        fecha_inicio_str = fecha_inicio.strftime('%Y-%m-%d')
-        fecha_fin_str = fecha_fin.strftime('%Y-%m-%d')
         
         # Llamar a la función SQL
-        long_data = data_section_27_favor_contra_mensual_sql(
-            fecha_inicio_str,
-            fecha_fin_str,
-            regiones,
-            medio
-        )
+        long_data = self._datos_seccion("27", global_filters)
     
         if not long_data.empty:
             # Crear gráfico de líneas
@@ -2925,7 +2770,7 @@ class CoctelSections:
             )
             fig.update_layout(xaxis_tickangle=45)
     
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
             
             # Mostrar tabla con datos
             st.write("**Detalle por mes:**")
@@ -2989,10 +2834,7 @@ class CoctelSections:
         
     def section_2_posicion_por_fuente(self, global_filters: Dict[str, Any], mostrar_todos: bool):
        """2.- Posición por fuente en lugar y fecha específica - con tabla y porcentajes"""
-       from sections.functions.grafico2 import (
-           data_section_2_posiciones_coctel_sql, 
-           preparar_datos_para_grafico
-       )
+       from sections.functions.grafico2 import preparar_datos_para_grafico
        
        st.subheader("2.- Posición por fuente en lugar y fecha específica")
        
@@ -3014,11 +2856,7 @@ class CoctelSections:
        st.write(f"Posición por fuente en {option_lugar} entre {fecha_inicio.strftime('%d.%m.%Y')} y {fecha_fin.strftime('%d.%m.%Y')}")
        
        # Obtener datos usando las funciones SQL de grafico2.py
-       df_radio, df_tv, df_redes = data_section_2_posiciones_coctel_sql(
-           fecha_inicio.strftime('%Y-%m-%d'),
-           fecha_fin.strftime('%Y-%m-%d'),
-           option_lugar
-       )
+       df_radio, df_tv, df_redes = self._datos_seccion("2", global_filters)
        
        # Preparar datos combinados
        df_combinado = preparar_datos_para_grafico(df_radio, df_tv, df_redes)
@@ -3111,7 +2949,7 @@ class CoctelSections:
 
     def section_3_tendencia_semanal(self, global_filters: Dict[str, Any], mostrar_todos: bool):
         """3.- Gráfico semanal por porcentaje de cocteles"""
-        from sections.functions.grafico3 import data_section_3_tendencia_semanal_sql, calcular_viernes_semana
+        from sections.functions.grafico3 import calcular_viernes_semana
         
         st.subheader("3.- Gráfico semanal por porcentaje de cocteles en lugar y fecha específica")
         
@@ -3132,12 +2970,7 @@ class CoctelSections:
         usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_s3")
         
         # Usar la nueva función SQL
-        weekly_data = data_section_3_tendencia_semanal_sql(
-            fecha_inicio.strftime('%Y-%m-%d'),
-            fecha_fin.strftime('%Y-%m-%d'),
-            option_lugar,
-            option_fuente
-        )
+        weekly_data = self._datos_seccion("3", global_filters)
         
         if not weekly_data.empty:
             # Calcular viernes de cada semana
@@ -3174,7 +3007,7 @@ class CoctelSections:
             fig.update_yaxes(title_text="Porcentaje de cocteles %")
             fig.update_layout(title=f"Tendencia semanal - {option_fuente} en {option_lugar}")
             
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
         else:
             st.warning("No hay datos suficientes para la tendencia semanal") 
 #    def section_3_tendencia_semanal(self, global_filters: Dict[str, Any], mostrar_todos: bool):
@@ -3315,7 +3148,7 @@ class CoctelSections:
     
     def section_4_favor_vs_contra(self, global_filters: Dict[str, Any], mostrar_todos: bool):
         """4.- Gráfico semanal de noticias a favor y en contra"""
-        from sections.functions.grafico4 import data_section_4_favor_vs_contra_sql, calcular_viernes_semana
+        from sections.functions.grafico4 import calcular_viernes_semana
         
         st.subheader("4.- Gráfico semanal de noticias a favor y en contra en lugar y fecha específica")
         
@@ -3336,12 +3169,7 @@ class CoctelSections:
         usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_s4")
         
         # Usar la nueva función SQL
-        weekly_data = data_section_4_favor_vs_contra_sql(
-            fecha_inicio.strftime('%Y-%m-%d'),
-            fecha_fin.strftime('%Y-%m-%d'),
-            option_lugar,
-            option_fuente
-        )
+        weekly_data = self._datos_seccion("4", global_filters)
         
         if not weekly_data.empty:
             # Calcular viernes de cada semana
@@ -3397,7 +3225,7 @@ class CoctelSections:
                 hovermode='x unified'
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            mostrar_figura(fig, use_container_width=True)
         else:
             st.warning("No hay datos suficientes para la tendencia semanal")
     
@@ -3406,7 +3234,7 @@ class CoctelSections:
 
     def section_5_grafico_acumulativo(self, global_filters: Dict[str, Any], mostrar_todos: bool):
         """5.- Gráfico acumulativo porcentaje de cocteles"""
-        from sections.functions.grafico5 import data_section_5_acumulativo_lugares_sql, calcular_viernes_semana
+        from sections.functions.grafico5 import calcular_viernes_semana
         
         st.subheader("5.- Gráfico acumulativo porcentaje de cocteles en lugar y fecha específica")
         
@@ -3421,12 +3249,7 @@ class CoctelSections:
         usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_s5")
         
         # Usar la nueva función SQL
-        cumulative_data = data_section_5_acumulativo_lugares_sql(
-            fecha_inicio.strftime('%Y-%m-%d'),
-            fecha_fin.strftime('%Y-%m-%d'),
-            option_lugares,
-            option_fuente
-        )
+        cumulative_data = self._datos_seccion("5", global_filters)
         
         if not cumulative_data.empty:
             # Calcular viernes de cada semana
@@ -3441,23 +3264,26 @@ class CoctelSections:
                 ).astype(str)
             
             # Crear gráfico con múltiples líneas (una por lugar)
-            fig = px.line(
-                cumulative_data,
-                x="eje_x",
-                y="porcentaje",
-                color="lugar",
-                title="Porcentaje de cocteles por semana %",
-                labels={"eje_x": "Fecha (Viernes)" if usar_fechas_viernes else "Semana", 
-                        "porcentaje": "Porcentaje de cocteles %",
-                        "lugar": "Lugar"},
-                markers=True,
-                text=cumulative_data["porcentaje"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
-            )
-            
-            fig.update_traces(textposition="top center")
-            fig.update_xaxes(tickangle=45)
+            def construir_figura():
+                fig = px.line(
+                    cumulative_data,
+                    x="eje_x",
+                    y="porcentaje",
+                    color="lugar",
+                    title="Porcentaje de cocteles por semana %",
+                    labels={"eje_x": "Fecha (Viernes)" if usar_fechas_viernes else "Semana", 
+                            "porcentaje": "Porcentaje de cocteles %",
+                            "lugar": "Lugar"},
+                    markers=True,
+                    text=cumulative_data["porcentaje"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
+                )
+                
+                fig.update_traces(textposition="top center")
+                fig.update_xaxes(tickangle=45)
+                return fig
             
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart_cacheado("s5", cumulative_data, construir_figura,
+                                  mostrar_todos=mostrar_todos, fechas_viernes=usar_fechas_viernes)
             
             # Mostrar tabla resumen de la última semana
             st.write(f"Porcentaje de cocteles por lugar en la última semana")
@@ -3530,7 +3356,7 @@ class CoctelSections:
 
     def section_top3_mejores_lugares(self, global_filters: Dict[str, Any], mostrar_todos: bool):
        """Top 3 mejores porcentajes de coctel semanal por lugar"""
-       from sections.functions.grafico_top3 import data_section_top3_lugares_sql, calcular_viernes_semana
+       from sections.functions.grafico_top3 import calcular_viernes_semana
        
        st.subheader("Top 3 mejores porcentajes de coctel semanal por lugar en fuente y fecha específica")
        
@@ -3540,12 +3366,7 @@ class CoctelSections:
        usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_stop3")
        
        # Usar la nueva función SQL que automáticamente selecciona TOP 3
-       top_data, top_lugares_list = data_section_top3_lugares_sql(
-           fecha_inicio.strftime('%Y-%m-%d'),
-           fecha_fin.strftime('%Y-%m-%d'),
-           option_fuente,
-           top_n=3
-       )
+       top_data, top_lugares_list = self._datos_seccion("top3", global_filters)
        
        if not top_data.empty:
            # Calcular viernes de cada semana
@@ -3576,7 +3397,7 @@ class CoctelSections:
            fig.update_traces(textposition="top center")
            fig.update_xaxes(tickangle=45)
            
-           st.plotly_chart(fig, use_container_width=True)
+           mostrar_figura(fig, use_container_width=True)
            
            # Mostrar tabla de top 3 lugares
            st.write(f"Top 3 lugares con mayor porcentaje de cocteles según {option_fuente}")
@@ -3639,7 +3460,7 @@ class CoctelSections:
 
     def section_6_top_medios(self, global_filters: Dict[str, Any], mostrar_todos: bool):
       """6.- Top 3 mejores radios, redes, tv"""
-      from sections.functions.grafico6 import data_section_6_top_medios_sql, calcular_viernes_semana
+      from sections.functions.grafico6 import calcular_viernes_semana
       
       st.subheader("6.- Top 3 mejores radios, redes, tv en lugar y fecha específica")
       
@@ -3664,13 +3485,7 @@ class CoctelSections:
       usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_s6")
       
       # Usar la nueva función SQL que automáticamente selecciona TOP 3 medios
-      top_data = data_section_6_top_medios_sql(
-          fecha_inicio.strftime('%Y-%m-%d'),
-          fecha_fin.strftime('%Y-%m-%d'),
-          option_lugar,
-          option_fuente,
-          top_n=3
-      )
+      top_data = self._datos_seccion("6", global_filters)
       
       if not top_data.empty:
           # Calcular viernes de cada semana
@@ -3701,7 +3516,7 @@ class CoctelSections:
           fig.update_traces(textposition="top center")
           fig.update_xaxes(tickangle=45)
           
-          st.plotly_chart(fig, use_container_width=True)
+          mostrar_figura(fig, use_container_width=True)
       else:
           st.warning("No hay datos para mostrar")
               
@@ -3771,7 +3586,7 @@ class CoctelSections:
     #
     def section_7_macroregion(self, global_filters: Dict[str, Any], mostrar_todos: bool):
        """7.- Crecimiento de cocteles por macroregión"""
-       from sections.functions.grafico7 import data_section_7_macroregion_sql, calcular_viernes_semana
+       from sections.functions.grafico7 import calcular_viernes_semana
        
        st.subheader("7.- Crecimiento de cocteles por macroregión en lugar y fecha específica")
        
@@ -3789,12 +3604,7 @@ class CoctelSections:
        usar_fechas_viernes = st.toggle("Mostrar fechas (Viernes de cada semana)", key="toggle_s7")
        
        # Usar la nueva función SQL
-       macro_data = data_section_7_macroregion_sql(
-           fecha_inicio.strftime('%Y-%m-%d'),
-           fecha_fin.strftime('%Y-%m-%d'),
-           option_macroregion,
-           option_fuente
-       )
+       macro_data = self._datos_seccion("7", global_filters)
        
        if not macro_data.empty:
            # Calcular viernes de cada semana
@@ -3809,23 +3619,27 @@ class CoctelSections:
                ).astype(str)
            
            # Crear gráfico con múltiples líneas (una por cada lugar de la macroregión)
-           fig = px.line(
-               macro_data,
-               x="eje_x",
-               y="porcentaje",
-               color="lugar",
-               title=f"Crecimiento de cocteles por macroregión en {option_macroregion}",
-               labels={"eje_x": "Fecha (Viernes)" if usar_fechas_viernes else "Semana", 
-                       "porcentaje": "Porcentaje de cocteles %",
-                       "lugar": "Lugar"},
-               markers=True,
-               text=macro_data["porcentaje"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
-           )
-           
-           fig.update_traces(textposition="top center")
-           fig.update_xaxes(tickangle=45)
+           def construir_figura():
+               fig = px.line(
+                   macro_data,
+                   x="eje_x",
+                   y="porcentaje",
+                   color="lugar",
+                   title=f"Crecimiento de cocteles por macroregión en {option_macroregion}",
+                   labels={"eje_x": "Fecha (Viernes)" if usar_fechas_viernes else "Semana", 
+                           "porcentaje": "Porcentaje de cocteles %",
+                           "lugar": "Lugar"},
+                   markers=True,
+                   text=macro_data["porcentaje"].map(lambda x: f"{x:.1f}%") if mostrar_todos else None,
+               )
+               
+               fig.update_traces(textposition="top center")
+               fig.update_xaxes(tickangle=45)
+               return fig
            
-           st.plotly_chart(fig, use_container_width=True)
+           plotly_chart_cacheado("s7", macro_data, construir_figura,
+                                 mostrar_todos=mostrar_todos, fechas_viernes=usar_fechas_viernes,
+                                 macroregion=option_macroregion)
            st.write("Nota: Los valores muestran el porcentaje de cocteles en cada semana")
        else:
            st.warning("No hay datos suficientes")
@@ -3838,7 +3652,6 @@ class CoctelSections:
         """
         st.markdown("## 📊 Gráfico 28: Productividad Mensual de Usuarios")
         
-        from sections.functions.grafico28 import obtener_data_grafico28
 
         # --- FILTROS ---
         col1, col2 = st.columns(2)
@@ -3857,7 +3670,7 @@ class CoctelSections:
         # Obtener datos
         try:
             # Ahora la función maneja los joins internamente según la fuente
-            df_con, df_sin, df_total = obtener_data_grafico28(id_fuente=fuente_map[option_fuente])
+            df_con, df_sin, df_total = self._datos_seccion("28")
         except Exception as e:
             st.error(f"Error al cargar datos: {e}")
             return
@@ -3877,24 +3690,22 @@ class CoctelSections:
         st.markdown(f"### {titulo_tabla}")
         
         if not df_mostrar.empty:
-            st.dataframe(
-                df_mostrar, 
-                use_container_width=True, 
-                hide_index=True,
+            render_tabla_paginada(
+                df_mostrar,
+                key="tabla_s28",
                 column_config={
                     "Usuario": st.column_config.TextColumn("Usuario", width="medium"),
                     "Región": st.column_config.TextColumn("Región", width="small"),
                     "Programa/Medio": st.column_config.TextColumn("Programa/Medio", width="large"),
-                }
+                },
+                columnas_busqueda=["Usuario", "Región", "Programa/Medio"]
             )
             
-            csv = df_mostrar.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Descargar Reporte (CSV)",
-                data=csv,
-                file_name=f"productividad_{option_fuente}_{opcion_tipo}.csv",
-                mime="text/csv",
-                key="btn_down_s28"
+            render_descarga(
+                df_mostrar,
+                key="btn_down_s28",
+                nombre_base=f"productividad_{option_fuente}_{opcion_tipo}",
+                etiqueta="📥 Descargar Reporte"
             )
         else:
             st.info("No se encontraron registros para esta selección.")
@@ -3903,41 +3714,11 @@ class CoctelSections:
         """Renderizar una sección específica basada en su código"""
         
         # Mapeo de códigos a métodos
-        section_map = {
-            "sn": lambda: self.section_sn_proporcion_basica(global_filters, mostrar_todos),
-            "1": lambda: self.section_1_proporcion_combinada(global_filters, mostrar_todos),
-            "2": lambda: self.section_2_posicion_por_fuente(global_filters, mostrar_todos),
-            "3": lambda: self.section_3_tendencia_semanal(global_filters, mostrar_todos),
-            "4": lambda: self.section_4_favor_vs_contra(global_filters, mostrar_todos),
-            "5": lambda: self.section_5_grafico_acumulativo(global_filters, mostrar_todos),
-            "top3": lambda: self.section_top3_mejores_lugares(global_filters, mostrar_todos),
-            "6": lambda: self.section_6_top_medios(global_filters, mostrar_todos),
-            "7": lambda: self.section_7_macroregion(global_filters, mostrar_todos),
-            "8": lambda: self.section_8_conteo_posiciones(global_filters, mostrar_todos),
-            "9": lambda: self.section_9_distribucion_posiciones(global_filters, mostrar_todos),
-            "10": lambda: self.section_10_eventos_coctel(global_filters, mostrar_todos),
-            "11": lambda: self.section_11_cocteles_fuente_lugar(global_filters),
-            "12": lambda: self.section_12_medios_generan_coctel(global_filters),
-            "13": lambda: self.section_13_conteo_mensual(global_filters),
-            "14": lambda: self.section_14_notas_favor_contra(global_filters, mostrar_todos),
-            "15": lambda: self.section_15_proporcion_mensajes(global_filters),
-            "16": lambda: self.section_16_mensajes_por_tema(global_filters),
-            "17": lambda: self.section_17_proporcion_por_tema(global_filters, mostrar_todos),
-            "18": lambda: self.section_18_tendencia_por_medio(global_filters),
-            "19": lambda: self.section_19_notas_tiempo_posicion(global_filters),
-            "20": lambda: self.section_20_actores_posiciones(global_filters),
-            "21": lambda: self.section_21_porcentaje_medios(global_filters, mostrar_todos),
-            "22": lambda: self.section_22_ultimos_3_meses(global_filters, mostrar_todos),
-            "23": lambda: self.section_23_evolucion_mensual(global_filters, mostrar_todos),
-            "24": lambda: self.section_24_mensajes_fuerza(global_filters, mostrar_todos),
-            "25": lambda: self.section_25_impactos_programa(global_filters),
-            "26": lambda: self.section_26_distribucion_medio(global_filters),
-            "27": lambda: self.section_27_favor_contra_mensual(global_filters),
-            "28": lambda: self.section_28_registros_usuarios(), # <--- AGREGADO
-        }
+        section_map = self._mapa_secciones(global_filters, mostrar_todos)
         
         # Ejecutar la sección seleccionada
         if section_code in section_map:
-            section_map[section_code]()
+            with query_context(prioridad=PRIORIDAD_INTERACTIVA):
+                _render_fragmento(section_code, section_map[section_code])
         else:
             st.error(f"❌ Sección '{section_code}' no encontrada")        
\ No newline at end of file
@@ -1,73 +1,10 @@
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any, Tuple
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
-def obtener_id_lugar(nombre_lugar):
-    query = """
-    SELECT id, nombre 
-    FROM lugares 
-    WHERE nombre = %s
-    LIMIT 1;
-    """
-    
-    try:
-        resultado = ejecutar_query(query, params=[nombre_lugar])
-        
-        if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
-            return None
-            
-        return int(resultado.iloc[0]['id'])
-        
-    except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
-        return None
+log = obtener_logger(__name__)
 
 def calcular_porcentajes_radio_tv_combinado(resultado_radio_tv):
     """
@@ -107,17 +44,10 @@ def data_section_1_proporcion_combinada_sql(f_inicio, f_final, lugares_lista, fu
     Maneja Radio/TV y Redes por separado como en sn.py original
     """
     
-    # Obtener IDs de lugares
-    lugar_ids = []
-    for lugar_nombre in lugares_lista:
-        lugar_id = obtener_id_lugar(lugar_nombre)
-        if lugar_id:
-            lugar_ids.append(lugar_id)
-    
-    if not lugar_ids:
+    # Los lugares se filtran por nombre dentro de cada query (sin una búsqueda de id por lugar)
+    if not lugares_lista:
         return pd.DataFrame({'tipo_coctel': ['SIN_COCTEL', 'CON_COCTEL'], 'cantidad': [0, 0], 'porcentaje': [0.0, 0.0]})
     
-    lugares_ids_str = ','.join(map(str, lugar_ids))
     resultado_combinado = pd.DataFrame()
     
     # RADIO/TV - usando acontecimiento_programa
@@ -125,7 +55,6 @@ def data_section_1_proporcion_combinada_sql(f_inicio, f_final, lugares_lista, fu
         fuentes_radio_tv = [f for f in fuentes_lista if f in ['Radio', 'TV']]
         fuente_map = {"Radio": 1, "TV": 2}
         fuentes_ids = [fuente_map[f] for f in fuentes_radio_tv]
-        fuentes_ids_str = ','.join(map(str, fuentes_ids))
         
         query_radio_tv = f"""
             SELECT 
@@ -139,14 +68,15 @@ def data_section_1_proporcion_combinada_sql(f_inicio, f_final, lugares_lista, fu
             JOIN programas p ON ap.id_programa = p.id
             JOIN fuentes f ON p.id_fuente = f.id
             JOIN acontecimientos a ON ap.id_acontecimiento = a.id
-            WHERE a.id_lugar IN ({lugares_ids_str})
-                AND p.id_fuente IN ({fuentes_ids_str})
+            JOIN lugares l ON a.id_lugar = l.id
+            WHERE l.nombre = ANY(%s)
+                AND p.id_fuente = ANY(%s)
                 AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
                 AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             ORDER BY f.nombre, p.id, a.id;
             """
         
-        resultado_radio_tv = ejecutar_query(query_radio_tv, params=[f_inicio, f_final])
+        resultado_radio_tv = ejecutar_query(query_radio_tv, params=[list(lugares_lista), fuentes_ids, f_inicio, f_final])
         if resultado_radio_tv is not None and not resultado_radio_tv.empty:
             resultado_radio_tv = resultado_radio_tv.drop_duplicates(subset=['programa_nombre', 'acontecimiento_id'])
             resultado_combinado = pd.concat([resultado_combinado, resultado_radio_tv], ignore_index=True)
@@ -162,13 +92,14 @@ def data_section_1_proporcion_combinada_sql(f_inicio, f_final, lugares_lista, fu
                 a.id_nota
             FROM acontecimientos a
             INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-            WHERE a.id_lugar IN ({lugares_ids_str})
+            INNER JOIN lugares l ON a.id_lugar = l.id
+            WHERE l.nombre = ANY(%s)
                 AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
                 AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             ORDER BY a.id;
             """
         
-        resultado_redes = ejecutar_query(query_redes, params=[f_inicio, f_final])
+        resultado_redes = ejecutar_query(query_redes, params=[list(lugares_lista), f_inicio, f_final])
         if resultado_redes is not None and not resultado_redes.empty:
             resultado_combinado = pd.concat([resultado_combinado, resultado_redes], ignore_index=True)
     
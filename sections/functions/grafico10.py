@@ -1,54 +1,12 @@
 # sections/functions/grafico10.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -57,28 +15,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 def conteo_eventos_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -89,9 +45,6 @@ def conteo_eventos_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares: List
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -107,7 +60,7 @@ def conteo_eventos_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares: List
         FROM acontecimientos a
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND p.id_fuente IN (1, 2)  -- Solo Radio (1) y TV (2)
@@ -140,13 +93,13 @@ def conteo_eventos_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares: List
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_eventos_radio_tv: {e}")
+        log.error("Error en conteo_eventos_radio_tv: %s", e)
         return pd.DataFrame()
 
 def conteo_eventos_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -157,9 +110,6 @@ def conteo_eventos_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[in
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     SELECT 
         'Redes' as fuente,
@@ -170,7 +120,7 @@ def conteo_eventos_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[in
         COUNT(*) as conteo_acontecimientos
     FROM acontecimientos a
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
     GROUP BY 
@@ -183,13 +133,13 @@ def conteo_eventos_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[in
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_eventos_redes: {e}")
+        log.error("Error en conteo_eventos_redes: %s", e)
         return pd.DataFrame()
 
 def data_section_10_eventos_coctel_sql(fecha_inicio: str, fecha_fin: str, lugares: List[str]) -> pd.DataFrame:
@@ -205,44 +155,42 @@ def data_section_10_eventos_coctel_sql(fecha_inicio: str, fecha_fin: str, lugare
         DataFrame con columnas: fuente, tipo_coctel, conteo_acontecimientos
     """
     
-    print(f"DEBUG: Parámetros recibidos:")
-    print(f"  fecha_inicio: {fecha_inicio}")
-    print(f"  fecha_fin: {fecha_fin}")
-    print(f"  lugares: {lugares}")
+    log.debug("Parámetros recibidos:")
+    log.debug("  fecha_inicio: %s", fecha_inicio)
+    log.debug("  fecha_fin: %s", fecha_fin)
+    log.debug("  lugares: %s", lugares)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
-    print(f"DEBUG: IDs lugares obtenidos: {ids_lugares}")
+    log.debug("IDs lugares obtenidos: %s", ids_lugares)
     if not ids_lugares:
-        print(f"ERROR: No se encontraron IDs para los lugares: {lugares}")
+        log.error("No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame()
     
     resultado_final = pd.DataFrame()
     
     try:
         # Obtener datos de Radio/TV
-        print(f"DEBUG: Consultando Radio/TV...")
+        log.debug("Consultando Radio/TV...")
         resultado_radio_tv = conteo_eventos_radio_tv(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"DEBUG: Resultado Radio/TV: {len(resultado_radio_tv)} filas")
+        log.debug("Resultado Radio/TV: %s filas", len(resultado_radio_tv))
         if not resultado_radio_tv.empty:
             resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
         
         # Obtener datos de Redes
-        print(f"DEBUG: Consultando Redes...")
+        log.debug("Consultando Redes...")
         resultado_redes = conteo_eventos_redes(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"DEBUG: Resultado Redes: {len(resultado_redes)} filas")
+        log.debug("Resultado Redes: %s filas", len(resultado_redes))
         if not resultado_redes.empty:
             resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
         
-        print(f"DEBUG: Resultado final combinado: {len(resultado_final)} filas")
-        print(f"DEBUG: Datos finales:\n{resultado_final}")
+        log.debug("Resultado final combinado: %s filas", len(resultado_final))
+        log.dataframe("Datos finales", resultado_final)
         
         return resultado_final
         
     except Exception as e:
-        print(f"ERROR en data_section_10_eventos_coctel_sql: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("ERROR en data_section_10_eventos_coctel_sql: %s", e)
         return pd.DataFrame()
 
 def convertir_a_formato_grafico(df: pd.DataFrame) -> pd.DataFrame:
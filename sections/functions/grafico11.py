@@ -1,54 +1,12 @@
 # sections/functions/grafico11.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -57,28 +15,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 def conteo_eventos_radio_tv_integrado(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -90,9 +46,6 @@ def conteo_eventos_radio_tv_integrado(fecha_inicio: str, fecha_fin: str, ids_lug
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         -- Obtener todos los acontecimientos con sus programas, deduplicando por nombre de programa
@@ -111,7 +64,7 @@ def conteo_eventos_radio_tv_integrado(fecha_inicio: str, fecha_fin: str, ids_lug
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND p.id_fuente IN (1, 2)  -- Solo Radio (1) y TV (2)
@@ -167,13 +120,13 @@ def conteo_eventos_radio_tv_integrado(fecha_inicio: str, fecha_fin: str, ids_lug
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_eventos_radio_tv_integrado: {e}")
+        log.error("Error en conteo_eventos_radio_tv_integrado: %s", e)
         return pd.DataFrame()
 
 def conteo_eventos_redes_integrado(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -185,9 +138,6 @@ def conteo_eventos_redes_integrado(fecha_inicio: str, fecha_fin: str, ids_lugare
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_redes AS (
         -- Obtener todos los acontecimientos con facebook posts
@@ -204,7 +154,7 @@ def conteo_eventos_redes_integrado(fecha_inicio: str, fecha_fin: str, ids_lugare
         FROM acontecimientos a
         INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
     ),
@@ -237,13 +187,13 @@ def conteo_eventos_redes_integrado(fecha_inicio: str, fecha_fin: str, ids_lugare
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_eventos_redes_integrado: {e}")
+        log.error("Error en conteo_eventos_redes_integrado: %s", e)
         return pd.DataFrame()
 
 def data_section_11_conteo_integrado_sql(fecha_inicio: str, fecha_fin: str, lugares: List[str]) -> pd.DataFrame:
@@ -260,32 +210,32 @@ def data_section_11_conteo_integrado_sql(fecha_inicio: str, fecha_fin: str, luga
         TV_Con_Coctel, TV_Sin_Coctel, Redes_Con_Coctel, Redes_Sin_Coctel
     """
     
-    print(f"DEBUG: Parámetros recibidos:")
-    print(f"  fecha_inicio: {fecha_inicio}")
-    print(f"  fecha_fin: {fecha_fin}")
-    print(f"  lugares: {lugares}")
+    log.debug("Parámetros recibidos:")
+    log.debug("  fecha_inicio: %s", fecha_inicio)
+    log.debug("  fecha_fin: %s", fecha_fin)
+    log.debug("  lugares: %s", lugares)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
-    print(f"DEBUG: IDs lugares obtenidos: {ids_lugares}")
+    log.debug("IDs lugares obtenidos: %s", ids_lugares)
     if not ids_lugares:
-        print(f"ERROR: No se encontraron IDs para los lugares: {lugares}")
+        log.error("No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame()
     
     try:
         # Obtener datos de Radio/TV
-        print(f"DEBUG: Consultando Radio/TV...")
+        log.debug("Consultando Radio/TV...")
         resultado_radio_tv = conteo_eventos_radio_tv_integrado(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"DEBUG: Resultado Radio/TV: {len(resultado_radio_tv)} filas")
+        log.debug("Resultado Radio/TV: %s filas", len(resultado_radio_tv))
         if not resultado_radio_tv.empty:
-            print(f"DEBUG: Columnas Radio/TV: {resultado_radio_tv.columns.tolist()}")
+            log.debug("Columnas Radio/TV: %s", resultado_radio_tv.columns.tolist())
         
         # Obtener datos de Redes
-        print(f"DEBUG: Consultando Redes...")
+        log.debug("Consultando Redes...")
         resultado_redes = conteo_eventos_redes_integrado(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"DEBUG: Resultado Redes: {len(resultado_redes)} filas")
+        log.debug("Resultado Redes: %s filas", len(resultado_redes))
         if not resultado_redes.empty:
-            print(f"DEBUG: Columnas Redes: {resultado_redes.columns.tolist()}")
+            log.debug("Columnas Redes: %s", resultado_redes.columns.tolist())
         
         # Combinar los resultados - CORRIGIENDO EL MERGE CON NOMBRES CORRECTOS
         if not resultado_radio_tv.empty and not resultado_redes.empty:
@@ -295,14 +245,14 @@ def data_section_11_conteo_integrado_sql(fecha_inicio: str, fecha_fin: str, luga
                 on='lugar', 
                 how='outer'
             )
-            print(f"DEBUG: Merge exitoso con {len(resultado_final)} filas")
+            log.debug("Merge exitoso con %s filas", len(resultado_final))
         elif not resultado_radio_tv.empty:
             # Solo Radio/TV - agregar columnas de Redes con ceros
             resultado_final = resultado_radio_tv.copy()
             resultado_final['redes'] = 0
             resultado_final['redes_con_coctel'] = 0
             resultado_final['redes_sin_coctel'] = 0
-            print(f"DEBUG: Solo Radio/TV con {len(resultado_final)} filas")
+            log.debug("Solo Radio/TV con %s filas", len(resultado_final))
         elif not resultado_redes.empty:
             # Solo Redes - agregar columnas de Radio/TV con ceros
             resultado_final = resultado_redes.copy()
@@ -312,10 +262,10 @@ def data_section_11_conteo_integrado_sql(fecha_inicio: str, fecha_fin: str, luga
             resultado_final['radio_sin_coctel'] = 0
             resultado_final['tv_con_coctel'] = 0
             resultado_final['tv_sin_coctel'] = 0
-            print(f"DEBUG: Solo Redes con {len(resultado_final)} filas")
+            log.debug("Solo Redes con %s filas", len(resultado_final))
         else:
             # Sin datos
-            print("DEBUG: Sin datos de ninguna fuente")
+            log.debug("Sin datos de ninguna fuente")
             resultado_final = pd.DataFrame()
         
         # Llenar NaN con 0 y convertir a enteros
@@ -342,15 +292,13 @@ def data_section_11_conteo_integrado_sql(fecha_inicio: str, fecha_fin: str, luga
                 'redes_sin_coctel': 'Redes_Sin_Coctel'
             })
         
-        print(f"DEBUG: Resultado final combinado: {len(resultado_final)} filas")
-        print(f"DEBUG: Columnas finales: {resultado_final.columns.tolist() if not resultado_final.empty else 'N/A'}")
+        log.debug("Resultado final combinado: %s filas", len(resultado_final))
+        log.debug("Columnas finales: %s", resultado_final.columns.tolist() if not resultado_final.empty else 'N/A')
         
         return resultado_final
         
     except Exception as e:
-        print(f"ERROR en data_section_11_conteo_integrado_sql: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("ERROR en data_section_11_conteo_integrado_sql: %s", e)
         return pd.DataFrame()
 
 def convertir_a_formato_resumen(df: pd.DataFrame) -> pd.DataFrame:
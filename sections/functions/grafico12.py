@@ -5,8 +5,13 @@ Cuenta MEDIOS ÚNICOS (canales/páginas) que generaron al menos un cóctel
 """
 
 from .sn import ejecutar_query
+from core.dimensions import decorar_etiquetas
 import pandas as pd
+import unicodedata
 from typing import List
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
@@ -16,30 +21,64 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 
+def _clave_colacion(columna: pd.Series) -> pd.Series:
+    """
+    Clave de orden para columnas de texto parecida a la colación de la base:
+    sin distinguir tildes ni mayúsculas ('Áncash' junto a 'Apurímac', no al final)
+    """
+    if columna.dtype != object:
+        return columna
+    return columna.map(
+        lambda v: unicodedata.normalize('NFKD', v).encode('ascii', 'ignore').decode().casefold()
+        if isinstance(v, str) else v
+    )
+
+
+def _decorar_medios(resultado: pd.DataFrame, mapeo: dict) -> pd.DataFrame:
+    """
+    Agregar lugar y canal_nombre desde las dimensiones y contar cocteles por nombre.
+
+    La query trae un acontecimiento por (lugar, fuente, medio) con ids; aquí se agrupa
+    por las etiquetas y se cuentan acontecimientos distintos, igual que el GROUP BY por
+    nombre de la query original: dos medios con el mismo nombre son una sola fila y un
+    acontecimiento con posts de ambos cuenta una vez.
+    """
+    resultado = decorar_etiquetas(resultado, mapeo)
+    resultado = (
+        resultado
+        .groupby(['lugar', 'fuente', 'canal_nombre'], dropna=False)['acontecimiento_id']
+        .nunique()
+        .reset_index(name='cantidad_cocteles')
+    )
+    return resultado.sort_values(
+        ['lugar', 'fuente', 'cantidad_cocteles'], ascending=[True, True, False],
+        key=_clave_colacion,
+    ).reset_index(drop=True)
+
+
 def contar_canales_radio_tv_con_coctel(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
     """
     Cuenta CANALES ÚNICOS de Radio y TV que generaron al menos un cóctel
@@ -47,51 +86,43 @@ def contar_canales_radio_tv_con_coctel(fecha_inicio: str, fecha_fin: str, ids_lu
     
     Returns:
         DataFrame con columnas: lugar, fuente, canal_nombre, cantidad_cocteles
+        (etiquetas desde las dimensiones cacheadas, conteo por nombre)
     """
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
-    WITH acontecimientos_con_coctel AS (
-        SELECT DISTINCT
-            a.id as acontecimiento_id,
-            l.nombre as lugar,
-            c.nombre as canal_nombre,
-            p.id_fuente,
-            CASE 
-                WHEN p.id_fuente = 1 THEN 'Radio'
-                WHEN p.id_fuente = 2 THEN 'TV'
-            END as fuente
-        FROM acontecimientos a
-        INNER JOIN lugares l ON a.id_lugar = l.id
-        INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
-        INNER JOIN programas p ON ap.id_programa = p.id
-        INNER JOIN canales c ON p.id_canal = c.id
-        WHERE a.id_lugar IN ({placeholders})
-            AND a.id_nota IS NOT NULL  -- Solo con cóctel
-            AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
-            AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
-            AND p.id_fuente IN (1, 2)  -- Radio y TV
-    )
-    SELECT 
-        lugar,
-        fuente,
-        canal_nombre,
-        COUNT(*) as cantidad_cocteles
-    FROM acontecimientos_con_coctel
-    GROUP BY lugar, fuente, canal_nombre
-    ORDER BY lugar, fuente, cantidad_cocteles DESC;
+    SELECT DISTINCT
+        a.id as acontecimiento_id,
+        a.id_lugar,
+        CASE 
+            WHEN p.id_fuente = 1 THEN 'Radio'
+            WHEN p.id_fuente = 2 THEN 'TV'
+        END as fuente,
+        p.id_canal
+    FROM acontecimientos a
+    INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
+    INNER JOIN programas p ON ap.id_programa = p.id
+    INNER JOIN canales c ON p.id_canal = c.id
+    WHERE a.id_lugar = ANY(%s)
+        AND a.id_nota IS NOT NULL  -- Solo con cóctel
+        AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
+        AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
+        AND p.id_fuente IN (1, 2);  -- Radio y TV
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
-        return resultado if resultado is not None else pd.DataFrame()
+        if resultado is None or resultado.empty:
+            return pd.DataFrame()
+        return _decorar_medios(resultado, {
+            'lugar': ('id_lugar', 'lugares'),
+            'canal_nombre': ('id_canal', 'canales'),
+        })
     except Exception as e:
-        print(f"Error en contar_canales_radio_tv_con_coctel: {e}")
+        log.error("Error en contar_canales_radio_tv_con_coctel: %s", e)
         return pd.DataFrame()
 
 
@@ -103,48 +134,41 @@ def contar_paginas_redes_con_coctel(fecha_inicio: str, fecha_fin: str, ids_lugar
     
     Returns:
         DataFrame con columnas: lugar, fuente, canal_nombre, cantidad_cocteles
+        (etiquetas desde las dimensiones cacheadas, conteo por nombre)
     """
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
-    WITH acontecimientos_redes AS (
-        SELECT DISTINCT
-            a.id as acontecimiento_id,
-            l.nombre as lugar,
-            fbp.nombre as canal_nombre,
-            'Redes' as fuente
-        FROM acontecimientos a
-        INNER JOIN lugares l ON a.id_lugar = l.id
-        INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-        INNER JOIN facebook_posts fp ON afp.id_facebook_post = fp.id
-        INNER JOIN facebook_pages fbp ON fp.id_facebook_page = fbp.id
-        WHERE a.id_lugar IN ({placeholders})
-            AND a.id_nota IS NOT NULL  -- Solo con cóctel
-            AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
-            AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
-            AND fbp.nombre IS NOT NULL
-            AND fbp.nombre != ''
-    )
-    SELECT 
-        lugar,
-        fuente,
-        canal_nombre,
-        COUNT(*) as cantidad_cocteles
-    FROM acontecimientos_redes
-    GROUP BY lugar, fuente, canal_nombre
-    ORDER BY lugar, fuente, cantidad_cocteles DESC;
+    SELECT DISTINCT
+        a.id as acontecimiento_id,
+        a.id_lugar,
+        'Redes' as fuente,
+        fbp.id as id_facebook_page
+    FROM acontecimientos a
+    INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
+    INNER JOIN facebook_posts fp ON afp.id_facebook_post = fp.id
+    INNER JOIN facebook_pages fbp ON fp.id_facebook_page = fbp.id
+    WHERE a.id_lugar = ANY(%s)
+        AND a.id_nota IS NOT NULL  -- Solo con cóctel
+        AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
+        AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
+        AND fbp.nombre IS NOT NULL
+        AND fbp.nombre != '';
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
-        return resultado if resultado is not None else pd.DataFrame()
+        if resultado is None or resultado.empty:
+            return pd.DataFrame()
+        return _decorar_medios(resultado, {
+            'lugar': ('id_lugar', 'lugares'),
+            'canal_nombre': ('id_facebook_page', 'facebook_pages'),
+        })
     except Exception as e:
-        print(f"Error en contar_paginas_redes_con_coctel: {e}")
+        log.error("Error en contar_paginas_redes_con_coctel: %s", e)
         return pd.DataFrame()
 
 
@@ -166,29 +190,29 @@ def data_section_12_medios_generan_coctel_sql(fecha_inicio: str, fecha_fin: str,
         tuple: (tabla_resumen, tabla_desagregada, datos_grafico)
     """
     
-    print(f"DEBUG Sección 12:")
-    print(f"  fecha_inicio: {fecha_inicio}")
-    print(f"  fecha_fin: {fecha_fin}")
-    print(f"  lugares: {lugares}")
+    log.debug("Sección 12:")
+    log.debug("  fecha_inicio: %s", fecha_inicio)
+    log.debug("  fecha_fin: %s", fecha_fin)
+    log.debug("  lugares: %s", lugares)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
-    print(f"DEBUG: IDs lugares obtenidos: {ids_lugares}")
+    log.debug("IDs lugares obtenidos: %s", ids_lugares)
     
     if not ids_lugares:
-        print(f"ERROR: No se encontraron IDs para los lugares: {lugares}")
+        log.error("No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
     
     try:
         # 1. Obtener datos desagregados de Radio/TV
-        print(f"🔍 Consultando canales de Radio/TV...")
+        log.debug("🔍 Consultando canales de Radio/TV...")
         resultado_radio_tv = contar_canales_radio_tv_con_coctel(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} canales encontrados")
+        log.debug("📻📺 Radio/TV: %s canales encontrados", len(resultado_radio_tv))
         
         # 2. Obtener datos desagregados de Redes
-        print(f"🔍 Consultando páginas de Redes...")
+        log.debug("🔍 Consultando páginas de Redes...")
         resultado_redes = contar_paginas_redes_con_coctel(fecha_inicio, fecha_fin, ids_lugares)
-        print(f"📱 Redes: {len(resultado_redes)} páginas encontradas")
+        log.debug("📱 Redes: %s páginas encontradas", len(resultado_redes))
         
         # 3. Combinar resultados desagregados
         tabla_desagregada = pd.DataFrame()
@@ -200,7 +224,7 @@ def data_section_12_medios_generan_coctel_sql(fecha_inicio: str, fecha_fin: str,
             tabla_desagregada = pd.concat([tabla_desagregada, resultado_redes], ignore_index=True)
         
         if tabla_desagregada.empty:
-            print("⚠️ No se encontraron datos")
+            log.warning("⚠️ No se encontraron datos")
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
         
         # Renombrar columnas para mejor presentación
@@ -209,7 +233,7 @@ def data_section_12_medios_generan_coctel_sql(fecha_inicio: str, fecha_fin: str,
             'cantidad_cocteles': 'Cantidad de Cocteles'
         })
         
-        print(f"✅ Total de medios encontrados: {len(tabla_desagregada)}")
+        log.debug("✅ Total de medios encontrados: %s", len(tabla_desagregada))
         
         # 4. Crear tabla resumen: contar MEDIOS ÚNICOS por lugar y fuente
         tabla_resumen = (
@@ -235,19 +259,17 @@ def data_section_12_medios_generan_coctel_sql(fecha_inicio: str, fecha_fin: str,
         columnas_orden = ['lugar', 'Radio', 'TV', 'Redes']
         tabla_resumen_pivot = tabla_resumen_pivot[[c for c in columnas_orden if c in tabla_resumen_pivot.columns]]
         
-        print(f"📊 Tabla resumen creada: {tabla_resumen_pivot.shape}")
+        log.debug("📊 Tabla resumen creada: %s", tabla_resumen_pivot.shape)
         
         # 5. Crear datos para gráfico (formato largo)
         datos_grafico = tabla_resumen.rename(columns={'conteo_medios': 'Cantidad'})
         
-        print(f"📈 Datos para gráfico creados: {datos_grafico.shape}")
+        log.debug("📈 Datos para gráfico creados: %s", datos_grafico.shape)
         
         return tabla_resumen_pivot, tabla_desagregada, datos_grafico
         
     except Exception as e:
-        print(f"❌ Error en data_section_12_medios_generan_coctel_sql: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Error en data_section_12_medios_generan_coctel_sql: %s", e)
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
 
@@ -1,53 +1,11 @@
 # grafico13.py
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar):
     """
@@ -64,13 +22,13 @@ def obtener_id_lugar(nombre_lugar):
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 def conteo_acontecimientos_radio_tv_por_lugar_mes(ids_lugares: List[int], fecha_inicio: str, fecha_fin: str) -> pd.DataFrame:
@@ -90,9 +48,6 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(ids_lugares: List[int], fecha_
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -105,7 +60,7 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(ids_lugares: List[int], fecha_
         INNER JOIN lugares l ON a.id_lugar = l.id
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND a.id_nota IS NOT NULL  -- Solo con coctel
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
@@ -141,13 +96,13 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(ids_lugares: List[int], fecha_
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_acontecimientos_radio_tv_por_lugar_mes: {e}")
+        log.error("Error en conteo_acontecimientos_radio_tv_por_lugar_mes: %s", e)
         return pd.DataFrame()
 
 
@@ -168,9 +123,6 @@ def conteo_acontecimientos_redes_por_lugar_mes(ids_lugares: List[int], fecha_ini
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     SELECT 
         l.nombre as lugar,
@@ -180,7 +132,7 @@ def conteo_acontecimientos_redes_por_lugar_mes(ids_lugares: List[int], fecha_ini
     FROM acontecimientos a
     INNER JOIN lugares l ON a.id_lugar = l.id
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND a.id_nota IS NOT NULL  -- Solo con coctel
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
@@ -193,13 +145,13 @@ def conteo_acontecimientos_redes_por_lugar_mes(ids_lugares: List[int], fecha_ini
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_acontecimientos_redes_por_lugar_mes: {e}")
+        log.error("Error en conteo_acontecimientos_redes_por_lugar_mes: %s", e)
         return pd.DataFrame()
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
@@ -209,28 +161,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 
@@ -248,45 +198,43 @@ def data_section_13_acontecimientos_por_lugar_mes(fecha_inicio: str, fecha_fin:
         DataFrame con columnas: lugar, año_mes, fuente, coctel
     """
     
-    print(f"DEBUG: Parámetros recibidos:")
-    print(f"  fecha_inicio: {fecha_inicio}")
-    print(f"  fecha_fin: {fecha_fin}")
-    print(f"  lugares: {lugares}")
+    log.debug("Parámetros recibidos:")
+    log.debug("  fecha_inicio: %s", fecha_inicio)
+    log.debug("  fecha_fin: %s", fecha_fin)
+    log.debug("  lugares: %s", lugares)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
-    print(f"DEBUG: IDs lugares obtenidos: {ids_lugares}")
+    log.debug("IDs lugares obtenidos: %s", ids_lugares)
     
     if not ids_lugares:
-        print(f"ERROR: No se encontraron IDs para los lugares: {lugares}")
+        log.error("No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame()
     
     resultado_final = pd.DataFrame()
     
     try:
         # Obtener datos de Radio/TV
-        print(f"DEBUG: Consultando Radio/TV...")
+        log.debug("Consultando Radio/TV...")
         resultado_radio_tv = conteo_acontecimientos_radio_tv_por_lugar_mes(ids_lugares, fecha_inicio, fecha_fin)
-        print(f"DEBUG: Resultado Radio/TV: {len(resultado_radio_tv)} filas")
+        log.debug("Resultado Radio/TV: %s filas", len(resultado_radio_tv))
         if not resultado_radio_tv.empty:
             resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
         
         # Obtener datos de Redes
-        print(f"DEBUG: Consultando Redes...")
+        log.debug("Consultando Redes...")
         resultado_redes = conteo_acontecimientos_redes_por_lugar_mes(ids_lugares, fecha_inicio, fecha_fin)
-        print(f"DEBUG: Resultado Redes: {len(resultado_redes)} filas")
+        log.debug("Resultado Redes: %s filas", len(resultado_redes))
         if not resultado_redes.empty:
             resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
         
-        print(f"DEBUG: Resultado final combinado: {len(resultado_final)} filas")
-        print(f"DEBUG: Datos finales:\n{resultado_final}")
+        log.debug("Resultado final combinado: %s filas", len(resultado_final))
+        log.dataframe("Datos finales", resultado_final)
         
         return resultado_final
         
     except Exception as e:
-        print(f"ERROR en data_section_13_acontecimientos_por_lugar_mes: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("ERROR en data_section_13_acontecimientos_por_lugar_mes: %s", e)
         return pd.DataFrame()
 
 
@@ -1,55 +1,12 @@
 # sections/functions/grafico14.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any, Tuple
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -66,13 +23,13 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 
@@ -83,28 +40,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"✅ Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("✅ Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 
@@ -134,8 +89,7 @@ def conteo_favor_contra_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares:
     # Filtro de lugares
     filtro_lugar = ""
     if ids_lugares:
-        placeholders_lugares = ','.join(['%s'] * len(ids_lugares))
-        filtro_lugar = f"AND a.id_lugar IN ({placeholders_lugares})"
+        filtro_lugar = "AND a.id_lugar = ANY(%s)"
     
     # Filtro de cóctel
     filtro_coctel = ""
@@ -144,9 +98,6 @@ def conteo_favor_contra_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares:
     elif option_nota == "Sin coctel":
         filtro_coctel = "AND a.id_nota IS NULL"
     
-    # Crear placeholders para fuentes
-    placeholders_fuentes = ','.join(['%s'] * len(ids_fuentes))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -162,7 +113,7 @@ def conteo_favor_contra_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares:
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             {filtro_lugar}
             {filtro_coctel}
-            AND p.id_fuente IN ({placeholders_fuentes})
+            AND p.id_fuente = ANY(%s)
     ),
     acontecimientos_deduplicados AS (
         SELECT DISTINCT
@@ -187,14 +138,14 @@ def conteo_favor_contra_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares:
     # Construir parámetros
     params = [fecha_inicio, fecha_fin]
     if ids_lugares:
-        params.extend(ids_lugares)
-    params.extend(ids_fuentes)
+        params.append(ids_lugares)
+    params.append(ids_fuentes)
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_favor_contra_radio_tv: {e}")
+        log.error("Error en conteo_favor_contra_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -220,8 +171,7 @@ def conteo_favor_contra_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: Li
     # Filtro de lugares
     filtro_lugar = ""
     if ids_lugares:
-        placeholders_lugares = ','.join(['%s'] * len(ids_lugares))
-        filtro_lugar = f"AND a.id_lugar IN ({placeholders_lugares})"
+        filtro_lugar = "AND a.id_lugar = ANY(%s)"
     
     # Filtro de cóctel
     filtro_coctel = ""
@@ -249,13 +199,13 @@ def conteo_favor_contra_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: Li
     # Construir parámetros
     params = [fecha_inicio, fecha_fin]
     if ids_lugares:
-        params.extend(ids_lugares)
+        params.append(ids_lugares)
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_favor_contra_redes: {e}")
+        log.error("Error en conteo_favor_contra_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -279,18 +229,18 @@ def data_section_14_favor_contra_neutral_sql(fecha_inicio: str, fecha_fin: str,
         - conteo_abs: DataFrame con conteos absolutos
     """
     
-    print(f"DEBUG grafico14: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugares={lugares}, fuentes={fuentes}, option_nota={option_nota}")
+    log.debug("grafico14: fecha_inicio=%s, fecha_fin=%s, lugares=%s, fuentes=%s, option_nota=%s", fecha_inicio, fecha_fin, lugares, fuentes, option_nota)
     
     # Obtener IDs de lugares
     ids_lugares = []
     if lugares:  # Si hay lugares específicos
         ids_lugares = obtener_ids_lugares(lugares)
         if not ids_lugares:
-            print(f"⚠️ No se encontraron IDs para los lugares: {lugares}")
+            log.warning("⚠️ No se encontraron IDs para los lugares: %s", lugares)
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-        print(f"✅ IDs de lugares: {ids_lugares}")
+        log.debug("✅ IDs de lugares: %s", ids_lugares)
     else:  # Si está vacío, significa "todas las regiones"
-        print(f"✅ Consultando todas las regiones")
+        log.debug("✅ Consultando todas las regiones")
     
     # Separar fuentes entre Radio/TV y Redes
     fuentes_radio_tv = [f for f in fuentes if f in ['RADIO', 'TV']]
@@ -302,19 +252,19 @@ def data_section_14_favor_contra_neutral_sql(fecha_inicio: str, fecha_fin: str,
     
     # Obtener datos de Radio/TV
     if fuentes_radio_tv:
-        print(f"🔍 Consultando Radio/TV...")
+        log.debug("🔍 Consultando Radio/TV...")
         resultado_radio_tv = conteo_favor_contra_radio_tv(
             fecha_inicio, fecha_fin, ids_lugares, fuentes_radio_tv, option_nota
         )
-        print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} filas")
+        log.debug("📻📺 Radio/TV: %s filas", len(resultado_radio_tv))
     
     # Obtener datos de Redes
     if incluye_redes:
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_redes = conteo_favor_contra_redes(
             fecha_inicio, fecha_fin, ids_lugares, option_nota
         )
-        print(f"📱 Redes: {len(resultado_redes)} filas")
+        log.debug("📱 Redes: %s filas", len(resultado_redes))
     
     # Combinar resultados
     if not resultado_radio_tv.empty and not resultado_redes.empty:
@@ -1,58 +1,15 @@
 # sections/functions/grafico18.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
+from core.query_executor import ejecutar_query
+
 # Importar constantes
 from config.constants import ID_POSICION_DICT
+from core.logger import obtener_logger
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -69,13 +26,13 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 
@@ -158,7 +115,7 @@ def conteo_por_canal_posicion(fecha_inicio: str, fecha_fin: str, lugar: int,
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_por_canal_posicion: {e}")
+        log.error("Error en conteo_por_canal_posicion: %s", e)
         return pd.DataFrame()
 
 
@@ -210,7 +167,7 @@ def conteo_por_pagina_posicion(fecha_inicio: str, fecha_fin: str, lugar: int,
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_por_pagina_posicion: {e}")
+        log.error("Error en conteo_por_pagina_posicion: %s", e)
         return pd.DataFrame()
 
 
@@ -234,7 +191,7 @@ def data_section_18_tendencia_por_medio_sql(fecha_inicio: str, fecha_fin: str,
         DataFrame con columnas: medio_nombre, id_posicion, frecuencia
     """
     
-    print(f"DEBUG grafico18: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugar={lugar}, fuente={fuente}, option_nota={option_nota}")
+    log.debug("grafico18: fecha_inicio=%s, fecha_fin=%s, lugar=%s, fuente=%s, option_nota=%s", fecha_inicio, fecha_fin, lugar, fuente, option_nota)
     
     # Obtener ID del lugar
     id_lugar = obtener_id_lugar(lugar)
@@ -243,19 +200,19 @@ def data_section_18_tendencia_por_medio_sql(fecha_inicio: str, fecha_fin: str,
     
     # Obtener datos según la fuente seleccionada
     if fuente == "Redes":
-        print(f"🔍 Consultando Redes (Facebook)...")
+        log.debug("🔍 Consultando Redes (Facebook)...")
         resultado = conteo_por_pagina_posicion(
             fecha_inicio, fecha_fin, id_lugar, option_nota
         )
         if not resultado.empty:
-            print(f"📱 Redes: {len(resultado)} combinaciones página-posición encontradas")
+            log.debug("📱 Redes: %s combinaciones página-posición encontradas", len(resultado))
     else:  # Radio o TV
-        print(f"🔍 Consultando {fuente}...")
+        log.debug("🔍 Consultando %s...", fuente)
         resultado = conteo_por_canal_posicion(
             fecha_inicio, fecha_fin, id_lugar, fuente, option_nota
         )
         if not resultado.empty:
-            print(f"📻📺 {fuente}: {len(resultado)} combinaciones canal-posición encontradas")
+            log.debug("📻📺 %s: %s combinaciones canal-posición encontradas", fuente, len(resultado))
     
     # Si tenemos datos, mapear posiciones a nombres
     if not resultado.empty:
@@ -1,58 +1,15 @@
 # sections/functions/grafico19.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
+from core.query_executor import ejecutar_query
+
 # Importar constantes
 from config.constants import ID_POSICION_DICT
+from core.logger import obtener_logger
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
+log = obtener_logger(__name__)
 
 def conteo_por_posicion_radio_tv(fecha_inicio: str, fecha_fin: str, option_nota: str) -> pd.DataFrame:
     """
@@ -119,7 +76,7 @@ def conteo_por_posicion_radio_tv(fecha_inicio: str, fecha_fin: str, option_nota:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_por_posicion_radio_tv: {e}")
+        log.error("Error en conteo_por_posicion_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -168,7 +125,7 @@ def conteo_por_posicion_redes(fecha_inicio: str, fecha_fin: str, option_nota: st
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_por_posicion_redes: {e}")
+        log.error("Error en conteo_por_posicion_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -190,25 +147,25 @@ def data_section_19_notas_tiempo_posicion_sql(fecha_inicio: str, fecha_fin: str,
         DataFrame con columnas: id_posicion, frecuencia
     """
     
-    print(f"DEBUG grafico19: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, option_nota={option_nota}")
-    print(f"📍 TODOS los lugares | 📻📺📱 TODAS las fuentes (Radio + TV + Redes)")
+    log.debug("grafico19: fecha_inicio=%s, fecha_fin=%s, option_nota=%s", fecha_inicio, fecha_fin, option_nota)
+    log.debug("📍 TODOS los lugares | 📻📺📱 TODAS las fuentes (Radio + TV + Redes)")
     
     # Inicializar resultado
     resultado_final = pd.DataFrame()
     
     # Obtener datos de Radio/TV
-    print(f"🔍 Consultando Radio + TV...")
+    log.debug("🔍 Consultando Radio + TV...")
     resultado_radio_tv = conteo_por_posicion_radio_tv(fecha_inicio, fecha_fin, option_nota)
     if not resultado_radio_tv.empty:
         resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
-        print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} posiciones encontradas")
+        log.debug("📻📺 Radio/TV: %s posiciones encontradas", len(resultado_radio_tv))
     
     # Obtener datos de Redes
-    print(f"🔍 Consultando Redes...")
+    log.debug("🔍 Consultando Redes...")
     resultado_redes = conteo_por_posicion_redes(fecha_inicio, fecha_fin, option_nota)
     if not resultado_redes.empty:
         resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
-        print(f"📱 Redes: {len(resultado_redes)} posiciones encontradas")
+        log.debug("📱 Redes: %s posiciones encontradas", len(resultado_redes))
     
     # Si tenemos datos, agrupar por posición
     if not resultado_final.empty:
@@ -221,7 +178,7 @@ def data_section_19_notas_tiempo_posicion_sql(fecha_inicio: str, fecha_fin: str,
         # Ordenar por id_posicion para consistencia visual
         df_grouped = df_grouped.sort_values('id_posicion').reset_index(drop=True)
         
-        print(f"✅ Total: {len(df_grouped)} posiciones con datos")
+        log.debug("✅ Total: %s posiciones con datos", len(df_grouped))
         return df_grouped
     
     return pd.DataFrame()
\ No newline at end of file
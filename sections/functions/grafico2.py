@@ -1,59 +1,13 @@
 # sections/functions/grafico2.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 from pathlib import Path
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
- #   env_path = Path(__file__).parent.parent.parent / '.env'
- #   if env_path.exists():
- #    from dotenv import load_dotenv
- #    load_dotenv(env_path)
- #    print(f"✅ .env cargado desde: {env_path}")
- #    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -70,16 +24,16 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
-def posiciones_radio_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd.DataFrame:
+def posiciones_radio_con_sin_coctel(fecha_inicio: str, fecha_fin: str, id_lugar: int) -> pd.DataFrame:
     """
     Obtiene las posiciones de publicaciones CON y SIN coctel para RADIO
     
@@ -87,10 +41,6 @@ def posiciones_radio_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: st
         DataFrame con columnas: id_posicion, tipo_coctel, cantidad
     """
     
-    id_lugar = obtener_id_lugar(lugar)
-    if id_lugar is None:
-        return pd.DataFrame()
-    
     query = """
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -126,10 +76,10 @@ def posiciones_radio_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: st
         resultado = ejecutar_query(query, params=[id_lugar, fecha_inicio, fecha_fin])
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en posiciones_radio_con_sin_coctel: {e}")
+        log.error("Error en posiciones_radio_con_sin_coctel: %s", e)
         return pd.DataFrame()
 
-def posiciones_tv_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd.DataFrame:
+def posiciones_tv_con_sin_coctel(fecha_inicio: str, fecha_fin: str, id_lugar: int) -> pd.DataFrame:
     """
     Obtiene las posiciones de publicaciones CON y SIN coctel para TV
     
@@ -137,10 +87,6 @@ def posiciones_tv_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: str)
         DataFrame con columnas: id_posicion, tipo_coctel, cantidad
     """
     
-    id_lugar = obtener_id_lugar(lugar)
-    if id_lugar is None:
-        return pd.DataFrame()
-    
     query = """
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -176,7 +122,7 @@ def posiciones_tv_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: str)
         resultado = ejecutar_query(query, params=[id_lugar, fecha_inicio, fecha_fin])
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en posiciones_tv_con_sin_coctel: {e}")
+        log.error("Error en posiciones_tv_con_sin_coctel: %s", e)
         return pd.DataFrame()
 
 def data_section_2_posiciones_coctel_sql(fecha_inicio: str, fecha_fin: str, lugar: str) -> tuple:
@@ -187,19 +133,24 @@ def data_section_2_posiciones_coctel_sql(fecha_inicio: str, fecha_fin: str, luga
         Tupla con (df_radio, df_tv, df_redes)
     """
     
+    # Un solo lookup del id para las tres consultas
+    id_lugar = obtener_id_lugar(lugar)
+    if id_lugar is None:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    
     try:
-        df_radio = posiciones_radio_con_sin_coctel(fecha_inicio, fecha_fin, lugar)
-        df_tv = posiciones_tv_con_sin_coctel(fecha_inicio, fecha_fin, lugar)
-        df_redes = posiciones_redes_con_sin_coctel(fecha_inicio, fecha_fin, lugar)
+        df_radio = posiciones_radio_con_sin_coctel(fecha_inicio, fecha_fin, id_lugar)
+        df_tv = posiciones_tv_con_sin_coctel(fecha_inicio, fecha_fin, id_lugar)
+        df_redes = posiciones_redes_con_sin_coctel(fecha_inicio, fecha_fin, id_lugar)
         
-        print(f"📻 Radio: {len(df_radio)} registros")
-        print(f"📺 TV: {len(df_tv)} registros")
-        print(f"📱 Redes: {len(df_redes)} registros")
+        log.debug("📻 Radio: %s registros", len(df_radio))
+        log.debug("📺 TV: %s registros", len(df_tv))
+        log.debug("📱 Redes: %s registros", len(df_redes))
         
         return df_radio, df_tv, df_redes
         
     except Exception as e:
-        print(f"Error en data_section_2_posiciones_coctel_sql: {e}")
+        log.error("Error en data_section_2_posiciones_coctel_sql: %s", e)
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
 
@@ -300,7 +251,7 @@ def preparar_datos_para_grafico(df_radio: pd.DataFrame, df_tv: pd.DataFrame, df_
     return resultado
 
 
-def posiciones_redes_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd.DataFrame:
+def posiciones_redes_con_sin_coctel(fecha_inicio: str, fecha_fin: str, id_lugar: int) -> pd.DataFrame:
     """
     Obtiene las posiciones de publicaciones CON y SIN coctel para REDES (Facebook)
     
@@ -308,10 +259,6 @@ def posiciones_redes_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: st
         DataFrame con columnas: id_posicion, tipo_coctel, cantidad
     """
     
-    id_lugar = obtener_id_lugar(lugar)
-    if id_lugar is None:
-        return pd.DataFrame()
-    
     query = """
     WITH acontecimientos_redes AS (
         SELECT DISTINCT
@@ -343,7 +290,7 @@ def posiciones_redes_con_sin_coctel(fecha_inicio: str, fecha_fin: str, lugar: st
         resultado = ejecutar_query(query, params=[id_lugar, fecha_inicio, fecha_fin])
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en posiciones_redes_con_sin_coctel: {e}")
+        log.error("Error en posiciones_redes_con_sin_coctel: %s", e)
         return pd.DataFrame()
 # Ejemplo de uso:
 # Ejemplo de uso:
@@ -1,58 +1,15 @@
 # sections/functions/grafico20.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
+from core.query_executor import ejecutar_query
+
 # Importar constantes
 from config.constants import ID_POSICION_DICT
+from core.logger import obtener_logger
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -69,13 +26,13 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 
@@ -166,7 +123,7 @@ def conteo_actores_posiciones_radio_tv(fecha_inicio: str, fecha_fin: str, lugar:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_actores_posiciones_radio_tv: {e}")
+        log.error("Error en conteo_actores_posiciones_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -223,7 +180,7 @@ def conteo_actores_posiciones_redes(fecha_inicio: str, fecha_fin: str, lugar: in
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_actores_posiciones_redes: {e}")
+        log.error("Error en conteo_actores_posiciones_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -248,7 +205,7 @@ def data_section_20_actores_posiciones_sql(fecha_inicio: str, fecha_fin: str,
         DataFrame con columnas: nombre, posicion, frecuencia
     """
     
-    print(f"DEBUG grafico20: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugar={lugar}, fuente={fuente}, option_nota={option_nota}")
+    log.debug("grafico20: fecha_inicio=%s, fecha_fin=%s, lugar=%s, fuente=%s, option_nota=%s", fecha_inicio, fecha_fin, lugar, fuente, option_nota)
     
     # Obtener ID del lugar
     id_lugar = obtener_id_lugar(lugar)
@@ -260,22 +217,22 @@ def data_section_20_actores_posiciones_sql(fecha_inicio: str, fecha_fin: str,
     
     # Obtener datos según la fuente seleccionada
     if fuente in ["Radio", "TV", "Todos"]:
-        print(f"🔍 Consultando Radio/TV...")
+        log.debug("🔍 Consultando Radio/TV...")
         resultado_radio_tv = conteo_actores_posiciones_radio_tv(
             fecha_inicio, fecha_fin, id_lugar, fuente, option_nota
         )
         if not resultado_radio_tv.empty:
             resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
-            print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} combinaciones actor-posición encontradas")
+            log.debug("📻📺 Radio/TV: %s combinaciones actor-posición encontradas", len(resultado_radio_tv))
     
     if fuente in ["Redes", "Todos"]:
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_redes = conteo_actores_posiciones_redes(
             fecha_inicio, fecha_fin, id_lugar, option_nota
         )
         if not resultado_redes.empty:
             resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
-            print(f"📱 Redes: {len(resultado_redes)} combinaciones actor-posición encontradas")
+            log.debug("📱 Redes: %s combinaciones actor-posición encontradas", len(resultado_redes))
     
     # Si tenemos datos, procesar
     if not resultado_final.empty:
@@ -296,7 +253,7 @@ def data_section_20_actores_posiciones_sql(fecha_inicio: str, fecha_fin: str,
         df_top['nombre'] = pd.Categorical(df_top['nombre'], categories=actor_totals.index, ordered=True)
         df_top = df_top.sort_values(['nombre', 'posicion'])
         
-        print(f"✅ TOP {len(top_actores)} actores encontrados (excluyendo 'periodista')")
+        log.debug("✅ TOP %s actores encontrados (excluyendo 'periodista')", len(top_actores))
         return df_top
     
     return pd.DataFrame()
\ No newline at end of file
@@ -1,55 +1,12 @@
 # sections/functions/grafico21.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def data_section_21_porcentaje_medios_sql(
     fecha_inicio: str, 
@@ -74,15 +31,12 @@ def data_section_21_porcentaje_medios_sql(
         DataFrame con columnas: lugar, fuente, total_coctel, porcentaje_coctel
     """
     
-    print(f"DEBUG grafico21: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugares={lugares}")
+    log.debug("grafico21: fecha_inicio=%s, fecha_fin=%s, lugares=%s", fecha_inicio, fecha_fin, lugares)
     
     if not lugares:
-        print("⚠️ No se especificaron lugares")
+        log.warning("⚠️ No se especificaron lugares")
         return pd.DataFrame()
     
-    # Crear la lista de parámetros para la cláusula IN
-    lugares_placeholders = ','.join(['%s'] * len(lugares))
-    
     # QUERY PARA RADIO Y TV (con deduplicación por programa)
     query_radio_tv = f"""
     WITH acontecimientos_programas AS (
@@ -99,7 +53,7 @@ def data_section_21_porcentaje_medios_sql(
         INNER JOIN fuentes f ON p.id_fuente = f.id
         WHERE (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
-            AND l.nombre IN ({lugares_placeholders})
+            AND l.nombre = ANY(%s)
             AND a.id_nota IS NOT NULL  -- Solo cocteles
             AND p.id_fuente IN (1, 2)  -- Solo Radio (1) y TV (2)
     ),
@@ -133,25 +87,25 @@ def data_section_21_porcentaje_medios_sql(
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
     WHERE (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
-        AND l.nombre IN ({lugares_placeholders})
+        AND l.nombre = ANY(%s)
         AND a.id_nota IS NOT NULL  -- Solo cocteles
     GROUP BY l.nombre
     ORDER BY l.nombre;
     """
     
-    # Parámetros: fecha_inicio, fecha_fin, y todos los lugares
-    params = [fecha_inicio, fecha_fin] + lugares
+    # Parámetros: fecha_inicio, fecha_fin y la lista de lugares como array
+    params = [fecha_inicio, fecha_fin, lugares]
     
     try:
         # Ejecutar query para Radio/TV
-        print("🔍 Consultando Radio/TV...")
+        log.debug("🔍 Consultando Radio/TV...")
         resultado_radio_tv = ejecutar_query(query_radio_tv, params=params)
-        print(f"📻📺 Radio/TV: {len(resultado_radio_tv) if resultado_radio_tv is not None else 0} filas")
+        log.debug("📻📺 Radio/TV: %s filas", len(resultado_radio_tv) if resultado_radio_tv is not None else 0)
         
         # Ejecutar query para Redes
-        print("🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_redes = ejecutar_query(query_redes, params=params)
-        print(f"📱 Redes: {len(resultado_redes) if resultado_redes is not None else 0} filas")
+        log.debug("📱 Redes: %s filas", len(resultado_redes) if resultado_redes is not None else 0)
         
         # Combinar resultados
         resultado_combinado = pd.DataFrame()
@@ -163,7 +117,7 @@ def data_section_21_porcentaje_medios_sql(
             resultado_combinado = pd.concat([resultado_combinado, resultado_redes], ignore_index=True)
         
         if resultado_combinado.empty:
-            print("⚠️ No se encontraron datos en ninguna fuente")
+            log.warning("⚠️ No se encontraron datos en ninguna fuente")
             return pd.DataFrame()
         
         # Calcular totales por lugar
@@ -181,13 +135,11 @@ def data_section_21_porcentaje_medios_sql(
         resultado_final = resultado_final[['lugar', 'fuente', 'total_coctel', 'porcentaje_coctel']]
         resultado_final = resultado_final.sort_values(['lugar', 'fuente'])
         
-        print(f"✅ Se encontraron {len(resultado_final)} combinaciones fuente-lugar")
+        log.debug("✅ Se encontraron %s combinaciones fuente-lugar", len(resultado_final))
         return resultado_final
         
     except Exception as e:
-        print(f"❌ Error en data_section_21_porcentaje_medios_sql: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Error en data_section_21_porcentaje_medios_sql: %s", e)
         return pd.DataFrame()
 
 
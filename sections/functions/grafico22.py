@@ -1,57 +1,14 @@
 # sections/functions/grafico22.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -60,21 +17,20 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders});
+    WHERE nombre = ANY(%s);
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
         return resultado['id'].tolist()
     except Exception as e:
-        print(f"Error al buscar lugares: {e}")
+        log.error("Error al buscar lugares: %s", e)
         return []
 
 
@@ -104,8 +60,6 @@ def conteo_coctel_radio_tv_ultimos_3_meses(
     # Mapeo de fuente
     id_fuente = 1 if fuente == 'Radio' else 2
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -118,7 +72,7 @@ def conteo_coctel_radio_tv_ultimos_3_meses(
         INNER JOIN lugares l ON a.id_lugar = l.id
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND a.id_nota IS NOT NULL  -- Solo cocteles
@@ -143,13 +97,13 @@ def conteo_coctel_radio_tv_ultimos_3_meses(
     ORDER BY lugar, fecha_mes;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin, id_fuente]
+    params = [ids_lugares, fecha_inicio, fecha_fin, id_fuente]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_coctel_radio_tv_ultimos_3_meses: {e}")
+        log.error("Error en conteo_coctel_radio_tv_ultimos_3_meses: %s", e)
         return pd.DataFrame()
 
 
@@ -173,8 +127,6 @@ def conteo_coctel_redes_ultimos_3_meses(
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     SELECT 
         l.nombre as lugar,
@@ -183,7 +135,7 @@ def conteo_coctel_redes_ultimos_3_meses(
     FROM acontecimientos a
     INNER JOIN lugares l ON a.id_lugar = l.id
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
         AND a.id_nota IS NOT NULL  -- Solo cocteles
@@ -191,13 +143,13 @@ def conteo_coctel_redes_ultimos_3_meses(
     ORDER BY l.nombre, fecha_mes;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_coctel_redes_ultimos_3_meses: {e}")
+        log.error("Error en conteo_coctel_redes_ultimos_3_meses: %s", e)
         return pd.DataFrame()
 
 
@@ -223,10 +175,10 @@ def data_section_22_ultimos_3_meses_sql(
         DataFrame con columnas: lugar, mes, fecha_mes, total_coctel, porcentaje_coctel
     """
     
-    print(f"DEBUG grafico22: ano_fin={ano_fin}, mes_fin={mes_fin}, lugares={lugares}, fuente={fuente}")
+    log.debug("grafico22: ano_fin=%s, mes_fin=%s, lugares=%s, fuente=%s", ano_fin, mes_fin, lugares, fuente)
     
     if not lugares:
-        print("⚠️ No se especificaron lugares")
+        log.warning("⚠️ No se especificaron lugares")
         return pd.DataFrame()
     
     # Calcular el rango de 3 meses
@@ -240,31 +192,31 @@ def data_section_22_ultimos_3_meses_sql(
     fecha_inicio = fecha_inicio_dt.strftime('%Y-%m-%d')
     fecha_fin = f"{fecha_fin_dt.year}-{fecha_fin_dt.month:02d}-{ultimo_dia:02d}"
     
-    print(f"📅 Rango calculado: {fecha_inicio} a {fecha_fin}")
+    log.debug("📅 Rango calculado: %s a %s", fecha_inicio, fecha_fin)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
     
     if not ids_lugares:
-        print(f"❌ No se encontraron IDs para los lugares: {lugares}")
+        log.error("❌ No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame()
     
     # Obtener datos según la fuente
     if fuente in ['Radio', 'TV']:
-        print(f"🔍 Consultando {fuente}...")
+        log.debug("🔍 Consultando %s...", fuente)
         resultado = conteo_coctel_radio_tv_ultimos_3_meses(fecha_inicio, fecha_fin, ids_lugares, fuente)
     elif fuente == 'Redes':
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado = conteo_coctel_redes_ultimos_3_meses(fecha_inicio, fecha_fin, ids_lugares)
     else:
-        print(f"❌ Fuente inválida: {fuente}")
+        log.error("❌ Fuente inválida: %s", fuente)
         return pd.DataFrame()
     
     if resultado.empty:
-        print(f"⚠️ No se encontraron datos para {fuente}")
+        log.warning("⚠️ No se encontraron datos para %s", fuente)
         return pd.DataFrame()
     
-    print(f"✅ {fuente}: {len(resultado)} filas")
+    log.debug("✅ %s: %s filas", fuente, len(resultado))
     
     # Calcular totales por mes (para el porcentaje)
     totales_mes = resultado.groupby('fecha_mes')['total_coctel'].sum().reset_index()
@@ -292,6 +244,6 @@ def data_section_22_ultimos_3_meses_sql(
     # Seleccionar columnas finales
     resultado_final = resultado_final[['lugar', 'mes', 'fecha_mes', 'total_coctel', 'porcentaje_coctel']]
     
-    print(f"✅ Total combinaciones lugar-mes: {len(resultado_final)}")
+    log.debug("✅ Total combinaciones lugar-mes: %s", len(resultado_final))
     
     return resultado_final
\ No newline at end of file
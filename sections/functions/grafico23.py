@@ -3,6 +3,9 @@
 from .sn import ejecutar_query
 import pandas as pd
 from typing import List
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
@@ -12,28 +15,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 def conteo_acontecimientos_radio_tv_por_lugar_mes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -44,8 +45,6 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(fecha_inicio: str, fecha_fin:
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -58,7 +57,7 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(fecha_inicio: str, fecha_fin:
         INNER JOIN lugares l ON a.id_lugar = l.id
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND a.id_nota IS NOT NULL  -- ✅ SOLO CON CÓCTEL (igual que grafico13.py)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
@@ -93,13 +92,13 @@ def conteo_acontecimientos_radio_tv_por_lugar_mes(fecha_inicio: str, fecha_fin:
         ad.id_fuente;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_acontecimientos_radio_tv_por_lugar_mes: {e}")
+        log.error("Error en conteo_acontecimientos_radio_tv_por_lugar_mes: %s", e)
         return pd.DataFrame()
 
 def conteo_acontecimientos_redes_por_lugar_mes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int]) -> pd.DataFrame:
@@ -110,8 +109,6 @@ def conteo_acontecimientos_redes_por_lugar_mes(fecha_inicio: str, fecha_fin: str
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     SELECT 
         l.nombre as lugar,
@@ -121,7 +118,7 @@ def conteo_acontecimientos_redes_por_lugar_mes(fecha_inicio: str, fecha_fin: str
     FROM acontecimientos a
     INNER JOIN lugares l ON a.id_lugar = l.id
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND a.id_nota IS NOT NULL  -- ✅ SOLO CON CÓCTEL (igual que grafico13.py)
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
@@ -133,13 +130,13 @@ def conteo_acontecimientos_redes_por_lugar_mes(fecha_inicio: str, fecha_fin: str
         año_mes;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_acontecimientos_redes_por_lugar_mes: {e}")
+        log.error("Error en conteo_acontecimientos_redes_por_lugar_mes: %s", e)
         return pd.DataFrame()
     
 def data_section_23_evolucion_mensual_sql(fecha_inicio: str, fecha_fin: str, lugares: List[str]) -> pd.DataFrame:
@@ -154,15 +151,15 @@ def data_section_23_evolucion_mensual_sql(fecha_inicio: str, fecha_fin: str, lug
     if not ids_lugares:
         return pd.DataFrame()
     
-    print(f"🔍 Consultando Radio/TV...")
+    log.debug("🔍 Consultando Radio/TV...")
     # 1. Obtener datos de Radio/TV (tienen id_fuente en tabla fuentes)
     resultado_radio_tv = conteo_acontecimientos_radio_tv_por_lugar_mes(fecha_inicio, fecha_fin, ids_lugares)
-    print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} filas")
+    log.debug("📻📺 Radio/TV: %s filas", len(resultado_radio_tv))
     
-    print(f"🔍 Consultando Redes...")
+    log.debug("🔍 Consultando Redes...")
     # 2. Obtener datos de Redes (NO tienen id_fuente, se maneja por separado)
     resultado_redes = conteo_acontecimientos_redes_por_lugar_mes(fecha_inicio, fecha_fin, ids_lugares)
-    print(f"📱 Redes: {len(resultado_redes)} filas")
+    log.debug("📱 Redes: %s filas", len(resultado_redes))
     
     # 3. Combinar resultados
     resultado_combinado = pd.DataFrame()
@@ -177,13 +174,14 @@ def data_section_23_evolucion_mensual_sql(fecha_inicio: str, fecha_fin: str, lug
         # 4. Agrupar por año_mes y fuente (sumar todos los lugares)
         resultado_final = resultado_combinado.groupby(['año_mes', 'fuente'], as_index=False).agg({'coctel': 'sum'})
         
-        print(f"✅ Datos finales: {len(resultado_final)} filas")
-        print(f"📊 Fuentes encontradas: {resultado_final['fuente'].unique()}")
-        print(f"📅 Meses encontrados: {sorted(resultado_final['año_mes'].unique())}")
+        log.debug("✅ Datos finales: %s filas", len(resultado_final))
+        if log.depurando():
+            log.debug("📊 Fuentes encontradas: %s", resultado_final['fuente'].unique())
+            log.debug("📅 Meses encontrados: %s", sorted(resultado_final['año_mes'].unique()))
         
         return resultado_final
     else:
-        print("⚠️ No se encontraron datos")
+        log.warning("⚠️ No se encontraron datos")
         return pd.DataFrame()
 
 def data_section_23_add_total_line(df: pd.DataFrame) -> pd.DataFrame:
@@ -200,6 +198,7 @@ def data_section_23_add_total_line(df: pd.DataFrame) -> pd.DataFrame:
     # Combinar datos originales con totales
     combined = pd.concat([df, total_monthly], ignore_index=True)
     
-    print(f"📈 Líneas en gráfico: {combined['fuente'].unique()}")
+    if log.depurando():
+        log.debug("📈 Líneas en gráfico: %s", combined['fuente'].unique())
     
     return combined.sort_values(['año_mes', 'fuente'])
\ No newline at end of file
@@ -1,55 +1,12 @@
 # sections/functions/grafico24.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def conteo_mensajes_fuerza_radio_tv(
     fecha_inicio: str,
@@ -106,7 +63,7 @@ def conteo_mensajes_fuerza_radio_tv(
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_mensajes_fuerza_radio_tv: {e}")
+        log.error("Error en conteo_mensajes_fuerza_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -156,7 +113,7 @@ def conteo_mensajes_fuerza_redes(
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_mensajes_fuerza_redes: {e}")
+        log.error("Error en conteo_mensajes_fuerza_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -230,7 +187,7 @@ def conteo_mensajes_fuerza_todos(
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_mensajes_fuerza_todos: {e}")
+        log.error("Error en conteo_mensajes_fuerza_todos: %s", e)
         return pd.DataFrame()
 
 
@@ -255,30 +212,30 @@ def data_section_24_mensajes_fuerza_sql(
         DataFrame con columnas: mensaje_fuerza, coctel (total), porcentaje
     """
     
-    print(f"DEBUG grafico24: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, fuente={fuente}, coctel_type={coctel_type}")
+    log.debug("grafico24: fecha_inicio=%s, fecha_fin=%s, fuente=%s, coctel_type=%s", fecha_inicio, fecha_fin, fuente, coctel_type)
     
     # Obtener datos según la fuente
     if fuente == 'Radio':
-        print(f"🔍 Consultando Radio...")
+        log.debug("🔍 Consultando Radio...")
         resultado = conteo_mensajes_fuerza_radio_tv(fecha_inicio, fecha_fin, 'Radio', coctel_type)
     elif fuente == 'TV':
-        print(f"🔍 Consultando TV...")
+        log.debug("🔍 Consultando TV...")
         resultado = conteo_mensajes_fuerza_radio_tv(fecha_inicio, fecha_fin, 'TV', coctel_type)
     elif fuente == 'Redes':
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado = conteo_mensajes_fuerza_redes(fecha_inicio, fecha_fin, coctel_type)
     elif fuente == 'Todos':
-        print(f"🔍 Consultando Todos...")
+        log.debug("🔍 Consultando Todos...")
         resultado = conteo_mensajes_fuerza_todos(fecha_inicio, fecha_fin, coctel_type)
     else:
-        print(f"❌ Fuente inválida: {fuente}")
+        log.error("❌ Fuente inválida: %s", fuente)
         return pd.DataFrame()
     
     if resultado is None or resultado.empty:
-        print(f"⚠️ No se encontraron datos para {fuente}")
+        log.warning("⚠️ No se encontraron datos para %s", fuente)
         return pd.DataFrame()
     
-    print(f"✅ {fuente}: {len(resultado)} mensajes fuerza encontrados")
+    log.debug("✅ %s: %s mensajes fuerza encontrados", fuente, len(resultado))
     
     # Renombrar columna para coincidir con el código original
     resultado = resultado.rename(columns={'total_acontecimientos': 'coctel'})
@@ -290,6 +247,6 @@ def data_section_24_mensajes_fuerza_sql(
     # Ordenar por cantidad descendente
     resultado = resultado.sort_values('coctel', ascending=False)
     
-    print(f"✅ Total acontecimientos: {total}")
+    log.debug("✅ Total acontecimientos: %s", total)
     
     return resultado
\ No newline at end of file
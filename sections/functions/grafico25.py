@@ -1,55 +1,12 @@
 # sections/functions/grafico25.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any, Tuple
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -64,11 +21,11 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     try:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
         return int(resultado.iloc[0]['id'])
     except Exception as e:
-        print(f"Error al buscar lugar: {e}")
+        log.error("Error al buscar lugar: %s", e)
         return None
 
 
@@ -179,7 +136,7 @@ def impactos_radio_tv(
         return resultado_coctel, resultado_total
         
     except Exception as e:
-        print(f"Error en impactos_radio_tv: {e}")
+        log.error("Error en impactos_radio_tv: %s", e)
         return pd.DataFrame(), pd.DataFrame()
 
 
@@ -281,7 +238,7 @@ def impactos_redes(
         return resultado_coctel, resultado_total
         
     except Exception as e:
-        print(f"Error en impactos_redes: {e}")
+        log.error("Error en impactos_redes: %s", e)
         return pd.DataFrame(), pd.DataFrame()
     
     
@@ -308,35 +265,35 @@ def data_section_25_impactos_programa_sql(
         Tuple de (impactos_con_coctel_df, total_impactos_df)
     """
     
-    print(f"DEBUG grafico25: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugar={lugar}, medio={medio}")
+    log.debug("grafico25: fecha_inicio=%s, fecha_fin=%s, lugar=%s, medio=%s", fecha_inicio, fecha_fin, lugar, medio)
     
     # Obtener ID del lugar
     id_lugar = obtener_id_lugar(lugar)
     if id_lugar is None:
-        print(f"❌ No se encontró el lugar: {lugar}")
+        log.error("❌ No se encontró el lugar: %s", lugar)
         return pd.DataFrame(), pd.DataFrame()
     
-    print(f"✅ ID lugar encontrado: {id_lugar}")
+    log.debug("✅ ID lugar encontrado: %s", id_lugar)
     
     # Obtener datos según el medio
     if medio == 'Radio':
-        print(f"🔍 Consultando Radio...")
+        log.debug("🔍 Consultando Radio...")
         resultado_coctel, resultado_total = impactos_radio_tv(fecha_inicio, fecha_fin, id_lugar, 'Radio')
     elif medio == 'TV':
-        print(f"🔍 Consultando TV...")
+        log.debug("🔍 Consultando TV...")
         resultado_coctel, resultado_total = impactos_radio_tv(fecha_inicio, fecha_fin, id_lugar, 'TV')
     elif medio == 'Redes':
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_coctel, resultado_total = impactos_redes(fecha_inicio, fecha_fin, id_lugar)
     else:
-        print(f"❌ Medio inválido: {medio}")
+        log.error("❌ Medio inválido: %s", medio)
         return pd.DataFrame(), pd.DataFrame()
     
     if resultado_coctel.empty and resultado_total.empty:
-        print(f"⚠️ No se encontraron datos para {medio}")
+        log.warning("⚠️ No se encontraron datos para %s", medio)
         return pd.DataFrame(), pd.DataFrame()
     
-    print(f"✅ {medio} - Impactos con cóctel: {len(resultado_coctel)} programas")
-    print(f"✅ {medio} - Total impactos: {len(resultado_total)} programas")
+    log.debug("✅ %s - Impactos con cóctel: %s programas", medio, len(resultado_coctel))
+    log.debug("✅ %s - Total impactos: %s programas", medio, len(resultado_total))
     
     return resultado_coctel, resultado_total
\ No newline at end of file
@@ -1,55 +1,12 @@
 # sections/functions/grafico26.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def distribucion_cocteles_radio_tv(
     fecha_inicio: str,
@@ -111,7 +68,7 @@ def distribucion_cocteles_radio_tv(
             return pd.DataFrame()
         return resultado
     except Exception as e:
-        print(f"Error en distribucion_cocteles_radio_tv: {e}")
+        log.error("Error en distribucion_cocteles_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -150,7 +107,7 @@ def distribucion_cocteles_redes(
             return pd.DataFrame()
         return resultado
     except Exception as e:
-        print(f"Error en distribucion_cocteles_redes: {e}")
+        log.error("Error en distribucion_cocteles_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -177,15 +134,15 @@ def data_section_26_distribucion_medio_sql(
         TV      | 230
     """
     
-    print(f"DEBUG grafico26: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}")
-    print(f"📊 TODAS las ubicaciones | 📻📺📱 Radio + TV + Redes")
+    log.debug("grafico26: fecha_inicio=%s, fecha_fin=%s", fecha_inicio, fecha_fin)
+    log.debug("📊 TODAS las ubicaciones | 📻📺📱 Radio + TV + Redes")
     
     # Obtener datos de Radio/TV
-    print(f"🔍 Consultando Radio + TV...")
+    log.debug("🔍 Consultando Radio + TV...")
     resultado_radio_tv = distribucion_cocteles_radio_tv(fecha_inicio, fecha_fin)
     
     # Obtener datos de Redes
-    print(f"🔍 Consultando Redes...")
+    log.debug("🔍 Consultando Redes...")
     resultado_redes = distribucion_cocteles_redes(fecha_inicio, fecha_fin)
     
     # Combinar resultados
@@ -193,14 +150,14 @@ def data_section_26_distribucion_medio_sql(
     
     if not resultado_radio_tv.empty:
         resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
-        print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} fuentes encontradas")
+        log.debug("📻📺 Radio/TV: %s fuentes encontradas", len(resultado_radio_tv))
     
     if not resultado_redes.empty:
         resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
-        print(f"📱 Redes: {len(resultado_redes)} fuentes encontradas")
+        log.debug("📱 Redes: %s fuentes encontradas", len(resultado_redes))
     
     if resultado_final.empty:
-        print(f"⚠️ No se encontraron cócteles en el rango de fechas")
+        log.warning("⚠️ No se encontraron cócteles en el rango de fechas")
         return pd.DataFrame()
     
     # Ordenar por fuente para consistencia
@@ -208,6 +165,6 @@ def data_section_26_distribucion_medio_sql(
     
     # Calcular totales
     total_cocteles = resultado_final['count'].sum()
-    print(f"✅ Total: {len(resultado_final)} fuentes con {total_cocteles} cócteles")
+    log.debug("✅ Total: %s fuentes con %s cócteles", len(resultado_final), total_cocteles)
     
     return resultado_final
\ No newline at end of file
@@ -1,66 +1,25 @@
 # sections/functions/grafico27.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
-def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
+def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
-    Obtiene el ID de un lugar dado su nombre.
+    Obtiene los IDs de varios lugares dados sus nombres (una sola query).
     """
-    query = "SELECT id FROM lugares WHERE nombre = %s LIMIT 1;"
-    resultado = ejecutar_query(query, params=[nombre_lugar])
+    if not nombres_lugares:
+        return []
+    query = "SELECT id FROM lugares WHERE nombre = ANY(%s) ORDER BY nombre;"
+    resultado = ejecutar_query(query, params=[list(nombres_lugares)])
     
     if resultado is not None and not resultado.empty:
-        return int(resultado.iloc[0]['id'])
-    return None
+        return [int(i) for i in resultado['id']]
+    return []
 
 
 def favor_contra_mensual_radio_tv(
@@ -94,8 +53,6 @@ def favor_contra_mensual_radio_tv(
     else:  # "Todos"
         filtro_fuente = "AND p.id_fuente IN (1, 2)"
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     WITH acontecimientos_programas AS (
         -- Paso 1: Obtener todas las combinaciones acontecimiento-programa
@@ -107,7 +64,7 @@ def favor_contra_mensual_radio_tv(
         FROM acontecimientos a
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             {filtro_fuente}
@@ -134,13 +91,13 @@ def favor_contra_mensual_radio_tv(
     ORDER BY mes;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en favor_contra_mensual_radio_tv: {e}")
+        log.error("Error en favor_contra_mensual_radio_tv: %s", e)
         return pd.DataFrame()
 
 
@@ -165,8 +122,6 @@ def favor_contra_mensual_redes(
     if not ids_lugares:
         return pd.DataFrame()
     
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     query = f"""
     SELECT 
         DATE_TRUNC('month', a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima') as mes,
@@ -175,7 +130,7 @@ def favor_contra_mensual_redes(
         COUNT(*) as total
     FROM acontecimientos a
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
         AND a.id_posicion IS NOT NULL
@@ -183,13 +138,13 @@ def favor_contra_mensual_redes(
     ORDER BY mes;
     """
     
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en favor_contra_mensual_redes: {e}")
+        log.error("Error en favor_contra_mensual_redes: %s", e)
         return pd.DataFrame()
 
 
@@ -221,46 +176,42 @@ def data_section_27_favor_contra_mensual_sql(
         Feb-25    | En contra (%)   | 21.3
     """
     
-    print(f"DEBUG grafico27: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}")
-    print(f"📊 Regiones: {regiones} | 📻📺📱 Medio: {medio}")
+    log.debug("grafico27: fecha_inicio=%s, fecha_fin=%s", fecha_inicio, fecha_fin)
+    log.debug("📊 Regiones: %s | 📻📺📱 Medio: %s", regiones, medio)
     
     # Convertir nombres de lugares a IDs
-    ids_lugares = []
-    for region in regiones:
-        id_lugar = obtener_id_lugar(region)
-        if id_lugar:
-            ids_lugares.append(id_lugar)
+    ids_lugares = obtener_ids_lugares(regiones)
     
     if not ids_lugares:
-        print(f"⚠️ No se encontraron IDs para las regiones: {regiones}")
+        log.warning("⚠️ No se encontraron IDs para las regiones: %s", regiones)
         return pd.DataFrame()
     
-    print(f"🔍 IDs de lugares: {ids_lugares}")
+    log.debug("🔍 IDs de lugares: %s", ids_lugares)
     
     # Obtener datos según el medio
     resultado = pd.DataFrame()
     
     if medio in ["Radio", "TV", "Todos"]:
-        print(f"🔍 Consultando Radio/TV...")
+        log.debug("🔍 Consultando Radio/TV...")
         resultado_radio_tv = favor_contra_mensual_radio_tv(
             fecha_inicio, fecha_fin, ids_lugares, medio
         )
         if not resultado_radio_tv.empty:
             resultado = resultado_radio_tv
-            print(f"📻📺 Radio/TV: {len(resultado_radio_tv)} meses encontrados")
+            log.debug("📻📺 Radio/TV: %s meses encontrados", len(resultado_radio_tv))
     
     if medio == "Redes":
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_redes = favor_contra_mensual_redes(
             fecha_inicio, fecha_fin, ids_lugares
         )
         if not resultado_redes.empty:
             resultado = resultado_redes
-            print(f"📱 Redes: {len(resultado_redes)} meses encontrados")
+            log.debug("📱 Redes: %s meses encontrados", len(resultado_redes))
     
     elif medio == "Todos":
         # Combinar Radio/TV + Redes
-        print(f"🔍 Consultando Redes...")
+        log.debug("🔍 Consultando Redes...")
         resultado_redes = favor_contra_mensual_redes(
             fecha_inicio, fecha_fin, ids_lugares
         )
@@ -274,12 +225,12 @@ def data_section_27_favor_contra_mensual_sql(
                     'en_contra': 'sum',
                     'total': 'sum'
                 })
-                print(f"📱 Redes: {len(resultado_redes)} meses encontrados")
+                log.debug("📱 Redes: %s meses encontrados", len(resultado_redes))
             else:
                 resultado = resultado_redes
     
     if resultado.empty:
-        print(f"⚠️ No se encontraron datos en el rango de fechas")
+        log.warning("⚠️ No se encontraron datos en el rango de fechas")
         return pd.DataFrame()
     
     # Calcular porcentajes
@@ -310,6 +261,6 @@ def data_section_27_favor_contra_mensual_sql(
     # Ordenar por mes
     long_df = long_df.sort_values('mes').reset_index(drop=True)
     
-    print(f"✅ Total: {len(long_df)} filas (2 × {len(resultado)} meses)")
+    log.debug("✅ Total: %s filas (2 × %s meses)", len(long_df), len(resultado))
     
     return long_df[['mes_str', 'Tipo', 'Porcentaje']]
\ No newline at end of file
@@ -1,52 +1,10 @@
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-# --- FUNCIÓN DE CONEXIÓN LOCAL ---
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query_copy
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 # --- LÓGICA DEL GRÁFICO 28 (CORREGIDA - CON DISTINCT PARA IGUALAR A SN.PY) ---
 
@@ -147,10 +105,11 @@ def obtener_data_grafico28(id_fuente=None):
         ORDER BY mes_sort DESC, nombre_usuario ASC, region ASC;
         """
 
-    print(f"DEBUG grafico28: Ejecutando consulta CON DISTINCT (id_fuente={id_fuente})...")
+    log.debug("grafico28: Ejecutando consulta CON DISTINCT (id_fuente=%s)...", id_fuente)
     
     try:
-        df = ejecutar_query(query)
+        # Extracción de 11 meses: COPY cuando el resultado estimado es grande
+        df = ejecutar_query_copy(query)
         
         if df is None or df.empty:
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
@@ -206,5 +165,5 @@ def obtener_data_grafico28(id_fuente=None):
         return df_con, df_sin, df_total
 
     except Exception as e:
-        print(f"❌ Error en grafico28: {e}")
+        log.error("❌ Error en grafico28: %s", e)
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
\ No newline at end of file
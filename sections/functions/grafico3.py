@@ -1,55 +1,12 @@
 # sections/functions/grafico3.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -66,13 +23,13 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 
@@ -90,7 +47,7 @@ def data_section_3_tendencia_semanal_sql(fecha_inicio: str, fecha_fin: str, luga
         DataFrame con columnas: semana, fecha_registro, total_acontecimientos, total_con_coctel, porcentaje
     """
     
-    print(f"DEBUG grafico3: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugar={lugar}, fuente={fuente}")
+    log.debug("grafico3: fecha_inicio=%s, fecha_fin=%s, lugar=%s, fuente=%s", fecha_inicio, fecha_fin, lugar, fuente)
     
     # Obtener ID del lugar
     id_lugar = obtener_id_lugar(lugar)
@@ -228,18 +185,18 @@ def data_section_3_tendencia_semanal_sql(fecha_inicio: str, fecha_fin: str, luga
                     # Ninguno tiene datos
                     resultado = pd.DataFrame()
         else:
-            print(f"ERROR: Fuente no válida: {fuente}")
+            log.error("Fuente no válida: %s", fuente)
             return pd.DataFrame()
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron datos para {lugar} - {fuente}")
+            log.warning("No se encontraron datos para %s - %s", lugar, fuente)
             return pd.DataFrame()
         
-        print(f"Resultado query grafico3: {len(resultado)} semanas encontradas")
+        log.debug("Resultado query grafico3: %s semanas encontradas", len(resultado))
         return resultado
         
     except Exception as e:
-        print(f"Error en data_section_3_tendencia_semanal_sql: {e}")
+        log.error("Error en data_section_3_tendencia_semanal_sql: %s", e)
         return pd.DataFrame()
 
 
@@ -1,55 +1,12 @@
 # sections/functions/grafico5.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -58,28 +15,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 
@@ -99,16 +54,13 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
                                 total_con_coctel, porcentaje
     """
     
-    print(f"DEBUG grafico5: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugares={lugares}, fuente={fuente}")
+    log.debug("grafico5: fecha_inicio=%s, fecha_fin=%s, lugares=%s, fuente=%s", fecha_inicio, fecha_fin, lugares, fuente)
     
     # Obtener IDs de lugares
     ids_lugares = obtener_ids_lugares(lugares)
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para IN clause
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     # Query para Radio y TV (cuando un acontecimiento tiene 2 programas, cuenta x2)
     query_radio_tv = f"""
     WITH acontecimientos_programas AS (
@@ -124,7 +76,7 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND p.id_fuente IN ({{fuente_filter}})
@@ -166,7 +118,7 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
         FROM acontecimientos a
         INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
     ),
@@ -198,18 +150,18 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
         if fuente == "Radio":
             # Solo Radio (id_fuente = 1)
             query_final = query_radio_tv.format(fuente_filter="1")
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado = ejecutar_query(query_final, params=params)
             
         elif fuente == "TV":
             # Solo TV (id_fuente = 2)
             query_final = query_radio_tv.format(fuente_filter="2")
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado = ejecutar_query(query_final, params=params)
             
         elif fuente == "Redes":
             # Solo Redes sociales
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado = ejecutar_query(query_redes, params=params)
             
         elif fuente == "Todos":
@@ -217,11 +169,11 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
             
             # 1. Radio + TV
             query_final = query_radio_tv.format(fuente_filter="1, 2")
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado_radio_tv = ejecutar_query(query_final, params=params)
             
             # 2. Redes
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado_redes = ejecutar_query(query_redes, params=params)
             
             # 3. Combinar resultados sumando por semana y lugar
@@ -248,18 +200,18 @@ def data_section_5_acumulativo_lugares_sql(fecha_inicio: str, fecha_fin: str, lu
                     # Ninguno tiene datos
                     resultado = pd.DataFrame()
         else:
-            print(f"ERROR: Fuente no válida: {fuente}")
+            log.error("Fuente no válida: %s", fuente)
             return pd.DataFrame()
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron datos para {lugares} - {fuente}")
+            log.warning("No se encontraron datos para %s - %s", lugares, fuente)
             return pd.DataFrame()
         
-        print(f"Resultado query grafico5: {len(resultado)} registros encontrados")
+        log.debug("Resultado query grafico5: %s registros encontrados", len(resultado))
         return resultado
         
     except Exception as e:
-        print(f"Error en data_section_5_acumulativo_lugares_sql: {e}")
+        log.error("Error en data_section_5_acumulativo_lugares_sql: %s", e)
         return pd.DataFrame()
 
 
@@ -1,55 +1,12 @@
 # sections/functions/grafico6.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
     """
@@ -66,13 +23,13 @@ def obtener_id_lugar(nombre_lugar: str) -> Optional[int]:
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 
@@ -99,7 +56,7 @@ def data_section_6_top_medios_sql(fecha_inicio: str, fecha_fin: str, lugar: str,
         DataFrame con columnas: viernes, nombre_medio, porcentaje
     """
     
-    print(f"DEBUG grafico6: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, lugar={lugar}, fuente={fuente}, top_n={top_n}")
+    log.debug("grafico6: fecha_inicio=%s, fecha_fin=%s, lugar=%s, fuente=%s, top_n=%s", fecha_inicio, fecha_fin, lugar, fuente, top_n)
     
     # Obtener ID del lugar
     id_lugar = obtener_id_lugar(lugar)
@@ -236,18 +193,18 @@ def data_section_6_top_medios_sql(fecha_inicio: str, fecha_fin: str, lugar: str,
             resultado = ejecutar_query(query_redes, params=params)
             
         else:
-            print(f"ERROR: Fuente no válida: {fuente}")
+            log.error("Fuente no válida: %s", fuente)
             return pd.DataFrame()
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron datos para {lugar} - {fuente}")
+            log.warning("No se encontraron datos para %s - %s", lugar, fuente)
             return pd.DataFrame()
         
-        print(f"Resultado query grafico6: {len(resultado)} registros encontrados")
+        log.debug("Resultado query grafico6: %s registros encontrados", len(resultado))
         return resultado
         
     except Exception as e:
-        print(f"Error en data_section_6_top_medios_sql: {e}")
+        log.error("Error en data_section_6_top_medios_sql: %s", e)
         return pd.DataFrame()
 
 
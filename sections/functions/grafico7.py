@@ -1,58 +1,15 @@
 # sections/functions/grafico7.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
+from core.query_executor import ejecutar_query
+
 # Importar las macroregiones desde constants
 from config.constants import MACROREGIONES
+from core.logger import obtener_logger
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -61,28 +18,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 
@@ -101,24 +56,21 @@ def data_section_7_macroregion_sql(fecha_inicio: str, fecha_fin: str, macroregio
                                 total_con_coctel, porcentaje
     """
     
-    print(f"DEBUG grafico7: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, macroregion={macroregion}, fuente={fuente}")
+    log.debug("grafico7: fecha_inicio=%s, fecha_fin=%s, macroregion=%s, fuente=%s", fecha_inicio, fecha_fin, macroregion, fuente)
     
     # Obtener lista de lugares de la macroregión
     lugares_macroregion = MACROREGIONES.get(macroregion, [])
     if not lugares_macroregion:
-        print(f"Macroregión '{macroregion}' no encontrada")
+        log.debug("Macroregión '%s' no encontrada", macroregion)
         return pd.DataFrame()
     
-    print(f"Lugares en {macroregion}: {lugares_macroregion}")
+    log.debug("Lugares en %s: %s", macroregion, lugares_macroregion)
     
     # Obtener IDs de lugares
     ids_lugares = obtener_ids_lugares(lugares_macroregion)
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para IN clause
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     # Query para Radio y TV
     query_radio_tv = f"""
     WITH acontecimientos_programas AS (
@@ -134,7 +86,7 @@ def data_section_7_macroregion_sql(fecha_inicio: str, fecha_fin: str, macroregio
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND p.id_fuente = %s
@@ -180,7 +132,7 @@ def data_section_7_macroregion_sql(fecha_inicio: str, fecha_fin: str, macroregio
         FROM acontecimientos a
         INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
         INNER JOIN lugares l ON a.id_lugar = l.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
     ),
@@ -214,30 +166,30 @@ def data_section_7_macroregion_sql(fecha_inicio: str, fecha_fin: str, macroregio
     
     try:
         if fuente == "Radio":
-            params = ids_lugares + [fecha_inicio, fecha_fin, 1]  # id_fuente = 1
+            params = [ids_lugares, fecha_inicio, fecha_fin, 1]  # id_fuente = 1
             resultado = ejecutar_query(query_radio_tv, params=params)
             
         elif fuente == "TV":
-            params = ids_lugares + [fecha_inicio, fecha_fin, 2]  # id_fuente = 2
+            params = [ids_lugares, fecha_inicio, fecha_fin, 2]  # id_fuente = 2
             resultado = ejecutar_query(query_radio_tv, params=params)
             
         elif fuente == "Redes":
-            params = ids_lugares + [fecha_inicio, fecha_fin]
+            params = [ids_lugares, fecha_inicio, fecha_fin]
             resultado = ejecutar_query(query_redes, params=params)
             
         else:
-            print(f"ERROR: Fuente no válida: {fuente}")
+            log.error("Fuente no válida: %s", fuente)
             return pd.DataFrame()
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron datos para {macroregion} - {fuente}")
+            log.warning("No se encontraron datos para %s - %s", macroregion, fuente)
             return pd.DataFrame()
         
-        print(f"Resultado query grafico7: {len(resultado)} registros encontrados")
+        log.debug("Resultado query grafico7: %s registros encontrados", len(resultado))
         return resultado
         
     except Exception as e:
-        print(f"Error en data_section_7_macroregion_sql: {e}")
+        log.error("Error en data_section_7_macroregion_sql: %s", e)
         return pd.DataFrame()
 
 
@@ -1,54 +1,12 @@
 # sections/functions/grafico8.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_id_lugar(nombre_lugar):
     """
@@ -65,24 +23,20 @@ def obtener_id_lugar(nombre_lugar):
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
-def conteo_posiciones_radio_tv(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd.DataFrame:
+def conteo_posiciones_radio_tv(fecha_inicio: str, fecha_fin: str, id_lugar: int) -> pd.DataFrame:
     """
     Obtiene conteo de posiciones para Radio y TV con programas
     """
     
-    id_lugar = obtener_id_lugar(lugar)
-    if id_lugar is None:
-        return pd.DataFrame()
-    
     query = """
     WITH acontecimientos_programas AS (
         SELECT DISTINCT
@@ -141,18 +95,14 @@ def conteo_posiciones_radio_tv(fecha_inicio: str, fecha_fin: str, lugar: str) ->
         resultado = ejecutar_query(query, params=[id_lugar, fecha_inicio, fecha_fin])
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_posiciones_radio_tv: {e}")
+        log.error("Error en conteo_posiciones_radio_tv: %s", e)
         return pd.DataFrame()
 
-def conteo_posiciones_redes(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd.DataFrame:
+def conteo_posiciones_redes(fecha_inicio: str, fecha_fin: str, id_lugar: int) -> pd.DataFrame:
     """
     Obtiene conteo de posiciones para Redes Sociales con facebook posts
     """
     
-    id_lugar = obtener_id_lugar(lugar)
-    if id_lugar is None:
-        return pd.DataFrame()
-    
     query = """
     SELECT 
         a.id_posicion as posicion,
@@ -182,7 +132,7 @@ def conteo_posiciones_redes(fecha_inicio: str, fecha_fin: str, lugar: str) -> pd
         resultado = ejecutar_query(query, params=[id_lugar, fecha_inicio, fecha_fin])
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_posiciones_redes: {e}")
+        log.error("Error en conteo_posiciones_redes: %s", e)
         return pd.DataFrame()
 
 def data_section_8_conteo_posiciones_sql(fecha_inicio: str, fecha_fin: str, lugar: str, option_fuente: str = "Todos", option_nota: str = "Todos") -> pd.DataFrame:
@@ -202,10 +152,15 @@ def data_section_8_conteo_posiciones_sql(fecha_inicio: str, fecha_fin: str, luga
     
     resultado_final = pd.DataFrame()
     
+    # Un solo lookup del id para Radio/TV y Redes
+    id_lugar = obtener_id_lugar(lugar)
+    if id_lugar is None:
+        return resultado_final
+    
     try:
         # Obtener datos según la fuente seleccionada
         if option_fuente in ["Radio", "TV", "Todos"]:
-            resultado_radio_tv = conteo_posiciones_radio_tv(fecha_inicio, fecha_fin, lugar)
+            resultado_radio_tv = conteo_posiciones_radio_tv(fecha_inicio, fecha_fin, id_lugar)
             if not resultado_radio_tv.empty:
                 # Filtrar por fuente específica si no es "Todos"
                 if option_fuente == "Radio":
@@ -216,7 +171,7 @@ def data_section_8_conteo_posiciones_sql(fecha_inicio: str, fecha_fin: str, luga
                 resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
         
         if option_fuente in ["Redes", "Todos"]:
-            resultado_redes = conteo_posiciones_redes(fecha_inicio, fecha_fin, lugar)
+            resultado_redes = conteo_posiciones_redes(fecha_inicio, fecha_fin, id_lugar)
             if not resultado_redes.empty:
                 resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
         if not resultado_final.empty and option_nota == "Todos":
@@ -241,7 +196,7 @@ def data_section_8_conteo_posiciones_sql(fecha_inicio: str, fecha_fin: str, luga
         return resultado_final
         
     except Exception as e:
-        print(f"Error en data_section_8_conteo_posiciones_sql: {e}")
+        log.error("Error en data_section_8_conteo_posiciones_sql: %s", e)
         return pd.DataFrame()
 
 def convertir_posicion_a_nombre(df: pd.DataFrame) -> pd.DataFrame:
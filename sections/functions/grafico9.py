@@ -1,54 +1,12 @@
 # sections/functions/grafico9.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     """
@@ -57,28 +15,26 @@ def obtener_ids_lugares(nombres_lugares: List[str]) -> List[int]:
     if not nombres_lugares:
         return []
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(nombres_lugares))
     query = f"""
     SELECT id, nombre 
     FROM lugares 
-    WHERE nombre IN ({placeholders})
+    WHERE nombre = ANY(%s)
     ORDER BY nombre;
     """
     
     try:
-        resultado = ejecutar_query(query, params=nombres_lugares)
+        resultado = ejecutar_query(query, params=[nombres_lugares])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron lugares: {nombres_lugares}")
+            log.warning("No se encontraron lugares: %s", nombres_lugares)
             return []
             
         ids_encontrados = resultado['id'].tolist()
-        print(f"Lugares encontrados: {len(ids_encontrados)} de {len(nombres_lugares)}")
+        log.debug("Lugares encontrados: %s de %s", len(ids_encontrados), len(nombres_lugares))
         return ids_encontrados
         
     except Exception as e:
-        print(f"Error al buscar lugares {nombres_lugares}: {e}")
+        log.error("Error al buscar lugares %s: %s", nombres_lugares, e)
         return []
 
 def conteo_posiciones_agregado_radio_tv(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int], option_fuente: str = "Todos", option_nota: str = "Todos") -> pd.DataFrame:
@@ -89,9 +45,6 @@ def conteo_posiciones_agregado_radio_tv(fecha_inicio: str, fecha_fin: str, ids_l
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     # Filtros adicionales según opciones
     filtro_fuente = ""
     if option_fuente == "Radio":
@@ -123,7 +76,7 @@ def conteo_posiciones_agregado_radio_tv(fecha_inicio: str, fecha_fin: str, ids_l
         FROM acontecimientos a
         INNER JOIN acontecimiento_programa ap ON a.id = ap.id_acontecimiento
         INNER JOIN programas p ON ap.id_programa = p.id
-        WHERE a.id_lugar IN ({placeholders})
+        WHERE a.id_lugar = ANY(%s)
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
             AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
             AND a.id_posicion IS NOT NULL
@@ -153,13 +106,13 @@ def conteo_posiciones_agregado_radio_tv(fecha_inicio: str, fecha_fin: str, ids_l
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_posiciones_agregado_radio_tv: {e}")
+        log.error("Error en conteo_posiciones_agregado_radio_tv: %s", e)
         return pd.DataFrame()
 
 def conteo_posiciones_agregado_redes(fecha_inicio: str, fecha_fin: str, ids_lugares: List[int], option_nota: str = "Todos") -> pd.DataFrame:
@@ -170,9 +123,6 @@ def conteo_posiciones_agregado_redes(fecha_inicio: str, fecha_fin: str, ids_luga
     if not ids_lugares:
         return pd.DataFrame()
     
-    # Crear placeholders para la query IN
-    placeholders = ','.join(['%s'] * len(ids_lugares))
-    
     # Filtros adicionales según opciones
     filtro_nota = ""
     if option_nota == "Con coctel":
@@ -186,7 +136,7 @@ def conteo_posiciones_agregado_redes(fecha_inicio: str, fecha_fin: str, ids_luga
         COUNT(*) as count
     FROM acontecimientos a
     INNER JOIN acontecimiento_facebook_post afp ON a.id = afp.id_acontecimiento
-    WHERE a.id_lugar IN ({placeholders})
+    WHERE a.id_lugar = ANY(%s)
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date >= %s::date
         AND (a.fecha_registro AT TIME ZONE 'UTC' AT TIME ZONE 'America/Lima')::date <= %s::date
         AND a.id_posicion IS NOT NULL
@@ -197,13 +147,13 @@ def conteo_posiciones_agregado_redes(fecha_inicio: str, fecha_fin: str, ids_luga
     """
     
     # Parámetros: ids_lugares + fecha_inicio + fecha_fin
-    params = ids_lugares + [fecha_inicio, fecha_fin]
+    params = [ids_lugares, fecha_inicio, fecha_fin]
     
     try:
         resultado = ejecutar_query(query, params=params)
         return resultado if resultado is not None else pd.DataFrame()
     except Exception as e:
-        print(f"Error en conteo_posiciones_agregado_redes: {e}")
+        log.error("Error en conteo_posiciones_agregado_redes: %s", e)
         return pd.DataFrame()
 
 def data_section_9_distribucion_posiciones_sql(fecha_inicio: str, fecha_fin: str, lugares: List[str], option_fuente: str = "Todos", option_nota: str = "Todos") -> pd.DataFrame:
@@ -221,18 +171,18 @@ def data_section_9_distribucion_posiciones_sql(fecha_inicio: str, fecha_fin: str
         DataFrame con columnas: posicion, count, Posición
     """
     
-    print(f"DEBUG: Parámetros recibidos:")
-    print(f"  fecha_inicio: {fecha_inicio}")
-    print(f"  fecha_fin: {fecha_fin}")
-    print(f"  lugares: {lugares}")
-    print(f"  option_fuente: {option_fuente}")
-    print(f"  option_nota: {option_nota}")
+    log.debug("Parámetros recibidos:")
+    log.debug("  fecha_inicio: %s", fecha_inicio)
+    log.debug("  fecha_fin: %s", fecha_fin)
+    log.debug("  lugares: %s", lugares)
+    log.debug("  option_fuente: %s", option_fuente)
+    log.debug("  option_nota: %s", option_nota)
     
     # Convertir nombres de lugares a IDs
     ids_lugares = obtener_ids_lugares(lugares)
-    print(f"DEBUG: IDs lugares obtenidos: {ids_lugares}")
+    log.debug("IDs lugares obtenidos: %s", ids_lugares)
     if not ids_lugares:
-        print(f"ERROR: No se encontraron IDs para los lugares: {lugares}")
+        log.error("No se encontraron IDs para los lugares: %s", lugares)
         return pd.DataFrame()
     
     resultado_final = pd.DataFrame()
@@ -240,35 +190,35 @@ def data_section_9_distribucion_posiciones_sql(fecha_inicio: str, fecha_fin: str
     try:
         # Obtener datos según la fuente seleccionada
         if option_fuente in ["Radio", "TV", "Todos"]:
-            print(f"DEBUG: Consultando Radio/TV...")
+            log.debug("Consultando Radio/TV...")
             resultado_radio_tv = conteo_posiciones_agregado_radio_tv(
                 fecha_inicio, fecha_fin, ids_lugares, option_fuente, option_nota
             )
-            print(f"DEBUG: Resultado Radio/TV: {len(resultado_radio_tv)} filas")
-            print(f"DEBUG: Datos Radio/TV:\n{resultado_radio_tv}")
+            log.debug("Resultado Radio/TV: %s filas", len(resultado_radio_tv))
+            log.dataframe("Datos Radio/TV", resultado_radio_tv)
             if not resultado_radio_tv.empty:
                 resultado_final = pd.concat([resultado_final, resultado_radio_tv], ignore_index=True)
         
         if option_fuente in ["Redes", "Todos"]:
-            print(f"DEBUG: Consultando Redes...")
+            log.debug("Consultando Redes...")
             resultado_redes = conteo_posiciones_agregado_redes(
                 fecha_inicio, fecha_fin, ids_lugares, option_nota
             )
-            print(f"DEBUG: Resultado Redes: {len(resultado_redes)} filas")
-            print(f"DEBUG: Datos Redes:\n{resultado_redes}")
+            log.debug("Resultado Redes: %s filas", len(resultado_redes))
+            log.dataframe("Datos Redes", resultado_redes)
             if not resultado_redes.empty:
                 resultado_final = pd.concat([resultado_final, resultado_redes], ignore_index=True)
         
-        print(f"DEBUG: Resultado combinado antes de procesar: {len(resultado_final)} filas")
-        print(f"DEBUG: Datos combinados:\n{resultado_final}")
+        log.debug("Resultado combinado antes de procesar: %s filas", len(resultado_final))
+        log.dataframe("Datos combinados", resultado_final)
         
         # Si tenemos datos de múltiples fuentes, sumar por posición
         if not resultado_final.empty and option_fuente == "Todos":
-            print(f"DEBUG: Sumando por posición para 'Todos'...")
+            log.debug("Sumando por posición para 'Todos'...")
             resultado_final = resultado_final.groupby('posicion').agg({
                 'count': 'sum'
             }).reset_index()
-            print(f"DEBUG: Resultado después de sumar:\n{resultado_final}")
+            log.dataframe("Resultado después de sumar", resultado_final)
         
         # Agregar columna de nombre descriptivo para posiciones
         if not resultado_final.empty:
@@ -289,16 +239,14 @@ def data_section_9_distribucion_posiciones_sql(fecha_inicio: str, fecha_fin: str
             despues_filtro = len(resultado_final)
             
             if antes_filtro > despues_filtro:
-                print(f"⚠️ Se eliminaron {antes_filtro - despues_filtro} registros con posiciones inválidas o nulas")
+                log.warning("⚠️ Se eliminaron %s registros con posiciones inválidas o nulas", antes_filtro - despues_filtro)
             
-            print(f"DEBUG: Resultado final con nombres:\n{resultado_final}")
+            log.dataframe("Resultado final con nombres", resultado_final)
         
         return resultado_final
         
     except Exception as e:
-        print(f"ERROR en data_section_9_distribucion_posiciones_sql: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("ERROR en data_section_9_distribucion_posiciones_sql: %s", e)
         return pd.DataFrame()
 
 def convertir_posicion_a_nombre(df: pd.DataFrame) -> pd.DataFrame:
@@ -1,55 +1,12 @@
 # sections/functions/grafico_top3.py
 
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any, Tuple
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
 
+log = obtener_logger(__name__)
 
 def data_section_top3_lugares_sql(fecha_inicio: str, fecha_fin: str, fuente: str, top_n: int = 3) -> Tuple[pd.DataFrame, List[str]]:
     """
@@ -67,7 +24,7 @@ def data_section_top3_lugares_sql(fecha_inicio: str, fecha_fin: str, fuente: str
         Tuple[DataFrame, List[str]]: (datos_filtrados, lista_top_lugares)
     """
     
-    print(f"DEBUG grafico_top3: fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}, fuente={fuente}, top_n={top_n}")
+    log.debug("grafico_top3: fecha_inicio=%s, fecha_fin=%s, fuente=%s, top_n=%s", fecha_inicio, fecha_fin, fuente, top_n)
     
     # Query para Radio y TV
     query_radio_tv = """
@@ -166,11 +123,11 @@ def data_section_top3_lugares_sql(fecha_inicio: str, fecha_fin: str, fuente: str
             resultado = ejecutar_query(query_redes, params=params)
             
         else:
-            print(f"ERROR: Fuente no válida para TOP3: {fuente}")
+            log.error("Fuente no válida para TOP3: %s", fuente)
             return pd.DataFrame(), []
         
         if resultado is None or resultado.empty:
-            print(f"No se encontraron datos para {fuente}")
+            log.warning("No se encontraron datos para %s", fuente)
             return pd.DataFrame(), []
         
         # Identificar TOP N lugares basándose en la última semana
@@ -180,17 +137,17 @@ def data_section_top3_lugares_sql(fecha_inicio: str, fecha_fin: str, fuente: str
         # Ordenar por porcentaje descendente y tomar top N
         top_lugares = datos_ultima_semana.nlargest(top_n, 'porcentaje')['lugar'].tolist()
         
-        print(f"TOP {top_n} lugares identificados: {top_lugares}")
+        log.debug("TOP %s lugares identificados: %s", top_n, top_lugares)
         
         # Filtrar solo los datos de los top lugares
         resultado_filtrado = resultado[resultado['lugar'].isin(top_lugares)]
         
-        print(f"Resultado query grafico_top3: {len(resultado_filtrado)} registros para {len(top_lugares)} lugares")
+        log.debug("Resultado query grafico_top3: %s registros para %s lugares", len(resultado_filtrado), len(top_lugares))
         
         return resultado_filtrado, top_lugares
         
     except Exception as e:
-        print(f"Error en data_section_top3_lugares_sql: {e}")
+        log.error("Error en data_section_top3_lugares_sql: %s", e)
         return pd.DataFrame(), []
 
 
@@ -6,6 +6,9 @@ from sqlalchemy import create_engine, text
 import warnings
 import os
 from dotenv import load_dotenv
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 
 load_dotenv()
@@ -94,10 +97,10 @@ def ejecutar_query(query: str, params: Optional[List[Any]] = None, return_datafr
     params = convert_numpy_params(params)
     
     # Debug: mostrar tipos de parámetros si hay alguno
-    if params:
-        print("Parámetros convertidos:")
+    if params and log.depurando():
+        log.debug("Parámetros convertidos:")
         for i, param in enumerate(params):
-            print(f"  Param {i}: {param} (tipo: {type(param)})")
+            log.debug("  Param %s: %s (tipo: %s)", i, param, type(param))
     
     if return_dataframe and use_sqlalchemy:
         # Método recomendado: SQLAlchemy + pandas
@@ -119,9 +122,9 @@ def ejecutar_query(query: str, params: Optional[List[Any]] = None, return_datafr
             return resultado
             
         except Exception as e:
-            print(f"Error con SQLAlchemy: {e}")
-            print(f"Query: {query}")
-            print(f"Params: {params}")
+            log.error("Error con SQLAlchemy: %s", e)
+            log.debug("Query: %s", query)
+            log.debug("Params: %s", params)
             return None
         finally:
             if engine:
@@ -159,16 +162,16 @@ def ejecutar_query(query: str, params: Optional[List[Any]] = None, return_datafr
                     return cursor.rowcount  # Número de filas afectadas
                     
         except psycopg2.Error as e:
-            print(f"Error de PostgreSQL: {e}")
-            print(f"Query: {query}")
-            print(f"Params: {params}")
+            log.error("Error de PostgreSQL: %s", e)
+            log.debug("Query: %s", query)
+            log.debug("Params: %s", params)
             if conn:
                 conn.rollback()
             return None
         except Exception as e:
-            print(f"Error general: {e}")
-            print(f"Query: {query}")
-            print(f"Params: {params}")
+            log.error("Error general: %s", e)
+            log.debug("Query: %s", query)
+            log.debug("Params: %s", params)
             return None
         finally:
             if conn:
@@ -183,10 +186,10 @@ def ejecutar_query_con_nombres(query: str, params: Optional[Dict[str, Any]] = No
     params = convert_numpy_dict_params(params)
     
     # Debug: mostrar tipos de parámetros si hay alguno
-    if params:
-        print("Parámetros nombrados convertidos:")
+    if params and log.depurando():
+        log.debug("Parámetros nombrados convertidos:")
         for key, param in params.items():
-            print(f"  {key}: {param} (tipo: {type(param)})")
+            log.debug("  %s: %s (tipo: %s)", key, param, type(param))
     
     engine = None
     try:
@@ -210,9 +213,9 @@ def ejecutar_query_con_nombres(query: str, params: Optional[Dict[str, Any]] = No
                 return pd.DataFrame(columns=columns)
                 
     except Exception as e:
-        print(f"Error con query nombrada: {e}")
-        print(f"Query: {query}")
-        print(f"Params: {params}")
+        log.error("Error con query nombrada: %s", e)
+        log.debug("Query: %s", query)
+        log.debug("Params: %s", params)
         return None
     finally:
         if engine:
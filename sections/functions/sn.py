@@ -1,8 +1,11 @@
 import pandas as pd
-import psycopg2
-import os
 from typing import Optional, List, Any, Tuple
 
+from core.query_executor import ejecutar_query
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
+
 def calcular_porcentajes_radio_tv(resultado_radio_tv):
     """
     Calcula los porcentajes de radio y TV con y sin cóctel (nota)
@@ -59,51 +62,6 @@ def calcular_porcentajes_radio_tv(resultado_radio_tv):
     
     return resultado
 
-def ejecutar_query(query: str, params: Optional[List[Any]] = None) -> Optional[pd.DataFrame]:
-    """
-    Ejecuta una query SQL y retorna los resultados como un DataFrame de pandas.
-    """
-    
-    DB_CONFIG = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'database': os.getenv('DB_NAME', 'tu_base_de_datos'),
-        'user': os.getenv('DB_USER', 'tu_usuario'),
-        'password': os.getenv('DB_PASSWORD', 'tu_contraseña'),
-        'port': os.getenv('DB_PORT', '5432')
-    }
-    
-    connection = None
-    cursor = None
-    
-    try:
-        connection = psycopg2.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
-        
-        if not results:
-            return pd.DataFrame()
-        
-        column_names = [desc[0] for desc in cursor.description]
-        df = pd.DataFrame(results, columns=column_names)
-        
-        return df
-        
-    except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
-        return None
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
 def obtener_id_lugar(nombre_lugar):
     query = """
     SELECT id, nombre 
@@ -116,13 +74,13 @@ def obtener_id_lugar(nombre_lugar):
         resultado = ejecutar_query(query, params=[nombre_lugar])
         
         if resultado is None or resultado.empty:
-            print(f"No se encontró el lugar: {nombre_lugar}")
+            log.warning("No se encontró el lugar: %s", nombre_lugar)
             return None
             
         return int(resultado.iloc[0]['id'])
         
     except Exception as e:
-        print(f"Error al buscar el lugar '{nombre_lugar}': {e}")
+        log.error("Error al buscar el lugar '%s': %s", nombre_lugar, e)
         return None
 
 def data_section_sn_proporcion_simple_sql(f_inicio, f_final, lugar) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -195,9 +153,9 @@ def data_section_sn_proporcion_simple_sql(f_inicio, f_final, lugar) -> Tuple[pd.
         resultado_tv = porcentajes_radio_tv['TV']
         
         # Debug prints (puedes comentarlos en producción)
-        print(f"Resultado RADIO: {resultado_radio}")
-        print(f"Resultado TV: {resultado_tv}")
-        print(f"Resultado redes sociales: {resultado_redes_sociales}")
+        log.dataframe("Resultado RADIO", resultado_radio)
+        log.dataframe("Resultado TV", resultado_tv)
+        log.dataframe("Resultado redes sociales", resultado_redes_sociales)
         
         if resultado_redes_sociales is None or resultado_redes_sociales.empty:
             # Crear DataFrame vacío con estructura esperada para redes sociales
@@ -210,7 +168,7 @@ def data_section_sn_proporcion_simple_sql(f_inicio, f_final, lugar) -> Tuple[pd.
         return resultado_radio, resultado_tv, resultado_redes_sociales
         
     except Exception as e:
-        print(f"Error al ejecutar la consulta: {e}")
+        log.error("Error al ejecutar la consulta: %s", e)
         # Retornar DataFrames vacíos en caso de error
         df_vacio = pd.DataFrame({'tipo_coctel': ['CON_COCTEL', 'SIN_COCTEL'], 'cantidad': [0, 0], 'porcentaje': [0.0, 0.0]})
         return df_vacio, df_vacio, df_vacio
@@ -0,0 +1,351 @@
+# sections/registry.py
+"""
+Registro liviano de secciones: código, título, dependencias de datos y método de
+render, sin importar ningún módulo pesado. sections.coctel_sections (plotly) y los
+módulos sections.functions.graficoN se importan recién cuando se dibuja una sección.
+
+Cada entrada tiene además su constructor de argumentos: lee los widgets de la sección
+desde session_state (mismas claves, opciones y defaults) y arma los parámetros de su
+función de datos. Lo usan tanto la precarga del modo "todas" como la propia sección
+después de dibujar sus widgets, así que ambas piden siempre la misma clave de caché.
+"""
+import calendar
+import importlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from config.constants import MACROREGIONES_RADIO_REDES, MACROREGIONES_TV, MESES_ES
+
+# Firmas de los métodos de render de CoctelSections
+FIRMA_FILTROS_MOSTRAR = "filtros_mostrar"   # metodo(global_filters, mostrar_todos)
+FIRMA_FILTROS = "filtros"                   # metodo(global_filters)
+FIRMA_SIN_ARGUMENTOS = "sin_argumentos"     # metodo()
+
+Argumentos = Tuple[tuple, Dict[str, Any]]
+
+
+class ContextoArgumentos:
+    """
+    Valores actuales de los widgets de las secciones, sin dibujarlos: session_state
+    o, si el widget todavía no existe, el mismo default que tendría al dibujarse
+    """
+
+    def __init__(self, secciones, global_filters: Optional[Dict[str, Any]]):
+        # secciones: instancia de CoctelSections (datos cargados y FilterManager)
+        self.secciones = secciones
+        self.global_filters = global_filters or {}
+        self.lugares_uniques = secciones.lugares_uniques
+        ano_actual = datetime.now().year
+        self.anos = list(range(ano_actual - 9, ano_actual + 1))
+
+    def fechas(self, nombre: str):
+        """Fechas de la sección como Timestamps"""
+        return self.secciones.filter_manager.resolve_section_dates(nombre, self.global_filters)
+
+    def fechas_str(self, nombre: str) -> Tuple[str, str]:
+        inicio, fin = self.fechas(nombre)
+        return inicio.strftime('%Y-%m-%d'), fin.strftime('%Y-%m-%d')
+
+    def lugares(self, nombre: str) -> List[str]:
+        return self.secciones.filter_manager.resolve_section_locations(nombre, self.global_filters, multi=True)
+
+    def lugares_de(self, *atributos: str) -> List[str]:
+        """Lugares presentes en uno o más DataFrames cargados (opciones de los selectbox de lugar)"""
+        lugares = set()
+        for atributo in atributos:
+            lugares.update(getattr(self.secciones, atributo)['lugar'].dropna().unique())
+        return sorted(lugares)
+
+    @staticmethod
+    def valor(key: str, opciones, index: int = 0):
+        """Valor actual de un selectbox (mismo default que st.selectbox)"""
+        opciones = list(opciones)
+        valor = st.session_state.get(key)
+        if valor in opciones:
+            return valor
+        return opciones[index] if opciones else None
+
+    @staticmethod
+    def valores(key: str, opciones, default) -> list:
+        """Valor actual de un multiselect"""
+        valor = st.session_state.get(key)
+        if valor is None:
+            return list(default)
+        return [v for v in valor if v in opciones]
+
+
+# Opciones de los widgets compartidos
+FUENTES = ("Radio", "TV", "Redes")
+FUENTES_TODOS = ("Radio", "TV", "Redes", "Todos")
+NOTAS = ("Con coctel", "Sin coctel", "Todos")
+FUENTE_A_ID = {"Radio": 1, "TV": 2, "Redes": 3, "Todos": None}
+
+
+def _fin_de_mes(ano: int, mes: int) -> str:
+    return f"{ano}-{mes:02d}-{calendar.monthrange(ano, mes)[1]:02d}"
+
+
+def _args_sn(c: ContextoArgumentos) -> Argumentos:
+    if c.global_filters.get('use_global_locations'):
+        opciones = c.global_filters['global_lugares']
+    else:
+        opciones = c.lugares_uniques
+    return (*c.fechas("sn"), c.valor("lugar_sn", opciones)), {}
+
+
+def _args_1(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s1"), c.lugares("s1"), c.valores("fuente_s1", FUENTES, FUENTES)), {}
+
+
+def _args_2(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s2"), c.valor("lugar_s2", sorted(c.lugares_uniques))), {}
+
+
+def _args_3(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s3"), c.valor("lugar_s3", c.lugares_de('temp_coctel_fuente')),
+            c.valor("fuente_s3", FUENTES_TODOS)), {}
+
+
+def _args_4(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s4"), c.valor("lugar_s4", c.lugares_de('temp_coctel_fuente_notas')),
+            c.valor("fuente_s4", FUENTES_TODOS)), {}
+
+
+def _args_5(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s5"), c.lugares("s5"), c.valor("fuente_s5", FUENTES_TODOS)), {}
+
+
+def _args_top3(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("stop3"), c.valor("fuente_stop3", FUENTES)), {'top_n': 3}
+
+
+def _args_6(c: ContextoArgumentos) -> Argumentos:
+    lugares = c.lugares_de('temp_coctel_fuente_programas', 'temp_coctel_fuente_fb')
+    return (*c.fechas_str("s6"), c.valor("lugar_s6", lugares), c.valor("fuente_s6", FUENTES)), {'top_n': 3}
+
+
+def _args_7(c: ContextoArgumentos) -> Argumentos:
+    fuente = c.valor("fuente_s7", FUENTES)
+    macroregiones = MACROREGIONES_RADIO_REDES if fuente in ["Radio", "Redes"] else MACROREGIONES_TV
+    return (*c.fechas_str("s7"), c.valor("macro_s7", macroregiones), fuente), {}
+
+
+def _args_8(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s8"), c.valor("lugar_s8", sorted(c.lugares_uniques)),
+            c.valor("fuente_s8", FUENTES_TODOS), c.valor("nota_s8", NOTAS)), {}
+
+
+def _args_9(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s9"), c.lugares("s9"), c.valor("fuente_s9", FUENTES_TODOS),
+            c.valor("nota_s9", NOTAS)), {}
+
+
+def _args_fechas_lugares(nombre: str) -> Callable[[ContextoArgumentos], Argumentos]:
+    """Secciones que solo dependen de sus fechas y lugares (10, 11 y 12)"""
+    def argumentos(c: ContextoArgumentos) -> Argumentos:
+        return (*c.fechas_str(nombre), c.lugares(nombre)), {}
+    return argumentos
+
+
+def _args_rango_mensual(sufijo: str) -> Callable[[ContextoArgumentos], Argumentos]:
+    """Secciones 13 y 23: rango de año/mes numérico, del primer día al último"""
+    def argumentos(c: ContextoArgumentos) -> Argumentos:
+        year_inicio = c.valor(f"year_inicio_{sufijo}", c.anos, len(c.anos) - 1)
+        month_inicio = c.valor(f"month_inicio_{sufijo}", range(1, 13), 0)
+        year_fin = c.valor(f"year_fin_{sufijo}", c.anos, len(c.anos) - 1)
+        month_fin = c.valor(f"month_fin_{sufijo}", range(1, 13), 11)
+        return (f"{year_inicio}-{month_inicio:02d}-01", _fin_de_mes(year_fin, month_fin), c.lugares(sufijo)), {}
+    return argumentos
+
+
+def _args_14(c: ContextoArgumentos) -> Argumentos:
+    fuentes = [f.upper() for f in c.valores("fuente_s14", FUENTES, FUENTES)]
+    return (*c.fechas_str("s14"), c.lugares("s14"), fuentes, c.valor("nota_s14", NOTAS)), {}
+
+
+def _args_lugar_fuente_nota(sufijo: str, dataframe: str, fuentes=FUENTES_TODOS,
+                            top_n: Optional[int] = None) -> Callable[[ContextoArgumentos], Argumentos]:
+    """Secciones 15-18 y 20: un lugar (del DataFrame indicado), fuente y nota"""
+    def argumentos(c: ContextoArgumentos) -> Argumentos:
+        args = (*c.fechas_str(sufijo), c.valor(f"lugar_{sufijo}", c.lugares_de(dataframe)),
+                c.valor(f"fuente_{sufijo}", fuentes), c.valor(f"nota_{sufijo}", NOTAS))
+        return args, ({'top_n': top_n} if top_n is not None else {})
+    return argumentos
+
+
+def _args_19(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s19"), c.valor("nota_s19", NOTAS)), {}
+
+
+def _args_21(c: ContextoArgumentos) -> Argumentos:
+    ano_inicio = c.valor("ano_inicio_s21", c.anos, len(c.anos) - 1)
+    mes_inicio = MESES_ES.index(c.valor("mes_inicio_s21", MESES_ES, 11)) + 1
+    ano_fin = c.valor("ano_fin_s21", c.anos, len(c.anos) - 1)
+    mes_fin = MESES_ES.index(c.valor("mes_fin_s21", MESES_ES, 11)) + 1
+    return (f"{ano_inicio}-{mes_inicio:02d}-01", _fin_de_mes(ano_fin, mes_fin), c.lugares("s21")), {}
+
+
+def _args_22(c: ContextoArgumentos) -> Argumentos:
+    return (c.valor("ano_fin_s22", c.anos, len(c.anos) - 1),
+            MESES_ES.index(c.valor("mes_fin_s22", MESES_ES, 11)) + 1,
+            c.lugares("s22"), c.valor("fuente_s22", ['Radio', 'Redes', 'TV'])), {}
+
+
+def _args_24(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s24"), c.valor("fuente_s24", FUENTES_TODOS), c.valor("nota_s24", NOTAS)), {}
+
+
+def _args_25(c: ContextoArgumentos) -> Argumentos:
+    lugares = c.lugares_de('temp_coctel_fuente_programas', 'temp_coctel_fuente_fb')
+    return (*c.fechas_str("s32"), c.valor("lugar_s32", lugares), c.valor("medio_s32", FUENTES)), {}
+
+
+def _args_26(c: ContextoArgumentos) -> Argumentos:
+    return c.fechas_str("s33"), {}
+
+
+def _args_27(c: ContextoArgumentos) -> Argumentos:
+    return (*c.fechas_str("s34"), c.lugares("s34"), c.valor("medio_s34", FUENTES_TODOS)), {}
+
+
+def _args_28(c: ContextoArgumentos) -> Argumentos:
+    return (), {'id_fuente': FUENTE_A_ID[c.valor("fuente_s28", list(FUENTE_A_ID))]}
+
+
+@dataclass(frozen=True)
+class EntradaSeccion:
+    """Metadatos de una sección del dashboard de cocteles"""
+    codigo: str
+    titulo: str
+    metodo: str
+    modulo_datos: str
+    funcion_datos: str
+    firma: str = FIRMA_FILTROS_MOSTRAR
+    # Máximo de queries por llamada a la función de datos (core.telemetry lo controla)
+    max_queries: Optional[int] = None
+    # (ContextoArgumentos) -> (args, kwargs) de la función de datos
+    argumentos: Optional[Callable[[ContextoArgumentos], Argumentos]] = None
+
+    def cargar_funcion_datos(self) -> Callable:
+        """Importar (una vez) el módulo de datos y devolver su función SQL"""
+        return getattr(importlib.import_module(self.modulo_datos), self.funcion_datos)
+
+    def construir_argumentos(self, contexto: ContextoArgumentos) -> Argumentos:
+        """Argumentos de la función de datos según los widgets actuales de la sección"""
+        args, kwargs = self.argumentos(contexto)
+        return tuple(args), kwargs
+
+
+_F = "sections.functions."
+
+# En el orden de la página "Ver Todas las Secciones". max_queries cuenta con las
+# dimensiones ya cacheadas, salvo la 12 que incluye las 2 que carga en frío
+SECCIONES: List[EntradaSeccion] = [
+    EntradaSeccion("sn", "SN. Proporción de cocteles en lugar y fecha específica",
+                   "section_sn_proporcion_basica", _F + "sn", "data_section_sn_proporcion_simple_sql",
+                   max_queries=3, argumentos=_args_sn),
+    EntradaSeccion("1", "1. Proporción de cocteles en lugar, fuentes y fechas específicas",
+                   "section_1_proporcion_combinada", _F + "grafico1", "data_section_1_proporcion_combinada_sql",
+                   max_queries=2, argumentos=_args_1),
+    EntradaSeccion("2", "2. Posición por fuente en lugar y fecha específica",
+                   "section_2_posicion_por_fuente", _F + "grafico2", "data_section_2_posiciones_coctel_sql",
+                   max_queries=4, argumentos=_args_2),
+    EntradaSeccion("3", "3. Gráfico semanal por porcentaje de cocteles",
+                   "section_3_tendencia_semanal", _F + "grafico3", "data_section_3_tendencia_semanal_sql",
+                   max_queries=3, argumentos=_args_3),
+    EntradaSeccion("4", "4. Tendencia A Favor vs En Contra",
+                   "section_4_favor_vs_contra", _F + "grafico4", "data_section_4_favor_vs_contra_sql",
+                   max_queries=3, argumentos=_args_4),
+    EntradaSeccion("5", "5. Gráfico Acumulativo",
+                   "section_5_grafico_acumulativo", _F + "grafico5", "data_section_5_acumulativo_lugares_sql",
+                   max_queries=3, argumentos=_args_5),
+    EntradaSeccion("top3", "TOP 3. Mejores lugares",
+                   "section_top3_mejores_lugares", _F + "grafico_top3", "data_section_top3_lugares_sql",
+                   max_queries=1, argumentos=_args_top3),
+    EntradaSeccion("6", "6. Top 3 mejores radios, redes, tv",
+                   "section_6_top_medios", _F + "grafico6", "data_section_6_top_medios_sql",
+                   max_queries=2, argumentos=_args_6),
+    EntradaSeccion("7", "7. Crecimiento por Macroregión",
+                   "section_7_macroregion", _F + "grafico7", "data_section_7_macroregion_sql",
+                   max_queries=2, argumentos=_args_7),
+    EntradaSeccion("8", "8. Gráfico de barras contando posiciones",
+                   "section_8_conteo_posiciones", _F + "grafico8", "data_section_8_conteo_posiciones_sql",
+                   max_queries=3, argumentos=_args_8),
+    EntradaSeccion("9", "9. Gráfico de dona - porcentaje de posiciones",
+                   "section_9_distribucion_posiciones", _F + "grafico9", "data_section_9_distribucion_posiciones_sql",
+                   max_queries=3, argumentos=_args_9),
+    EntradaSeccion("10", "10. Porcentaje de acontecimientos con coctel",
+                   "section_10_eventos_coctel", _F + "grafico10", "data_section_10_eventos_coctel_sql",
+                   max_queries=3, argumentos=_args_fechas_lugares("s10")),
+    EntradaSeccion("11", "11. Cantidad de cocteles por fuente y lugar",
+                   "section_11_cocteles_fuente_lugar", _F + "grafico11", "data_section_11_conteo_integrado_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_fechas_lugares("s11")),
+    EntradaSeccion("12", "12. Medios que Generan Coctel",
+                   "section_12_medios_generan_coctel", _F + "grafico12", "data_section_12_medios_generan_coctel_sql",
+                   FIRMA_FILTROS, max_queries=5, argumentos=_args_fechas_lugares("s12")),
+    EntradaSeccion("13", "13. Conteo mensual de coctel utilizado",
+                   "section_13_conteo_mensual", _F + "grafico13", "data_section_13_acontecimientos_por_lugar_mes",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_rango_mensual("s13")),
+    EntradaSeccion("14", "14. Notas A Favor, Neutral, En Contra",
+                   "section_14_notas_favor_contra", _F + "grafico14", "data_section_14_favor_contra_neutral_sql",
+                   max_queries=3, argumentos=_args_14),
+    EntradaSeccion("15", "15. Proporción de Mensajes por Posición",
+                   "section_15_proporcion_mensajes", _F + "grafico15", "data_section_15_proporcion_mensajes_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_lugar_fuente_nota("s15", 'temp_coctel_fuente')),
+    EntradaSeccion("16", "16. Mensajes por Tema",
+                   "section_16_mensajes_por_tema", _F + "grafico16", "data_section_16_mensajes_por_tema_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_lugar_fuente_nota("s16", 'temp_coctel_temas', top_n=10)),
+    EntradaSeccion("17", "17. Proporción por Tema",
+                   "section_17_proporcion_por_tema", _F + "grafico17", "data_section_17_proporcion_por_tema_sql",
+                   max_queries=3, argumentos=_args_lugar_fuente_nota("s17", 'temp_coctel_temas', top_n=10)),
+    EntradaSeccion("18", "18. Tendencia por medio",
+                   "section_18_tendencia_por_medio", _F + "grafico18", "data_section_18_tendencia_por_medio_sql",
+                   FIRMA_FILTROS, max_queries=2, argumentos=_args_lugar_fuente_nota("s18", 'temp_coctel_fuente', FUENTES)),
+    EntradaSeccion("19", "19. Notas por Tiempo y Posición",
+                   "section_19_notas_tiempo_posicion", _F + "grafico19", "data_section_19_notas_tiempo_posicion_sql",
+                   FIRMA_FILTROS, max_queries=2, argumentos=_args_19),
+    EntradaSeccion("20", "20. Actores y Posiciones",
+                   "section_20_actores_posiciones", _F + "grafico20", "data_section_20_actores_posiciones_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_lugar_fuente_nota("s20", 'temp_coctel_fuente_actores', top_n=10)),
+    EntradaSeccion("21", "21. Porcentaje de cóctel por medios",
+                   "section_21_porcentaje_medios", _F + "grafico21", "data_section_21_porcentaje_medios_sql",
+                   max_queries=2, argumentos=_args_21),
+    EntradaSeccion("22", "22. Últimos 3 Meses",
+                   "section_22_ultimos_3_meses", _F + "grafico22", "data_section_22_ultimos_3_meses_sql",
+                   max_queries=2, argumentos=_args_22),
+    EntradaSeccion("23", "23. Evolución mensual (Radio, Redes, TV)",
+                   "section_23_evolucion_mensual", _F + "grafico23", "data_section_23_evolucion_mensual_sql",
+                   max_queries=3, argumentos=_args_rango_mensual("s23")),
+    EntradaSeccion("24", "24. Mensajes Fuerza",
+                   "section_24_mensajes_fuerza", _F + "grafico24", "data_section_24_mensajes_fuerza_sql",
+                   max_queries=1, argumentos=_args_24),
+    EntradaSeccion("25", "25. Impactos por programa",
+                   "section_25_impactos_programa", _F + "grafico25", "data_section_25_impactos_programa_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_25),
+    EntradaSeccion("26", "26. Distribución por medio",
+                   "section_26_distribucion_medio", _F + "grafico26", "data_section_26_distribucion_medio_sql",
+                   FIRMA_FILTROS, max_queries=2, argumentos=_args_26),
+    EntradaSeccion("27", "27. A Favor vs En Contra (Mensual)",
+                   "section_27_favor_contra_mensual", _F + "grafico27", "data_section_27_favor_contra_mensual_sql",
+                   FIRMA_FILTROS, max_queries=3, argumentos=_args_27),
+    EntradaSeccion("28", "28. Registros creados por usuarios (Mensual)",
+                   "section_28_registros_usuarios", _F + "grafico28", "obtener_data_grafico28",
+                   FIRMA_SIN_ARGUMENTOS, max_queries=1, argumentos=_args_28),
+]
+
+SECCIONES_POR_CODIGO: Dict[str, EntradaSeccion] = {s.codigo: s for s in SECCIONES}
+
+ORDEN_SECCIONES: List[str] = [s.codigo for s in SECCIONES]
+
+
+def obtener_seccion(codigo: str) -> Optional[EntradaSeccion]:
+    return SECCIONES_POR_CODIGO.get(codigo)
+
+
+def clase_secciones():
+    """Importar CoctelSections solo cuando hace falta dibujar una sección"""
+    from sections.coctel_sections import CoctelSections
+    return CoctelSections
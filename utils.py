@@ -1,10 +1,17 @@
 #utils.py
 
 import os
+import uuid
 import pandas as pd
+from typing import Callable, Optional
 from sqlalchemy import create_engine
 from sqlalchemy.sql.elements import TextClause
 from queries import coctel_queries, user_queries
+from core.cassette import cassette
+from core.query_executor import estimar_filas, leer_copy, normalizar_tipos, UMBRAL_FILAS_COPY
+from core.logger import obtener_logger
+
+log = obtener_logger(__name__)
 
 def _get_engine():
     """
@@ -18,8 +25,7 @@ def _get_engine():
     sslmode  = os.getenv("DB_SSLMODE", "require")
 
     # DEBUG: mostrar en logs qué variables está recibiendo
-    print(f"[DEBUG _get_engine] DB_HOST={host!r} DB_PORT={port!r} DB_USER={user!r} "
-          f"DB_NAME={dbname!r} DB_SSLMODE={sslmode!r}")
+    log.debug("_get_engine: DB_HOST=%r DB_PORT=%r DB_USER=%r DB_NAME=%r DB_SSLMODE=%r", host, port, user, dbname, sslmode)
     
     # URI de conexión PostgreSQL
     dsn = (
@@ -29,28 +35,148 @@ def _get_engine():
     # Creamos el engine; SQLAlchemy se encargará de abrir/cerrar conexiones
     return create_engine(dsn)
 
+def _usar_copy(conn, sql: str) -> bool:
+    """True si el planificador estima más filas que el umbral de extracción con COPY"""
+    cursor = conn.cursor()
+    try:
+        return estimar_filas(cursor, sql) >= UMBRAL_FILAS_COPY
+    except Exception as e:
+        log.warning("No se pudo estimar filas, se usa la carga normal: %s", e)
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
 def cargar_datos(query: TextClause) -> pd.DataFrame:
     """
     Ejecuta el query (SQLAlchemy TextClause) y devuelve un DataFrame.
     Ahora usa un SQLAlchemy Engine para evitar el UserWarning de pandas.
+    Si se esperan más de SIMA_COPY_ROW_THRESHOLD filas, extrae con COPY.
+    Con SIMA_DB_CASSETTE=record/replay el resultado se graba o se lee del cassette.
     """
-    engine = _get_engine()
-    # pd.read_sql_query acepta como 'con' un engine de SQLAlchemy
-    df = pd.read_sql_query(str(query), con=engine)
+    if cassette.reproduciendo:
+        return cassette.reproducir(str(query))
+    df = _cargar_datos_db(query)
+    if cassette.grabando:
+        cassette.grabar(str(query), None, df)
     return df
 
+def _cargar_datos_db(query: TextClause) -> pd.DataFrame:
+    """Carga desde PostgreSQL (COPY o pd.read_sql_query) con una sola conexión"""
+    engine = _get_engine()
+    try:
+        with engine.connect() as conexion:
+            # Conexión psycopg2 detrás de la conexión de SQLAlchemy (la misma sesión)
+            dbapi = conexion.connection
+            if _usar_copy(dbapi, str(query)):
+                cursor = dbapi.cursor()
+                try:
+                    return leer_copy(cursor, str(query))
+                finally:
+                    cursor.close()
+            # pd.read_sql_query acepta una conexión de SQLAlchemy
+            return pd.read_sql_query(query, con=conexion)
+    finally:
+        engine.dispose()
+
+# Filas por lote en la carga por streaming
+FETCH_SIZE = int(os.getenv("SIMA_FETCH_SIZE", 50000))
+
+def cargar_datos_por_lotes(query: TextClause,
+                           transformar_lote: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                           fetch_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Ejecuta el query con un cursor del lado del servidor (named cursor) y arma el
+    DataFrame por lotes de `fetch_size` filas. Cada lote se convierte a DataFrame y
+    se transforma (tipos, filtros) antes de pedir el siguiente, de modo que nunca
+    se mantiene en memoria el resultado completo como tuplas de Python.
+    Si se esperan más de SIMA_COPY_ROW_THRESHOLD filas, los lotes salen de un COPY.
+    """
+    fetch_size = fetch_size or FETCH_SIZE
+    if cassette.reproduciendo:
+        lotes = list(cassette.reproducir_lotes(str(query)))
+        if transformar_lote is not None:
+            lotes = [transformar_lote(lote) for lote in lotes]
+        return pd.concat(lotes, ignore_index=True, copy=False)
+    if cassette.grabando:
+        # Se graban los lotes crudos; al reproducir se vuelven a transformar
+        with cassette.grabar_lotes(str(query)) as grabar_lote:
+            return _cargar_lotes_db(query, transformar_lote, fetch_size, grabar_lote)
+    return _cargar_lotes_db(query, transformar_lote, fetch_size)
+
+def _cargar_lotes_db(query: TextClause,
+                     transformar_lote: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                     fetch_size: int,
+                     grabar_lote: Optional[Callable[[pd.DataFrame], None]] = None) -> pd.DataFrame:
+    """Carga por lotes desde PostgreSQL (COPY o cursor del lado del servidor)"""
+    engine = _get_engine()
+    conn = engine.raw_connection()
+    lotes = []
+    columnas = []
+    try:
+        # Resultados grandes: COPY a CSV en memoria, parseado por lotes
+        if _usar_copy(conn, str(query)):
+            cursor = conn.cursor()
+            try:
+                for lote in leer_copy(cursor, str(query), chunksize=fetch_size):
+                    columnas = list(lote.columns)
+                    if grabar_lote is not None:
+                        grabar_lote(lote)
+                    if transformar_lote is not None:
+                        lote = transformar_lote(lote)
+                    lotes.append(lote)
+            finally:
+                cursor.close()
+            conn.commit()
+        else:
+            lotes, columnas = _leer_cursor_servidor(conn, query, transformar_lote, fetch_size, grabar_lote)
+    finally:
+        conn.close()
+        engine.dispose()
+
+    if not lotes:
+        vacio = pd.DataFrame(columns=columnas)
+        if grabar_lote is not None:
+            grabar_lote(vacio)
+        return transformar_lote(vacio) if transformar_lote is not None else vacio
+    # Los lotes de COPY traen enteros/booleanos nullables: mismos tipos que sin lotes
+    return normalizar_tipos(pd.concat(lotes, ignore_index=True, copy=False))
+
+def _leer_cursor_servidor(conn, query: TextClause,
+                          transformar_lote: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                          fetch_size: int,
+                          grabar_lote: Optional[Callable[[pd.DataFrame], None]] = None):
+    """Leer el resultado por lotes desde un cursor con nombre (del lado del servidor)"""
+    lotes = []
+    columnas = []
+    # Los cursores con nombre de psycopg2 se declaran en el servidor
+    with conn.cursor(name=f"sima_stream_{uuid.uuid4().hex}") as cursor:
+        cursor.itersize = fetch_size
+        cursor.execute(str(query))
+        while True:
+            filas = cursor.fetchmany(fetch_size)
+            if not columnas and cursor.description:
+                columnas = [desc[0] for desc in cursor.description]
+            if not filas:
+                break
+            lote = pd.DataFrame.from_records(filas, columns=columnas)
+            del filas
+            if grabar_lote is not None:
+                grabar_lote(lote)
+            if transformar_lote is not None:
+                lote = transformar_lote(lote)
+            lotes.append(lote)
+    conn.commit()
+    return lotes, columnas
+
 # Mapa de categorías a sus diccionarios de queries
 ALL_QUERIES = {
     "cocteles": coctel_queries.queries,
     "usuarios": user_queries.queries,
 }
 
-def get_query(category: str, table_name: str, mode: str = "read") -> pd.DataFrame:
-    """
-    category   : 'cocteles' o 'usuarios'
-    table_name : nombre de la consulta en tu módulo queries (por ej. 'coctel_completo')
-    mode       : generalmente 'read'
-    """
+def _resolver_query(category: str, table_name: str, mode: str = "read") -> TextClause:
+    """Obtener el TextClause registrado para category/table_name/mode"""
     qdict = ALL_QUERIES.get(category)
     if not qdict:
         raise ValueError(f"Categoría '{category}' no encontrada.")
@@ -60,4 +186,22 @@ def get_query(category: str, table_name: str, mode: str = "read") -> pd.DataFram
     query = entry.get(mode)
     if query is None:
         raise ValueError(f"Modo '{mode}' no definido para '{table_name}'.")
-    return cargar_datos(query)
+    return query
+
+def get_query(category: str, table_name: str, mode: str = "read") -> pd.DataFrame:
+    """
+    category   : 'cocteles' o 'usuarios'
+    table_name : nombre de la consulta en tu módulo queries (por ej. 'coctel_completo')
+    mode       : generalmente 'read'
+    """
+    return cargar_datos(_resolver_query(category, table_name, mode))
+
+def get_query_por_lotes(category: str, table_name: str,
+                        transformar_lote: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                        fetch_size: Optional[int] = None, mode: str = "read") -> pd.DataFrame:
+    """
+    Igual que get_query, pero cargando por lotes con un cursor del lado del servidor.
+    transformar_lote se aplica a cada lote antes de concatenarlos.
+    """
+    query = _resolver_query(category, table_name, mode)
+    return cargar_datos_por_lotes(query, transformar_lote=transformar_lote, fetch_size=fetch_size)